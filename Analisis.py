@@ -0,0 +1,165 @@
+from Instrumentacion import instrumentar
+
+
+class AnalisisCancelado(Exception):
+    """Se lanza cuando un análisis en curso se cancela antes de terminar"""
+
+
+def analizar_codigo(codigo, analizador_lexico, analizador_gramatical, instrumentacion=None):
+    """
+    Ejecuta el análisis léxico y gramatical sobre un único flujo de tokens
+    
+    El código se tokeniza y clasifica una sola vez: cada línea producida por el
+    analizador léxico se registra en la tabla de tokens y pasa inmediatamente al
+    PDA y a las validaciones semánticas del analizador gramatical.
+    
+    Args:
+        codigo (str): Código fuente completo
+        analizador_lexico: Instancia de AnalizadorLexico
+        analizador_gramatical: Instancia de AnalizadorGramatical
+        instrumentacion (Instrumentacion): Si se indica, mide fases y reglas; las
+            mediciones quedan en resultado_gramatical['estadisticas']
+        
+    Returns:
+        tuple: (resultado_lexico, resultado_gramatical) con el mismo formato que
+        AnalizadorLexico.analizar_codigo y AnalizadorGramatical.analizar_codigo
+    """
+    analizador_lexico.reiniciar()
+    analizador_gramatical.reiniciar()
+    
+    with instrumentar(instrumentacion, analizador_lexico, analizador_gramatical):
+        for linea in analizador_lexico.generar_tokens(codigo):
+            analizador_lexico.errores_lexicos.extend(
+                analizador_lexico.limites.filtrar(analizador_lexico.registrar_linea(linea)))
+            analizador_gramatical.procesar_linea(linea)
+        resultado_gramatical = analizador_gramatical.finalizar_analisis()
+    
+    if instrumentacion is not None:
+        resultado_gramatical['estadisticas'] = instrumentacion.como_dict()
+    return analizador_lexico.obtener_resultados(), resultado_gramatical
+
+
+def analizar_stream(lineas, analizador_lexico, analizador_gramatical, cancelado=None,
+                    instrumentacion=None):
+    """
+    Analiza un flujo de líneas emitiendo los diagnósticos apenas se encuentran
+    
+    Las líneas pasan una a una por el analizador léxico, el PDA y las reglas
+    semánticas; ningún diagnóstico se acumula, así que la memoria usada solo
+    depende de la tabla de tokens, las variables/funciones y la pila del PDA.
+    Al terminar, la tabla de tokens queda en analizador_lexico.tokens_dict y las
+    tablas de símbolos (con los símbolos visibles al final) en
+    analizador_gramatical.variables / .funciones.
+    
+    Solo se emiten los diagnósticos que admiten los límites de cada analizador
+    (analizador_lexico.limites para los errores léxicos y
+    analizador_gramatical.limites para el resto); los demás solo se cuentan.
+    
+    Args:
+        lineas (iterable): Líneas del código (p. ej. un archivo abierto); el
+            salto de línea final de cada una es opcional
+        analizador_lexico: Instancia de AnalizadorLexico
+        analizador_gramatical: Instancia de AnalizadorGramatical
+        cancelado (threading.Event): Si se activa, el análisis se interrumpe
+            antes de la siguiente línea
+        instrumentacion (Instrumentacion): Si se indica, mide fases y reglas
+            (se consulta con instrumentacion.como_dict() al terminar)
+        
+    Yields:
+        Diagnostico: Cada error o advertencia, en orden de detección (su tipo
+        es 'error_lexico', 'error' o 'advertencia'; el texto, Diagnostico.mensaje)
+    
+    Raises:
+        AnalisisCancelado: Si `cancelado` se activó durante el análisis
+    """
+    with instrumentar(instrumentacion, analizador_lexico, analizador_gramatical):
+        yield from _analizar_stream(lineas, analizador_lexico, analizador_gramatical, cancelado)
+
+
+def _analizar_stream(lineas, analizador_lexico, analizador_gramatical, cancelado):
+    """Cuerpo de analizar_stream"""
+    lineas = (texto[:-1] if texto.endswith('\n') else texto for texto in lineas)
+    yield from _analizar_flujo(analizador_lexico.generar_lineas(lineas), analizador_lexico,
+                               analizador_gramatical, cancelado)
+
+
+def _analizar_flujo(flujo, analizador_lexico, analizador_gramatical, cancelado):
+    """Emite los diagnósticos de un flujo de LineaTokens (ver analizar_stream)"""
+    analizador_lexico.reiniciar()
+    analizador_gramatical.reiniciar()
+    pda = analizador_gramatical.pda
+    admitir_lexico = analizador_lexico.limites.admitir
+    admitir = analizador_gramatical.limites.admitir
+    
+    for linea in flujo:
+        if cancelado is not None and cancelado.is_set():
+            raise AnalisisCancelado()
+        
+        yield from filter(admitir_lexico, analizador_lexico.registrar_linea(linea))
+        
+        validacion = analizador_gramatical.validar_linea(linea)
+        yield from filter(admitir, validacion['errores'])
+        yield from filter(admitir, validacion['advertencias'])
+        
+        if pda.errores or pda.advertencias:
+            yield from _diagnosticos_pda(pda.extraer_resultados(), admitir)
+    
+    # Estructuras que quedaron abiertas al final del archivo
+    pda.validar_final()
+    yield from _diagnosticos_pda(pda.extraer_resultados(), admitir)
+
+
+def analizar_bytes(datos, analizador_lexico, analizador_gramatical, encoding="utf-8", cancelado=None,
+                   instrumentacion=None):
+    """
+    Analiza un contenido ya leído en bytes
+    
+    Igual que analizar_archivo sobre un archivo con ese contenido (ver
+    AnalizadorLexico.generar_tokens_bytes); sirve a quien necesita analizar
+    exactamente los bytes que leyó, p. ej. para asociar el resultado a su hash.
+    
+    Args:
+        datos (bytes): Contenido del archivo
+        analizador_lexico: Instancia de AnalizadorLexico
+        analizador_gramatical: Instancia de AnalizadorGramatical
+        encoding (str): Codificación del contenido (compatible con ASCII)
+        cancelado (threading.Event): Permite interrumpir el análisis (ver analizar_stream)
+        instrumentacion (Instrumentacion): Mediciones opcionales (ver analizar_stream)
+        
+    Yields:
+        Diagnostico: Diagnósticos como los de analizar_stream
+    """
+    with instrumentar(instrumentacion, analizador_lexico, analizador_gramatical):
+        flujo = analizador_lexico.generar_tokens_bytes(datos, encoding)
+        yield from _analizar_flujo(flujo, analizador_lexico, analizador_gramatical, cancelado)
+
+
+def _diagnosticos_pda(resultados, admitir):
+    """Emite los resultados extraídos del PDA que admiten los límites"""
+    yield from filter(admitir, resultados['errores'])
+    yield from filter(admitir, resultados['advertencias'])
+
+
+def analizar_archivo(ruta, analizador_lexico, analizador_gramatical, encoding="utf-8", cancelado=None,
+                     instrumentacion=None):
+    """
+    Analiza un archivo sin cargarlo completo en memoria
+    
+    El archivo se mapea en memoria y se tokeniza directamente sobre sus bytes
+    (ver AnalizadorLexico.generar_tokens_archivo); los diagnósticos son los
+    mismos que al pasar las líneas del archivo a analizar_stream.
+    
+    Args:
+        ruta (str): Ruta del archivo a analizar
+        analizador_lexico: Instancia de AnalizadorLexico
+        analizador_gramatical: Instancia de AnalizadorGramatical
+        encoding (str): Codificación del archivo
+        cancelado (threading.Event): Permite interrumpir el análisis (ver analizar_stream)
+        instrumentacion (Instrumentacion): Mediciones opcionales (ver analizar_stream)
+        
+    Yields:
+        Diagnostico: Diagnósticos como los de analizar_stream
+    """
+    with instrumentar(instrumentacion, analizador_lexico, analizador_gramatical):
+        flujo = analizador_lexico.generar_tokens_archivo(ruta, encoding)
+        yield from _analizar_flujo(flujo, analizador_lexico, analizador_gramatical, cancelado)
@@ -1,21 +1,370 @@
+import io
 import re
 import json
+import mmap
+import os
+import stat
+import time
+from array import array
+from collections import OrderedDict
+
+from Diagnosticos import Diagnostico, LimitesDiagnosticos
+from Instrumentacion import instrumentar
+from Registro import advertir, informar
+from TablasTokens import (CATEGORIA_POR_GRUPO, CODIGO_POR_GRUPO, CODIGOS_TIPO, TIPOS_TOKEN, compilar_tabla,
+                          perfil_tokens)
+
+# Patrón de tokenización compartido por el análisis léxico y gramatical. La
+# alternancia maestra (TablasTokens.PATRON_MAESTRO) produce los mismos tokens,
+# pero el grupo con nombre que coincide ya indica la categoría del token; cada
+# TablaTokens la compila con los operadores y signos de su Tokens.json
+PATRON_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|\w+|==|!=|<=|>=|\+\+|--|[+\-*/=<>%(){}\[\];,]|\n')
+
+PATRON_SALTO_BYTES = re.compile(rb'\r\n?|\n')
+
+# Clasificación de un token aislado (fullmatch): admite decimales como '1.5'
+PATRON_TOKEN_AISLADO = re.compile(
+    r'(?P<cadena>"(?:\\.|[^"\\])*")'
+    r'|(?P<numeros>\d+(?:\.\d+)?)'
+    r'|(?P<identificadores>[a-zA-Z_][a-zA-Z0-9_]*)'
+)
+
+CODIGO_CADENA = CODIGOS_TIPO["cadena"]
+CODIGO_DESCONOCIDO = CODIGOS_TIPO["desconocido"]
+
+# Cantidad de líneas distintas que recuerda por defecto el caché de líneas
+TAMANO_CACHE_LINEAS = 4096
+
+
+class ClasificadorTokens:
+    """
+    Motor de clasificación sobre las tablas compiladas de Tokens.json
+    
+    Combina la alternancia maestra (la categoría sale del grupo que coincide) con
+    un diccionario token -> categoría para palabras reservadas, operadores y signos.
+    Las tablas son las de una TablaTokens compartida; el clasificador solo las
+    referencia, así que crearlo no cuesta nada.
+    """
+
+    def __init__(self, tabla):
+        """
+        Args:
+            tabla (TablaTokens): Tablas compiladas (ver TablasTokens.compilar_tabla)
+        """
+        self.tabla = tabla
+        self.patron = tabla.patron
+        self.patron_bytes = tabla.patron_bytes
+        self.categorias = tabla.categorias
+        self.codigos = tabla.codigos
+        self.codigos_bytes = tabla.codigos_bytes
+        self.reservadas = tabla.reservadas
+        # Categoría por defecto según el grupo del patrón maestro
+        self.por_grupo = CATEGORIA_POR_GRUPO
+        self.codigo_por_grupo = CODIGO_POR_GRUPO
+
+    def categoria(self, grupo, token):
+        """
+        Categoría de un token a partir del grupo que lo reconoció
+        
+        Args:
+            grupo (str): Nombre del grupo (lastgroup) del patrón maestro
+            token (str): Texto del token
+            
+        Returns:
+            str: Categoría del token
+        """
+        if grupo == "cadena":
+            return "cadena"
+        return self.categorias.get(token) or self.por_grupo[grupo]
+
+    def clasificar(self, token):
+        """
+        Clasifica un token aislado
+        
+        Args:
+            token (str): Token a clasificar
+            
+        Returns:
+            str: Categoría del token
+        """
+        token = token.strip()  # elimina espacios residuales
+        coincidencia = PATRON_TOKEN_AISLADO.fullmatch(token)
+        
+        if coincidencia is not None and coincidencia.lastgroup == "cadena":
+            return "cadena"
+        if token in self.reservadas:
+            return self.categorias[token]
+        if coincidencia is None:
+            return "desconocido"
+        return coincidencia.lastgroup
+
+
+def dividir_lineas(codigo):
+    """
+    Recorre las líneas de un código sin crear la lista completa (como split('\\n'))
+    
+    Args:
+        codigo (str): Código fuente completo
+        
+    Yields:
+        str: Cada línea, sin el salto de línea
+    """
+    inicio = 0
+    while True:
+        fin = codigo.find('\n', inicio)
+        if fin < 0:
+            yield codigo[inicio:]
+            return
+        yield codigo[inicio:fin]
+        inicio = fin + 1
+
+
+def codificacion_compatible_ascii(encoding):
+    """
+    Indica si una codificación representa los caracteres ASCII con los mismos bytes
+    
+    Solo en esas codificaciones (utf-8, latin-1, cp1252...) un archivo puede
+    tokenizarse directamente sobre sus bytes.
+    
+    Args:
+        encoding (str): Nombre de la codificación
+        
+    Returns:
+        bool: True si el texto ASCII se codifica byte a byte
+    """
+    muestra = "".join(map(chr, range(128)))
+    try:
+        return muestra.encode(encoding) == muestra.encode("ascii")
+    except (LookupError, UnicodeError):
+        return False
+
+
+def dividir_lineas_bytes(datos, encoding="utf-8"):
+    """
+    Recorre las líneas de un contenido en bytes decodificándolas de a una
+    
+    Args:
+        datos: bytes o mmap con el contenido
+        encoding (str): Codificación del contenido
+        
+    Yields:
+        str: Cada línea, sin el salto de línea
+    """
+    inicio = 0
+    for salto in PATRON_SALTO_BYTES.finditer(datos):
+        yield datos[inicio:salto.start()].decode(encoding)
+        inicio = salto.end()
+    if inicio < len(datos):
+        yield datos[inicio:].decode(encoding)
+
+
+class LineaTokens:
+    """
+    Tokens de una línea del código fuente, producidos una sola vez por el
+    analizador léxico y consumidos por el gramatical, el PDA y las reglas semánticas
+    
+    Los tokens se guardan en columnas compactas: el tipo de cada token como un
+    byte (índice en TIPOS_TOKEN) y sus posiciones de inicio y fin dentro de
+    `texto` en un array('I'). Las cadenas de los tokens solo se crean cuando se
+    piden (tokens, token, tokens_lexicos), así que una línea guardada ocupa unos
+    pocos bytes por token en lugar de un str y una tupla por token.
+    
+    Los tokens que el analizador léxico ya creó al clasificar la línea se
+    conservan mientras la línea recorre el flujo; quien guarda muchas líneas
+    por más tiempo (p. ej. el análisis incremental) las compacta con compactar().
+    """
+    __slots__ = ("numero", "texto", "tipos", "posiciones", "corte", "lexicos", "conteo", "_tokens")
+
+    def __init__(self, numero, texto, tipos, posiciones, corte, lexicos=None, conteo=None, tokens=None):
+        self.numero = numero          # Número de línea (desde 1)
+        self.texto = texto            # Texto original de la línea
+        self.tipos = tipos            # bytes: código de tipo de cada token (ver TIPOS_TOKEN)
+        self.posiciones = posiciones  # array('I'): inicio y fin de cada token en texto, alternados
+        self.corte = corte            # Cantidad de tokens antes del comentario '//'
+        self.lexicos = lexicos        # Pares (token, tipo) si el comentario parte un token
+        self.conteo = conteo          # (registros, desconocidos) precalculados por el caché
+        self._tokens = tokens         # Tokens (str) ya creados por el analizador léxico, o None
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def compactar(self):
+        """Descarta los tokens (str) ya creados; se vuelven a crear desde las posiciones"""
+        self._tokens = None
+
+    @property
+    def tokens(self):
+        """Lista de tokens (str) de la línea completa"""
+        if self._tokens is not None:
+            return self._tokens
+        texto = self.texto
+        posiciones = iter(self.posiciones)
+        return [texto[inicio:fin] for inicio, fin in zip(posiciones, posiciones)]
+
+    @property
+    def spans(self):
+        """Lista de (inicio, fin) de cada token dentro de la línea"""
+        posiciones = iter(self.posiciones)
+        return list(zip(posiciones, posiciones))
+
+    def token(self, indice):
+        """Texto del token en la posición `indice`"""
+        return self.texto[self.posiciones[2 * indice]:self.posiciones[2 * indice + 1]]
+
+    def tipo(self, indice):
+        """Categoría (nombre) del token en la posición `indice`"""
+        return TIPOS_TOKEN[self.tipos[indice]]
+
+    def tokens_lexicos(self):
+        """
+        Retorna los tokens que cuentan para el análisis léxico (sin comentario)
+
+        Returns:
+            iterable: Pares (token, tipo)
+        """
+        if self.lexicos is not None:
+            return self.lexicos
+        corte = self.corte
+        if self._tokens is not None:
+            tipos = map(TIPOS_TOKEN.__getitem__, self.tipos)
+            if corte == len(self._tokens):
+                return zip(self._tokens, tipos)
+            return zip(self._tokens[:corte], tipos)
+        texto = self.texto
+        posiciones = iter(self.posiciones if corte == len(self.tipos) else self.posiciones[:2 * corte])
+        return [(texto[inicio:fin], TIPOS_TOKEN[codigo])
+                for inicio, fin, codigo in zip(posiciones, posiciones, self.tipos)]
+
+    def contar_tokens(self):
+        """
+        Agrupa los tokens léxicos de la línea para registrarlos de una vez
+
+        Returns:
+            tuple: (registros, desconocidos) donde registros son tuplas
+            (token, tipo, cantidad) en orden de primera aparición y desconocidos
+            pares (token, índice del token en la línea) en orden de aparición; el
+            índice es None si el comentario parte un token (ver lexicos)
+        """
+        cantidades = {}
+        desconocidos = []
+        con_indice = self.lexicos is None
+        for indice, (token, tipo) in enumerate(self.tokens_lexicos()):
+            if tipo == "desconocido":
+                desconocidos.append((token, indice if con_indice else None))
+            elif token in cantidades:
+                cantidades[token][2] += 1
+            else:
+                cantidades[token] = [token, tipo, 1]
+        return tuple(map(tuple, cantidades.values())), tuple(desconocidos)
+
+
+class CacheLineas:
+    """
+    Caché LRU acotado de líneas ya tokenizadas y clasificadas
+
+    La clave es el texto de la línea sin espacios al inicio ni al final, así que
+    la misma instrucción con distinta sangría se tokeniza una sola vez. Al
+    superar la capacidad se descarta la línea usada hace más tiempo.
+    """
+
+    def __init__(self, capacidad=TAMANO_CACHE_LINEAS):
+        """
+        Args:
+            capacidad (int): Cantidad máxima de líneas distintas guardadas
+        """
+        self.capacidad = capacidad
+        self.entradas = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """
+        Busca una línea en el caché
+
+        Args:
+            clave (str): Texto normalizado de la línea
+
+        Returns:
+            La entrada guardada, o None si no está
+        """
+        entrada = self.entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self.entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada
+
+    def guardar(self, clave, entrada):
+        """
+        Guarda una línea descartando la menos usada si el caché está lleno
+
+        Args:
+            clave (str): Texto normalizado de la línea
+            entrada: Datos de la línea
+        """
+        self.entradas[clave] = entrada
+        if len(self.entradas) > self.capacidad:
+            self.entradas.popitem(last=False)
+
+    def limpiar(self):
+        """Vacía el caché y reinicia los contadores"""
+        self.entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def estadisticas(self):
+        """
+        Retorna el uso del caché
+
+        Returns:
+            dict: {'capacidad', 'lineas', 'aciertos', 'fallos', 'tasa_aciertos'}
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'capacidad': self.capacidad,
+            'lineas': len(self.entradas),
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+        }
+
 
 class AnalizadorLexico:
-    def __init__(self, ruta_tokens_json="Tokens.json"):
-        """Inicializa el analizador léxico con las categorías de tokens"""
-        self.tokens_json = self._cargar_tokens_json(ruta_tokens_json)
+    def __init__(self, ruta_tokens_json="Tokens.json", tokens_json=None,
+                 tamano_cache=TAMANO_CACHE_LINEAS, limites=None, perfil=None):
+        """
+        Inicializa el analizador léxico con las categorías de tokens
+
+        Args:
+            ruta_tokens_json (str): Ruta del archivo JSON de tokens; sus tablas
+                se recargan si el archivo cambia (ver actualizar_tabla)
+            tokens_json (dict): Categorías ya cargadas (evita leer el archivo)
+            tamano_cache (int): Líneas distintas que recuerda el caché (0 lo desactiva)
+            limites (LimitesDiagnosticos): Máximos de errores léxicos guardados
+                (por defecto, sin límite; igual se cuentan)
+            perfil (PerfilTokens): Perfil de tokens ya cargado (en lugar de la ruta)
+        """
+        if tokens_json is None and perfil is None:
+            perfil = self._cargar_perfil(ruta_tokens_json)
+        self.perfil = perfil
+        self.cache = CacheLineas(tamano_cache) if tamano_cache else None
+        if perfil is not None:
+            self._aplicar_tabla(perfil.tabla)
+        else:
+            self._aplicar_tabla(compilar_tabla(tokens_json))
+            self.tokens_json = tokens_json
+        self.instrumentacion = None  # Instrumentacion activa durante un análisis medido
         self.tokens_dict = {}  # Almacena tokens encontrados {token: {Token, Tipo, Cantidad}}
+        self.errores_lexicos = []
+        self.limites = limites if limites is not None else LimitesDiagnosticos()
     
-    def _cargar_tokens_json(self, ruta):
-        """Carga el archivo JSON de tokens"""
+    def _cargar_perfil(self, ruta):
+        """Carga el perfil de un archivo JSON de tokens (compartido en el proceso)"""
         try:
-            with open(ruta, "r", encoding="utf-8") as archivo:
-                tokens = json.load(archivo)
-            print("✓ JSON de tokens cargado correctamente")
-            return tokens
+            perfil = perfil_tokens(ruta)
         except FileNotFoundError:
-            print("⚠ No se encontró Tokens.json, creando uno por defecto...")
+            advertir(__name__, "⚠ No se encontró Tokens.json, creando uno por defecto...")
             tokens = {
                 "Preservada": ["entero", "decimal", "caracter", "si", "sino", "mientras", "para", "imprimir","func", "siguente", "finaliza"],
                 "operadores": ["+", "-", "*", "/", "=", "==", "!=", "<=", ">=", "<", ">", "%", "++", "--"],
@@ -23,53 +372,422 @@ class AnalizadorLexico:
             }
             with open(ruta, "w", encoding="utf-8") as f:
                 json.dump(tokens, f, indent=4, ensure_ascii=False)
-            return tokens
-        except json.JSONDecodeError:
-            raise ValueError("⚠ El archivo Tokens.json tiene formato inválido")
+            perfil = perfil_tokens(ruta)
+        informar(__name__, "✓ JSON de tokens cargado correctamente")
+        return perfil
+    
+    def _aplicar_tabla(self, tabla):
+        """Usa las tablas compiladas de `tabla` para clasificar"""
+        self.tabla = tabla
+        self.tokens_json = tabla.tokens_json
+        self.clasificador = ClasificadorTokens(tabla)
+        if self.cache is not None:
+            # Las líneas guardadas se clasificaron con la tabla anterior
+            self.cache.limpiar()
+    
+    def actualizar_tabla(self):
+        """
+        Recarga las tablas si el archivo de tokens cambió
+        
+        Se consulta al reiniciar cada análisis: con un archivo que no cambia
+        solo cuesta un stat.
+        
+        Returns:
+            bool: True si la tabla cambió (las LineaTokens ya producidas quedan
+            clasificadas con la anterior)
+        """
+        if self.perfil is None:
+            return False
+        self.perfil.actualizar()
+        if self.perfil.tabla is self.tabla:
+            return False
+        self._aplicar_tabla(self.perfil.tabla)
+        return True
     
     def clasificar_token(self, token):
-        token = token.strip()  # elimina espacios residuales
+        """
+        Clasifica un token según las categorías de Tokens.json
         
-        # Detectar cadenas
-        if re.fullmatch(r'"(?:\\.|[^"\\])*"', token):
-            return "cadena"
+        Args:
+            token (str): Token a clasificar
+            
+        Returns:
+            str: Categoría del token
+        """
+        if self.instrumentacion is not None:
+            inicio = time.perf_counter()
+            categoria = self.clasificador.clasificar(token)
+            self.instrumentacion.registrar_fase("clasificar_token", time.perf_counter() - inicio)
+            self.instrumentacion.contar_regex("clasificar_token")
+            return categoria
+        return self.clasificador.clasificar(token)
+
+    def tokenizar_linea(self, linea):
+        """Tokeniza una línea con el patrón compartido"""
+        return PATRON_TOKEN.findall(linea)
+
+    def _construir_linea(self, numero_linea, texto, tokens, tipos, posiciones):
+        """
+        Arma la LineaTokens de una línea ya tokenizada y clasificada
         
-        # Palabras reservadas, operadores y signos (según JSON)
-        for categoria in ["Preservada", "operadores", "signos"]:
-            if token in self.tokens_json.get(categoria, []):
-                return categoria
+        Las líneas vacías o que comienzan con '//' no producen tokens; en el resto
+        el comentario inline queda después de `corte` (el análisis gramatical sí
+        lo recibe).
         
-        # Números (enteros o decimales)
-        if re.fullmatch(r"\d+(\.\d+)?", token):
-            return "numeros"
+        Args:
+            tokens (list): Tokens (str) de la línea, o None si no se crearon
+            tipos (list): Código de tipo de cada token
+            posiciones (list): Inicio y fin de cada token en texto, alternados
         
-        # Identificadores (variables)
-        if re.fullmatch(r"[a-zA-Z_][a-zA-Z0-9_]*", token):
-            return "identificadores"
+        Returns:
+            LineaTokens: La línea, o None si no aporta tokens
+        """
+        if not tipos or texto.lstrip().startswith('//'):
+            return None
         
-        # Espacios o saltos
-        if token == " ":
-            return "espacio"
-        if token == "\n":
-            return "salto de linea"
+        cantidad = len(tipos)
+        corte = cantidad
+        lexicos = None
+        inicio_comentario = texto.find('//')
+        if inicio_comentario >= 0:
+            corte = 0
+            while corte < cantidad and posiciones[2 * corte + 1] <= inicio_comentario:
+                corte += 1
+            # Un token (p. ej. una cadena) que contiene '//' se parte igual que
+            # al recortar la línea, así que se re-tokeniza solo ese prefijo
+            if corte < cantidad and posiciones[2 * corte] < inicio_comentario:
+                if self.instrumentacion is not None:
+                    self.instrumentacion.contar_regex("tokenizacion")
+                prefijo = self.tokenizar_linea(texto[:inicio_comentario])
+                lexicos = [(token, self.clasificar_token(token)) for token in prefijo]
         
-        # Si no encaja con nada
-        return"desconocido"
+        return LineaTokens(numero_linea, texto, bytes(tipos), array('I', posiciones),
+                           corte, lexicos, tokens=tokens)
 
-    def tokenizar_linea(self, linea):
-    # Mejor patrón para cadenas con escapes
-        patron = r'"(?:\\.|[^"\\])*"|\w+|==|!=|<=|>=|\+\+|--|[+\-*/=<>%(){}\[\];,]|\n'
-        return re.findall(patron, linea)
+    def generar_lineas(self, lineas, primera_linea=1):
+        """
+        Genera el flujo de tokens a partir de las líneas de un código
+        
+        Args:
+            lineas (iterable): Líneas del código fuente (sin salto de línea)
+            primera_linea (int): Número de la primera línea
+            
+        Returns:
+            iterator: LineaTokens de cada línea con contenido
+        """
+        flujo = self._generar_lineas(lineas, primera_linea)
+        if self.instrumentacion is not None:
+            return self.instrumentacion.medir_iterador("tokenizacion", flujo)
+        return flujo
+
+    def _generar_lineas(self, lineas, primera_linea):
+        """Generador de generar_lineas (sin instrumentación)"""
+        if self.cache is not None:
+            for numero_linea, texto in enumerate(lineas, start=primera_linea):
+                linea = self._linea_desde_cache(numero_linea, texto)
+                if linea is not None:
+                    yield linea
+            return
+        
+        for numero_linea, texto in enumerate(lineas, start=primera_linea):
+            linea = self._tokenizar_texto(numero_linea, texto)
+            if linea is not None:
+                yield linea
 
-    def registrar_token(self, token):
+    def _tokenizar_texto(self, numero_linea, texto):
+        """
+        Tokeniza y clasifica una línea con el patrón maestro
+        
+        Returns:
+            LineaTokens: La línea, o None si no aporta tokens
+        """
+        codigos = self.clasificador.codigos
+        codigo_por_grupo = self.clasificador.codigo_por_grupo
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar_regex("tokenizacion")
+        
+        tokens = []
+        tipos = []
+        posiciones = []
+        for coincidencia in self.clasificador.patron.finditer(texto):
+            token = coincidencia.group()
+            grupo = coincidencia.lastgroup
+            tokens.append(token)
+            if grupo == "cadena":
+                tipos.append(CODIGO_CADENA)
+            else:
+                tipos.append(codigos.get(token, codigo_por_grupo[grupo]))
+            posiciones += coincidencia.span()
+        
+        return self._construir_linea(numero_linea, texto, tokens, tipos, posiciones)
+
+    def _linea_desde_cache(self, numero_linea, texto):
+        """
+        Obtiene la LineaTokens de una línea reutilizando el caché de líneas
+        
+        Las líneas con el mismo texto (salvo espacios al inicio y al final)
+        comparten las columnas, los tokens (str) y el conteo ya agrupado para la
+        tabla de tokens. Un fallo cuesta lo mismo que tokenizar la línea: la
+        primera aparición se guarda sin copiar nada y el conteo se arma recién
+        cuando la línea se repite.
+        
+        Returns:
+            LineaTokens: La línea, o None si no aporta tokens
+        """
+        clave = texto.strip()
+        entrada = self.cache.obtener(clave)
+        if entrada is None:
+            linea = self._tokenizar_texto(numero_linea, texto)
+            # Las líneas sin tokens también se guardan (False, para distinguirlas de un fallo).
+            # La entrada es otro objeto que comparte los datos de la línea, para que
+            # compactar la línea devuelta no descarte los tokens del caché
+            if linea is None:
+                self.cache.guardar(clave, False)
+            else:
+                self.cache.guardar(clave, LineaTokens(numero_linea, texto, linea.tipos, linea.posiciones,
+                                                      linea.corte, linea.lexicos, tokens=linea._tokens))
+            return linea
+        
+        if entrada is False:
+            return None
+        if entrada.conteo is None:
+            entrada.conteo = entrada.contar_tokens()
+        
+        # Las posiciones dependen de la sangría de cada aparición
+        posiciones = entrada.posiciones
+        diferencia = (len(texto) - len(texto.lstrip())) - (len(entrada.texto) - len(entrada.texto.lstrip()))
+        if diferencia:
+            posiciones = array('I', [posicion + diferencia for posicion in posiciones])
+        
+        return LineaTokens(numero_linea, texto, entrada.tipos, posiciones,
+                           entrada.corte, entrada.lexicos, entrada.conteo, entrada._tokens)
+
+    def generar_tokens(self, codigo):
+        """
+        Genera el flujo de tokens de un código completo
+        
+        El código se recorre con una sola pasada de finditer del patrón maestro;
+        los saltos de línea delimitan las líneas y el grupo que coincide da la
+        categoría de cada token sin volver a clasificarlo.
+        
+        Con el caché de líneas activo el código se recorre línea por línea para
+        reutilizar las líneas repetidas (las cadenas nunca cruzan un salto de
+        línea, así que el resultado es el mismo). Las líneas se extraen de a una,
+        sin armar la lista de todas las líneas del código.
+        
+        Args:
+            codigo (str): Código fuente completo
+            
+        Returns:
+            iterator: LineaTokens de cada línea con contenido
+        """
+        flujo = self._generar_tokens(codigo)
+        if self.instrumentacion is not None:
+            return self.instrumentacion.medir_iterador("tokenizacion", flujo)
+        return flujo
+
+    def _generar_tokens(self, codigo):
+        """Generador de generar_tokens (sin instrumentación)"""
+        if self.cache is not None:
+            yield from self._generar_lineas(dividir_lineas(codigo), 1)
+            return
+        
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar_regex("tokenizacion")
+        
+        codigos = self.clasificador.codigos
+        codigo_por_grupo = self.clasificador.codigo_por_grupo
+        
+        numero_linea = 1
+        inicio_linea = 0
+        tokens = []
+        tipos = []
+        posiciones = []
+        
+        for coincidencia in self.clasificador.patron.finditer(codigo):
+            grupo = coincidencia.lastgroup
+            inicio, fin = coincidencia.span()
+            
+            if grupo == "salto":
+                if tokens:
+                    linea = self._construir_linea(numero_linea, codigo[inicio_linea:inicio],
+                                                  tokens, tipos, posiciones)
+                    if linea is not None:
+                        yield linea
+                    tokens = []
+                    tipos = []
+                    posiciones = []
+                numero_linea += 1
+                inicio_linea = fin
+                continue
+            
+            token = coincidencia.group()
+            tokens.append(token)
+            if grupo == "cadena":
+                tipos.append(CODIGO_CADENA)
+            else:
+                tipos.append(codigos.get(token, codigo_por_grupo[grupo]))
+            posiciones += (inicio - inicio_linea, fin - inicio_linea)
+        
+        if tokens:
+            linea = self._construir_linea(numero_linea, codigo[inicio_linea:], tokens, tipos, posiciones)
+            if linea is not None:
+                yield linea
+
+    def generar_tokens_archivo(self, ruta, encoding="utf-8"):
+        """
+        Genera el flujo de tokens de un archivo sin leerlo completo en memoria
+        
+        El archivo se mapea en memoria (mmap) y se recorre directamente sobre
+        los bytes con el patrón en bytes: no se crea un str por archivo ni por
+        token, y solo se decodifican las líneas que tienen tokens. Las líneas con
+        caracteres no ASCII se decodifican y se tokenizan como texto, así que
+        el resultado es el mismo que el de recorrer el archivo abierto en modo
+        texto. Con el caché de líneas activo cada línea se decodifica y se
+        procesa igual que en generar_lineas; si el archivo no se puede mapear
+        (vacío o no regular, como una tubería) o la codificación no es
+        compatible con ASCII (p. ej. utf-16), se lee en modo texto.
+        
+        Args:
+            ruta (str): Ruta del archivo
+            encoding (str): Codificación del archivo
+            
+        Returns:
+            iterator: LineaTokens de cada línea con contenido
+        """
+        flujo = self._generar_tokens_archivo(ruta, encoding)
+        if self.instrumentacion is not None:
+            return self.instrumentacion.medir_iterador("tokenizacion", flujo)
+        return flujo
+
+    def _generar_tokens_archivo(self, ruta, encoding):
+        """Generador de generar_tokens_archivo (sin instrumentación)"""
+        with open(ruta, "rb") as archivo:
+            estado = os.fstat(archivo.fileno())
+            # mmap necesita un archivo regular no vacío (no una tubería, p. ej.)
+            if (estado.st_size == 0 or not stat.S_ISREG(estado.st_mode)
+                    or not codificacion_compatible_ascii(encoding)):
+                texto = io.TextIOWrapper(archivo, encoding=encoding)
+                lineas = (linea[:-1] if linea.endswith('\n') else linea for linea in texto)
+                yield from self._generar_lineas(lineas, 1)
+                return
+            
+            datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                # Lectura de principio a fin: el sistema lee por adelantado y puede
+                # liberar las páginas ya recorridas
+                datos.madvise(mmap.MADV_SEQUENTIAL)
+            try:
+                yield from self._generar_tokens_datos(datos, encoding)
+            finally:
+                try:
+                    datos.close()
+                except BufferError:
+                    # Un traceback todavía referencia el contenido; se libera con el recolector
+                    pass
+
+    def generar_tokens_bytes(self, datos, encoding="utf-8"):
+        """
+        Genera el flujo de tokens de un contenido en bytes (p. ej. un fragmento de archivo)
+        
+        Igual que generar_tokens_archivo sobre un archivo con ese contenido; la
+        codificación debe ser compatible con ASCII (ver codificacion_compatible_ascii).
+        
+        Args:
+            datos: bytes o mmap con el contenido
+            encoding (str): Codificación del contenido
+            
+        Returns:
+            iterator: LineaTokens de cada línea con contenido
+        """
+        flujo = self._generar_tokens_datos(datos, encoding)
+        if self.instrumentacion is not None:
+            return self.instrumentacion.medir_iterador("tokenizacion", flujo)
+        return flujo
+
+    def _generar_tokens_datos(self, datos, encoding):
+        """Generador de generar_tokens_bytes (sin instrumentación)"""
+        if self.cache is not None:
+            yield from self._generar_lineas(dividir_lineas_bytes(datos, encoding), 1)
+        else:
+            yield from self._generar_tokens_bytes(datos, encoding)
+
+    def _generar_tokens_bytes(self, datos, encoding):
+        """
+        Recorre un contenido en bytes con una sola pasada del patrón en bytes
+        
+        Equivale a _generar_tokens sobre el texto decodificado; las posiciones
+        de los tokens salen de los bytes y la línea se decodifica una sola vez.
+        """
+        if self.instrumentacion is not None:
+            self.instrumentacion.contar_regex("tokenizacion")
+        
+        codigos = self.clasificador.codigos_bytes
+        codigo_por_grupo = self.clasificador.codigo_por_grupo
+        patron = self.clasificador.patron_bytes
+        
+        numero_linea = 1
+        inicio_linea = 0
+        tipos = []
+        posiciones = []
+        no_ascii = False   # La línea tiene bytes no ASCII fuera de los tokens
+        
+        for coincidencia in patron.finditer(datos):
+            grupo = coincidencia.lastgroup
+            inicio, fin = coincidencia.span()
+            
+            if grupo == "salto":
+                if tipos or no_ascii:
+                    linea = self._construir_linea_bytes(numero_linea, datos[inicio_linea:inicio],
+                                                        tipos, posiciones, encoding)
+                    if linea is not None:
+                        yield linea
+                    tipos = []
+                    posiciones = []
+                    no_ascii = False
+                numero_linea += 1
+                inicio_linea = fin
+                continue
+            
+            if grupo == "no_ascii":
+                no_ascii = True
+                continue
+            
+            if grupo == "cadena":
+                tipos.append(CODIGO_CADENA)
+            else:
+                tipos.append(codigos.get(coincidencia.group(), codigo_por_grupo[grupo]))
+            posiciones += (inicio - inicio_linea, fin - inicio_linea)
+        
+        if tipos or no_ascii:
+            linea = self._construir_linea_bytes(numero_linea, datos[inicio_linea:], tipos, posiciones, encoding)
+            if linea is not None:
+                yield linea
+
+    def _construir_linea_bytes(self, numero_linea, crudo, tipos, posiciones, encoding):
+        """
+        Arma la LineaTokens de una línea tokenizada sobre sus bytes
+        
+        Returns:
+            LineaTokens: La línea, o None si no aporta tokens
+        """
+        if crudo.isascii():
+            return self._construir_linea(numero_linea, crudo.decode("ascii"), None, tipos, posiciones)
+        # Con caracteres no ASCII los bytes no se corresponden con los caracteres
+        # (ni \w con el de un str): la línea se tokeniza como texto
+        return self._tokenizar_texto(numero_linea, crudo.decode(encoding))
+
+    def registrar_token(self, token, categoria=None):
         """
         Registra un token en el diccionario interno
         
         Args:
             token (str): Token a registrar
-            categoria (str): Categoría del token
+            categoria (str): Categoría del token (se calcula si no se indica)
         """
-        categoria = self.clasificar_token(token)
+        if categoria is None:
+            categoria = self.clasificar_token(token)
         
         if categoria not in ["espacio", "desconocido"]:
             if token in self.tokens_dict:
@@ -81,54 +799,164 @@ class AnalizadorLexico:
                     "Cantidad": 1
                 }
     
-    def analizar_codigo(self, codigo):
+    def reiniciar(self):
+        """Reinicia los tokens y errores para un nuevo análisis"""
+        self.actualizar_tabla()
+        self.tokens_dict = {}
+        self.errores_lexicos = []
+        self.limites.reiniciar()
+
+    def registrar_linea(self, linea):
         """
-        Analiza un código completo línea por línea
+        Registra los tokens léxicos de una línea en la tabla de tokens
+        
+        Los errores no se acumulan aquí para que el análisis por flujo pueda
+        emitirlos sin guardarlos; analizar_codigo los agrega a errores_lexicos
+        (respetando self.limites).
         
         Args:
-            codigo (str): Código fuente completo
+            linea (LineaTokens): Línea producida por generar_lineas
             
         Returns:
-            dict: {
-                'tokens': dict con tokens encontrados,
-                'errores_lexicos': lista de errores léxicos encontrados
-            }
+            list: Errores léxicos (Diagnostico) de la línea
         """
-        self.tokens_dict = {}  # Reiniciar contador
-        errores_lexicos = []
+        if self.instrumentacion is not None:
+            inicio = time.perf_counter()
+            errores = self._registrar_linea(linea)
+            self.instrumentacion.registrar_fase("registro", time.perf_counter() - inicio)
+            return errores
+        return self._registrar_linea(linea)
+
+    def _registrar_linea(self, linea):
+        """Cuerpo de registrar_linea (sin instrumentación)"""
+        if linea.conteo is not None:
+            return self._registrar_conteo(linea)
         
-        lineas = codigo.split('\n')
+        # Sin columna si el comentario parte un token (los tokens léxicos no coinciden con las posiciones)
+        if linea.lexicos is not None:
+            pares = ((token, CODIGOS_TIPO[categoria]) for token, categoria in linea.lexicos)
+            tipos = None
+        else:
+            tipos = linea.tipos
+            tokens = linea.tokens
+            if linea.corte < len(tokens):
+                tokens = tokens[:linea.corte]
+            pares = zip(tokens, linea.tipos)
         
-        for numero_linea, linea in enumerate(lineas, start=1):
-            # Eliminar comentarios inline
-            if '//' in linea:
-                linea = linea[:linea.index('//')]
-            
-            linea_limpia = linea.strip()
-            
-            # Ignorar líneas vacías
-            if not linea_limpia:
+        # Igual que registrar_token, sin una llamada por token
+        tokens_dict = self.tokens_dict
+        errores = []
+        indice = -1
+        for token, codigo in pares:
+            if codigo == CODIGO_DESCONOCIDO:
+                columna = None
+                if tipos is not None:
+                    # Los desconocidos son raros: su posición se busca solo al encontrarlos
+                    indice = tipos.index(CODIGO_DESCONOCIDO, indice + 1)
+                    columna = linea.posiciones[2 * indice] + 1
+                errores.append(Diagnostico("LEX001", linea.numero, columna, (token,)))
                 continue
-            
-            tokens = self.tokenizar_linea(linea_limpia)
-            
-            for token in tokens:
-                categoria = self.clasificar_token(token)
-                
-                if categoria == "desconocido":
-                    errores_lexicos.append({
-                        'linea': numero_linea,
-                        'token': token,
-                        'mensaje': f"⚠ Línea {numero_linea}: Token desconocido '{token}'"
-                    })
-                else:
-                    self.registrar_token(token)
+            datos = tokens_dict.get(token)
+            if datos is None:
+                tokens_dict[token] = {
+                    "Token": token,
+                    "Tipo": TIPOS_TOKEN[codigo],
+                    "Cantidad": 1
+                }
+            else:
+                datos["Cantidad"] += 1
+        return errores
+
+    def _registrar_conteo(self, linea):
+        """Registra una línea del caché sumando las cantidades ya agrupadas"""
+        tokens_dict = self.tokens_dict
+        registros, desconocidos = linea.conteo
+        for token, categoria, cantidad in registros:
+            datos = tokens_dict.get(token)
+            if datos is None:
+                tokens_dict[token] = {
+                    "Token": token,
+                    "Tipo": categoria,
+                    "Cantidad": cantidad
+                }
+            else:
+                datos["Cantidad"] += cantidad
+        
+        posiciones = linea.posiciones
+        return [Diagnostico("LEX001", linea.numero,
+                            None if indice is None else posiciones[2 * indice] + 1, (token,))
+                for token, indice in desconocidos]
+
+    def descontar_linea(self, linea):
+        """
+        Descuenta de la tabla de tokens los tokens léxicos de una línea
         
+        Es la operación inversa de registrar_linea; los tokens cuya cantidad
+        llega a cero se eliminan de la tabla.
+        
+        Args:
+            linea (LineaTokens): Línea registrada previamente
+        """
+        if linea.conteo is not None:
+            for token, categoria, cantidad in linea.conteo[0]:
+                datos = self.tokens_dict[token]
+                datos["Cantidad"] -= cantidad
+                if datos["Cantidad"] == 0:
+                    del self.tokens_dict[token]
+            return
+        
+        for token, categoria in linea.tokens_lexicos():
+            if categoria == "desconocido":
+                continue
+            datos = self.tokens_dict[token]
+            datos["Cantidad"] -= 1
+            if datos["Cantidad"] == 0:
+                del self.tokens_dict[token]
+
+    def obtener_resultados(self):
+        """
+        Retorna los tokens y errores léxicos acumulados
+        
+        Returns:
+            dict: {
+                'tokens': dict con tokens encontrados,
+                'errores_lexicos': lista de errores léxicos encontrados (Diagnostico),
+                'errores_descartados': errores léxicos contados pero no guardados por los límites
+            }
+        """
         return {
             'tokens': self.tokens_dict,
-            'errores_lexicos': errores_lexicos
+            'errores_lexicos': self.errores_lexicos,
+            'errores_descartados': self.limites.descartados('error_lexico')
         }
     
+    def analizar_codigo(self, codigo, instrumentacion=None):
+        """
+        Analiza un código completo línea por línea
+        
+        Args:
+            codigo (str): Código fuente completo
+            instrumentacion (Instrumentacion): Si se indica, mide las fases del análisis
+            
+        Returns:
+            dict: {
+                'tokens': dict con tokens encontrados,
+                'errores_lexicos': lista de errores léxicos encontrados (Diagnostico),
+                'errores_descartados': ver obtener_resultados,
+                'estadisticas': mediciones (solo con instrumentacion)
+            }
+        """
+        self.reiniciar()
+        
+        with instrumentar(instrumentacion, self, None):
+            for linea in self.generar_tokens(codigo):
+                self.errores_lexicos.extend(self.limites.filtrar(self.registrar_linea(linea)))
+        
+        resultado = self.obtener_resultados()
+        if instrumentacion is not None:
+            resultado['estadisticas'] = instrumentacion.como_dict()
+        return resultado
+    
     def obtener_tokens_ordenados(self):
         """
         Obtiene los tokens ordenados por tipo y nombre
@@ -138,6 +966,15 @@ class AnalizadorLexico:
         """
         return sorted(self.tokens_dict.items(), key=lambda x: (x[1]["Tipo"], x[0]))
     
+    def estadisticas_cache(self):
+        """
+        Retorna los contadores del caché de líneas
+
+        Returns:
+            dict: Ver CacheLineas.estadisticas (None si el caché está desactivado)
+        """
+        return self.cache.estadisticas() if self.cache is not None else None
+
     def get_tokens_json(self):
         """Retorna el diccionario de tokens JSON cargado"""
         return self.tokens_json
\ No newline at end of file
@@ -1,182 +1,558 @@
 import re
+import time
 from PDA import PDA
+from Diagnosticos import Diagnostico, LimitesDiagnosticos
+from TablaSimbolos import TablaSimbolos
+from AnalisisLexico import AnalizadorLexico, CODIGOS_TIPO
+from Instrumentacion import ContadorRegex, instrumentar
+
+# Disparadores de las reglas semánticas: bits de la máscara que se arma una vez por línea
+DISPARO_TIPO_INICIAL = 1 << 0   # La línea empieza con una palabra reservada y tiene 2+ tokens
+DISPARO_IGUAL = 1 << 1          # Hay un token '='
+DISPARO_COMPARACION = 1 << 2    # Algún token contiene '==' (el operador o una cadena)
+DISPARO_PARENTESIS = 1 << 3     # Hay un token '('
+DISPARO_FUNC = 1 << 4           # Hay un token 'func'
+DISPARO_CONDICION = 1 << 5      # Hay un token 'si' o 'mientras'
+DISPARO_ARITMETICO = 1 << 6     # Hay un operador aritmético (+ - * / %)
+DISPARO_CADENA = 1 << 7         # La línea tiene comillas dobles (puede haber cadenas)
+
+# Disparadores que aporta cada token con solo aparecer en la línea
+DISPAROS_TOKEN = {
+    "=": DISPARO_IGUAL,
+    "==": DISPARO_COMPARACION,
+    "(": DISPARO_PARENTESIS,
+    "func": DISPARO_FUNC,
+    "si": DISPARO_CONDICION,
+    "mientras": DISPARO_CONDICION,
+    "+": DISPARO_ARITMETICO,
+    "-": DISPARO_ARITMETICO,
+    "*": DISPARO_ARITMETICO,
+    "/": DISPARO_ARITMETICO,
+    "%": DISPARO_ARITMETICO,
+}
+TOKENS_DISPARO = frozenset(DISPAROS_TOKEN)
+
+# Patrones de las reglas semánticas, compilados una sola vez
+PATRON_IDENTIFICADOR = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+PATRON_ENTERO = re.compile(r"^\d+$")
+PATRON_DECIMAL = re.compile(r"^\d+(\.\d+)?$")
+PATRON_CADENA = re.compile(r'^".*"$')
+PATRON_OPERADOR_SIN_ESPACIOS = re.compile(r"\w[+\-*/%]\w")
+
+# Clase de cada token para las reglas semánticas: qué patrón de arriba cumple
+CLASE_OTRO = 0
+CLASE_IDENTIFICADOR = 1
+CLASE_ENTERO = 2
+CLASE_DECIMAL = 3      # Solo en tokens que no vienen del analizador léxico (p. ej. '1.5')
+CLASE_CADENA = 4
+CLASE_RESERVADA = 5    # Token de Tokens.json: su clase se busca en _clases_reservadas
+
+# Tipo del analizador léxico (índice en TIPOS_TOKEN) -> clase, para bytes.translate
+_CLASE_POR_TIPO = {
+    "Preservada": CLASE_RESERVADA,
+    "operadores": CLASE_RESERVADA,
+    "signos": CLASE_RESERVADA,
+    "cadena": CLASE_CADENA,
+    "numeros": CLASE_ENTERO,
+    "identificadores": CLASE_IDENTIFICADOR,
+    "desconocido": CLASE_OTRO,
+}
+TABLA_CLASES = bytes(_CLASE_POR_TIPO.get(tipo, CLASE_OTRO) for tipo in
+                     sorted(CODIGOS_TIPO, key=CODIGOS_TIPO.get)).ljust(256, bytes([CLASE_OTRO]))
+
+
+def clase_por_patron(token):
+    """
+    Clase de un token según los patrones de las reglas semánticas
+    
+    Args:
+        token (str): Token a clasificar
+        
+    Returns:
+        int: CLASE_IDENTIFICADOR, CLASE_ENTERO, CLASE_DECIMAL, CLASE_CADENA o CLASE_OTRO
+    """
+    if PATRON_IDENTIFICADOR.match(token):
+        return CLASE_IDENTIFICADOR
+    if PATRON_ENTERO.match(token):
+        return CLASE_ENTERO
+    if PATRON_DECIMAL.match(token):
+        return CLASE_DECIMAL
+    if PATRON_CADENA.match(token):
+        return CLASE_CADENA
+    return CLASE_OTRO
+
+
+def clases_reservadas(tabla):
+    """
+    Clase de cada token de Tokens.json que cumple algún patrón de las reglas semánticas
+    
+    Args:
+        tabla (TablaTokens): Tablas compiladas de Tokens.json
+        
+    Returns:
+        dict: token -> clase (sin los tokens de CLASE_OTRO)
+    """
+    clases = {}
+    for token in tabla.categorias:
+        clase = clase_por_patron(token)
+        if clase != CLASE_OTRO:
+            clases[token] = clase
+    return clases
+
 
 class AnalizadorGramatical:
     """Validador de reglas gramaticales y sintaxis usando PDA"""
     
-    def __init__(self, tokens_json):
-        self.tokens_json = tokens_json
-        self.variables = {}
-        self.funciones = set()
-        self.tipos_datos = tokens_json.get("Preservada", [])
+    def __init__(self, tokens_json=None, limites=None, perfil=None):
+        """
+        Args:
+            tokens_json (dict): Categorías de tokens (Tokens.json)
+            limites (LimitesDiagnosticos): Máximos de diagnósticos guardados
+                (por defecto, sin límite; igual se cuentan)
+            perfil (PerfilTokens): Perfil de tokens (en lugar de tokens_json); sus
+                tablas se recargan si el archivo cambia (ver actualizar_tabla)
+        """
+        # Tablas de símbolos con ámbitos: nombre -> tipo de la variable, y funciones declaradas
+        self.variables = TablaSimbolos()
+        self.funciones = TablaSimbolos()
         self.pda = PDA()  # Instancia del Autómata de Pila
+        # Los bloques siguiente ... finaliza del PDA abren y cierran los ámbitos
+        self.pda.tablas = (self.variables, self.funciones)
+        # Produce el flujo de tokens; las tablas de Tokens.json salen de él
+        self.lexico = AnalizadorLexico(tokens_json=tokens_json, perfil=perfil)
+        self._aplicar_tabla(self.lexico.tabla)
+        self.errores = []
+        self.advertencias = []
+        self.errores_pda = []       # Diagnósticos del PDA ya extraídos por procesar_linea
+        self.advertencias_pda = []
+        self.limites = limites if limites is not None else LimitesDiagnosticos()
+        
+        # Reglas semánticas: (nombre, disparadores requeridos, disparadores excluyentes, validación).
+        # Una regla se ejecuta solo en las líneas cuya máscara tiene todos sus
+        # disparadores requeridos y ninguno de los excluyentes, en este orden
+        self.reglas = [
+            ("declaracion", DISPARO_TIPO_INICIAL, 0, self._validar_declaracion),
+            ("asignacion", DISPARO_IGUAL, DISPARO_COMPARACION, self._validar_asignacion),
+            ("llamada_funcion", DISPARO_PARENTESIS, 0, self._validar_llamada_funcion),
+            ("declaracion_funcion", DISPARO_FUNC, 0, self._validar_declaracion_funcion),
+            # Regla 5: ambigüedad, una verificación por construcción
+            ("ambiguedad", DISPARO_CADENA, 0, self._ambiguedad_operador_sin_espacios),
+            ("ambiguedad", DISPARO_CONDICION | DISPARO_IGUAL, DISPARO_COMPARACION,
+             self._ambiguedad_asignacion_en_condicion),
+            ("ambiguedad", DISPARO_ARITMETICO, 0, self._ambiguedad_operadores_consecutivos),
+            ("ambiguedad", DISPARO_IGUAL, DISPARO_COMPARACION, self._ambiguedad_asignaciones_multiples),
+        ]
+        # Tabla de despacho: máscara de disparadores -> reglas que se ejecutan
+        self._despacho = {}
+        
+        # Las reglas usan self.re: el módulo re, o un contador de llamadas al instrumentar
+        self.re = re
+        self.instrumentacion = None
+    
+    def agregar_regla(self, nombre, validar, requiere=0, excluye=0):
+        """
+        Agrega una regla semántica al final de las existentes
         
-    def analizar_codigo(self, codigo):
+        Args:
+            nombre (str): Nombre de la regla (agrupa sus mediciones)
+            validar (callable): validar(tokens, clases, numero_linea) -> {'errores': [], 'advertencias': []},
+                con `clases` la clase de cada token (ver clase)
+            requiere (int): Disparadores (DISPARO_*) que deben estar todos en la línea;
+                con 0 la regla se ejecuta en todas las líneas
+            excluye (int): Disparadores que impiden ejecutarla
         """
-        Analiza un código completo usando PDA y validaciones semánticas
+        self.reglas.append((nombre, requiere, excluye, validar))
+        self._despacho = {}
+    
+    def calcular_disparos(self, tokens, texto=None):
+        """
+        Arma la máscara de disparadores de una línea con una sola pasada
         
         Args:
-            codigo (str): Código fuente completo
+            tokens (list): Tokens de la línea
+            texto (str): Texto de la línea, si los tokens son los del analizador
+                léxico; sin él cualquier token podría contener operadores o '=='
             
         Returns:
-            dict: {
-                'errores': lista de errores gramaticales,
-                'advertencias': lista de advertencias,
-                'variables': dict de variables encontradas,
-                'funciones': set de funciones encontradas
-            }
+            int: Combinación de bits DISPARO_*
+        """
+        mascara = 0
+        # La intersección recorre los tokens sin un paso de Python por token
+        for token in TOKENS_DISPARO.intersection(tokens):
+            mascara |= DISPAROS_TOKEN[token]
+        if len(tokens) >= 2 and tokens[0] in self._tipos_iniciales:
+            mascara |= DISPARO_TIPO_INICIAL
+        # Una cadena puede contener '==' o un operador entre letras
+        if texto is None or '"' in texto:
+            mascara |= DISPARO_CADENA
+            if not mascara & DISPARO_COMPARACION and self._contiene_comparacion(tokens):
+                mascara |= DISPARO_COMPARACION
+        return mascara
+    
+    def reglas_para(self, mascara):
+        """
+        Reglas que se ejecutan en una línea con esa máscara de disparadores
+        
+        Args:
+            mascara (int): Resultado de calcular_disparos
+            
+        Returns:
+            tuple: Reglas (ver self.reglas) en orden
+        """
+        reglas = self._despacho.get(mascara)
+        if reglas is None:
+            reglas = tuple(regla for regla in self.reglas
+                           if mascara & regla[1] == regla[1] and not mascara & regla[2])
+            self._despacho[mascara] = reglas
+        return reglas
+    
+    def activar_instrumentacion(self, instrumentacion):
+        """
+        Activa (o desactiva con None) la medición de fases y reglas
+        
+        Args:
+            instrumentacion (Instrumentacion): Mediciones a completar
         """
-        self.variables = {}
-        self.funciones = set()
+        self.instrumentacion = instrumentacion
+        self.re = re if instrumentacion is None else ContadorRegex(instrumentacion)
+    
+    def _aplicar_tabla(self, tabla):
+        """Toma las palabras reservadas de las tablas compiladas de Tokens.json"""
+        self.tabla = tabla
+        self.tokens_json = self.lexico.tokens_json
+        self.tipos_datos = tabla.tipos_datos
+        self._tipos_iniciales = tabla.preservadas
+        # Los tokens de Tokens.json tienen su propio tipo léxico; su clase se calcula
+        # una vez por tabla (y la comparten todos los analizadores)
+        self._clases_reservadas = tabla.derivada("clases_reservadas", clases_reservadas)
+    
+    def actualizar_tabla(self):
+        """
+        Recarga las tablas si el archivo de tokens del perfil cambió
+        
+        Returns:
+            bool: True si la tabla cambió
+        """
+        self.lexico.actualizar_tabla()
+        if self.lexico.tabla is self.tabla:
+            return False
+        self._aplicar_tabla(self.lexico.tabla)
+        return True
+    
+    def reiniciar(self):
+        """Reinicia tablas, PDA y diagnósticos para un nuevo análisis"""
+        self.actualizar_tabla()
+        self.variables.reiniciar()
+        self.funciones.reiniciar()
         self.pda.reiniciar()
+        self.errores = []
+        self.advertencias = []
+        self.errores_pda = []
+        self.advertencias_pda = []
+        self.limites.reiniciar()
+    
+    def capturar_estado(self):
+        """
+        Captura el estado del análisis en un límite de línea (PDA y tablas de símbolos)
         
-        errores_totales = []
-        advertencias_totales = []
+        Returns:
+            tuple: (estado_pda, variables, funciones) independiente del analizador
+        """
+        return (self.pda.capturar_estado(), self.variables.capturar(), self.funciones.capturar())
+    
+    def restaurar_estado(self, estado):
+        """
+        Restaura un estado capturado con capturar_estado
         
-        lineas = codigo.split('\n')
+        Args:
+            estado (tuple): Estado capturado
+        """
+        self.pda.restaurar_estado(estado[0])
+        self.variables.restaurar(estado[1])
+        self.funciones.restaurar(estado[2])
+        self.errores = []
+        self.advertencias = []
+        self.errores_pda = []
+        self.advertencias_pda = []
+    
+    def estado_igual(self, estado):
+        """
+        Indica si el análisis está exactamente en el estado capturado
         
-        # Primera pasada: Análisis con PDA
-        for numero_linea, linea in enumerate(lineas, start=1):
-            linea_limpia = linea.strip()
-            
-            if not linea_limpia or linea_limpia.startswith("//"):
-                continue
-            
-            tokens = self._tokenizar_linea(linea_limpia)
+        Args:
+            estado (tuple): Estado capturado
             
-            # Procesar con PDA
-            self.pda.procesar_linea(tokens, numero_linea)
+        Returns:
+            bool: True si el PDA y las tablas de símbolos coinciden
+        """
+        return (self.pda.estado_igual(estado[0])
+                and self.variables.igual(estado[1])
+                and self.funciones.igual(estado[2]))
+    
+    def validar_linea(self, linea):
+        """
+        Procesa una línea del flujo de tokens con el PDA y las validaciones semánticas
+        
+        Los errores del PDA quedan en el propio PDA; los semánticos se retornan
+        sin acumularse.
+        
+        Args:
+            linea (LineaTokens): Línea producida por AnalizadorLexico.generar_lineas
             
-            # Validaciones semánticas adicionales
-            validacion = self.validar_semantica(linea_limpia, numero_linea, tokens)
-            errores_totales.extend(validacion["errores"])
-            advertencias_totales.extend(validacion["advertencias"])
+        Returns:
+            dict: {'errores': [], 'advertencias': []} de las reglas semánticas
+        """
+        if self.instrumentacion is not None:
+            return self._validar_linea_instrumentada(linea)
+        
+        # Los tokens se materializan una sola vez para el PDA y todas las reglas
+        tokens = linea.tokens
+        
+        # Validaciones semánticas, con las categorías que ya asignó el léxico. Van
+        # antes que el PDA: lo que declara la línea que abre un bloque (p. ej.
+        # 'func nombre(...) siguiente') pertenece al ámbito exterior
+        resultado = self.validar_semantica(linea.texto, linea.numero, tokens, linea.tipos)
+        
+        # Procesar con PDA (abre y cierra los ámbitos de las tablas de símbolos)
+        self.pda.procesar_linea(tokens, linea.numero, linea.posiciones)
+        return resultado
+    
+    def _validar_linea_instrumentada(self, linea):
+        """validar_linea midiendo el PDA y cada regla semántica"""
+        instrumentacion = self.instrumentacion
+        reloj = time.perf_counter
+        tokens = linea.tokens
+        numero_linea = linea.numero
+        
+        inicio_reglas = reloj()
+        errores = []
+        advertencias = []
+        clases = linea.tipos.translate(TABLA_CLASES)
+        for nombre, _, _, validar in self.reglas_para(self.calcular_disparos(tokens, linea.texto)):
+            instrumentacion.regla_actual = nombre
+            inicio = reloj()
+            resultado = validar(tokens, clases, numero_linea)
+            errores.extend(resultado["errores"])
+            advertencias.extend(resultado["advertencias"])
+            instrumentacion.registrar_regla(nombre, reloj() - inicio)
+        instrumentacion.regla_actual = None
+        
+        instrumentacion.registrar_fase("reglas", reloj() - inicio_reglas)
+        
+        inicio = reloj()
+        self.pda.procesar_linea(tokens, numero_linea, linea.posiciones)
+        instrumentacion.registrar_fase("pda", reloj() - inicio)
+        instrumentacion.registrar_profundidad(self.pda.profundidad_maxima)
+        return {"errores": errores, "advertencias": advertencias}
+    
+    def procesar_linea(self, linea):
+        """
+        Procesa una línea del flujo de tokens y acumula sus errores y advertencias
         
+        Cada diagnóstico pasa por self.limites: se cuenta siempre, pero solo
+        se guarda mientras no se alcance el máximo.
+        
+        Args:
+            linea (LineaTokens): Línea producida por AnalizadorLexico.generar_lineas
+        """
+        validacion = self.validar_linea(linea)
+        admitir = self.limites.admitir
+        for error in validacion["errores"]:
+            if admitir(error):
+                self.errores.append(error)
+        for advertencia in validacion["advertencias"]:
+            if admitir(advertencia):
+                self.advertencias.append(advertencia)
+        
+        pda = self.pda
+        if pda.errores or pda.advertencias:
+            resultados = pda.extraer_resultados()
+            self.errores_pda.extend(filter(admitir, resultados["errores"]))
+            self.advertencias_pda.extend(filter(admitir, resultados["advertencias"]))
+    
+    def finalizar_analisis(self):
+        """
+        Valida el estado final del PDA y retorna los resultados acumulados
+        
+        Returns:
+            dict: {
+                'errores': lista de errores gramaticales (Diagnostico),
+                'advertencias': lista de advertencias (Diagnostico),
+                'errores_descartados': errores contados pero no guardados por los límites,
+                'advertencias_descartadas': ídem para advertencias,
+                'variables': dict de variables visibles al final (nombre -> tipo),
+                'funciones': set de funciones visibles al final
+            }
+        """
         # Validar que el PDA termine en estado válido
         self.pda.validar_final()
         
         # Obtener resultados del PDA
         resultados_pda = self.pda.obtener_resultados()
-        errores_totales.extend(resultados_pda['errores'])
-        advertencias_totales.extend(resultados_pda['advertencias'])
+        admitir = self.limites.admitir
         
         return {
-            'errores': errores_totales,
-            'advertencias': advertencias_totales,
-            'variables': self.variables,
-            'funciones': self.funciones
+            'errores': self.errores + self.errores_pda + list(filter(admitir, resultados_pda['errores'])),
+            'advertencias': (self.advertencias + self.advertencias_pda
+                             + list(filter(admitir, resultados_pda['advertencias']))),
+            'errores_descartados': self.limites.descartados('error'),
+            'advertencias_descartadas': self.limites.descartados('advertencia'),
+            'variables': self.variables.visibles(),
+            'funciones': set(self.funciones)
         }
     
-    def _tokenizar_linea(self, linea):
-        """Tokeniza una línea"""
-        patron = r'"(?:\\.|[^"\\])*"|\w+|==|!=|<=|>=|\+\+|--|[+\-*/=<>%(){}\[\];,]|\n'
-        tokens = re.findall(patron, linea)
-        tokens_limpios = [t for t in tokens if t not in ('"', "''") and t.strip() != '']
-        return tokens_limpios
-        
-    def validar_semantica(self, linea, numero_linea, tokens):
-        """Validaciones semánticas (declaraciones, tipos, etc.)"""
-        errores = []
-        advertencias = []
+    def analizar_lineas(self, lineas):
+        """
+        Analiza un flujo de tokens ya producido por el analizador léxico
         
-        # Regla 1: Declaración de variables
-        if self._es_declaracion(tokens):
-            resultado = self._validar_declaracion(tokens, numero_linea)
-            errores.extend(resultado["errores"])
-            advertencias.extend(resultado["advertencias"])
+        Args:
+            lineas (iterable): LineaTokens en orden de línea
+            
+        Returns:
+            dict: Igual que analizar_codigo
+        """
+        self.reiniciar()
         
-        # Regla 2: Asignación de valores
-        if self._contiene_asignacion(tokens):
-            resultado = self._validar_asignacion(tokens, numero_linea)
-            errores.extend(resultado["errores"])
-            advertencias.extend(resultado["advertencias"])
+        for linea in lineas:
+            self.procesar_linea(linea)
         
-        # Regla 3: Llamada a función
-        if self._es_llamada_funcion(tokens):
-            resultado = self._validar_llamada_funcion(tokens, numero_linea)
-            errores.extend(resultado["errores"])
-            advertencias.extend(resultado["advertencias"])
+        return self.finalizar_analisis()
+        
+    def analizar_codigo(self, codigo, instrumentacion=None):
+        """
+        Analiza un código completo usando PDA y validaciones semánticas
+        
+        Args:
+            codigo (str): Código fuente completo
+            instrumentacion (Instrumentacion): Si se indica, mide fases y reglas
+            
+        Returns:
+            dict: {
+                'errores': lista de errores gramaticales (Diagnostico),
+                'advertencias': lista de advertencias (Diagnostico),
+                'errores_descartados', 'advertencias_descartadas': ver finalizar_analisis,
+                'variables', 'funciones': ver finalizar_analisis,
+                'estadisticas': mediciones (solo con instrumentacion)
+            }
+        """
+        with instrumentar(instrumentacion, self.lexico, self):
+            resultado = self.analizar_lineas(self.lexico.generar_tokens(codigo))
+        if instrumentacion is not None:
+            resultado['estadisticas'] = instrumentacion.como_dict()
+        return resultado
+        
+    def validar_semantica(self, linea, numero_linea, tokens, tipos=None):
+        """
+        Validaciones semánticas (declaraciones, tipos, etc.)
+        
+        Solo se ejecutan las reglas cuyos disparadores aparecen en la línea
+        (ver calcular_disparos y reglas_para).
+        
+        Args:
+            linea (str): Texto de la línea
+            numero_linea (int): Número de línea
+            tokens (list): Tokens de la línea
+            tipos (bytes): Tipo léxico de cada token (LineaTokens.tipos); sin él
+                los tokens pueden ser cualesquiera y la clase de cada uno se
+                obtiene con los patrones
+        """
+        reglas = self.reglas_para(self.calcular_disparos(tokens, linea if tipos is not None else None))
+        if not reglas:
+            return {"errores": [], "advertencias": []}
         
-        # Regla 4: Declaración de funciones
-        if self._es_declaracion_funcion(tokens):
-            resultado = self._validar_declaracion_funcion(tokens, numero_linea)
+        if tipos is not None:
+            clases = tipos.translate(TABLA_CLASES)
+        else:
+            clases = [clase_por_patron(token) for token in tokens]
+        
+        errores = []
+        advertencias = []
+        for _, _, _, validar in reglas:
+            resultado = validar(tokens, clases, numero_linea)
             errores.extend(resultado["errores"])
             advertencias.extend(resultado["advertencias"])
-        
-        # Regla 5: Detección de ambigüedad
-        advertencias.extend(self._detectar_ambiguedad(tokens, numero_linea))
-
         return {"errores": errores, "advertencias": advertencias}
     
-    def _es_declaracion(self, tokens):
-        """Detecta si es una declaración de variable"""
-        return len(tokens) >= 2 and tokens[0] in self.tipos_datos
-    
-    def _validar_declaracion(self, tokens, linea):
+    def clase(self, tokens, clases, indice):
+        """
+        Clase del token `indice` para las reglas semánticas
+        
+        Args:
+            tokens (list): Tokens de la línea
+            clases: Clase de cada token (de los tipos léxicos o de clase_por_patron)
+            indice (int): Posición del token
+            
+        Returns:
+            int: Una de las constantes CLASE_*
+        """
+        clase = clases[indice]
+        if clase == CLASE_RESERVADA:
+            return self._clases_reservadas.get(tokens[indice], CLASE_OTRO)
+        return clase
+
+    def _validar_declaracion(self, tokens, clases, linea):
         """Valida una declaración: tipo nombre [= valor];"""
         resultado = {"errores": [], "advertencias": []}
 
         if len(tokens) < 2:
-            resultado["errores"].append(f"⚠ Línea {linea}: Declaración incompleta")
+            resultado["errores"].append(Diagnostico("DEC001", linea))
             return resultado
 
         tipo_dato = tokens[0]
         nombre_var = tokens[1]
 
         # Verificar identificador válido
-        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", nombre_var):
-            resultado["errores"].append(f"⚠ Línea {linea}: '{nombre_var}' no es un identificador válido")
+        if self.clase(tokens, clases, 1) != CLASE_IDENTIFICADOR:
+            resultado["errores"].append(Diagnostico("DEC002", linea, args=(nombre_var,)))
             return resultado
 
-        # Registrar variable
-        self.variables[nombre_var] = tipo_dato
+        # Registrar variable en el ámbito actual (oculta la de un ámbito exterior)
+        self.variables.declarar(nombre_var, tipo_dato)
 
         # Sin inicialización
         if len(tokens) == 2 or (len(tokens) == 3 and tokens[-1] == ";"):
-            resultado["advertencias"].append(f"⚠️ Línea {linea}: Variable '{nombre_var}' declarada pero no inicializada")
+            resultado["advertencias"].append(Diagnostico("DEC003", linea, args=(nombre_var,)))
             return resultado
 
         # Si tiene asignación
         if "=" in tokens:
             idx = tokens.index("=")
             if idx + 1 >= len(tokens):
-                resultado["errores"].append(f"⚠ Línea {linea}: Falta valor en la asignación")
+                resultado["errores"].append(Diagnostico("DEC004", linea))
                 return resultado
 
             valor = tokens[idx + 1]
+            clase_valor = self.clase(tokens, clases, idx + 1)
 
             # Validación según tipo
             if tipo_dato == "cadena":
-                if not re.match(r'^".*"$', valor):
-                    resultado["errores"].append(
-                        f"⚠ Línea {linea}: Las variables tipo 'cadena' deben tener valores entre comillas dobles (\"texto\")"
-                    )
+                if clase_valor != CLASE_CADENA:
+                    resultado["errores"].append(Diagnostico("DEC005", linea))
 
             elif tipo_dato == "booleano":
                 if valor not in ["verdadero", "falso"]:
-                    resultado["errores"].append(
-                        f"⚠ Línea {linea}: Las variables tipo 'booleano' solo pueden ser 'verdadero' o 'falso'"
-                    )
+                    resultado["errores"].append(Diagnostico("DEC006", linea))
 
             elif tipo_dato == "entero":
-                if not re.match(r"^\d+$", valor):
-                    resultado["errores"].append(
-                        f"⚠ Línea {linea}: Valor '{valor}' inválido para tipo 'entero'"
-                    )
+                if clase_valor != CLASE_ENTERO:
+                    resultado["errores"].append(Diagnostico("DEC007", linea, args=(valor,)))
 
             elif tipo_dato == "decimal":
-                if not re.match(r"^\d+(\.\d+)?$", valor):
-                    resultado["errores"].append(
-                        f"⚠ Línea {linea}: Valor '{valor}' inválido para tipo 'decimal'"
-                    )
+                if clase_valor != CLASE_ENTERO and clase_valor != CLASE_DECIMAL:
+                    resultado["errores"].append(Diagnostico("DEC008", linea, args=(valor,)))
 
         return resultado
     
-    def _contiene_asignacion(self, tokens):
-        """Detecta si hay asignación (=) pero no es comparación (==)"""
-        return "=" in tokens and "==" not in " ".join(tokens)
+    @staticmethod
+    def _contiene_comparacion(tokens):
+        """
+        Indica si algún token contiene '==' (el operador o una cadena que lo incluye)
+        
+        Equivale a buscar '==' en " ".join(tokens) sin armar la cadena unida.
+        """
+        return any("==" in token for token in tokens)
     
-    def _validar_asignacion(self, tokens, linea):
+    def _validar_asignacion(self, tokens, clases, linea):
         resultado = {"errores": [], "advertencias": []}
         
         if "=" not in tokens:
@@ -185,7 +561,7 @@ class AnalizadorGramatical:
         idx = tokens.index("=")
         
         if idx == 0:
-            resultado["errores"].append(f"⚠ Línea {linea}: Asignación sin variable")
+            resultado["errores"].append(Diagnostico("ASG001", linea))
             return resultado
         
         var = tokens[idx - 1]
@@ -194,55 +570,53 @@ class AnalizadorGramatical:
         if idx + 1 < len(tokens) and tokens[idx + 1] == "=":
             return resultado
         
-        # Validar que la variable esté declarada
-        if re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", var):
-            if var not in self.variables:
-                resultado["errores"].append(f"⚠ Línea {linea}: Variable '{var}' no declarada")
+        # Validar que la variable esté declarada en un ámbito visible
+        if self.clase(tokens, clases, idx - 1) == CLASE_IDENTIFICADOR:
+            tipo_var = self.variables.buscar(var)
+            if tipo_var is None:
+                resultado["errores"].append(Diagnostico("ASG002", linea, args=(var,)))
                 return resultado
         
-            # Validar tipo de dato
+            # Validar tipo de dato (un identificador como valor no se verifica)
             if idx + 1 < len(tokens):
                 valor = tokens[idx + 1]
-                tipo_var = self.variables[var]
+                clase_valor = self.clase(tokens, clases, idx + 1)
                 
-                if tipo_var == "entero" and not re.match(r"^\d+$", valor):
-                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", valor):
-                        resultado["errores"].append(f"⚠ Línea {linea}: Tipo incompatible, '{var}' es 'entero'")
+                if clase_valor == CLASE_IDENTIFICADOR:
+                    pass
+                elif tipo_var == "entero" and clase_valor != CLASE_ENTERO:
+                    resultado["errores"].append(Diagnostico("ASG003", linea, args=(var, "entero")))
                 
-                elif tipo_var == "cadena" and not re.match(r'^".*"$', valor):
-                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", valor):
-                        resultado["errores"].append(f"⚠ Línea {linea}: Tipo incompatible, '{var}' es 'cadena'")
+                elif tipo_var == "cadena" and clase_valor != CLASE_CADENA:
+                    resultado["errores"].append(Diagnostico("ASG003", linea, args=(var, "cadena")))
                 
                 elif tipo_var == "booleano" and valor not in ["verdadero", "falso"]:
-                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", valor):
-                        resultado["errores"].append(f"⚠ Línea {linea}: Tipo incompatible, '{var}' es 'booleano'")
+                    resultado["errores"].append(Diagnostico("ASG003", linea, args=(var, "booleano")))
             
         return resultado
     
-    def _es_llamada_funcion(self, tokens):
+    def _es_llamada_funcion(self, tokens, clases):
         """Detecta llamadas a función: nombre()"""
-        for i, token in enumerate(tokens):
-            if i + 1 < len(tokens) and tokens[i + 1] == "(":
-                if re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", token):
-                    return True
+        for i in range(1, len(tokens)):
+            if tokens[i] == "(" and self.clase(tokens, clases, i - 1) == CLASE_IDENTIFICADOR:
+                return True
         return False
     
-    def _validar_llamada_funcion(self, tokens, linea):
+    def _validar_llamada_funcion(self, tokens, clases, linea):
         """Valida llamadas a función"""
         resultado = {"errores": [], "advertencias": []}
         
+        if not self._es_llamada_funcion(tokens, clases):
+            return resultado
+        
         for i, token in enumerate(tokens):
             if i + 1 < len(tokens) and tokens[i + 1] == "(":
                 if token not in ["si", "mientras", "para", "imprimir"] and token not in self.funciones:
-                    self.funciones.add(token)
+                    self.funciones.declarar(token)
         
         return resultado
-    
-    def _es_declaracion_funcion(self, tokens):
-        """Detecta declaración de función: func nombre() siguiente ... finaliza"""
-        return "func" in tokens
 
-    def _validar_declaracion_funcion(self, tokens, linea):
+    def _validar_declaracion_funcion(self, tokens, clases, linea):
         """Valida declaración de funciones"""
         resultado = {"errores": [], "advertencias": []}
         
@@ -253,49 +627,50 @@ class AnalizadorGramatical:
     
         # Verificar que haya nombre después de func
         if idx + 1 >= len(tokens):
-            resultado["errores"].append(f"⚠ Línea {linea}: 'func' debe ir seguido del nombre de la función")
+            resultado["errores"].append(Diagnostico("FUN001", linea))
             return resultado
         
         nombre_func = tokens[idx + 1]
         
         # Verificar identificador válido
-        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", nombre_func):
-            resultado["errores"].append(f"⚠ Línea {linea}: '{nombre_func}' no es un nombre de función válido")
+        if self.clase(tokens, clases, idx + 1) != CLASE_IDENTIFICADOR:
+            resultado["errores"].append(Diagnostico("FUN002", linea, args=(nombre_func,)))
             return resultado
         
-        # Registrar función
-        if nombre_func in self.funciones:
-            resultado["advertencias"].append(f"⚠️ Línea {linea}: Función '{nombre_func}' redeclarada")
+        # Registrar función (solo es redeclaración dentro del mismo ámbito)
+        if self.funciones.declarado_en_ambito(nombre_func):
+            resultado["advertencias"].append(Diagnostico("FUN003", linea, args=(nombre_func,)))
         else:
-            self.funciones.add(nombre_func)
+            self.funciones.declarar(nombre_func)
         
         # Verificar paréntesis
         if idx + 2 >= len(tokens) or tokens[idx + 2] != "(":
-            resultado["errores"].append(f"⚠ Línea {linea}: Falta '(' después del nombre de la función")
+            resultado["errores"].append(Diagnostico("FUN004", linea))
         
         return resultado
 
-    def _detectar_ambiguedad(self, tokens, linea):
-        """Detecta construcciones ambiguas o potencialmente problemáticas"""
-        advertencias = []
-        
-        # Ambigüedad 1: Operadores sin espacios
-        linea_str = " ".join(tokens)
-        if re.search(r"\w[+\-*/%]\w", linea_str):
-            advertencias.append(f"⚠️ Línea {linea}: Operador sin espacios (ambigüedad)")
-        
-        # Ambigüedad 2: Asignación dentro de condición
-        if "si" in tokens or "mientras" in tokens:
-            if "=" in tokens and "==" not in " ".join(tokens):
-                advertencias.append(f"⚠️ Línea {linea}: ¿Asignación dentro de condición? (ambigüedad)")
-        
-        # Ambigüedad 3: Operadores consecutivos
+    def _ambiguedad_operador_sin_espacios(self, tokens, clases, linea):
+        """Ambigüedad 1: operador sin espacios (solo posible dentro de una cadena)"""
+        resultado = {"errores": [], "advertencias": []}
+        if self.re.search(PATRON_OPERADOR_SIN_ESPACIOS, " ".join(tokens)):
+            resultado["advertencias"].append(Diagnostico("AMB001", linea))
+        return resultado
+    
+    def _ambiguedad_asignacion_en_condicion(self, tokens, clases, linea):
+        """Ambigüedad 2: asignación dentro de condición (si/mientras con '=' y sin '==')"""
+        return {"errores": [], "advertencias": [Diagnostico("AMB002", linea)]}
+    
+    def _ambiguedad_operadores_consecutivos(self, tokens, clases, linea):
+        """Ambigüedad 3: operadores aritméticos consecutivos"""
+        resultado = {"errores": [], "advertencias": []}
         for i in range(len(tokens) - 1):
             if tokens[i] in ["+", "-", "*", "/", "%"] and tokens[i + 1] in ["+", "-", "*", "/", "%"]:
-                advertencias.append(f"⚠️ Línea {linea}: Operadores consecutivos (ambigüedad)")
-        
-        # Ambigüedad 4: Múltiples asignaciones
-        if tokens.count("=") > 1 and "==" not in " ".join(tokens):
-            advertencias.append(f"⚠️ Línea {linea}: Asignaciones múltiples (ambigüedad)")
-        
-        return advertencias
\ No newline at end of file
+                resultado["advertencias"].append(Diagnostico("AMB003", linea))
+        return resultado
+    
+    def _ambiguedad_asignaciones_multiples(self, tokens, clases, linea):
+        """Ambigüedad 4: más de un '=' en la línea (sin '==')"""
+        resultado = {"errores": [], "advertencias": []}
+        if tokens.count("=") > 1:
+            resultado["advertencias"].append(Diagnostico("AMB004", linea))
+        return resultado
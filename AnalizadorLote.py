@@ -0,0 +1,287 @@
+"""
+Análisis por lotes sin interfaz gráfica
+
+Recorre directorios o patrones glob, analiza cada archivo con AnalizadorLexico
+y AnalizadorGramatical en un pool de procesos y escribe un resultado por
+archivo en formato NDJSON (un objeto JSON por línea).
+
+Uso:
+    python AnalizadorLote.py programas/ otros/*.txt --jobs 8 --salida resultados.ndjson
+
+Con --estadisticas cada resultado incluye el tiempo por fase y por regla
+(ver Instrumentacion); con --perfil DIR además se guarda un perfil de
+cProfile por archivo en DIR/<archivo>-<hash de la ruta>.pstats (ver
+nombre_perfil).
+
+Con --max-diagnosticos y --max-por-regla se guardan a lo sumo esa cantidad de
+diagnósticos por archivo (en total y por regla); los que superan el límite se
+cuentan en 'descartados'.
+
+Código de salida: 0 sin errores, 1 si algún archivo tiene errores léxicos o
+gramaticales, 2 si no se encontraron archivos o alguno no se pudo leer.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from Analisis import analizar_archivo
+from Instrumentacion import Instrumentacion
+from NucleoAnalisis import RUTA_TOKENS, crear_analizadores
+from TablasTokens import cargar_tabla
+
+
+# Analizadores del proceso actual (cada worker los crea una sola vez)
+_analizadores = None
+# Opciones de medición del proceso actual: (estadisticas, directorio_perfil)
+_medicion = (False, None)
+
+
+def _inicializar_worker(ruta_tokens, estadisticas=False, directorio_perfil=None,
+                        maximo_diagnosticos=None, maximo_por_regla=None):
+    """Carga Tokens.json y crea los analizadores una vez por proceso"""
+    global _analizadores, _medicion
+    _medicion = (estadisticas or directorio_perfil is not None, directorio_perfil)
+    # Las tablas compiladas salen del caché en disco; durante el lote no se recargan
+    tokens_json = cargar_tabla(ruta_tokens).tokens_json
+    _analizadores = crear_analizadores(tokens_json=tokens_json, maximo_diagnosticos=maximo_diagnosticos,
+                                       maximo_por_regla=maximo_por_regla)
+
+
+def analizadores_del_proceso():
+    """(AnalizadorLexico, AnalizadorGramatical) que el pool creó en el proceso actual"""
+    return _analizadores
+
+
+def analizar_ruta(ruta):
+    """
+    Analiza un archivo con los analizadores del proceso
+
+    Args:
+        ruta (str): Ruta del archivo
+
+    Returns:
+        dict: Resultado serializable a JSON del archivo
+    """
+    analizador_lexico, analizador_gramatical = _analizadores
+    medir, directorio_perfil = _medicion
+    instrumentacion = None
+    if medir:
+        ruta_perfil = None
+        if directorio_perfil is not None:
+            ruta_perfil = os.path.join(directorio_perfil, nombre_perfil(ruta))
+        instrumentacion = Instrumentacion(ruta_perfil)
+
+    resultado = {'archivo': ruta}
+    try:
+        resultado.update(resumir_analisis(
+            analizar_archivo(ruta, analizador_lexico, analizador_gramatical, instrumentacion=instrumentacion),
+            analizador_lexico, analizador_gramatical))
+    except (OSError, UnicodeDecodeError) as e:
+        return {'archivo': ruta, 'fallo': str(e)}
+
+    if instrumentacion is not None:
+        resultado['estadisticas'] = instrumentacion.como_dict()
+    return resultado
+
+
+def nombre_perfil(ruta):
+    """
+    Nombre del archivo de perfil de una ruta
+
+    Lleva el nombre del archivo y un hash de su ruta absoluta: dos archivos
+    con el mismo nombre en distintos directorios (p. ej. a/x.txt y b/x.txt)
+    no comparten perfil, aunque los analicen workers distintos a la vez.
+
+    Args:
+        ruta (str): Ruta del archivo analizado
+
+    Returns:
+        str: '<archivo>-<hash>.pstats'
+    """
+    huella = hashlib.sha256(os.path.abspath(ruta).encode("utf-8", "surrogateescape")).hexdigest()[:12]
+    return f"{os.path.basename(ruta)}-{huella}.pstats"
+
+
+def resumir_analisis(diagnosticos, analizador_lexico, analizador_gramatical):
+    """
+    Consume los diagnósticos de un análisis y arma su resultado serializable
+
+    Args:
+        diagnosticos (iterable): Diagnósticos de analizar_archivo, analizar_stream...
+        analizador_lexico: AnalizadorLexico que hace el análisis
+        analizador_gramatical: AnalizadorGramatical que hace el análisis
+
+    Returns:
+        dict: {'errores_lexicos', 'errores', 'advertencias'} con los mensajes,
+        'descartados' (solo si los límites descartaron alguno), 'tokens_unicos',
+        'variables' y 'funciones'
+    """
+    resultado = {
+        'errores_lexicos': [],
+        'errores': [],
+        'advertencias': [],
+    }
+    destinos = {
+        'error_lexico': resultado['errores_lexicos'],
+        'error': resultado['errores'],
+        'advertencia': resultado['advertencias'],
+    }
+    for diagnostico in diagnosticos:
+        destinos[diagnostico.tipo].append(diagnostico.mensaje)
+
+    limites = analizador_gramatical.limites
+    if limites.descartados():
+        resultado['descartados'] = {
+            'errores_lexicos': limites.descartados('error_lexico'),
+            'errores': limites.descartados('error'),
+            'advertencias': limites.descartados('advertencia'),
+        }
+
+    resultado['tokens_unicos'] = len(analizador_lexico.tokens_dict)
+    resultado['variables'] = analizador_gramatical.variables.visibles()
+    resultado['funciones'] = sorted(analizador_gramatical.funciones)
+    return resultado
+
+
+def descartar_salida_estandar():
+    """
+    Apunta la salida estándar a os.devnull después de un BrokenPipeError
+
+    Si quien lee la salida la cerró antes de tiempo (p. ej. `| head`), lo que
+    quedó en el buffer de sys.stdout volvería a fallar al terminar el
+    intérprete, con un traceback.
+    """
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
+def _errores_descartados(resultado):
+    """Errores de un archivo que no se guardaron por los límites de diagnósticos"""
+    descartados = resultado.get('descartados')
+    if not descartados:
+        return 0
+    return descartados['errores_lexicos'] + descartados['errores']
+
+
+def buscar_archivos(entradas, extension=".txt"):
+    """
+    Expande directorios y patrones glob a una lista ordenada de archivos
+
+    Args:
+        entradas (list): Archivos, directorios o patrones glob
+        extension (str): Extensión de los archivos buscados dentro de directorios
+
+    Returns:
+        list: Rutas de archivos sin repetir
+    """
+    encontrados = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            for carpeta, _, archivos in os.walk(entrada):
+                encontrados.extend(os.path.join(carpeta, nombre)
+                                   for nombre in archivos if nombre.endswith(extension))
+        elif glob.has_magic(entrada):
+            encontrados.extend(ruta for ruta in glob.glob(entrada, recursive=True)
+                               if os.path.isfile(ruta))
+        else:
+            encontrados.append(entrada)
+    return sorted(set(encontrados))
+
+
+def analizar_lote(rutas, jobs=None, ruta_tokens=RUTA_TOKENS, estadisticas=False, directorio_perfil=None,
+                  maximo_diagnosticos=None, maximo_por_regla=None, funcion=analizar_ruta):
+    """
+    Analiza los archivos en un pool de procesos
+
+    Args:
+        rutas (list): Archivos a analizar
+        jobs (int): Cantidad de procesos (por defecto, uno por núcleo)
+        ruta_tokens (str): Ruta de Tokens.json
+        estadisticas (bool): Si cada resultado incluye las mediciones del análisis
+        directorio_perfil (str): Directorio donde guardar un perfil de cProfile por archivo
+        maximo_diagnosticos (int): Diagnósticos guardados por archivo como máximo
+        maximo_por_regla (int): Diagnósticos guardados por archivo y por regla como máximo
+        funcion (callable): Función de nivel de módulo que analiza cada ruta con
+            analizadores_del_proceso() (por defecto, analizar_ruta)
+
+    Yields:
+        dict: Resultado de cada archivo, en el orden de `rutas`
+    """
+    jobs = jobs or os.cpu_count() or 1
+    opciones = (ruta_tokens, estadisticas, directorio_perfil, maximo_diagnosticos, maximo_por_regla)
+    if jobs == 1:
+        _inicializar_worker(*opciones)
+        yield from map(funcion, rutas)
+        return
+
+    # Lotes de varios archivos por tarea para amortizar la comunicación entre procesos
+    chunksize = max(1, min(64, len(rutas) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_inicializar_worker,
+                             initargs=opciones) as executor:
+        yield from executor.map(funcion, rutas, chunksize=chunksize)
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Analiza archivos del lenguaje sin interfaz gráfica y escribe resultados NDJSON"
+    )
+    parser.add_argument("entradas", nargs="+", help="Archivos, directorios o patrones glob")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("-o", "--salida", default=None,
+                        help="Archivo NDJSON de salida (por defecto, la salida estándar)")
+    parser.add_argument("--tokens", default=RUTA_TOKENS, help="Ruta de Tokens.json")
+    parser.add_argument("--extension", default=".txt",
+                        help="Extensión de los archivos buscados en directorios")
+    parser.add_argument("--estadisticas", action="store_true",
+                        help="Incluye tiempo por fase y por regla en cada resultado")
+    parser.add_argument("--perfil", default=None, metavar="DIR",
+                        help="Guarda un perfil de cProfile por archivo en DIR (<archivo>-<hash>.pstats)")
+    parser.add_argument("--max-diagnosticos", type=int, default=None, metavar="N",
+                        help="Guarda a lo sumo N diagnósticos por archivo (el resto solo se cuenta)")
+    parser.add_argument("--max-por-regla", type=int, default=None, metavar="N",
+                        help="Guarda a lo sumo N diagnósticos de cada regla por archivo")
+    args = parser.parse_args(argv)
+
+    rutas = buscar_archivos(args.entradas, args.extension)
+    if not rutas:
+        print("⚠ No se encontraron archivos para analizar", file=sys.stderr)
+        return 2
+
+    if args.perfil:
+        os.makedirs(args.perfil, exist_ok=True)
+
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    con_errores = 0
+    fallidos = 0
+    try:
+        for resultado in analizar_lote(rutas, args.jobs, args.tokens, args.estadisticas, args.perfil,
+                                       args.max_diagnosticos, args.max_por_regla):
+            if 'fallo' in resultado:
+                fallidos += 1
+            elif resultado['errores_lexicos'] or resultado['errores'] or _errores_descartados(resultado):
+                con_errores += 1
+            salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    except BrokenPipeError:
+        # El lector de la salida terminó: no tiene sentido seguir analizando
+        descartar_salida_estandar()
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"📊 Archivos: {len(rutas)} • Con errores: {con_errores} • Fallidos: {fallidos}",
+          file=sys.stderr)
+
+    if fallidos:
+        return 2
+    return 1 if con_errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+Diagnósticos del análisis como registros compactos
+
+Cada error o advertencia se guarda como un Diagnostico (código, línea,
+columna y argumentos); el texto del mensaje se arma recién cuando se muestra
+o se exporta. La regla que lo produce, la severidad y la plantilla del
+mensaje dependen solo del código (ver CATALOGO).
+
+LimitesDiagnosticos permite dejar de guardar diagnósticos después de cierta
+cantidad (en total o por regla) sin dejar de contarlos.
+"""
+
+# codigo -> (regla, severidad, plantilla del mensaje sin el prefijo "⚠ Línea N: ")
+CATALOGO = {
+    # Analizador léxico
+    "LEX001": ("lexico", "error", "Token desconocido '{0}'"),
+    # Regla 1: declaración de variables
+    "DEC001": ("declaracion", "error", "Declaración incompleta"),
+    "DEC002": ("declaracion", "error", "'{0}' no es un identificador válido"),
+    "DEC003": ("declaracion", "advertencia", "Variable '{0}' declarada pero no inicializada"),
+    "DEC004": ("declaracion", "error", "Falta valor en la asignación"),
+    "DEC005": ("declaracion", "error",
+               "Las variables tipo 'cadena' deben tener valores entre comillas dobles (\"texto\")"),
+    "DEC006": ("declaracion", "error",
+               "Las variables tipo 'booleano' solo pueden ser 'verdadero' o 'falso'"),
+    "DEC007": ("declaracion", "error", "Valor '{0}' inválido para tipo 'entero'"),
+    "DEC008": ("declaracion", "error", "Valor '{0}' inválido para tipo 'decimal'"),
+    # Regla 2: asignación
+    "ASG001": ("asignacion", "error", "Asignación sin variable"),
+    "ASG002": ("asignacion", "error", "Variable '{0}' no declarada"),
+    "ASG003": ("asignacion", "error", "Tipo incompatible, '{0}' es '{1}'"),
+    # Regla 4: declaración de funciones
+    "FUN001": ("declaracion_funcion", "error", "'func' debe ir seguido del nombre de la función"),
+    "FUN002": ("declaracion_funcion", "error", "'{0}' no es un nombre de función válido"),
+    "FUN003": ("declaracion_funcion", "advertencia", "Función '{0}' redeclarada"),
+    "FUN004": ("declaracion_funcion", "error", "Falta '(' después del nombre de la función"),
+    # Regla 5: ambigüedad
+    "AMB001": ("ambiguedad", "advertencia", "Operador sin espacios (ambigüedad)"),
+    "AMB002": ("ambiguedad", "advertencia", "¿Asignación dentro de condición? (ambigüedad)"),
+    "AMB003": ("ambiguedad", "advertencia", "Operadores consecutivos (ambigüedad)"),
+    "AMB004": ("ambiguedad", "advertencia", "Asignaciones múltiples (ambigüedad)"),
+    # Autómata de pila
+    "PDA001": ("pda", "error", "')' sin '(' correspondiente"),
+    "PDA002": ("pda", "error", "']' sin '[' correspondiente"),
+    "PDA003": ("pda", "error", "'finaliza' sin estructura que cerrar"),
+    "PDA004": ("pda", "error", "'finaliza' sin estructura correspondiente"),
+    "PDA005": ("pda", "advertencia", "'{0}' cerrado con 'finaliza' pero sin 'siguiente'"),
+    "PDA006": ("pda", "error", "'(' sin ')' correspondiente"),
+    "PDA007": ("pda", "error", "'[' sin ']' correspondiente"),
+    "PDA008": ("pda", "error", "'{0}' sin 'finaliza' correspondiente"),
+}
+
+# Prefijo del mensaje según la severidad
+PREFIJOS = {"error": "⚠", "advertencia": "⚠️"}
+
+
+class Diagnostico:
+    """
+    Error o advertencia del análisis
+
+    Solo guarda el código y los datos variables del mensaje; regla, severidad
+    y texto se obtienen del CATALOGO al pedirlos.
+    """
+    __slots__ = ("codigo", "linea", "columna", "args")
+
+    def __init__(self, codigo, linea, columna=None, args=()):
+        self.codigo = codigo      # Clave en CATALOGO
+        self.linea = linea        # Número de línea (desde 1)
+        self.columna = columna    # Columna (desde 1) del token que lo produjo, o None
+        self.args = args          # Valores que completan la plantilla del mensaje
+
+    @property
+    def regla(self):
+        """Regla que produjo el diagnóstico ('lexico', 'declaracion', ..., 'pda')"""
+        return CATALOGO[self.codigo][0]
+
+    @property
+    def severidad(self):
+        """'error' o 'advertencia'"""
+        return CATALOGO[self.codigo][1]
+
+    @property
+    def tipo(self):
+        """'error_lexico', 'error' o 'advertencia' (clasificación de analizar_stream)"""
+        regla, severidad, _ = CATALOGO[self.codigo]
+        return "error_lexico" if regla == "lexico" else severidad
+
+    @property
+    def descripcion(self):
+        """Texto del diagnóstico sin el prefijo de severidad ni la línea"""
+        return CATALOGO[self.codigo][2].format(*self.args)
+
+    @property
+    def mensaje(self):
+        """Texto del diagnóstico, armado en cada consulta"""
+        return f"{PREFIJOS[self.severidad]} Línea {self.linea}: {self.descripcion}"
+
+    def con_linea(self, linea):
+        """Copia del diagnóstico con otro número de línea"""
+        return Diagnostico(self.codigo, linea, self.columna, self.args)
+
+    def como_dict(self):
+        """
+        Representación serializable (p. ej. a JSON) del diagnóstico
+
+        Returns:
+            dict: {'codigo', 'regla', 'severidad', 'tipo', 'linea', 'columna', 'mensaje'}
+        """
+        return {
+            'codigo': self.codigo,
+            'regla': self.regla,
+            'severidad': self.severidad,
+            'tipo': self.tipo,
+            'linea': self.linea,
+            'columna': self.columna,
+            'mensaje': self.mensaje,
+        }
+
+    def como_lista(self):
+        """
+        Representación compacta serializable: [codigo, linea, columna, args]
+
+        Returns:
+            list: Datos con los que desde_lista() reconstruye el diagnóstico
+        """
+        return [self.codigo, self.linea, self.columna, list(self.args)]
+
+    @classmethod
+    def desde_lista(cls, datos):
+        """Diagnóstico a partir de como_lista() (p. ej. leído de JSON)"""
+        codigo, linea, columna, args = datos
+        return cls(codigo, linea, columna, tuple(args))
+
+    def _clave(self):
+        return (self.codigo, self.linea, self.columna, self.args)
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Diagnostico):
+            return NotImplemented
+        return self._clave() == otro._clave()
+
+    def __hash__(self):
+        return hash(self._clave())
+
+    def __str__(self):
+        return self.mensaje
+
+    def __repr__(self):
+        return f"Diagnostico({self.codigo!r}, linea={self.linea}, columna={self.columna}, args={self.args!r})"
+
+
+class LimitesDiagnosticos:
+    """
+    Límites de diagnósticos guardados durante un análisis
+
+    Todos los diagnósticos se cuentan (por regla y en total), pero una vez
+    alcanzado el máximo total o el de su regla dejan de guardarse. Los
+    analizadores consultan admitir() antes de acumular o emitir cada
+    diagnóstico; compartir el mismo objeto entre el analizador léxico y el
+    gramatical aplica el máximo total a ambos en conjunto.
+    """
+
+    def __init__(self, maximo_total=None, maximo_por_regla=None):
+        """
+        Args:
+            maximo_total (int): Diagnósticos guardados como máximo (None: sin límite)
+            maximo_por_regla (int | dict): Máximo para cada regla, o {regla: máximo}
+                para limitar solo algunas (None: sin límite)
+        """
+        self.maximo_total = maximo_total
+        self.maximo_por_regla = maximo_por_regla
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Pone los contadores en cero para un nuevo análisis"""
+        self.total = 0                  # Diagnósticos encontrados
+        self.guardados = 0              # Diagnósticos admitidos
+        self.por_regla = {}             # regla -> [encontrados, guardados]
+        self.descartados_por_tipo = {}  # tipo -> descartados
+
+    def _maximo_regla(self, regla):
+        """Máximo de diagnósticos guardados de una regla, o None"""
+        if isinstance(self.maximo_por_regla, dict):
+            return self.maximo_por_regla.get(regla)
+        return self.maximo_por_regla
+
+    def maximo_guardados(self, regla):
+        """
+        Cantidad máxima de diagnósticos de una regla que se pueden guardar en un análisis
+
+        Args:
+            regla (str): Regla ('lexico', 'declaracion', ..., 'pda')
+
+        Returns:
+            int: El menor entre el máximo total y el de la regla, o None si no hay límite
+        """
+        maximos = [maximo for maximo in (self.maximo_total, self._maximo_regla(regla)) if maximo is not None]
+        return min(maximos) if maximos else None
+
+    def admitir(self, diagnostico):
+        """
+        Cuenta un diagnóstico e indica si todavía se debe guardar
+
+        Args:
+            diagnostico (Diagnostico): Diagnóstico encontrado
+
+        Returns:
+            bool: False si ya se alcanzó el máximo total o el de su regla
+        """
+        regla, severidad, _ = CATALOGO[diagnostico.codigo]
+        conteo = self.por_regla.get(regla)
+        if conteo is None:
+            conteo = self.por_regla[regla] = [0, 0]
+        conteo[0] += 1
+        self.total += 1
+
+        # Se llama por cada diagnóstico encontrado: sin _maximo_regla ni Diagnostico.tipo
+        maximo_regla = self.maximo_por_regla
+        if isinstance(maximo_regla, dict):
+            maximo_regla = maximo_regla.get(regla)
+        if ((self.maximo_total is not None and self.guardados >= self.maximo_total)
+                or (maximo_regla is not None and conteo[1] >= maximo_regla)):
+            tipo = "error_lexico" if regla == "lexico" else severidad
+            self.descartados_por_tipo[tipo] = self.descartados_por_tipo.get(tipo, 0) + 1
+            return False
+
+        conteo[1] += 1
+        self.guardados += 1
+        return True
+
+    def descartar(self, codigo, cantidad=1):
+        """
+        Cuenta diagnósticos que ya se sabe que no se guardan, sin crearlos
+
+        Sirve a quien encontró más diagnósticos de una regla que los que
+        permite maximo_guardados: los sobrantes se cuentan como descartados.
+
+        Args:
+            codigo (str): Código (clave en CATALOGO) de los diagnósticos
+            cantidad (int): Cantidad de diagnósticos
+        """
+        regla, severidad, _ = CATALOGO[codigo]
+        conteo = self.por_regla.get(regla)
+        if conteo is None:
+            conteo = self.por_regla[regla] = [0, 0]
+        conteo[0] += cantidad
+        self.total += cantidad
+        tipo = "error_lexico" if regla == "lexico" else severidad
+        self.descartados_por_tipo[tipo] = self.descartados_por_tipo.get(tipo, 0) + cantidad
+
+    def admitiria(self, codigo):
+        """
+        Indica si un diagnóstico con ese código todavía se guardaría, sin contarlo
+
+        Una vez que retorna False, ningún diagnóstico más de ese código se
+        guarda en el análisis: quien tenga varios los puede contar juntos con
+        descartar().
+
+        Args:
+            codigo (str): Código (clave en CATALOGO) del diagnóstico
+
+        Returns:
+            bool: False si ya se alcanzó el máximo total o el de su regla
+        """
+        if self.maximo_total is not None and self.guardados >= self.maximo_total:
+            return False
+        regla = CATALOGO[codigo][0]
+        maximo_regla = self._maximo_regla(regla)
+        return maximo_regla is None or self.por_regla.get(regla, (0, 0))[1] < maximo_regla
+
+    def filtrar(self, diagnosticos):
+        """
+        Cuenta los diagnósticos y retorna los que se deben guardar
+
+        Args:
+            diagnosticos (iterable): Diagnósticos en orden de detección
+
+        Returns:
+            list: Diagnósticos admitidos
+        """
+        return [diagnostico for diagnostico in diagnosticos if self.admitir(diagnostico)]
+
+    def descartados(self, *tipos):
+        """
+        Cantidad de diagnósticos contados pero no guardados
+
+        Args:
+            *tipos (str): 'error_lexico', 'error' y/o 'advertencia' (todos si no se indica)
+
+        Returns:
+            int: Diagnósticos descartados de esos tipos
+        """
+        if not tipos:
+            return self.total - self.guardados
+        return sum(self.descartados_por_tipo.get(tipo, 0) for tipo in tipos)
+
+    def resumen(self):
+        """
+        Conteo del último análisis
+
+        Returns:
+            dict: {
+                'total': diagnósticos encontrados,
+                'guardados': diagnósticos admitidos,
+                'descartados': diagnósticos no guardados,
+                'por_regla': {regla: {'encontrados', 'guardados'}}
+            }
+        """
+        return {
+            'total': self.total,
+            'guardados': self.guardados,
+            'descartados': self.total - self.guardados,
+            'por_regla': {regla: {'encontrados': conteo[0], 'guardados': conteo[1]}
+                          for regla, conteo in self.por_regla.items()},
+        }
@@ -0,0 +1,74 @@
+import queue
+import threading
+
+from Analisis import AnalisisCancelado
+
+
+class EjecutorAnalisis:
+    """
+    Ejecuta análisis en un hilo de fondo para no bloquear la interfaz
+
+    Cada ejecución recibe un identificador creciente y un threading.Event de
+    cancelación; iniciar una ejecución nueva cancela la anterior. Las
+    ejecuciones se serializan con un lock, porque comparten las instancias de
+    los analizadores. Los resultados se dejan en la cola `resultados` como
+    tuplas (id, tipo, datos), con tipo 'parcial', 'resultado' o 'error'; la
+    interfaz los consume desde su propio hilo (p. ej. con ventana.after) y
+    descarta los de ejecuciones que ya no son la actual.
+    """
+
+    def __init__(self):
+        self.resultados = queue.Queue()
+        self.id_actual = 0
+        self._cancelado = None
+        self._lock = threading.Lock()
+
+    def ejecutar(self, tarea, *args):
+        """
+        Cancela la ejecución en curso e inicia `tarea` en un hilo nuevo
+
+        La tarea se llama como tarea(*args, cancelado=evento, publicar=funcion);
+        `publicar(datos)` envía resultados parciales a la cola y el valor que
+        retorna la tarea se envía como resultado final.
+
+        Args:
+            tarea (callable): Función que ejecuta el análisis
+            *args: Argumentos de la tarea
+
+        Returns:
+            int: Identificador de la ejecución
+        """
+        self.cancelar()
+        self.id_actual += 1
+        cancelado = threading.Event()
+        self._cancelado = cancelado
+
+        hilo = threading.Thread(target=self._trabajar,
+                                args=(self.id_actual, cancelado, tarea, args),
+                                daemon=True)
+        hilo.start()
+        return self.id_actual
+
+    def cancelar(self):
+        """Pide a la ejecución en curso que se detenga"""
+        if self._cancelado is not None:
+            self._cancelado.set()
+
+    def _trabajar(self, id_ejecucion, cancelado, tarea, args):
+        """Cuerpo del hilo: espera a la ejecución anterior y corre la tarea"""
+        with self._lock:
+            if cancelado.is_set():
+                return
+
+            def publicar(datos):
+                self.resultados.put((id_ejecucion, 'parcial', datos))
+
+            try:
+                resultado = tarea(*args, cancelado=cancelado, publicar=publicar)
+            except AnalisisCancelado:
+                return
+            except Exception as e:
+                self.resultados.put((id_ejecucion, 'error', e))
+                return
+
+            self.resultados.put((id_ejecucion, 'resultado', resultado))
\ No newline at end of file
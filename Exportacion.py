@@ -0,0 +1,411 @@
+"""
+Exportación del análisis a NDJSON, CSV y SARIF mientras se analiza
+
+Los exportadores escriben cada diagnóstico apenas el análisis lo emite (ver
+Analisis.analizar_archivo) y, al terminar cada archivo, su tabla de tokens y
+el resumen de conteos; nada del resultado se acumula antes de escribirlo, así
+que la memoria no depende del tamaño de la entrada sino de la cantidad de
+tokens distintos (la tabla que ya guarda el analizador léxico).
+
+    - NDJSON: un objeto JSON por línea con el campo 'registro' ('diagnostico',
+      'token', 'resumen' o 'fallo') y 'archivo'
+    - CSV: una fila por diagnóstico, por token y por conteo del resumen, con
+      las columnas de COLUMNAS_CSV
+    - SARIF 2.1.0: un run con las reglas del CATALOGO y un result por
+      diagnóstico; el resumen total va en las propiedades del run (SARIF no
+      tiene lugar para la tabla de tokens, que no se exporta)
+
+Uso:
+    python Exportacion.py programas/ --formato sarif --salida resultados.sarif
+    python Exportacion.py enorme.txt --formato csv --max-por-regla 1000
+
+Con --jobs N los archivos se analizan en el pool de AnalizadorLote: cada
+worker retorna los diagnósticos de un archivo completo (compactos) y se
+exportan en el orden de las rutas; por defecto se analiza en este proceso y
+todo se escribe durante el análisis.
+
+El código de salida es el de AnalizadorLote.
+"""
+import argparse
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from Analisis import analizar_archivo
+from AnalizadorLote import (RUTA_TOKENS, analizadores_del_proceso, analizar_lote, buscar_archivos,
+                            descartar_salida_estandar)
+from Diagnosticos import CATALOGO, Diagnostico
+from NucleoAnalisis import crear_analizadores
+
+# Tipo del diagnóstico (Diagnostico.tipo) -> clave de su conteo en el resumen
+CLAVES_RESUMEN = {'error_lexico': 'errores_lexicos', 'error': 'errores', 'advertencia': 'advertencias'}
+
+COLUMNAS_CSV = ("registro", "archivo", "linea", "columna", "codigo", "regla", "severidad", "tipo",
+                "mensaje", "token", "cantidad")
+
+VERSION_SARIF = "2.1.0"
+ESQUEMA_SARIF = "https://json.schemastore.org/sarif-2.1.0.json"
+NOMBRE_HERRAMIENTA = "AnalizadorLenguaje"
+# Severidad del CATALOGO -> nivel de SARIF
+NIVELES_SARIF = {"error": "error", "advertencia": "warning"}
+
+
+def _resumen(conteo, analizador_lexico, analizador_gramatical):
+    """
+    Resumen de un archivo analizado
+
+    Args:
+        conteo (dict): Diagnósticos exportados por clave de CLAVES_RESUMEN
+        analizador_lexico: AnalizadorLexico que analizó el archivo
+        analizador_gramatical: AnalizadorGramatical que analizó el archivo
+
+    Returns:
+        dict: {'errores_lexicos', 'errores', 'advertencias', 'descartados':
+        {mismas claves}, 'tokens_unicos'}
+    """
+    limites = analizador_gramatical.limites
+    resumen = dict(conteo)
+    resumen['descartados'] = {clave: limites.descartados(tipo) for tipo, clave in CLAVES_RESUMEN.items()}
+    resumen['tokens_unicos'] = len(analizador_lexico.tokens_dict)
+    return resumen
+
+
+class Exportador(ABC):
+    """
+    Base de los exportadores: recibe el análisis de cada archivo por partes
+
+    Para cada archivo se llama a abrir_archivo(), diagnostico() por cada
+    diagnóstico en orden de detección, y cerrar_archivo() con la tabla de
+    tokens y el resumen; o fallo() si no se pudo analizar. finalizar() cierra
+    el documento (no cierra `salida`). Cada formato implementa al menos
+    diagnostico().
+    """
+
+    def __init__(self, salida):
+        """
+        Args:
+            salida: Archivo de texto abierto para escribir
+        """
+        self.salida = salida
+        self.archivo = None
+        self.con_errores = 0   # Archivos con errores (exportados o descartados)
+        self.fallidos = 0      # Archivos que no se pudieron analizar
+
+    def abrir_archivo(self, archivo):
+        self.archivo = archivo
+
+    @abstractmethod
+    def diagnostico(self, diagnostico):
+        """
+        Args:
+            diagnostico (Diagnostico): Diagnóstico del archivo abierto
+        """
+
+    def cerrar_archivo(self, tokens, resumen):
+        """
+        Args:
+            tokens (iterable): (token, tipo, cantidad) ordenados por tipo y token
+            resumen (dict): Ver _resumen
+        """
+        descartados = resumen['descartados']
+        if (resumen['errores_lexicos'] or resumen['errores']
+                or descartados['errores_lexicos'] or descartados['errores']):
+            self.con_errores += 1
+
+    def fallo(self, archivo, mensaje):
+        self.fallidos += 1
+
+    def finalizar(self):
+        pass
+
+
+class ExportadorNDJSON(Exportador):
+    """Un objeto JSON por línea: diagnósticos, tokens, resumen y fallos de cada archivo"""
+
+    def _escribir(self, registro):
+        self.salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    def diagnostico(self, diagnostico):
+        registro = {'registro': 'diagnostico', 'archivo': self.archivo}
+        registro.update(diagnostico.como_dict())
+        self._escribir(registro)
+
+    def cerrar_archivo(self, tokens, resumen):
+        super().cerrar_archivo(tokens, resumen)
+        for token, tipo, cantidad in tokens:
+            self._escribir({'registro': 'token', 'archivo': self.archivo,
+                            'token': token, 'tipo': tipo, 'cantidad': cantidad})
+        registro = {'registro': 'resumen', 'archivo': self.archivo}
+        registro.update(resumen)
+        self._escribir(registro)
+
+    def fallo(self, archivo, mensaje):
+        super().fallo(archivo, mensaje)
+        self._escribir({'registro': 'fallo', 'archivo': archivo, 'mensaje': mensaje})
+
+
+class ExportadorCSV(Exportador):
+    """
+    Una tabla con las columnas de COLUMNAS_CSV
+
+    Los diagnósticos ocupan linea..mensaje; los tokens, tipo (su categoría),
+    token y cantidad; cada conteo del resumen es una fila 'resumen' (o
+    'descartados') con la clave en tipo y el valor en cantidad.
+    """
+
+    def __init__(self, salida):
+        super().__init__(salida)
+        self.escritor = csv.writer(salida)
+        self.escritor.writerow(COLUMNAS_CSV)
+
+    def diagnostico(self, diagnostico):
+        self.escritor.writerow(("diagnostico", self.archivo, diagnostico.linea, diagnostico.columna,
+                                diagnostico.codigo, diagnostico.regla, diagnostico.severidad,
+                                diagnostico.tipo, diagnostico.mensaje, None, None))
+
+    def cerrar_archivo(self, tokens, resumen):
+        super().cerrar_archivo(tokens, resumen)
+        escribir = self.escritor.writerow
+        archivo = self.archivo
+        for token, tipo, cantidad in tokens:
+            escribir(("token", archivo, None, None, None, None, None, tipo, None, token, cantidad))
+        for clave, valor in resumen.items():
+            if clave == 'descartados':
+                for tipo, cantidad in valor.items():
+                    escribir(("descartados", archivo, None, None, None, None, None, tipo, None, None, cantidad))
+            else:
+                escribir(("resumen", archivo, None, None, None, None, None, clave, None, None, valor))
+
+    def fallo(self, archivo, mensaje):
+        super().fallo(archivo, mensaje)
+        self.escritor.writerow(("fallo", archivo, None, None, None, None, None, None, mensaje, None, None))
+
+
+def _uri(ruta):
+    """URI de un archivo para SARIF: relativa con '/' o file:// si la ruta es absoluta"""
+    ruta = Path(ruta)
+    return ruta.as_uri() if ruta.is_absolute() else ruta.as_posix()
+
+
+class ExportadorSARIF(Exportador):
+    """
+    Documento SARIF 2.1.0 escrito a medida que llegan los diagnósticos
+
+    El encabezado (herramienta y reglas) se escribe al crearlo y cada result
+    al recibir su diagnóstico; los totales y los archivos fallidos se
+    escriben en finalizar().
+    """
+
+    def __init__(self, salida):
+        super().__init__(salida)
+        codigos = sorted(CATALOGO)
+        self.indice_regla = {codigo: indice for indice, codigo in enumerate(codigos)}
+        reglas = [{
+            'id': codigo,
+            'name': CATALOGO[codigo][0],
+            'shortDescription': {'text': CATALOGO[codigo][2]},
+            'defaultConfiguration': {'level': NIVELES_SARIF[CATALOGO[codigo][1]]},
+        } for codigo in codigos]
+        herramienta = {'driver': {'name': NOMBRE_HERRAMIENTA, 'rules': reglas}}
+        self.uri = None
+        self.primero = True
+        self.totales = dict.fromkeys(CLAVES_RESUMEN.values(), 0)
+        self.totales['descartados'] = dict.fromkeys(CLAVES_RESUMEN.values(), 0)
+        self.totales['archivos'] = 0
+        self.fallos = []   # Notificaciones de los archivos que no se pudieron analizar
+        salida.write(f'{{"$schema": "{ESQUEMA_SARIF}", "version": "{VERSION_SARIF}", "runs": [{{'
+                     f'"tool": {json.dumps(herramienta, ensure_ascii=False)}, "results": [\n')
+
+    def abrir_archivo(self, archivo):
+        super().abrir_archivo(archivo)
+        self.uri = _uri(archivo)
+
+    def diagnostico(self, diagnostico):
+        region = {'startLine': diagnostico.linea}
+        if diagnostico.columna is not None:
+            region['startColumn'] = diagnostico.columna
+        resultado = {
+            'ruleId': diagnostico.codigo,
+            'ruleIndex': self.indice_regla[diagnostico.codigo],
+            'level': NIVELES_SARIF[diagnostico.severidad],
+            'message': {'text': diagnostico.descripcion},
+            'locations': [{'physicalLocation': {'artifactLocation': {'uri': self.uri}, 'region': region}}],
+        }
+        self.salida.write(("" if self.primero else ",\n") + json.dumps(resultado, ensure_ascii=False))
+        self.primero = False
+
+    def cerrar_archivo(self, tokens, resumen):
+        super().cerrar_archivo(tokens, resumen)
+        self.totales['archivos'] += 1
+        for clave in CLAVES_RESUMEN.values():
+            self.totales[clave] += resumen[clave]
+            self.totales['descartados'][clave] += resumen['descartados'][clave]
+
+    def fallo(self, archivo, mensaje):
+        super().fallo(archivo, mensaje)
+        self.fallos.append({
+            'level': 'error',
+            'message': {'text': mensaje},
+            'locations': [{'physicalLocation': {'artifactLocation': {'uri': _uri(archivo)}}}],
+        })
+
+    def finalizar(self):
+        self.totales['con_errores'] = self.con_errores
+        self.totales['fallidos'] = self.fallidos
+        invocacion = {'executionSuccessful': not self.fallos,
+                      'toolExecutionNotifications': self.fallos}
+        self.salida.write(f'\n], "invocations": [{json.dumps(invocacion, ensure_ascii=False)}], '
+                          f'"properties": {{"resumen": {json.dumps(self.totales)}}}}}]}}\n')
+
+
+FORMATOS = {"ndjson": ExportadorNDJSON, "csv": ExportadorCSV, "sarif": ExportadorSARIF}
+
+
+def exportar_archivo(ruta, analizador_lexico, analizador_gramatical, exportador, encoding="utf-8"):
+    """
+    Analiza un archivo escribiendo cada diagnóstico apenas se encuentra
+
+    Args:
+        ruta (str): Ruta del archivo
+        analizador_lexico: Instancia de AnalizadorLexico
+        analizador_gramatical: Instancia de AnalizadorGramatical
+        exportador (Exportador): Destino de los resultados
+        encoding (str): Codificación del archivo
+
+    Returns:
+        bool: False si el archivo no se pudo leer (se exporta como fallo)
+    """
+    conteo = dict.fromkeys(CLAVES_RESUMEN.values(), 0)
+    exportador.abrir_archivo(ruta)
+    try:
+        for diagnostico in analizar_archivo(ruta, analizador_lexico, analizador_gramatical, encoding):
+            conteo[CLAVES_RESUMEN[diagnostico.tipo]] += 1
+            exportador.diagnostico(diagnostico)
+    except (OSError, UnicodeDecodeError) as e:
+        exportador.fallo(ruta, str(e))
+        return False
+
+    tokens = ((token, datos["Tipo"], datos["Cantidad"])
+              for token, datos in analizador_lexico.obtener_tokens_ordenados())
+    exportador.cerrar_archivo(tokens, _resumen(conteo, analizador_lexico, analizador_gramatical))
+    return True
+
+
+def analizar_ruta_exportable(ruta):
+    """
+    Analiza un archivo en un worker del pool de AnalizadorLote (ver analizar_lote)
+
+    Args:
+        ruta (str): Ruta del archivo
+
+    Returns:
+        dict: {'archivo', 'diagnosticos' (Diagnostico.como_lista), 'tokens'
+        ([token, tipo, cantidad] ordenados), 'resumen'} o {'archivo', 'fallo'}
+    """
+    analizador_lexico, analizador_gramatical = analizadores_del_proceso()
+    conteo = dict.fromkeys(CLAVES_RESUMEN.values(), 0)
+    diagnosticos = []
+    try:
+        for diagnostico in analizar_archivo(ruta, analizador_lexico, analizador_gramatical):
+            conteo[CLAVES_RESUMEN[diagnostico.tipo]] += 1
+            diagnosticos.append(diagnostico.como_lista())
+    except (OSError, UnicodeDecodeError) as e:
+        return {'archivo': ruta, 'fallo': str(e)}
+
+    return {
+        'archivo': ruta,
+        'diagnosticos': diagnosticos,
+        'tokens': [[token, datos["Tipo"], datos["Cantidad"]]
+                   for token, datos in analizador_lexico.obtener_tokens_ordenados()],
+        'resumen': _resumen(conteo, analizador_lexico, analizador_gramatical),
+    }
+
+
+def exportar_resultado(resultado, exportador):
+    """Exporta el resultado de analizar_ruta_exportable"""
+    if 'fallo' in resultado:
+        exportador.fallo(resultado['archivo'], resultado['fallo'])
+        return
+    exportador.abrir_archivo(resultado['archivo'])
+    for datos in resultado['diagnosticos']:
+        exportador.diagnostico(Diagnostico.desde_lista(datos))
+    exportador.cerrar_archivo(resultado['tokens'], resultado['resumen'])
+
+
+def exportar_lote(rutas, exportador, jobs=1, ruta_tokens=RUTA_TOKENS, maximo_diagnosticos=None,
+                  maximo_por_regla=None):
+    """
+    Analiza y exporta varios archivos, en orden
+
+    Args:
+        rutas (list): Archivos a analizar
+        exportador (Exportador): Destino de los resultados (se finaliza al terminar)
+        jobs (int): Con 1 (por defecto) se analiza en este proceso escribiendo
+            durante el análisis; con más, en el pool de AnalizadorLote
+        ruta_tokens (str): Ruta de Tokens.json
+        maximo_diagnosticos (int): Diagnósticos exportados por archivo como máximo
+        maximo_por_regla (int): Diagnósticos exportados por archivo y por regla como máximo
+    """
+    if jobs == 1:
+        analizador_lexico, analizador_gramatical = crear_analizadores(
+            ruta_tokens, maximo_diagnosticos=maximo_diagnosticos, maximo_por_regla=maximo_por_regla)
+        for ruta in rutas:
+            exportar_archivo(ruta, analizador_lexico, analizador_gramatical, exportador)
+    else:
+        for resultado in analizar_lote(rutas, jobs, ruta_tokens, maximo_diagnosticos=maximo_diagnosticos,
+                                       maximo_por_regla=maximo_por_regla, funcion=analizar_ruta_exportable):
+            exportar_resultado(resultado, exportador)
+    exportador.finalizar()
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Analiza archivos del lenguaje y exporta los resultados a NDJSON, CSV o SARIF"
+    )
+    parser.add_argument("entradas", nargs="+", help="Archivos, directorios o patrones glob")
+    parser.add_argument("-f", "--formato", choices=sorted(FORMATOS), default="ndjson",
+                        help="Formato de salida (por defecto, ndjson)")
+    parser.add_argument("-o", "--salida", default=None,
+                        help="Archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Procesos del pool (por defecto, 1: se exporta durante el análisis)")
+    parser.add_argument("--tokens", default=RUTA_TOKENS, help="Ruta de Tokens.json")
+    parser.add_argument("--extension", default=".txt",
+                        help="Extensión de los archivos buscados en directorios")
+    parser.add_argument("--max-diagnosticos", type=int, default=None, metavar="N",
+                        help="Exporta a lo sumo N diagnósticos por archivo (el resto solo se cuenta)")
+    parser.add_argument("--max-por-regla", type=int, default=None, metavar="N",
+                        help="Exporta a lo sumo N diagnósticos de cada regla por archivo")
+    args = parser.parse_args(argv)
+
+    rutas = buscar_archivos(args.entradas, args.extension)
+    if not rutas:
+        print("⚠ No se encontraron archivos para analizar", file=sys.stderr)
+        return 2
+
+    # newline="" para que el módulo csv controle los saltos de línea
+    salida = (open(args.salida, "w", encoding="utf-8", newline="") if args.salida
+              else sys.stdout)
+    try:
+        exportador = FORMATOS[args.formato](salida)
+        exportar_lote(rutas, exportador, args.jobs, args.tokens, args.max_diagnosticos, args.max_por_regla)
+    except BrokenPipeError:
+        # El lector de la salida terminó (p. ej. `| head`)
+        descartar_salida_estandar()
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"📊 Archivos: {len(rutas)} • Con errores: {exportador.con_errores} • "
+          f"Fallidos: {exportador.fallidos}", file=sys.stderr)
+
+    if exportador.fallidos:
+        return 2
+    return 1 if exportador.con_errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
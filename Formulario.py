@@ -1,6 +1,28 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
 import os
+import queue
+import time
+from itertools import islice
+from Analisis import analizar_archivo
+from Ejecutor import EjecutorAnalisis
+from Incremental import AnalizadorIncremental
+from Instrumentacion import Instrumentacion, formatear_estadisticas
+from TablaVirtual import crear_tabla_tokens, filas_tokens
+
+# Archivos mayores a este tamaño no se copian al editor: se analizan desde disco
+LIMITE_EDITOR_BYTES = 2 * 1024 * 1024
+# Líneas que se muestran como vista previa de un archivo grande
+LINEAS_VISTA_PREVIA = 1000
+# Pausa de escritura tras la cual se analiza automáticamente (modo "analizar al escribir")
+RETARDO_ANALISIS_MS = 400
+# Cada cuánto se revisa la cola de resultados del hilo de análisis
+INTERVALO_REVISION_MS = 50
+# Los diagnósticos de un archivo se envían a la interfaz en lotes
+LOTE_DIAGNOSTICOS = 500
+SEGUNDOS_LOTE = 0.1
+# Diagnósticos que se guardan y muestran por análisis (el resto solo se cuenta en el resumen)
+MAXIMO_DIAGNOSTICOS = 10_000
 
 class InterfazAnalizador:
     """Interfaz gráfica del analizador léxico y gramatical"""
@@ -15,6 +37,15 @@ class InterfazAnalizador:
         """
         self.analizador_lexico = analizador_lexico
         self.analizador_gramatical = analizador_gramatical
+        # Reutiliza el análisis anterior del editor: solo se re-analiza lo editado
+        self.analizador_incremental = AnalizadorIncremental(analizador_lexico, analizador_gramatical)
+        # El análisis corre en un hilo de fondo; la ventana sigue respondiendo
+        self.ejecutor = EjecutorAnalisis()
+        self.ejecucion_actual = None
+        self.revisando_resultados = False
+        self.al_terminar = None          # Qué hacer con el resultado de la ejecución actual
+        self.mensaje_error = ""
+        self.espera_escritura = None     # Timer pendiente del modo "analizar al escribir"
         
         self.ventana = tk.Tk()
         self.ventana.title("Analizador Léxico y Gramatical")
@@ -22,6 +53,11 @@ class InterfazAnalizador:
         self.ventana.configure(bg="#34495e")
         
         self.ruta_archivo = tk.StringVar()
+        self.archivo_en_disco = False  # True si el archivo es grande y se analiza por flujo
+        self.analizar_al_escribir = tk.BooleanVar(value=False)
+        self.medir_analisis = tk.BooleanVar(value=False)
+        self.ventana_estadisticas = None  # Panel de estadísticas (se crea al primer uso)
+        self.estado_analisis = tk.StringVar()
         
         self._construir_interfaz()
     
@@ -57,6 +93,23 @@ class InterfazAnalizador:
                                 padx=15, pady=8)
         btn_analizar.pack(side="left", padx=5)
 
+        chk_al_escribir = tk.Checkbutton(frame_botones, text="⌨ Analizar al escribir",
+                                         variable=self.analizar_al_escribir,
+                                         bg="#34495e", fg="white", selectcolor="#2c3e50",
+                                         activebackground="#34495e", activeforeground="white",
+                                         font=("Arial", 10, "bold"))
+        chk_al_escribir.pack(side="left", padx=5)
+
+        chk_medir = tk.Checkbutton(frame_botones, text="📈 Estadísticas",
+                                   variable=self.medir_analisis,
+                                   bg="#34495e", fg="white", selectcolor="#2c3e50",
+                                   activebackground="#34495e", activeforeground="white",
+                                   font=("Arial", 10, "bold"))
+        chk_medir.pack(side="left", padx=5)
+
+        tk.Label(frame_izq, textvariable=self.estado_analisis, bg="#34495e", fg="#f1c40f",
+                 font=("Arial", 9, "bold")).pack()
+
         # ===== PANEL DERECHO (RESULTADOS) =====
         tk.Label(frame_der, text="ANÁLISIS LÉXICO Y GRAMATICAL", bg="#34495e", fg="white",
                 font=("Arial", 12, "bold")).pack(pady=5)
@@ -76,6 +129,10 @@ class InterfazAnalizador:
         self.frame_tabla = tk.Frame(frame_der, bg="white", borderwidth=2, relief="solid")
         self.frame_tabla.pack(fill="both", expand=True, pady=5)
 
+        # Tabla virtual: solo dibuja las filas visibles, se crea una sola vez
+        self.tabla_tokens = crear_tabla_tokens(self.frame_tabla)
+        self.tabla_tokens.pack(fill="both", expand=True)
+
         # Área de texto editable
         self.text_contenido = scrolledtext.ScrolledText(
             frame_izq, wrap="none", width=50, height=35, 
@@ -83,9 +140,10 @@ class InterfazAnalizador:
             state=tk.NORMAL  # ⚠ CAMBIO IMPORTANTE: ahora editable
         )
         self.text_contenido.pack(fill="both", expand=True, pady=5)
+        self.text_contenido.bind("<<Modified>>", self._texto_modificado)
 
     def _seleccionar_archivo(self):
-        """⚠ SE MANTIENE IGUAL - Permite al usuario seleccionar un archivo"""
+        """Permite al usuario seleccionar un archivo"""
         archivo = filedialog.askopenfilename(
         title="Seleccionar archivo a analizar",
         filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
@@ -94,8 +152,16 @@ class InterfazAnalizador:
         if archivo:
             self.ruta_archivo.set(archivo)
             try:
+                # Los archivos grandes no se copian al editor: solo una vista previa
+                self.archivo_en_disco = os.path.getsize(archivo) > LIMITE_EDITOR_BYTES
+                
                 with open(archivo, "r", encoding="utf-8") as f:
-                    contenido = f.read()
+                    if self.archivo_en_disco:
+                        contenido = "".join(islice(f, LINEAS_VISTA_PREVIA))
+                        contenido += (f"\n// ... vista previa de {LINEAS_VISTA_PREVIA} líneas; "
+                                      f"el archivo completo se analiza desde disco\n")
+                    else:
+                        contenido = f.read()
                     
                 self.text_contenido.config(state=tk.NORMAL)
                 self.text_contenido.delete(1.0, tk.END)
@@ -110,8 +176,10 @@ class InterfazAnalizador:
         
     def _analizar_archivo(self):
         """
-        ⚠ CAMBIO PRINCIPAL: Ahora usa los analizadores en lugar de lógica embebida
-        Analiza el archivo seleccionado
+        Analiza el archivo seleccionado leyéndolo por flujo desde disco
+        
+        Los diagnósticos se muestran a medida que se encuentran, sin cargar el
+        archivo completo en memoria ni en el editor.
         """
         if not self.ruta_archivo.get():
             messagebox.showwarning("Atención", "⚠️ Seleccione un archivo primero")
@@ -124,27 +192,82 @@ class InterfazAnalizador:
         
         # Limpiar resultados anteriores
         self._limpiar_resultados()
+        self._configurar_estilos()
         
-        try:
-            # Leer el código
-            with open(ruta, "r", encoding="utf-8") as archivo:
-                codigo = archivo.read()
-            
-            # ⚠ CAMBIO: Análisis separado en módulos
-            # Análisis léxico
-            resultado_lexico = self.analizador_lexico.analizar_codigo(codigo)
-            
-            # Análisis gramatical
-            resultado_gramatical = self.analizador_gramatical.analizar_codigo(codigo)
-            
-            # Mostrar resultados
-            self._mostrar_resultados(resultado_lexico, resultado_gramatical)
-            
-            # Crear tabla de tokens
-            self._crear_tabla()
+        instrumentacion = Instrumentacion() if self.medir_analisis.get() else None
+        self._iniciar_analisis(self._tarea_archivo, (ruta, instrumentacion), self._terminar_archivo,
+                               "⚠ Error al analizar el archivo")
+    
+    def _tarea_archivo(self, ruta, instrumentacion, cancelado, publicar):
+        """
+        Analiza el archivo en el hilo de fondo (no debe tocar widgets)
+        
+        Publica los diagnósticos en lotes para que la interfaz los muestre
+        mientras el análisis continúa.
+        
+        Returns:
+            dict: Totales del resumen y filas de la tabla de tokens
+        """
+        total_errores = 0
+        total_advertencias = 0
+        lote = []
+        ultimo_envio = time.monotonic()
+        
+        for diagnostico in analizar_archivo(ruta, self.analizador_lexico, self.analizador_gramatical,
+                                            cancelado=cancelado, instrumentacion=instrumentacion):
+            if diagnostico.tipo == 'advertencia':
+                total_advertencias += 1
+            else:
+                total_errores += 1
+            lote.append(diagnostico)
             
-        except Exception as e:
-            messagebox.showerror("Error", f"⚠ Error al analizar el archivo: {str(e)}")
+            if len(lote) >= LOTE_DIAGNOSTICOS or time.monotonic() - ultimo_envio > SEGUNDOS_LOTE:
+                publicar(lote)
+                lote = []
+                ultimo_envio = time.monotonic()
+        
+        if lote:
+            publicar(lote)
+        
+        # Los diagnósticos que superaron los límites no se emitieron, pero se contaron
+        descartados_lexicos = self.analizador_lexico.limites.descartados('error_lexico')
+        limites = self.analizador_gramatical.limites
+        return {
+            'errores': total_errores + descartados_lexicos + limites.descartados('error'),
+            'advertencias': total_advertencias + limites.descartados('advertencia'),
+            'omitidos': descartados_lexicos + limites.descartados('error', 'advertencia'),
+            'tokens': len(self.analizador_lexico.tokens_dict),
+            'variables': len(self.analizador_gramatical.variables),
+            'funciones': len(self.analizador_gramatical.funciones),
+            'filas': filas_tokens(self.analizador_lexico.tokens_dict),
+            'estadisticas': instrumentacion.como_dict() if instrumentacion is not None else None
+        }
+    
+    def _mostrar_diagnosticos(self, diagnosticos):
+        """Agrega al área de mensajes un lote de diagnósticos del análisis por flujo"""
+        self.text_mensajes.config(state=tk.NORMAL)
+        for diagnostico in diagnosticos:
+            estilo = "warning" if diagnostico.tipo == 'advertencia' else "error"
+            self.text_mensajes.insert(tk.END, diagnostico.mensaje + "\n", estilo)
+        self.text_mensajes.config(state=tk.DISABLED)
+    
+    def _terminar_archivo(self, resultado):
+        """Muestra el resumen y la tabla de tokens al terminar el análisis del archivo"""
+        self.text_mensajes.config(state=tk.NORMAL)
+        
+        if not resultado['errores']:
+            self.text_mensajes.insert(tk.END, "✓ Análisis exitoso sin errores\n", "exito")
+        
+        self._mostrar_resumen(resultado['errores'], resultado['advertencias'],
+                              resultado['tokens'], resultado['variables'], resultado['funciones'],
+                              resultado['omitidos'])
+        self.text_mensajes.config(state=tk.DISABLED)
+        
+        # Crear tabla de tokens
+        self._crear_tabla(resultado['filas'])
+        
+        if resultado['estadisticas']:
+            self._mostrar_estadisticas(resultado['estadisticas'])
     
     def _limpiar_resultados(self):
         """Limpia el área de mensajes y la tabla"""
@@ -152,8 +275,7 @@ class InterfazAnalizador:
         self.text_mensajes.delete(1.0, tk.END)
         self.text_mensajes.config(state=tk.DISABLED)
         
-        for widget in self.frame_tabla.winfo_children():
-            widget.destroy()
+        self.tabla_tokens.establecer_filas([])
     
     def _mostrar_resultados(self, resultado_lexico, resultado_gramatical):
         """
@@ -162,110 +284,211 @@ class InterfazAnalizador:
         self.text_mensajes.config(state=tk.NORMAL)
         
         # Configurar estilos
-        self.text_mensajes.tag_config("error", foreground="red", font=("Arial", 9, "bold"))
-        self.text_mensajes.tag_config("warning", foreground="orange", font=("Arial", 9, "bold"))
-        self.text_mensajes.tag_config("exito", foreground="green", font=("Arial", 10, "bold"))
+        self._configurar_estilos()
         
         # Mostrar errores léxicos
         if resultado_lexico['errores_lexicos']:
             for error in resultado_lexico['errores_lexicos']:
-                self.text_mensajes.insert(tk.END, error['mensaje'] + "\n", "error")
+                self.text_mensajes.insert(tk.END, error.mensaje + "\n", "error")
         
         # Mostrar errores gramaticales
         if resultado_gramatical['errores']:
             for error in resultado_gramatical['errores']:
-                self.text_mensajes.insert(tk.END, error + "\n", "error")
+                self.text_mensajes.insert(tk.END, error.mensaje + "\n", "error")
         
         # Mostrar advertencias
         if resultado_gramatical['advertencias']:
             for adv in resultado_gramatical['advertencias']:
-                self.text_mensajes.insert(tk.END, adv + "\n", "warning")
+                self.text_mensajes.insert(tk.END, adv.mensaje + "\n", "warning")
         
         # Mensaje de éxito si no hay errores
         if not resultado_lexico['errores_lexicos'] and not resultado_gramatical['errores']:
             self.text_mensajes.insert(tk.END, "✓ Análisis exitoso sin errores\n", "exito")
         
-        # Resumen
-        total_errores = len(resultado_lexico['errores_lexicos']) + len(resultado_gramatical['errores'])
-        total_advertencias = len(resultado_gramatical['advertencias'])
+        # Resumen (incluye los diagnósticos que superaron los límites y no se guardaron)
+        omitidos = (resultado_lexico['errores_descartados'] + resultado_gramatical['errores_descartados']
+                    + resultado_gramatical['advertencias_descartadas'])
+        total_errores = (len(resultado_lexico['errores_lexicos']) + resultado_lexico['errores_descartados']
+                         + len(resultado_gramatical['errores']) + resultado_gramatical['errores_descartados'])
+        total_advertencias = (len(resultado_gramatical['advertencias'])
+                              + resultado_gramatical['advertencias_descartadas'])
+        
+        self._mostrar_resumen(total_errores, total_advertencias,
+                              len(resultado_lexico['tokens']),
+                              len(resultado_gramatical['variables']),
+                              len(resultado_gramatical['funciones']),
+                              omitidos)
         
+        self.text_mensajes.config(state=tk.DISABLED)
+    
+    def _configurar_estilos(self):
+        """Configura los estilos del área de mensajes"""
+        self.text_mensajes.tag_config("error", foreground="red", font=("Arial", 9, "bold"))
+        self.text_mensajes.tag_config("warning", foreground="orange", font=("Arial", 9, "bold"))
+        self.text_mensajes.tag_config("exito", foreground="green", font=("Arial", 10, "bold"))
+    
+    def _mostrar_resumen(self, total_errores, total_advertencias, total_tokens, total_variables, total_funciones,
+                         total_omitidos=0):
+        """Muestra el resumen del análisis al final del área de mensajes"""
         self.text_mensajes.insert(tk.END, f"\n📊 RESUMEN:\n", "exito")
         self.text_mensajes.insert(tk.END, f"   • Errores: {total_errores}\n", 
                                  "error" if total_errores > 0 else "exito")
         self.text_mensajes.insert(tk.END, f"   • Advertencias: {total_advertencias}\n", 
                                  "warning" if total_advertencias > 0 else "exito")
-        self.text_mensajes.insert(tk.END, f"   • Tokens únicos: {len(resultado_lexico['tokens'])}\n", "exito")
-        self.text_mensajes.insert(tk.END, f"   • Variables: {len(resultado_gramatical['variables'])}\n", "exito")
-        self.text_mensajes.insert(tk.END, f"   • Funciones: {len(resultado_gramatical['funciones'])}\n", "exito")
-        
-        self.text_mensajes.config(state=tk.DISABLED)
+        self.text_mensajes.insert(tk.END, f"   • Tokens únicos: {total_tokens}\n", "exito")
+        self.text_mensajes.insert(tk.END, f"   • Variables: {total_variables}\n", "exito")
+        self.text_mensajes.insert(tk.END, f"   • Funciones: {total_funciones}\n", "exito")
+        if total_omitidos:
+            self.text_mensajes.insert(tk.END, f"   • No mostrados (límite de {MAXIMO_DIAGNOSTICOS:,}): "
+                                              f"{total_omitidos}\n", "warning")
     
-    def _crear_tabla(self):
-        """⚠ SE MANTIENE IGUAL - Genera la tabla de tokens"""
-        tokens_dict = self.analizador_lexico.tokens_dict
+    def _crear_tabla(self, filas):
+        """Carga las filas de tokens (ya ordenadas por tipo y nombre) en la tabla"""
+        self.tabla_tokens.establecer_filas(filas)
+
+    def _analizar_codigo_textbox(self, automatico=False):
+        """
+        Analiza el contenido escrito directamente en el TextBox
         
-        if not tokens_dict:
+        Args:
+            automatico (bool): True si lo dispara el modo "analizar al escribir"
+                (no muestra avisos)
+        """
+        # Un archivo grande solo tiene una vista previa en el editor
+        if self.archivo_en_disco:
+            if not automatico:
+                self._analizar_archivo()
             return
         
-        # Crear canvas con scrollbar
-        canvas = tk.Canvas(self.frame_tabla, bg="white")
-        scrollbar_v = tk.Scrollbar(self.frame_tabla, orient="vertical", command=canvas.yview)
-        scrollbar_h = tk.Scrollbar(self.frame_tabla, orient="horizontal", command=canvas.xview)
+        codigo = self.text_contenido.get("1.0", tk.END).strip()
+        if not codigo:
+            if not automatico:
+                messagebox.showwarning("Atención", "⚠️ No hay código para analizar")
+            return
+
+        # Los resultados anteriores se reemplazan recién cuando llegan los nuevos
+        instrumentacion = Instrumentacion() if self.medir_analisis.get() else None
+        self._iniciar_analisis(self._tarea_codigo, (codigo, instrumentacion), self._terminar_codigo,
+                               "⚠ Error al analizar el código")
+
+    def _tarea_codigo(self, codigo, instrumentacion, cancelado, publicar):
+        """
+        Análisis incremental del código del editor en el hilo de fondo
         
-        frame_interno = tk.Frame(canvas, bg="white")
-        frame_interno.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        Returns:
+            tuple: (resultado_lexico, resultado_gramatical, filas de la tabla de tokens)
+        """
+        try:
+            # ⚙ Análisis léxico y gramatical
+            resultado_lexico, resultado_gramatical = self.analizador_incremental.analizar(
+                codigo, cancelado=cancelado, instrumentacion=instrumentacion)
+        except Exception:
+            # Un análisis interrumpido deja el caché incremental inconsistente
+            self.analizador_incremental.reiniciar()
+            raise
+        return resultado_lexico, resultado_gramatical, filas_tokens(resultado_lexico['tokens'])
+
+    def _terminar_codigo(self, resultado):
+        """Muestra los resultados del análisis del editor"""
+        resultado_lexico, resultado_gramatical, filas = resultado
+        self._limpiar_resultados()
+        self._mostrar_resultados(resultado_lexico, resultado_gramatical)
+        self._crear_tabla(filas)
         
-        canvas.create_window((0, 0), window=frame_interno, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
+        if 'estadisticas' in resultado_gramatical:
+            self._mostrar_estadisticas(resultado_gramatical['estadisticas'])
+
+    def _mostrar_estadisticas(self, estadisticas):
+        """
+        Muestra las mediciones del análisis en el panel de estadísticas
         
-        # Encabezados
-        columnas = ["TOKEN", "TIPO", "CANTIDAD"]
-        for col, texto in enumerate(columnas):
-            lbl = tk.Label(frame_interno, text=texto, bg="#2c3e50", fg="white", 
-                          width=25, font=("Arial", 10, "bold"), borderwidth=1, relief="solid")
-            lbl.grid(row=0, column=col, sticky="nsew", padx=1, pady=1)
+        Args:
+            estadisticas (dict): Resultado de Instrumentacion.como_dict
+        """
+        if self.ventana_estadisticas is None:
+            self.ventana_estadisticas = tk.Toplevel(self.ventana)
+            self.ventana_estadisticas.title("Estadísticas del análisis")
+            self.ventana_estadisticas.configure(bg="#34495e")
+            self.ventana_estadisticas.protocol("WM_DELETE_WINDOW", self._cerrar_estadisticas)
+            
+            self.text_estadisticas = scrolledtext.ScrolledText(
+                self.ventana_estadisticas, wrap="none", width=60, height=30,
+                borderwidth=2, relief="solid", font=("Consolas", 9)
+            )
+            self.text_estadisticas.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Ordenar tokens por tipo y nombre
-        tokens_ordenados = self.analizador_lexico.obtener_tokens_ordenados()
+        self.text_estadisticas.config(state=tk.NORMAL)
+        self.text_estadisticas.delete(1.0, tk.END)
+        self.text_estadisticas.insert(tk.END, formatear_estadisticas(estadisticas))
+        self.text_estadisticas.config(state=tk.DISABLED)
+
+    def _cerrar_estadisticas(self):
+        """Cierra el panel de estadísticas (se vuelve a abrir con el próximo análisis medido)"""
+        self.ventana_estadisticas.destroy()
+        self.ventana_estadisticas = None
+
+    def _texto_modificado(self, event=None):
+        """Reprograma el análisis automático mientras el usuario escribe"""
+        if not self.text_contenido.edit_modified():
+            return
+        self.text_contenido.edit_modified(False)
         
-        # Colores alternos para filas
-        colores = ["#ecf0f1", "#ffffff"]
+        if self.espera_escritura is not None:
+            self.ventana.after_cancel(self.espera_escritura)
+            self.espera_escritura = None
         
-        for fila, (token, datos) in enumerate(tokens_ordenados, start=1):
-            color = colores[fila % 2]
-            
-            tk.Label(frame_interno, text=datos["Token"], width=25, bg=color, 
-                    borderwidth=1, relief="solid").grid(row=fila, column=0, sticky="nsew", padx=1, pady=1)
-            tk.Label(frame_interno, text=datos["Tipo"], width=25, bg=color,
-                    borderwidth=1, relief="solid").grid(row=fila, column=1, sticky="nsew", padx=1, pady=1)
-            tk.Label(frame_interno, text=datos["Cantidad"], width=25, bg=color,
-                    borderwidth=1, relief="solid").grid(row=fila, column=2, sticky="nsew", padx=1, pady=1)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar_v.pack(side="right", fill="y")
-        scrollbar_h.pack(side="bottom", fill="x")
+        if self.analizar_al_escribir.get():
+            self.espera_escritura = self.ventana.after(RETARDO_ANALISIS_MS, self._analizar_por_escritura)
 
-    def _analizar_codigo_textbox(self):
-        """Analiza el contenido escrito directamente en el TextBox"""
-        codigo = self.text_contenido.get("1.0", tk.END).strip()
-        if not codigo:
-            messagebox.showwarning("Atención", "⚠️ No hay código para analizar")
-            return
+    def _analizar_por_escritura(self):
+        """Análisis disparado cuando el usuario deja de escribir"""
+        self.espera_escritura = None
+        self._analizar_codigo_textbox(automatico=True)
 
-        # Limpiar resultados anteriores
-        self._limpiar_resultados()
+    def _iniciar_analisis(self, tarea, args, al_terminar, mensaje_error):
+        """
+        Lanza una tarea en el hilo de análisis, cancelando la que esté en curso
+        
+        Args:
+            tarea (callable): Función que corre en el hilo de fondo
+            args (tuple): Argumentos de la tarea
+            al_terminar (callable): Recibe el resultado final en el hilo de Tk
+            mensaje_error (str): Prefijo del mensaje si la tarea falla
+        """
+        self.al_terminar = al_terminar
+        self.mensaje_error = mensaje_error
+        self.ejecucion_actual = self.ejecutor.ejecutar(tarea, *args)
+        self.estado_analisis.set("⏳ Analizando...")
+        
+        if not self.revisando_resultados:
+            self.revisando_resultados = True
+            self.ventana.after(INTERVALO_REVISION_MS, self._revisar_resultados)
 
+    def _revisar_resultados(self):
+        """Consume la cola de resultados del hilo de análisis (corre en el hilo de Tk)"""
+        terminado = False
         try:
-            # ⚙ Análisis léxico y gramatical
-            resultado_lexico = self.analizador_lexico.analizar_codigo(codigo)
-            resultado_gramatical = self.analizador_gramatical.analizar_codigo(codigo)
-
-            # Mostrar resultados
-            self._mostrar_resultados(resultado_lexico, resultado_gramatical)
-            self._crear_tabla()
-
-        except Exception as e:
-            messagebox.showerror("Error", f"⚠ Error al analizar el código: {str(e)}")
+            while not terminado:
+                id_ejecucion, tipo, datos = self.ejecutor.resultados.get_nowait()
+                if id_ejecucion != self.ejecucion_actual:
+                    continue  # Resultado de una ejecución ya cancelada
+                
+                if tipo == 'parcial':
+                    self._mostrar_diagnosticos(datos)
+                elif tipo == 'resultado':
+                    terminado = True
+                    self.al_terminar(datos)
+                else:
+                    terminado = True
+                    messagebox.showerror("Error", f"{self.mensaje_error}: {str(datos)}")
+        except queue.Empty:
+            pass
+        
+        if terminado:
+            self.revisando_resultados = False
+            self.estado_analisis.set("")
+        else:
+            self.ventana.after(INTERVALO_REVISION_MS, self._revisar_resultados)
 
     def iniciar(self):
         """Inicia el loop principal de la interfaz"""
@@ -0,0 +1,744 @@
+import time
+
+from Analisis import AnalisisCancelado
+from Instrumentacion import instrumentar
+
+# Líneas por bloque de conteos de diagnósticos (ver AnalizadorIncremental._bloques)
+LINEAS_BLOQUE = 256
+
+# Ediciones que se acumulan antes de poner al día todo lo guardado (ver AnalizadorIncremental._compactar)
+MAXIMO_EDICIONES = 1024
+
+
+def _mapeo_lineas(inicio, fin, desplazamiento):
+    """
+    Número de línea (desde 1) después de reemplazar las líneas [inicio, fin)
+
+    Las líneas anteriores a la edición no cambian; las de la región editada ya
+    no existen y se mapean a 0.
+    """
+    def mapeo(numero):
+        if numero <= inicio:
+            return numero
+        if numero > fin:
+            return numero + desplazamiento
+        return 0
+    return mapeo
+
+
+def _renumerar(diagnosticos, mapeo):
+    """(errores, advertencias) con los números de línea remapeados"""
+    return tuple([diagnostico.con_linea(mapeo(diagnostico.linea)) for diagnostico in lista]
+                 for lista in diagnosticos)
+
+
+def _mismos(nuevos, guardados):
+    """
+    True si dos listas de diagnósticos de una línea solo difieren en el número de línea
+
+    Al re-analizar una línea cuyos diagnósticos no cambiaron se conservan
+    los guardados (que se renumeran al armar los resultados): un re-análisis
+    largo no reemplaza miles de objetos iguales por copias nuevas.
+    """
+    return len(nuevos) == len(guardados) and all(
+        nuevo.codigo == guardado.codigo and nuevo.columna == guardado.columna and nuevo.args == guardado.args
+        for nuevo, guardado in zip(nuevos, guardados))
+
+
+def _sumar_conteo(total, conteo, signo):
+    """Suma (o resta, con signo -1) un conteo {código: cantidad} a otro"""
+    for codigo, cantidad in conteo.items():
+        cantidad = total.get(codigo, 0) + signo * cantidad
+        if cantidad:
+            total[codigo] = cantidad
+        else:
+            del total[codigo]
+
+
+def _linea_maxima_estado(estado):
+    """Mayor número de línea de la pila de un estado capturado del PDA"""
+    return max((marco[1] for marco in estado[0][1]), default=0)
+
+
+def _linea_maxima_diagnosticos(diagnosticos):
+    """Mayor número de línea de (errores, advertencias)"""
+    return max((diagnostico.linea for lista in diagnosticos for diagnostico in lista), default=0)
+
+
+def _prefijo_comun(a, b):
+    """
+    Cantidad de elementos iguales al principio de dos listas
+
+    Compara tramos cada vez más largos y después busca el primer elemento
+    distinto por bisección: las comparaciones las hace la lista, no un
+    bucle de Python por elemento.
+    """
+    limite = min(len(a), len(b))
+    largo = 1
+    while largo < limite and a[:largo] == b[:largo]:
+        largo *= 2
+    bajo, alto = largo // 2, min(largo, limite)
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[bajo:medio] == b[bajo:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+
+class AnalizadorIncremental:
+    """
+    Re-análisis incremental del código del editor
+
+    Guarda por línea los tokens, los errores léxicos y los diagnósticos
+    gramaticales, y cada cierto número de líneas un checkpoint del estado del
+    análisis (pila/estado del PDA y tablas de variables y funciones) en el límite
+    de esa línea. Tras una edición solo se re-tokenizan las líneas editadas; el
+    PDA y las reglas semánticas se retoman desde el checkpoint más cercano por
+    encima del cambio y se detienen en cuanto el estado vuelve a coincidir con
+    el de la ejecución anterior, reutilizando el resto de los resultados.
+
+    Una edición que cambia el estado hasta el final del código (p. ej. una
+    declaración global o un bloque sin cerrar) obliga a re-analizar todas las
+    líneas siguientes. Con un `limite` de tiempo, aplicar_edicion se detiene
+    al agotarlo y guarda el estado en esa línea como re-análisis pendiente:
+    las líneas siguientes conservan los resultados anteriores hasta que
+    continuar() las alcanza. Las ediciones siguientes se pueden aplicar antes
+    de terminar; el análisis se retoma desde el primer pendiente.
+
+    Lo que cuesta una edición no depende del largo del código:
+        - Los checkpoints y los diagnósticos del PDA guardan números de línea
+          de otras líneas (la que abrió una estructura). Al agregar o quitar
+          líneas no se reescriben: cada uno recuerda cuántas ediciones había
+          al guardarse y se pone al día recién cuando se lo usa (ver _al_dia).
+        - Los diagnósticos guardados se cuentan por código en bloques de
+          unas LINEAS_BLOQUE líneas consecutivas (ver _bloques), y en total.
+          Al armar los resultados, un bloque sin diagnósticos se saltea, uno
+          cuyos diagnósticos ya no entran en los límites solo suma sus
+          conteos, y una vez que no entra ninguno más el resto se descarta
+          de una vez a partir de los totales.
+    """
+
+    def __init__(self, analizador_lexico, analizador_gramatical, intervalo_checkpoint=32):
+        """
+        Args:
+            analizador_lexico: Instancia de AnalizadorLexico
+            analizador_gramatical: Instancia de AnalizadorGramatical
+            intervalo_checkpoint (int): Cada cuántas líneas se guarda un checkpoint
+        """
+        self.lexico = analizador_lexico
+        self.gramatical = analizador_gramatical
+        self.intervalo_checkpoint = intervalo_checkpoint
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todos los resultados guardados"""
+        self.lineas = []              # Texto de cada línea
+        self.tokens = []              # LineaTokens de cada línea (None si no aporta tokens)
+        self.errores_lexicos = []     # Errores léxicos por línea (renumerados al armar los resultados)
+        self.semanticos = []          # (errores, advertencias) semánticos por línea (ídem)
+        self.diagnosticos_pda = []    # (errores, advertencias, versión) del PDA por línea
+        self.checkpoints = []         # (estado antes de cada línea, versión), o None si no hay checkpoint
+        self.estado_final = None      # Estado después de la última línea (None hasta llegar al final)
+        self.pendientes = {}          # Línea desde la que falta re-analizar -> (estado antes de ella,
+                                      # índice hasta el que no se puede reutilizar lo anterior)
+        self.tokens_dict = {}
+        self._ediciones = []          # (inicio, fin, desplazamiento) de cada edición que movió líneas;
+                                      # la versión de lo guardado es cuántas había (ver _al_dia)
+        self._bloques = []            # [líneas, conteo léxico, conteo gramatical] de cada bloque de
+                                      # líneas consecutivas; conteos {código: cantidad} o None a recontar
+        self._totales = ({}, {})      # Suma de los conteos (léxico, gramatical) de los bloques contados
+        self.lineas_reanalizadas = 0  # Líneas re-procesadas por el PDA en la última edición
+        self.tabla = self.lexico.tabla  # Tablas de tokens con las que se clasificaron las líneas
+
+    def analizar(self, codigo, cancelado=None, instrumentacion=None, region=None):
+        """
+        Analiza el código reutilizando los resultados de la ejecución anterior
+
+        Sin `region`, la región editada se busca comparando las líneas con
+        las anteriores. Quien ya la conoce (p. ej. un editor que acumula los
+        rangos cambiados, como ServidorLSP.Documento) la puede indicar.
+
+        Args:
+            codigo (str): Código fuente completo
+            cancelado (threading.Event): Si se activa, el análisis se interrumpe
+                y los resultados guardados se descartan
+            instrumentacion (Instrumentacion): Si se indica, mide fases y reglas
+                (solo de las líneas re-analizadas); las mediciones quedan en
+                resultado_gramatical['estadisticas']
+            region (tuple): (inicio, fin) índices de las líneas del código
+                anterior que pueden haber cambiado: las anteriores a `inicio` y
+                las posteriores a `fin` (exclusivo) son las mismas en `codigo`
+
+        Returns:
+            tuple: (resultado_lexico, resultado_gramatical) con el mismo formato
+            que Analisis.analizar_codigo
+
+        Raises:
+            AnalisisCancelado: Si `cancelado` se activó durante el análisis
+        """
+        with instrumentar(instrumentacion, self.lexico, self.gramatical):
+            resultado_lexico, resultado_gramatical = self._analizar(codigo, cancelado, region)
+        if instrumentacion is not None:
+            resultado_gramatical['estadisticas'] = instrumentacion.como_dict()
+        return resultado_lexico, resultado_gramatical
+
+    def _analizar(self, codigo, cancelado, region):
+        """Cuerpo de analizar (ver allí los argumentos)"""
+        # Si Tokens.json cambió, las líneas guardadas se clasificaron con la
+        # tabla anterior: se re-analiza todo
+        self.lexico.actualizar_tabla()
+        self.gramatical.actualizar_tabla()
+        if self.lexico.tabla is not self.tabla:
+            self.reiniciar()
+
+        nuevas = codigo.split('\n')
+        anteriores = self.lineas
+
+        if region is not None and self.checkpoints:
+            inicio, fin = region
+            sufijo = len(anteriores) - fin
+            return self.aplicar_edicion(inicio, fin, nuevas[inicio:len(nuevas) - sufijo], cancelado)
+
+        if self.checkpoints and nuevas == anteriores:
+            self.lineas_reanalizadas = 0
+            if self.pendientes:
+                self.continuar(cancelado)
+            return self._resultados()
+
+        # Prefijo y sufijo comunes delimitan la región editada
+        limite = min(len(nuevas), len(anteriores))
+        inicio = _prefijo_comun(nuevas, anteriores)
+        sufijo = min(_prefijo_comun(nuevas[::-1], anteriores[::-1]), limite - inicio)
+
+        return self.aplicar_edicion(inicio, len(anteriores) - sufijo,
+                                    nuevas[inicio:len(nuevas) - sufijo], cancelado)
+
+    def aplicar_edicion(self, inicio, fin, nuevas, cancelado=None, limite=None):
+        """
+        Reemplaza las líneas [inicio, fin) por `nuevas` y actualiza el análisis
+
+        Args:
+            inicio (int): Índice (desde 0) de la primera línea reemplazada
+            fin (int): Índice (exclusivo) de la última línea reemplazada
+            nuevas (list): Texto de las líneas nuevas
+            cancelado (threading.Event): Permite interrumpir el análisis
+            limite (float): Segundos como máximo de re-análisis; lo que falte
+                queda pendiente para continuar() (por defecto, sin límite)
+
+        Returns:
+            tuple: (resultado_lexico, resultado_gramatical); si quedó análisis
+            pendiente, las líneas que faltan conservan los resultados anteriores
+
+        Raises:
+            AnalisisCancelado: Si `cancelado` se activó durante el análisis
+        """
+        try:
+            return self._aplicar_edicion(inicio, fin, nuevas, cancelado, limite)
+        except AnalisisCancelado:
+            # Una edición a medio aplicar deja los resultados guardados inconsistentes
+            self.reiniciar()
+            raise
+
+    def continuar(self, cancelado=None, limite=None):
+        """
+        Retoma el re-análisis pendiente de ediciones anteriores
+
+        Args:
+            cancelado (threading.Event): Permite interrumpir el análisis
+            limite (float): Segundos como máximo (por defecto, hasta terminar)
+
+        Returns:
+            bool: True si ya no queda análisis pendiente (ver completo)
+
+        Raises:
+            AnalisisCancelado: Si `cancelado` se activó durante el análisis
+        """
+        try:
+            if limite is None:
+                self._completar(cancelado)
+            elif self.pendientes:
+                frontera = min(self.pendientes)
+                self._reanalizar(frontera, frontera, cancelado, time.perf_counter() + limite)
+        except AnalisisCancelado:
+            self.reiniciar()
+            raise
+        return self.completo
+
+    @property
+    def completo(self):
+        """True si los resultados guardados corresponden a todo el código actual"""
+        return not self.pendientes
+
+    def resultados(self):
+        """
+        Resultados completos armados a partir de lo guardado por línea
+
+        Returns:
+            tuple: (resultado_lexico, resultado_gramatical), como aplicar_edicion
+        """
+        return self._resultados()
+
+    def _completar(self, cancelado):
+        """Re-analiza desde cada pendiente hasta que no quede ninguno"""
+        while self.pendientes:
+            frontera = min(self.pendientes)
+            self._reanalizar(frontera, frontera, cancelado)
+
+    def _aplicar_edicion(self, inicio, fin, nuevas, cancelado, limite):
+        """Cuerpo de aplicar_edicion (ver allí los argumentos)"""
+        primer_analisis = not self.checkpoints
+        if primer_analisis:
+            # Estado inicial como checkpoint de la línea 0
+            self.gramatical.reiniciar()
+            self.checkpoints = [(self.gramatical.capturar_estado(), 0)]
+            self._bloques = [[1, None, None]]
+            self.lineas = [""]
+            self.tokens = [None]
+            self.errores_lexicos = [None]
+            self.semanticos = [None]
+            self.diagnosticos_pda = [None]
+            inicio, fin = 0, 1
+
+        # Un código vacío sigue teniendo una línea
+        if not nuevas and inicio == 0 and fin == len(self.lineas):
+            nuevas = [""]
+
+        desplazamiento = len(nuevas) - (fin - inicio)
+        self.lexico.tokens_dict = self.tokens_dict
+
+        # Análisis léxico: solo las líneas editadas
+        for linea in self.tokens[inicio:fin]:
+            if linea is not None:
+                self.lexico.descontar_linea(linea)
+
+        tokens_nuevos = [None] * len(nuevas)
+        errores_nuevos = [None] * len(nuevas)
+        for linea in self.lexico.generar_lineas(nuevas, primera_linea=inicio + 1):
+            if cancelado is not None and cancelado.is_set():
+                raise AnalisisCancelado()
+            indice = linea.numero - 1 - inicio
+            tokens_nuevos[indice] = linea
+            errores_nuevos[indice] = self.lexico.registrar_linea(linea) or None
+
+        # El estado antes de `inicio` solo depende de las líneas anteriores
+        if inicio < len(self.checkpoints):
+            checkpoint_inicio = self.checkpoints[inicio]
+        elif self.estado_final is not None:
+            checkpoint_inicio = (self.estado_final, len(self._ediciones))
+        else:
+            checkpoint_inicio = None
+
+        fin_editado = inicio + len(nuevas)
+        if self.pendientes:
+            fin_editado = self._mover_pendientes(inicio, fin, len(nuevas))
+        # Con un pendiente antes de `inicio`, el checkpoint de `inicio` es de una ejecución anterior
+        vigente = not self.pendientes or min(self.pendientes) > inicio
+
+        vacias = [None] * len(nuevas)
+        self.lineas[inicio:fin] = nuevas
+        self.tokens[inicio:fin] = tokens_nuevos
+        self.errores_lexicos[inicio:fin] = errores_nuevos
+        self.semanticos[inicio:fin] = vacias
+        self.diagnosticos_pda[inicio:fin] = vacias
+        self.checkpoints[inicio:fin] = vacias
+        if inicio < len(self.checkpoints) and vigente:
+            self.checkpoints[inicio] = checkpoint_inicio
+        self._reemplazar_bloques(inicio, fin, len(nuevas))
+
+        if desplazamiento and not primer_analisis:
+            # Lo guardado después de la edición se renumera recién al usarlo (ver _al_dia)
+            self._ediciones.append((inicio, fin, desplazamiento))
+            if self.estado_final is not None:
+                self.estado_final = self._desplazar_estado(self.estado_final,
+                                                           _mapeo_lineas(inicio, fin, desplazamiento))
+            if len(self._ediciones) >= MAXIMO_EDICIONES:
+                self._compactar()
+
+        if limite is None:
+            self._reanalizar(inicio, fin_editado, cancelado)
+            self._completar(cancelado)
+        else:
+            self._reanalizar(inicio, fin_editado, cancelado, time.perf_counter() + limite)
+        return self._resultados()
+
+    def _mover_pendientes(self, inicio, fin, cantidad):
+        """
+        Ajusta los re-análisis pendientes al reemplazo de [inicio, fin) por `cantidad` líneas
+
+        Los pendientes dentro de la región reemplazada, o justo después de
+        ella (su estado depende de las líneas reemplazadas), se descartan; lo
+        que les faltaba re-analizar pasa a la edición. También se descartan
+        los que quedan en el final del código (p. ej. al borrar las líneas
+        desde un pendiente hasta el final): la edición re-analiza hasta el final.
+
+        Returns:
+            int: Índice hasta el que la edición no puede reutilizar resultados anteriores
+        """
+        fin_nuevo = inicio + cantidad
+        desplazamiento = fin_nuevo - fin
+        total = len(self.lineas) + desplazamiento
+        mapeo = _mapeo_lineas(inicio, fin, desplazamiento)
+
+        def mover(indice):
+            if indice <= inicio:
+                return indice
+            if indice >= fin:
+                return indice + desplazamiento
+            return fin_nuevo
+
+        fin_editado = fin_nuevo
+        pendientes = {}
+        for indice, (estado, hasta) in self.pendientes.items():
+            if inicio < indice <= fin:
+                fin_editado = max(fin_editado, mover(hasta))
+                continue
+            if mover(indice) >= total:
+                # Sin líneas desde el pendiente: falta el estado final
+                fin_editado = total
+                continue
+            if desplazamiento:
+                estado = self._desplazar_estado(estado, mapeo)
+            pendientes[mover(indice)] = (estado, mover(hasta))
+        self.pendientes = pendientes
+        return fin_editado
+
+    def _al_dia(self, version, valor, desplazar, linea_maxima):
+        """
+        Lleva los números de línea de algo guardado a la numeración actual
+
+        Aplica, en orden, el mapeo de cada edición que movió líneas después de
+        guardarlo. Las líneas anteriores a una edición no cambian, así que se
+        saltean las ediciones posteriores a la mayor línea referenciada; las
+        de la región editada ya no existen y se mapean a 0 para que ningún
+        checkpoint que las referencie vuelva a coincidir.
+
+        Args:
+            version (int): Ediciones que había al guardarlo (len(self._ediciones))
+            valor: Estado capturado o (errores, advertencias)
+            desplazar (callable): desplazar(valor, mapeo) -> copia remapeada
+            linea_maxima (callable): linea_maxima(valor) -> mayor línea referenciada
+
+        Returns:
+            Copia de `valor` con los números de línea actuales
+        """
+        maxima = linea_maxima(valor)
+        for inicio, fin, desplazamiento in self._ediciones[version:]:
+            if inicio < maxima:
+                valor = desplazar(valor, _mapeo_lineas(inicio, fin, desplazamiento))
+                maxima = linea_maxima(valor)
+        return valor
+
+    def _checkpoint(self, indice):
+        """Estado del checkpoint de una línea con los números de línea actuales, o None"""
+        guardado = self.checkpoints[indice]
+        if guardado is None:
+            return None
+        estado, version = guardado
+        if version != len(self._ediciones):
+            estado = self._al_dia(version, estado, self._desplazar_estado, _linea_maxima_estado)
+            self.checkpoints[indice] = (estado, len(self._ediciones))
+        return estado
+
+    def _diagnosticos_pda(self, indice):
+        """(errores, advertencias) del PDA guardados en una línea, con los números de línea actuales"""
+        errores, advertencias, version = self.diagnosticos_pda[indice]
+        if version != len(self._ediciones):
+            # Las advertencias del PDA pueden referirse a la línea que abrió la estructura
+            errores, advertencias = self._al_dia(version, (errores, advertencias), _renumerar,
+                                                 _linea_maxima_diagnosticos)
+            self.diagnosticos_pda[indice] = (errores, advertencias, len(self._ediciones))
+        return errores, advertencias
+
+    def _compactar(self):
+        """
+        Pone al día todos los checkpoints y diagnósticos del PDA y vacía _ediciones
+
+        Cuesta lo que recorrer todo el código, pero solo ocurre cada
+        MAXIMO_EDICIONES ediciones: acota lo que _al_dia recorre para poner
+        al día algo guardado hace mucho.
+        """
+        for indice, guardado in enumerate(self.checkpoints):
+            if guardado is not None:
+                self.checkpoints[indice] = (self._checkpoint(indice), 0)
+        for indice, guardados in enumerate(self.diagnosticos_pda):
+            if guardados is not None:
+                self.diagnosticos_pda[indice] = self._diagnosticos_pda(indice) + (0,)
+        self._ediciones = []
+
+    def _desplazar_estado(self, estado, mapeo):
+        """Copia de un estado capturado con las líneas de la pila remapeadas"""
+        pda = self.gramatical.pda
+        return (pda.desplazar_estado(estado[0], mapeo), estado[1], estado[2])
+
+    def _reanalizar(self, inicio, fin_editado, cancelado=None, vencimiento=None):
+        """
+        Re-ejecuta el PDA y las reglas semánticas desde el checkpoint más cercano
+
+        Si hay un re-análisis pendiente antes de `inicio`, los checkpoints
+        posteriores a él son de una ejecución anterior: se retoma desde el
+        primer pendiente.
+
+        Args:
+            inicio (int): Primera línea editada
+            fin_editado (int): Índice siguiente a la última línea nueva
+            cancelado (threading.Event): Permite interrumpir el análisis
+            vencimiento (float): Instante (time.perf_counter) a partir del cual
+                se deja el resto pendiente
+        """
+        gramatical = self.gramatical
+        pda = gramatical.pda
+        pendientes = self.pendientes
+
+        total = len(self.lineas)
+        version = len(self._ediciones)
+
+        # Si se borraron las últimas líneas basta con llegar al final del código
+        desde = min(inicio, total - 1)
+        if pendientes and min(pendientes) <= desde:
+            desde = min(pendientes)
+            estado, hasta = pendientes.pop(desde)
+            fin_editado = max(fin_editado, hasta)
+            self.checkpoints[desde] = (estado, version) if desde % self.intervalo_checkpoint == 0 else None
+        else:
+            while self.checkpoints[desde] is None:
+                desde -= 1
+            estado = self._checkpoint(desde)
+        gramatical.restaurar_estado(estado)
+
+        indice = desde
+        while indice < total:
+            if cancelado is not None and cancelado.is_set():
+                raise AnalisisCancelado()
+
+            if indice != desde:
+                if pendientes:
+                    # Al pasar por un pendiente, lo que le faltaba queda a cargo de este re-análisis
+                    pendiente = pendientes.pop(indice, None)
+                    if pendiente is not None:
+                        fin_editado = max(fin_editado, pendiente[1])
+                if vencimiento is not None and time.perf_counter() >= vencimiento:
+                    # El resto queda pendiente desde esta línea
+                    pendientes[indice] = (gramatical.capturar_estado(), fin_editado)
+                    break
+
+                # Fuera de la región editada, si el estado coincide con el de la
+                # ejecución anterior el resto de los resultados sigue siendo válido
+                if (indice >= fin_editado and self.checkpoints[indice] is not None
+                        and gramatical.estado_igual(self._checkpoint(indice))):
+                    break
+
+                if indice % self.intervalo_checkpoint == 0:
+                    self.checkpoints[indice] = (gramatical.capturar_estado(), version)
+                else:
+                    self.checkpoints[indice] = None
+
+            linea = self.tokens[indice]
+            if linea is None:
+                self.semanticos[indice] = None
+                self.diagnosticos_pda[indice] = None
+            else:
+                linea.numero = indice + 1
+                validacion = gramatical.validar_linea(linea)
+                # La línea queda guardada hasta la próxima edición: solo sus columnas compactas
+                linea.compactar()
+                if validacion["errores"] or validacion["advertencias"]:
+                    guardados = self.semanticos[indice]
+                    if not (guardados is not None and _mismos(validacion["errores"], guardados[0])
+                            and _mismos(validacion["advertencias"], guardados[1])):
+                        self.semanticos[indice] = (validacion["errores"], validacion["advertencias"])
+                else:
+                    self.semanticos[indice] = None
+                if pda.errores or pda.advertencias:
+                    resultados = pda.extraer_resultados()
+                    self.diagnosticos_pda[indice] = (resultados['errores'], resultados['advertencias'], version)
+                else:
+                    self.diagnosticos_pda[indice] = None
+            indice += 1
+        else:
+            self.estado_final = gramatical.capturar_estado()
+
+        self.lineas_reanalizadas = indice - desde
+        self._invalidar_bloques(desde, indice)
+
+    def _reemplazar_bloques(self, inicio, fin, cantidad):
+        """
+        Ajusta los bloques al reemplazo de las líneas [inicio, fin) por `cantidad` líneas
+
+        Los bloques que tocan la región editada se reemplazan por bloques
+        nuevos, sin contar, de hasta LINEAS_BLOQUE líneas; los demás no
+        cambian. Un reemplazo de menos de LINEAS_BLOQUE // 2 líneas incluye
+        a un bloque vecino, para que los bloques no queden cada vez más chicos.
+        """
+        bloques = self._bloques
+        primero = None
+        base = 0
+        for posicion, bloque in enumerate(bloques):
+            final = base + bloque[0]
+            if primero is None and inicio < final:
+                primero, desde = posicion, base
+            if primero is not None and fin <= final:
+                ultimo, hasta = posicion, final
+                break
+            base = final
+        else:
+            # La edición llega al final del código (o agrega líneas después de la última)
+            if primero is None:
+                primero, desde = len(bloques) - 1, base - bloques[-1][0]
+            ultimo, hasta = len(bloques) - 1, base
+
+        lineas = hasta - desde + cantidad - (fin - inicio)
+        while lineas < LINEAS_BLOQUE // 2 and (primero > 0 or ultimo < len(bloques) - 1):
+            if ultimo < len(bloques) - 1:
+                ultimo += 1
+                lineas += bloques[ultimo][0]
+            else:
+                primero -= 1
+                lineas += bloques[primero][0]
+
+        for bloque in bloques[primero:ultimo + 1]:
+            self._descontar_bloque(bloque)
+        partes = max(1, -(-lineas // LINEAS_BLOQUE))
+        bloques[primero:ultimo + 1] = [[lineas // partes + (parte < lineas % partes), None, None]
+                                       for parte in range(partes)]
+
+    def _invalidar_bloques(self, desde, hasta):
+        """Marca para recontar los bloques con líneas en [desde, hasta)"""
+        base = 0
+        for bloque in self._bloques:
+            if base >= hasta:
+                break
+            base += bloque[0]
+            if base > desde:
+                self._descontar_bloque(bloque)
+
+    def _descontar_bloque(self, bloque):
+        """Resta de los totales los conteos de un bloque y lo marca para recontar"""
+        if bloque[1] is not None:
+            _sumar_conteo(self._totales[0], bloque[1], -1)
+            _sumar_conteo(self._totales[1], bloque[2], -1)
+            bloque[1] = bloque[2] = None
+
+    def _contar_bloque(self, bloque, base):
+        """Cuenta por código los diagnósticos guardados en las líneas de un bloque"""
+        lexicos, gramaticales = {}, {}
+        for indice in range(base, base + bloque[0]):
+            for diagnostico in self.errores_lexicos[indice] or ():
+                lexicos[diagnostico.codigo] = lexicos.get(diagnostico.codigo, 0) + 1
+            for guardados in (self.semanticos[indice], self.diagnosticos_pda[indice]):
+                if guardados is not None:
+                    for diagnostico in guardados[0] + guardados[1]:
+                        gramaticales[diagnostico.codigo] = gramaticales.get(diagnostico.codigo, 0) + 1
+        bloque[1] = lexicos
+        bloque[2] = gramaticales
+        _sumar_conteo(self._totales[0], lexicos, 1)
+        _sumar_conteo(self._totales[1], gramaticales, 1)
+
+    def _resultados(self):
+        """
+        Arma los resultados completos a partir de lo guardado por línea
+
+        Por línea se guardan todos los diagnósticos; los límites de cada
+        analizador se aplican aquí, en el mismo orden que en Analisis.analizar_codigo.
+        Si el primer análisis todavía no llegó al final del código, faltan
+        las estructuras que quedan abiertas al final.
+
+        Los bloques sin diagnósticos se saltean. Si ningún código de un
+        bloque entra ya en los límites, sus diagnósticos se cuentan como
+        descartados de una vez, sin recorrer sus líneas. Las variables y
+        funciones son vistas de solo lectura de las tablas (ver VistaSimbolos).
+        """
+        gramatical = self.gramatical
+        if self.estado_final is not None:
+            gramatical.restaurar_estado(self.estado_final)
+            gramatical.pda.validar_final()
+            finales = gramatical.pda.extraer_resultados()
+        else:
+            finales = {'errores': [], 'advertencias': []}
+
+        limites_lexicos = self.lexico.limites
+        limites = gramatical.limites
+        limites_lexicos.reiniciar()
+        limites.reiniciar()
+        admitir_lexico = limites_lexicos.admitir
+        admitir = limites.admitir
+
+        errores_lexicos = []
+        errores, advertencias = [], []
+        errores_pda, advertencias_pda = [], []
+        def admitidos(guardados, indice, admitir):
+            """Diagnósticos admitidos de una línea, renumerados (y guardados así) si la línea se movió"""
+            numero = indice + 1
+            if guardados[0].linea != numero:
+                guardados[:] = [diagnostico.con_linea(numero) for diagnostico in guardados]
+            return filter(admitir, guardados)
+
+        base = 0
+        for bloque in self._bloques:
+            if bloque[1] is None:
+                self._contar_bloque(bloque, base)
+            base += bloque[0]
+
+        # Diagnósticos de los bloques ya recorridos, para descontarlos de los totales
+        totales_lexicos, totales_gramaticales = self._totales
+        recorridos_lexicos, recorridos_gramaticales = {}, {}
+        base = 0
+        for bloque in self._bloques:
+            lexicos_bloque, gramaticales_bloque = bloque[1], bloque[2]
+            if not (lexicos_bloque or gramaticales_bloque):
+                base += bloque[0]
+                continue
+            if (not any(map(limites_lexicos.admitiria, totales_lexicos))
+                    and not any(map(limites.admitiria, totales_gramaticales))):
+                # Ya no entra ningún diagnóstico: el resto se descarta de una vez
+                for totales, recorridos, limites_tipo in (
+                        (totales_lexicos, recorridos_lexicos, limites_lexicos),
+                        (totales_gramaticales, recorridos_gramaticales, limites)):
+                    for codigo, cantidad in totales.items():
+                        resto = cantidad - recorridos.get(codigo, 0)
+                        if resto:
+                            limites_tipo.descartar(codigo, resto)
+                break
+            if (not any(map(limites_lexicos.admitiria, lexicos_bloque))
+                    and not any(map(limites.admitiria, gramaticales_bloque))):
+                for codigo, cantidad in lexicos_bloque.items():
+                    limites_lexicos.descartar(codigo, cantidad)
+                for codigo, cantidad in gramaticales_bloque.items():
+                    limites.descartar(codigo, cantidad)
+            else:
+                for indice in range(base, base + bloque[0]):
+                    lexicos = self.errores_lexicos[indice]
+                    if lexicos:
+                        errores_lexicos.extend(admitidos(lexicos, indice, admitir_lexico))
+                    semanticos = self.semanticos[indice]
+                    if semanticos is not None:
+                        if semanticos[0]:
+                            errores.extend(admitidos(semanticos[0], indice, admitir))
+                        if semanticos[1]:
+                            advertencias.extend(admitidos(semanticos[1], indice, admitir))
+                    if self.diagnosticos_pda[indice] is not None:
+                        pda = self._diagnosticos_pda(indice)
+                        errores_pda.extend(filter(admitir, pda[0]))
+                        advertencias_pda.extend(filter(admitir, pda[1]))
+            _sumar_conteo(recorridos_lexicos, lexicos_bloque, 1)
+            _sumar_conteo(recorridos_gramaticales, gramaticales_bloque, 1)
+            base += bloque[0]
+        errores += errores_pda
+        errores.extend(filter(admitir, finales['errores']))
+        advertencias += advertencias_pda
+        advertencias.extend(filter(admitir, finales['advertencias']))
+
+        self.lexico.tokens_dict = self.tokens_dict
+        self.lexico.errores_lexicos = errores_lexicos
+
+        resultado_lexico = self.lexico.obtener_resultados()
+        resultado_gramatical = {
+            'errores': errores,
+            'advertencias': advertencias,
+            'errores_descartados': limites.descartados('error'),
+            'advertencias_descartadas': limites.descartados('advertencia'),
+            'variables': gramatical.variables.vista(),
+            'funciones': gramatical.funciones.vista().keys()
+        }
+        return resultado_lexico, resultado_gramatical
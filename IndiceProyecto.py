@@ -0,0 +1,504 @@
+"""
+Comprobación de proyectos con un índice persistente de análisis (SQLite)
+
+El índice guarda, por contenido (hash SHA-256 de los bytes del archivo), el
+resultado léxico (tabla de tokens y errores), el gramatical y el resumen de
+variables y funciones de cada análisis, y por ruta el hash, el mtime y el
+tamaño con los que se vio el archivo por última vez. Los diagnósticos se
+guardan compactos (Diagnostico.como_lista) y el texto se arma al
+escribirlos. Al volver a comprobar un árbol de programas solo se analizan
+los archivos cuyo contenido no está en el índice:
+
+    - mismo mtime y tamaño que la última vez: se reutiliza sin leerlo
+    - mtime o tamaño distintos: se lee y se calcula el hash; si ese contenido
+      ya se analizó (p. ej. un archivo copiado o revertido) se reutiliza
+    - contenido nuevo: se analiza en el pool de AnalizadorLote
+
+Los resultados dependen también de Tokens.json, de los límites de
+diagnósticos y del código de los analizadores; si cambia alguno (ver
+huella_configuracion) el índice se vacía.
+
+Con --vigilar se comprueba el árbol cada tantos segundos y solo se escriben
+los resultados de los archivos que cambiaron o se eliminaron.
+
+Uso:
+    python IndiceProyecto.py programas/ --indice .analisis.sqlite
+    python IndiceProyecto.py programas/ --vigilar 1
+
+La salida es NDJSON con el formato de AnalizadorLote más el campo 'cambio'
+('sin_cambios', 'reutilizado', 'analizado' o 'eliminado'); el código de
+salida también es el de AnalizadorLote.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from Analisis import analizar_bytes
+from AnalizadorLote import (RUTA_TOKENS, analizadores_del_proceso, analizar_lote, buscar_archivos,
+                            descartar_salida_estandar)
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RUTA_INDICE = ".analisis.sqlite"
+
+# Módulos cuyo código determina el resultado del análisis
+MODULOS_ANALISIS = ("Analisis.py", "AnalisisLexico.py", "AnalizadorGramatical.py", "Diagnosticos.py",
+                    "PDA.py", "TablaSimbolos.py", "TablasTokens.py")
+
+# Un mtime más reciente que esto puede no reflejar una escritura en curso
+# en el mismo instante: no se guarda, y la próxima vez se compara el hash
+MARGEN_MTIME_NS = 2 * 10**9
+# Hashes por consulta al leer resultados (límite de parámetros de SQLite)
+HASHES_POR_CONSULTA = 500
+
+
+def huella_configuracion(ruta_tokens=RUTA_TOKENS, maximo_diagnosticos=None, maximo_por_regla=None):
+    """
+    Hash de todo lo que, además del contenido, determina el resultado de un análisis
+
+    Args:
+        ruta_tokens (str): Ruta de Tokens.json
+        maximo_diagnosticos (int): Diagnósticos guardados por archivo como máximo
+        maximo_por_regla (int): Diagnósticos guardados por archivo y por regla como máximo
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    huella = hashlib.sha256(json.dumps([maximo_diagnosticos, maximo_por_regla]).encode("utf-8"))
+    for ruta in (ruta_tokens,) + tuple(os.path.join(DIRECTORIO, modulo) for modulo in MODULOS_ANALISIS):
+        with open(ruta, "rb") as archivo:
+            huella.update(archivo.read())
+    return huella.hexdigest()
+
+
+class IndiceAnalisis:
+    """
+    Índice en disco (SQLite) de resultados de análisis por contenido
+
+    Tablas:
+        resultados: hash -> tokens, lexico, gramatical, resumen (JSON, ver
+            analizar_para_indice), salida (el resultado ya serializado en el
+            formato de AnalizadorLote) y con_errores
+        archivos: ruta absoluta -> hash, mtime_ns, tamano
+        configuracion: 'huella' -> huella_configuracion() de los resultados guardados
+
+    Las modificaciones quedan en una transacción hasta confirmar().
+    """
+
+    def __init__(self, ruta, huella):
+        """
+        Args:
+            ruta (str): Archivo SQLite (se crea si no existe)
+            huella (str): Huella de la configuración actual; si no es la guardada,
+                el índice se vacía
+        """
+        self.conexion = sqlite3.connect(ruta)
+        with self.conexion:
+            self.conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS configuracion (
+                    clave TEXT PRIMARY KEY,
+                    valor TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS resultados (
+                    hash TEXT PRIMARY KEY,
+                    tokens TEXT NOT NULL,
+                    lexico TEXT NOT NULL,
+                    gramatical TEXT NOT NULL,
+                    resumen TEXT NOT NULL,
+                    salida TEXT NOT NULL,
+                    con_errores INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS archivos (
+                    ruta TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    tamano INTEGER NOT NULL
+                );
+            """)
+            fila = self.conexion.execute("SELECT valor FROM configuracion WHERE clave = 'huella'").fetchone()
+            if fila is None or fila[0] != huella:
+                self.conexion.execute("DELETE FROM archivos")
+                self.conexion.execute("DELETE FROM resultados")
+                self.conexion.execute("INSERT OR REPLACE INTO configuracion VALUES ('huella', ?)", (huella,))
+
+    def archivos(self):
+        """
+        Archivos vistos en la última comprobación
+
+        Returns:
+            dict: {ruta absoluta: (hash, mtime_ns, tamano)}
+        """
+        return {ruta: (hash_contenido, mtime_ns, tamano) for ruta, hash_contenido, mtime_ns, tamano
+                in self.conexion.execute("SELECT ruta, hash, mtime_ns, tamano FROM archivos")}
+
+    def tiene(self, hash_contenido):
+        """True si el resultado de ese contenido está en el índice"""
+        return self.conexion.execute("SELECT 1 FROM resultados WHERE hash = ?",
+                                     (hash_contenido,)).fetchone() is not None
+
+    def salidas(self, hashes):
+        """
+        Resultados ya serializados de varios contenidos
+
+        Args:
+            hashes (iterable): Hashes de los contenidos
+
+        Returns:
+            dict: {hash: (salida, con_errores)} de los que están en el índice
+        """
+        hashes = list(set(hashes))
+        leidas = {}
+        for inicio in range(0, len(hashes), HASHES_POR_CONSULTA):
+            parte = hashes[inicio:inicio + HASHES_POR_CONSULTA]
+            consulta = ("SELECT hash, salida, con_errores FROM resultados WHERE hash IN (%s)"
+                        % ",".join("?" * len(parte)))
+            for hash_contenido, salida, con_errores in self.conexion.execute(consulta, parte):
+                leidas[hash_contenido] = (salida, bool(con_errores))
+        return leidas
+
+    def guardar_resultado(self, resultado):
+        """
+        Guarda el resultado de un contenido (si ya estaba, se conserva)
+
+        Args:
+            resultado (dict): Resultado de analizar_para_indice
+        """
+        columnas = [json.dumps(resultado[clave], ensure_ascii=False)
+                    for clave in ('tokens', 'lexico', 'gramatical', 'resumen')]
+        self.conexion.execute("INSERT OR IGNORE INTO resultados VALUES (?, ?, ?, ?, ?, ?, ?)",
+                              (resultado['hash'], *columnas, resultado['salida'], resultado['con_errores']))
+
+    def guardar_archivo(self, ruta, hash_contenido, mtime_ns, tamano):
+        """Registra con qué contenido, mtime y tamaño se vio un archivo"""
+        self.conexion.execute("INSERT OR REPLACE INTO archivos VALUES (?, ?, ?, ?)",
+                              (ruta, hash_contenido, mtime_ns, tamano))
+
+    def olvidar(self, rutas):
+        """Quita archivos del índice"""
+        self.conexion.executemany("DELETE FROM archivos WHERE ruta = ?", ((ruta,) for ruta in rutas))
+
+    def limpiar(self):
+        """Borra los resultados de contenidos que ya no tiene ningún archivo"""
+        self.conexion.execute("DELETE FROM resultados WHERE hash NOT IN (SELECT hash FROM archivos)")
+
+    def confirmar(self):
+        """Guarda en disco las modificaciones pendientes"""
+        self.conexion.commit()
+
+    def cerrar(self):
+        self.conexion.close()
+
+
+def analizar_para_indice(ruta):
+    """
+    Analiza un archivo con los analizadores del pool de AnalizadorLote
+
+    Se analizan exactamente los bytes de los que se calcula el hash, y el
+    mtime se toma antes de leerlos: si el archivo cambia mientras tanto, la
+    próxima comprobación lo vuelve a leer.
+
+    Args:
+        ruta (str): Ruta del archivo
+
+    Returns:
+        dict: {'archivo', 'hash', 'mtime_ns', 'tamano', 'tokens', 'lexico',
+        'gramatical', 'resumen', 'salida', 'con_errores'}, o {'archivo', 'fallo'}
+        si no se pudo leer. La tabla de tokens es {token: [tipo, cantidad]}, los
+        diagnósticos están como Diagnostico.como_lista() y 'salida' es el
+        resultado de AnalizadorLote.analizar_ruta (sin 'archivo') serializado a JSON
+    """
+    analizador_lexico, analizador_gramatical = analizadores_del_proceso()
+    por_tipo = {'error_lexico': [], 'error': [], 'advertencia': []}
+    try:
+        estado = os.stat(ruta)
+        with open(ruta, "rb") as archivo:
+            datos = archivo.read()
+        for diagnostico in analizar_bytes(datos, analizador_lexico, analizador_gramatical):
+            por_tipo[diagnostico.tipo].append(diagnostico)
+    except (OSError, UnicodeDecodeError) as e:
+        return {'archivo': ruta, 'fallo': str(e)}
+
+    limites = analizador_gramatical.limites
+    descartados = {
+        'errores_lexicos': limites.descartados('error_lexico'),
+        'errores': limites.descartados('error'),
+        'advertencias': limites.descartados('advertencia'),
+    }
+    resumen = {
+        'variables': analizador_gramatical.variables.visibles(),
+        'funciones': sorted(analizador_gramatical.funciones),
+        'tokens_unicos': len(analizador_lexico.tokens_dict),
+    }
+
+    # Mismo formato (y orden de las claves) que AnalizadorLote.analizar_ruta
+    salida = {tipo: [diagnostico.mensaje for diagnostico in por_tipo[clave]]
+              for tipo, clave in (('errores_lexicos', 'error_lexico'), ('errores', 'error'),
+                                  ('advertencias', 'advertencia'))}
+    if any(descartados.values()):
+        salida['descartados'] = descartados
+    salida.update(resumen)
+
+    def compactos(clave):
+        return [diagnostico.como_lista() for diagnostico in por_tipo[clave]]
+
+    return {
+        'archivo': ruta,
+        'hash': hashlib.sha256(datos).hexdigest(),
+        'mtime_ns': estado.st_mtime_ns,
+        'tamano': estado.st_size,
+        'tokens': {token: [fila["Tipo"], fila["Cantidad"]] for token, fila in analizador_lexico.tokens_dict.items()},
+        'lexico': {
+            'errores_lexicos': compactos('error_lexico'),
+            'errores_descartados': descartados['errores_lexicos'],
+        },
+        'gramatical': {
+            'errores': compactos('error'),
+            'advertencias': compactos('advertencia'),
+            'errores_descartados': descartados['errores'],
+            'advertencias_descartadas': descartados['advertencias'],
+        },
+        'resumen': resumen,
+        'salida': json.dumps(salida, ensure_ascii=False),
+        'con_errores': bool(por_tipo['error_lexico'] or por_tipo['error']
+                            or descartados['errores_lexicos'] or descartados['errores']),
+    }
+
+
+def linea_ndjson(ruta, cambio, salida):
+    """
+    Línea NDJSON de un archivo comprobado
+
+    Args:
+        ruta (str): Ruta del archivo
+        cambio (str): Cambio desde la comprobación anterior (ver comprobar_proyecto)
+        salida (str): Resultado serializado sin 'archivo' (ver comprobar_proyecto)
+
+    Returns:
+        str: {'archivo', 'cambio', ...resultado} en JSON, con el salto de línea
+    """
+    # La salida guardada ya es JSON: se completa sin volver a decodificarla
+    cabecera = json.dumps({'archivo': ruta, 'cambio': cambio}, ensure_ascii=False)
+    return f"{cabecera[:-1]}, {salida[1:]}\n"
+
+
+def _leer_hash(ruta):
+    """Hash del contenido actual de un archivo"""
+    with open(ruta, "rb") as archivo:
+        return hashlib.sha256(archivo.read()).hexdigest()
+
+
+def _mtime_guardado(mtime_ns):
+    """mtime a guardar en el índice (0 si es demasiado reciente, ver MARGEN_MTIME_NS)"""
+    return mtime_ns if time.time_ns() - mtime_ns > MARGEN_MTIME_NS else 0
+
+
+def comprobar_proyecto(rutas, indice, jobs=None, ruta_tokens=RUTA_TOKENS, maximo_diagnosticos=None,
+                       maximo_por_regla=None, solo_cambios=False):
+    """
+    Comprueba los archivos analizando solo los que cambiaron desde la última vez
+
+    Args:
+        rutas (list): Archivos a comprobar
+        indice (IndiceAnalisis): Índice del proyecto (creado con la misma configuración)
+        jobs (int): Procesos para analizar los archivos nuevos (por defecto, uno por núcleo)
+        ruta_tokens (str): Ruta de Tokens.json
+        maximo_diagnosticos (int): Diagnósticos guardados por archivo como máximo
+        maximo_por_regla (int): Diagnósticos guardados por archivo y por regla como máximo
+        solo_cambios (bool): Si solo se retornan los archivos cuyo contenido
+            cambió desde la última comprobación (y los eliminados)
+
+    Returns:
+        list: (ruta, cambio, salida, con_errores) de cada archivo, en el orden
+        de `rutas`, y al final los archivos del índice que ya no existen.
+        cambio es 'sin_cambios', 'reutilizado' (contenido ya indexado),
+        'analizado', 'fallo' o 'eliminado'; salida es el resultado con el
+        formato de AnalizadorLote.analizar_ruta, sin 'archivo', serializado a
+        JSON ({'fallo'} si no se pudo leer, {'eliminado'} si ya no existe).
+        Los eliminados se informan con rutas absolutas si todas las de
+        `rutas` lo son, y si no relativas al directorio actual
+    """
+    conocidos = indice.archivos()
+    hashes = {}       # ruta -> hash del contenido actual
+    cambios = {}      # ruta -> cambio
+    fallos = {}       # ruta -> mensaje
+    pendientes = []   # Rutas cuyo contenido no está en el índice
+    vistas = set()
+
+    for ruta in rutas:
+        clave = os.path.abspath(ruta)
+        vistas.add(clave)
+        conocido = conocidos.get(clave)
+        try:
+            estado = os.stat(ruta)
+            if conocido is not None and conocido[1] and conocido[1:] == (estado.st_mtime_ns, estado.st_size):
+                hashes[ruta] = conocido[0]
+                cambios[ruta] = 'sin_cambios'
+                continue
+            hash_contenido = _leer_hash(ruta)
+        except OSError as e:
+            fallos[ruta] = str(e)
+            continue
+        if not indice.tiene(hash_contenido):
+            pendientes.append(ruta)
+            continue
+        hashes[ruta] = hash_contenido
+        cambios[ruta] = ('sin_cambios' if conocido is not None and conocido[0] == hash_contenido
+                         else 'reutilizado')
+        indice.guardar_archivo(clave, hash_contenido, _mtime_guardado(estado.st_mtime_ns), estado.st_size)
+
+    analizados = {}
+    if pendientes:
+        jobs = min(jobs or os.cpu_count() or 1, len(pendientes))
+        for resultado in analizar_lote(pendientes, jobs, ruta_tokens, maximo_diagnosticos=maximo_diagnosticos,
+                                       maximo_por_regla=maximo_por_regla, funcion=analizar_para_indice):
+            ruta = resultado['archivo']
+            if 'fallo' in resultado:
+                fallos[ruta] = resultado['fallo']
+                continue
+            indice.guardar_resultado(resultado)
+            indice.guardar_archivo(os.path.abspath(ruta), resultado['hash'],
+                                   _mtime_guardado(resultado['mtime_ns']), resultado['tamano'])
+            analizados[ruta] = (resultado['salida'], resultado['con_errores'])
+            cambios[ruta] = 'analizado'
+
+    eliminados = sorted(ruta for ruta in conocidos if ruta not in vistas and not os.path.exists(ruta))
+    indice.olvidar(eliminados)
+    if pendientes or eliminados or any(cambio == 'reutilizado' for cambio in cambios.values()):
+        indice.limpiar()
+    indice.confirmar()
+
+    guardadas = indice.salidas(hashes[ruta] for ruta, cambio in cambios.items()
+                               if cambio == 'reutilizado' or (cambio == 'sin_cambios' and not solo_cambios))
+    comprobados = []
+    for ruta in rutas:
+        if ruta in fallos:
+            comprobados.append((ruta, 'fallo', json.dumps({'fallo': fallos[ruta]}, ensure_ascii=False), False))
+            continue
+        cambio = cambios[ruta]
+        if solo_cambios and cambio == 'sin_cambios':
+            continue
+        salida, con_errores = analizados[ruta] if cambio == 'analizado' else guardadas[hashes[ruta]]
+        comprobados.append((ruta, cambio, salida, con_errores))
+    # El índice guarda rutas absolutas: se informan como las demás
+    absolutas = bool(rutas) and all(os.path.isabs(ruta) for ruta in rutas)
+    comprobados.extend((ruta if absolutas else os.path.relpath(ruta), 'eliminado', '{"eliminado": true}', False)
+                       for ruta in eliminados)
+    return comprobados
+
+
+def _escribir(salida, comprobados):
+    """
+    Escribe los archivos comprobados como NDJSON
+
+    Returns:
+        bool: False si quien lee la salida ya la cerró (p. ej. `| head`)
+    """
+    try:
+        for ruta, cambio, resultado, _ in comprobados:
+            salida.write(linea_ndjson(ruta, cambio, resultado))
+        salida.flush()
+    except BrokenPipeError:
+        descartar_salida_estandar()
+        return False
+    return True
+
+
+def vigilar(entradas, indice, intervalo, salida, extension=".txt", **opciones):
+    """
+    Comprueba el árbol cada `intervalo` segundos y escribe lo que cambió
+
+    La primera comprobación escribe todos los archivos; las siguientes, solo
+    los que cambiaron de contenido, los que fallaron y los eliminados. Termina
+    con Ctrl+C o cuando quien lee la salida la cierra.
+
+    Args:
+        entradas (list): Archivos, directorios o patrones glob
+        indice (IndiceAnalisis): Índice del proyecto
+        intervalo (float): Segundos entre comprobaciones
+        salida: Flujo de texto donde escribir los resultados NDJSON
+        extension (str): Extensión de los archivos buscados dentro de directorios
+        **opciones: jobs, ruta_tokens, maximo_diagnosticos, maximo_por_regla
+            (ver comprobar_proyecto)
+    """
+    solo_cambios = False
+    while True:
+        inicio = time.perf_counter()
+        comprobados = comprobar_proyecto(buscar_archivos(entradas, extension), indice,
+                                         solo_cambios=solo_cambios, **opciones)
+        if not _escribir(salida, comprobados):
+            return
+        if solo_cambios and comprobados:
+            print(f"🔄 Actualizados: {len(comprobados)} • {(time.perf_counter() - inicio) * 1000:.0f} ms",
+                  file=sys.stderr)
+        solo_cambios = True
+        time.sleep(intervalo)
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Comprueba un árbol de programas re-analizando solo los archivos que cambiaron"
+    )
+    parser.add_argument("entradas", nargs="+", help="Archivos, directorios o patrones glob")
+    parser.add_argument("--indice", default=RUTA_INDICE,
+                        help=f"Archivo SQLite del índice (por defecto, {RUTA_INDICE})")
+    parser.add_argument("--vigilar", type=float, nargs="?", const=1.0, default=None, metavar="SEGUNDOS",
+                        help="Vuelve a comprobar cada SEGUNDOS (1 por defecto) y escribe solo los cambios")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Procesos para analizar archivos nuevos (por defecto, uno por núcleo)")
+    parser.add_argument("-o", "--salida", default=None,
+                        help="Archivo NDJSON de salida (por defecto, la salida estándar)")
+    parser.add_argument("--tokens", default=RUTA_TOKENS, help="Ruta de Tokens.json")
+    parser.add_argument("--extension", default=".txt",
+                        help="Extensión de los archivos buscados en directorios")
+    parser.add_argument("--max-diagnosticos", type=int, default=None, metavar="N",
+                        help="Guarda a lo sumo N diagnósticos por archivo (el resto solo se cuenta)")
+    parser.add_argument("--max-por-regla", type=int, default=None, metavar="N",
+                        help="Guarda a lo sumo N diagnósticos de cada regla por archivo")
+    args = parser.parse_args(argv)
+
+    opciones = {
+        'jobs': args.jobs,
+        'ruta_tokens': args.tokens,
+        'maximo_diagnosticos': args.max_diagnosticos,
+        'maximo_por_regla': args.max_por_regla,
+    }
+    indice = IndiceAnalisis(args.indice, huella_configuracion(args.tokens, args.max_diagnosticos,
+                                                              args.max_por_regla))
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        if args.vigilar is not None:
+            try:
+                vigilar(args.entradas, indice, args.vigilar, salida, args.extension, **opciones)
+            except KeyboardInterrupt:
+                pass
+            return 0
+
+        rutas = buscar_archivos(args.entradas, args.extension)
+        if not rutas:
+            print("⚠ No se encontraron archivos para analizar", file=sys.stderr)
+            return 2
+        inicio = time.perf_counter()
+        comprobados = comprobar_proyecto(rutas, indice, **opciones)
+        _escribir(salida, comprobados)
+    finally:
+        indice.cerrar()
+        if salida is not sys.stdout:
+            salida.close()
+
+    fallidos = sum(1 for _, cambio, _, _ in comprobados if cambio == 'fallo')
+    con_errores = sum(1 for _, _, _, errores in comprobados if errores)
+    analizados = sum(1 for _, cambio, _, _ in comprobados if cambio == 'analizado')
+    print(f"📊 Archivos: {len(rutas)} • Analizados: {analizados} • Con errores: {con_errores} • "
+          f"Fallidos: {fallidos} • {(time.perf_counter() - inicio) * 1000:.0f} ms", file=sys.stderr)
+
+    if fallidos:
+        return 2
+    return 1 if con_errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import re
+import time
+from contextlib import contextmanager
+
+
+class Instrumentacion:
+    """
+    Mediciones de un análisis: tiempo y llamadas por fase y por regla
+
+    Se activa por ejecución (ver instrumentar); mientras no está activa los
+    analizadores no pagan ningún costo más allá de comprobar un atributo.
+
+    Fases: 'tokenizacion' (recorrido del patrón y clasificación de cada línea),
+    'clasificar_token' (clasificación de tokens aislados), 'registro' (tabla
+    de tokens), 'pda' (transiciones del autómata) y 'reglas' (validaciones
+    semánticas). Las reglas se detallan por separado: 'declaracion',
+    'asignacion', 'llamada_funcion', 'declaracion_funcion' y 'ambiguedad'; sus
+    llamadas cuentan solo las líneas en que la regla se disparó.
+    """
+
+    FASES = ("tokenizacion", "clasificar_token", "registro", "pda", "reglas")
+    REGLAS = ("declaracion", "asignacion", "llamada_funcion", "declaracion_funcion", "ambiguedad")
+
+    def __init__(self, ruta_perfil=None):
+        """
+        Args:
+            ruta_perfil (str): Si se indica, el análisis también se ejecuta bajo
+                cProfile y las estadísticas se guardan en esa ruta (formato pstats)
+        """
+        self.ruta_perfil = ruta_perfil
+        self.fases = {fase: [0.0, 0] for fase in self.FASES}     # fase -> [segundos, llamadas]
+        self.reglas = {regla: [0.0, 0] for regla in self.REGLAS}
+        self.llamadas_regex = {}                                  # origen -> cantidad
+        self.profundidad_maxima = 0
+        self.regla_actual = None   # Regla en ejecución (origen de las llamadas a regex)
+        self.segundos_totales = 0.0
+        self._inicio = None
+        self._perfilador = None
+
+    def iniciar(self):
+        """Comienza a medir (y a perfilar si se indicó ruta_perfil)"""
+        self._inicio = time.perf_counter()
+        if self.ruta_perfil:
+            import cProfile  # Solo al perfilar: no forma parte del arranque del núcleo
+            self._perfilador = cProfile.Profile()
+            self._perfilador.enable()
+
+    def terminar(self):
+        """Deja de medir y guarda el perfil de cProfile si corresponde"""
+        if self._perfilador is not None:
+            self._perfilador.disable()
+            self._perfilador.dump_stats(self.ruta_perfil)
+            self._perfilador = None
+        if self._inicio is not None:
+            self.segundos_totales += time.perf_counter() - self._inicio
+            self._inicio = None
+
+    def registrar_fase(self, fase, segundos, llamadas=1):
+        """Suma tiempo y llamadas a una fase"""
+        datos = self.fases[fase]
+        datos[0] += segundos
+        datos[1] += llamadas
+
+    def registrar_regla(self, regla, segundos):
+        """Suma tiempo y una llamada a una regla semántica (las agregadas con agregar_regla también)"""
+        datos = self.reglas.get(regla)
+        if datos is None:
+            datos = self.reglas[regla] = [0.0, 0]
+        datos[0] += segundos
+        datos[1] += 1
+
+    def contar_regex(self, origen, cantidad=1):
+        """Cuenta llamadas al motor de expresiones regulares"""
+        self.llamadas_regex[origen] = self.llamadas_regex.get(origen, 0) + cantidad
+
+    def registrar_profundidad(self, profundidad):
+        """Actualiza la profundidad máxima observada en la pila del PDA"""
+        if profundidad > self.profundidad_maxima:
+            self.profundidad_maxima = profundidad
+
+    def medir_iterador(self, fase, iterable):
+        """
+        Envuelve un iterador sumando a `fase` el tiempo que tarda cada elemento
+
+        Args:
+            fase (str): Fase a la que se atribuye el tiempo
+            iterable: Iterador a medir (p. ej. el flujo de LineaTokens)
+
+        Yields:
+            Los mismos elementos del iterable
+        """
+        reloj = time.perf_counter
+        iterador = iter(iterable)
+        datos = self.fases[fase]
+        while True:
+            inicio = reloj()
+            try:
+                elemento = next(iterador)
+            except StopIteration:
+                datos[0] += reloj() - inicio
+                return
+            datos[0] += reloj() - inicio
+            datos[1] += 1
+            yield elemento
+
+    def como_dict(self):
+        """
+        Resultados de la medición
+
+        Returns:
+            dict: {
+                'fases': {fase: {'segundos', 'llamadas'}},
+                'reglas': {regla: {'segundos', 'llamadas'}},
+                'regex': {origen: llamadas},
+                'profundidad_maxima_pila': int,
+                'segundos_totales': float,
+                'perfil': ruta del volcado de cProfile o None
+            }
+        """
+        return {
+            'fases': {fase: {'segundos': datos[0], 'llamadas': datos[1]}
+                      for fase, datos in self.fases.items()},
+            'reglas': {regla: {'segundos': datos[0], 'llamadas': datos[1]}
+                       for regla, datos in self.reglas.items()},
+            'regex': dict(self.llamadas_regex),
+            'profundidad_maxima_pila': self.profundidad_maxima,
+            'segundos_totales': self.segundos_totales,
+            'perfil': self.ruta_perfil,
+        }
+
+
+class ContadorRegex:
+    """
+    Sustituto del módulo re que cuenta las llamadas de las reglas semánticas
+
+    Se asigna a AnalizadorGramatical.re mientras la instrumentación está
+    activa; cada llamada se atribuye a la regla en ejecución.
+    """
+
+    def __init__(self, instrumentacion):
+        self.instrumentacion = instrumentacion
+
+    def _contar(self):
+        self.instrumentacion.contar_regex(self.instrumentacion.regla_actual or "otros")
+
+    def match(self, patron, texto, flags=0):
+        self._contar()
+        return re.match(patron, texto, flags)
+
+    def search(self, patron, texto, flags=0):
+        self._contar()
+        return re.search(patron, texto, flags)
+
+    def fullmatch(self, patron, texto, flags=0):
+        self._contar()
+        return re.fullmatch(patron, texto, flags)
+
+
+@contextmanager
+def instrumentar(instrumentacion, analizador_lexico, analizador_gramatical):
+    """
+    Activa la instrumentación en los analizadores durante un bloque
+
+    Con instrumentacion=None no hace nada, así que los análisis pueden usarlo
+    siempre.
+
+    Args:
+        instrumentacion (Instrumentacion): Mediciones a completar, o None
+        analizador_lexico: Instancia de AnalizadorLexico
+        analizador_gramatical: Instancia de AnalizadorGramatical (None si solo
+            se mide el análisis léxico)
+    """
+    if instrumentacion is None:
+        yield
+        return
+
+    analizador_lexico.instrumentacion = instrumentacion
+    if analizador_gramatical is not None:
+        analizador_gramatical.activar_instrumentacion(instrumentacion)
+    instrumentacion.iniciar()
+    try:
+        yield
+    finally:
+        instrumentacion.terminar()
+        analizador_lexico.instrumentacion = None
+        if analizador_gramatical is not None:
+            analizador_gramatical.activar_instrumentacion(None)
+
+
+def formatear_estadisticas(estadisticas):
+    """
+    Arma una tabla de texto con las mediciones de Instrumentacion.como_dict
+
+    Args:
+        estadisticas (dict): Mediciones de un análisis
+
+    Returns:
+        str: Tabla con tiempo, llamadas y porcentaje por fase y por regla
+    """
+    total = estadisticas['segundos_totales'] or 1e-12
+    lineas = [f"⏱ Tiempo total: {estadisticas['segundos_totales'] * 1000:.1f} ms", ""]
+
+    for titulo, grupo in (("FASE", estadisticas['fases']), ("REGLA", estadisticas['reglas'])):
+        lineas.append(f"{titulo:<22}{'ms':>10}{'llamadas':>12}{'%':>8}")
+        for nombre, datos in grupo.items():
+            lineas.append(f"{nombre:<22}{datos['segundos'] * 1000:>10.1f}{datos['llamadas']:>12,}"
+                          f"{datos['segundos'] / total:>8.1%}")
+        lineas.append("")
+
+    lineas.append(f"{'REGEX (llamadas)':<22}{sum(estadisticas['regex'].values()):>22,}")
+    for origen, cantidad in sorted(estadisticas['regex'].items(), key=lambda item: -item[1]):
+        lineas.append(f"  {origen:<20}{cantidad:>22,}")
+    lineas.append("")
+    lineas.append(f"Profundidad máxima de la pila del PDA: {estadisticas['profundidad_maxima_pila']}")
+    if estadisticas['perfil']:
+        lineas.append(f"Perfil de cProfile: {estadisticas['perfil']}")
+    return "\n".join(lineas)
@@ -0,0 +1,309 @@
+"""
+Análisis léxico en paralelo por bloques de líneas
+
+El análisis léxico es local a cada línea (ni las cadenas ni los comentarios
+'//' cruzan un salto de línea), así que un código grande se puede partir en
+bloques de líneas completas y tokenizar cada bloque en un proceso distinto.
+Cada proceso devuelve el conteo de tokens de su bloque, sus errores léxicos
+(con números de línea relativos al bloque) y cuántas líneas tiene; los
+resultados se combinan en el orden de los bloques, de modo que la tabla de
+tokens, los errores y los límites de diagnósticos quedan igual que en
+AnalizadorLexico.analizar_codigo.
+
+Con un archivo cada proceso lee directamente su rango de bytes, sin pasar el
+contenido por el proceso principal.
+
+Uso:
+    lexico = AnalizadorLexico()
+    resultado = analizar_archivo("programa.txt", lexico, jobs=8)
+"""
+import os
+import stat
+from concurrent.futures import ProcessPoolExecutor
+
+from AnalisisLexico import AnalizadorLexico, codificacion_compatible_ascii
+
+# Tamaño aproximado de cada bloque (caracteres de un código o bytes de un archivo)
+TAMANO_BLOQUE = 8 * 1024 * 1024
+
+# Analizador léxico del proceso actual (cada worker lo crea una sola vez)
+_lexico = None
+
+
+def _inicializar_worker(tokens_json, tamano_cache):
+    """Crea el analizador léxico una vez por proceso"""
+    global _lexico
+    _lexico = AnalizadorLexico(tokens_json=tokens_json, tamano_cache=tamano_cache)
+
+
+def _registrar_bloque(lineas, maximo):
+    """
+    Registra las líneas de un bloque en una tabla de tokens vacía
+
+    Args:
+        lineas (iterable): LineaTokens del bloque
+        maximo (int): Errores léxicos que conviene devolver como máximo (None: todos)
+
+    Returns:
+        tuple: (registros (token, tipo, cantidad) en orden de primera aparición,
+        errores léxicos devueltos, errores léxicos encontrados)
+    """
+    lexico = _lexico
+    lexico.tokens_dict = {}
+    errores = []
+    total = 0
+    for linea in lineas:
+        for error in lexico.registrar_linea(linea):
+            total += 1
+            if maximo is None or len(errores) < maximo:
+                errores.append(error)
+    registros = [(token, datos["Tipo"], datos["Cantidad"]) for token, datos in lexico.tokens_dict.items()]
+    lexico.tokens_dict = {}
+    return registros, errores, total
+
+
+def _lexear_codigo(tarea):
+    """
+    Analiza un bloque de un código (str)
+
+    Args:
+        tarea (tuple): (texto del bloque, máximo de errores devueltos)
+
+    Returns:
+        tuple: Ver _registrar_bloque, más la cantidad de saltos de línea del bloque
+    """
+    texto, maximo = tarea
+    return _registrar_bloque(_lexico.generar_tokens(texto), maximo) + (texto.count("\n"),)
+
+
+def _lexear_archivo(tarea):
+    """
+    Analiza un rango de bytes de un archivo
+
+    Args:
+        tarea (tuple): (ruta, inicio, fin, encoding, máximo de errores devueltos)
+
+    Returns:
+        tuple: Ver _registrar_bloque, más la cantidad de saltos de línea del bloque
+    """
+    ruta, inicio, fin, encoding, maximo = tarea
+    datos = leer_bloque(ruta, inicio, fin)
+    return _registrar_bloque(_lexico.generar_tokens_bytes(datos, encoding), maximo) + (contar_saltos(datos),)
+
+
+def lexico_del_proceso():
+    """Analizador léxico que ejecutar() creó en el proceso actual"""
+    return _lexico
+
+
+def leer_bloque(ruta, inicio, fin):
+    """
+    Lee un rango de bytes de un archivo
+
+    Returns:
+        bytes: Contenido entre `inicio` y `fin`
+    """
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        return archivo.read(fin - inicio)
+
+
+def contar_saltos(datos):
+    """
+    Cantidad de saltos de línea de un contenido en bytes ('\r\n', '\r' o '\n', como en modo texto)
+
+    Args:
+        datos (bytes): Contenido
+
+    Returns:
+        int: Saltos de línea
+    """
+    return datos.count(b"\n") + datos.count(b"\r") - datos.count(b"\r\n")
+
+
+def dividir_bloques(longitud, buscar_salto, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Parte un contenido en bloques de líneas completas
+
+    Cada bloque termina justo después de un '\\n' (o al final del contenido),
+    así que ningún bloque parte una línea ni un '\\r\\n'.
+
+    Args:
+        longitud (int): Longitud del contenido
+        buscar_salto (callable): buscar_salto(posicion) -> índice del primer
+            '\\n' desde `posicion`, o -1 (p. ej. codigo.find con "\\n")
+        tamano_bloque (int): Tamaño aproximado de cada bloque
+
+    Returns:
+        list: Pares (inicio, fin) de cada bloque, en orden
+    """
+    bloques = []
+    inicio = 0
+    while inicio < longitud:
+        salto = buscar_salto(inicio + max(1, tamano_bloque) - 1)
+        fin = longitud if salto < 0 else salto + 1
+        bloques.append((inicio, fin))
+        inicio = fin
+    return bloques
+
+
+def _opciones_worker(analizador_lexico):
+    """Argumentos de _inicializar_worker para reproducir la configuración del analizador"""
+    cache = analizador_lexico.cache
+    return (analizador_lexico.tokens_json, cache.capacidad if cache is not None else 0)
+
+
+def ejecutar(funcion, tareas, analizador_lexico, jobs):
+    """
+    Ejecuta las tareas en un pool de procesos (o en este proceso si alcanza con uno)
+
+    Cada proceso crea un analizador léxico con la configuración de
+    `analizador_lexico`; `funcion` lo obtiene con lexico_del_proceso().
+
+    Args:
+        funcion (callable): Función de nivel de módulo (se envía a los procesos)
+        tareas (list): Argumento de cada llamada a `funcion`
+        analizador_lexico: AnalizadorLexico cuya configuración se reproduce
+        jobs (int): Cantidad de procesos
+
+    Yields:
+        Resultado de cada tarea, en el orden de `tareas`
+    """
+    opciones = _opciones_worker(analizador_lexico)
+    if jobs == 1 or len(tareas) <= 1:
+        _inicializar_worker(*opciones)
+        yield from map(funcion, tareas)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tareas)), initializer=_inicializar_worker,
+                             initargs=opciones) as executor:
+        yield from executor.map(funcion, tareas)
+
+
+def _combinar(analizador_lexico, resultados):
+    """
+    Combina los resultados de los bloques en la tabla de tokens y los errores del analizador
+
+    Los bloques se recorren en orden: la tabla de tokens conserva el orden de
+    primera aparición, los errores reciben el número de línea global y pasan
+    por los límites del analizador igual que en el análisis secuencial.
+
+    Returns:
+        dict: Ver AnalizadorLexico.obtener_resultados
+    """
+    analizador_lexico.reiniciar()
+    tokens_dict = analizador_lexico.tokens_dict
+    errores_lexicos = analizador_lexico.errores_lexicos
+    limites = analizador_lexico.limites
+
+    desplazamiento = 0   # Líneas de los bloques anteriores
+    for registros, errores, total, saltos in resultados:
+        for token, tipo, cantidad in registros:
+            datos = tokens_dict.get(token)
+            if datos is None:
+                tokens_dict[token] = {
+                    "Token": token,
+                    "Tipo": tipo,
+                    "Cantidad": cantidad
+                }
+            else:
+                datos["Cantidad"] += cantidad
+
+        for error in errores:
+            if desplazamiento:
+                error = error.con_linea(error.linea + desplazamiento)
+            if limites.admitir(error):
+                errores_lexicos.append(error)
+        # Los que el bloque no devolvió superan el límite: solo se cuentan
+        if total > len(errores):
+            limites.descartar("LEX001", total - len(errores))
+
+        desplazamiento += saltos
+
+    return analizador_lexico.obtener_resultados()
+
+
+def analizar_codigo(codigo, analizador_lexico, jobs=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Análisis léxico de un código completo repartido en procesos
+
+    Args:
+        codigo (str): Código fuente completo
+        analizador_lexico: Instancia de AnalizadorLexico; recibe la tabla de
+            tokens y los errores como con analizar_codigo
+        jobs (int): Cantidad de procesos (por defecto, uno por núcleo)
+        tamano_bloque (int): Caracteres aproximados de cada bloque
+
+    Returns:
+        dict: Igual que AnalizadorLexico.analizar_codigo
+    """
+    jobs = jobs or os.cpu_count() or 1
+    maximo = analizador_lexico.limites.maximo_guardados("lexico")
+    tareas = [(codigo[inicio:fin], maximo)
+              for inicio, fin in dividir_bloques(len(codigo), lambda posicion: codigo.find("\n", posicion),
+                                                 tamano_bloque)]
+    return _combinar(analizador_lexico, ejecutar(_lexear_codigo, tareas, analizador_lexico, jobs))
+
+
+def analizar_archivo(ruta, analizador_lexico, encoding="utf-8", jobs=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Análisis léxico de un archivo repartido en procesos
+
+    Los bloques se buscan sobre el archivo sin leerlo completo y cada proceso
+    lee solo su rango. Si el archivo no es regular (p. ej. una tubería) o la
+    codificación no es compatible con ASCII, se analiza en este proceso.
+
+    Args:
+        ruta (str): Ruta del archivo
+        analizador_lexico: Instancia de AnalizadorLexico; recibe la tabla de
+            tokens y los errores como con analizar_codigo
+        encoding (str): Codificación del archivo
+        jobs (int): Cantidad de procesos (por defecto, uno por núcleo)
+        tamano_bloque (int): Bytes aproximados de cada bloque
+
+    Returns:
+        dict: Igual que AnalizadorLexico.analizar_codigo
+    """
+    jobs = jobs or os.cpu_count() or 1
+    maximo = analizador_lexico.limites.maximo_guardados("lexico")
+
+    if not stat.S_ISREG(os.stat(ruta).st_mode) or not codificacion_compatible_ascii(encoding):
+        # No se puede leer por rangos: todo el archivo es un único bloque
+        _inicializar_worker(*_opciones_worker(analizador_lexico))
+        resultado = _registrar_bloque(_lexico.generar_tokens_archivo(ruta, encoding), maximo)
+        return _combinar(analizador_lexico, [resultado + (0,)])
+
+    tareas = [(ruta, inicio, fin, encoding, maximo) for inicio, fin in bloques_archivo(ruta, tamano_bloque)]
+
+    return _combinar(analizador_lexico, ejecutar(_lexear_archivo, tareas, analizador_lexico, jobs))
+
+
+def bloques_archivo(ruta, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Parte un archivo en bloques de líneas completas sin leerlo completo
+
+    Cada '\\n' se busca con lecturas cortas a partir del tamaño de bloque.
+
+    Args:
+        ruta (str): Ruta de un archivo regular
+        tamano_bloque (int): Bytes aproximados de cada bloque
+
+    Returns:
+        list: Pares (inicio, fin) de cada bloque, en orden (ver dividir_bloques)
+    """
+    with open(ruta, "rb") as archivo:
+        longitud = os.fstat(archivo.fileno()).st_size
+
+        def buscar_salto(posicion):
+            while posicion < longitud:
+                archivo.seek(posicion)
+                fragmento = archivo.read(64 * 1024)
+                if not fragmento:
+                    break
+                indice = fragmento.find(b"\n")
+                if indice >= 0:
+                    return posicion + indice
+                posicion += len(fragmento)
+            return -1
+
+        return dividir_bloques(longitud, buscar_salto, tamano_bloque)
@@ -1,21 +1,13 @@
-from AnalisisLexico import AnalizadorLexico
-from AnalizadorGramatical import AnalizadorGramatical
-from Formulario import InterfazAnalizador
+from NucleoAnalisis import abrir_interfaz, configurar_registro
 
 def main():
     """Función principal que inicializa y ejecuta la aplicación"""
     
-    # Inicializar analizador léxico
-    analizador_lexico = AnalizadorLexico("Tokens.json")
+    # Los mensajes de carga de Tokens.json se muestran en la consola, como antes
+    configurar_registro()
     
-    # Inicializar analizador gramatical (recibe las categorías del léxico)
-    analizador_gramatical = AnalizadorGramatical(analizador_lexico.get_tokens_json())
-    
-    # Crear y mostrar la interfaz
-    interfaz = InterfazAnalizador(analizador_lexico, analizador_gramatical)
-    
-    # Iniciar el loop de la interfaz
-    interfaz.iniciar()
+    # Crear los analizadores y mostrar la interfaz (tkinter se importa recién aquí)
+    abrir_interfaz("Tokens.json")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,82 @@
+"""
+Punto de entrada de los analizadores sin interfaz gráfica
+
+Reúne lo necesario para analizar código desde un script o un servicio sin
+importar tkinter ni necesitar una pantalla: crear el analizador léxico y el
+gramatical con un perfil de tokens compartido y analizar un código, un
+archivo, un flujo de líneas o un contenido en bytes. La interfaz
+(Formulario, TablaVirtual) solo se importa al pedir la ventana con
+abrir_interfaz().
+
+Los cargadores (Tokens.json, recarga de las tablas de tokens) informan por el
+módulo logging en lugar de imprimir (ver Registro): sin configurar nada solo
+las advertencias llegan a stderr; configurar_registro() muestra también los
+mensajes informativos, como hacía la interfaz.
+
+Uso:
+    from NucleoAnalisis import analizar_codigo, crear_analizadores
+    lexico, gramatical = crear_analizadores()
+    resultado_lexico, resultado_gramatical = analizar_codigo(codigo, lexico, gramatical)
+"""
+import os
+
+# Lo que un script necesita para analizar se importa desde este módulo
+from Analisis import AnalisisCancelado, analizar_archivo, analizar_bytes, analizar_codigo, analizar_stream
+from AnalisisLexico import AnalizadorLexico
+from AnalizadorGramatical import AnalizadorGramatical
+from Diagnosticos import Diagnostico, LimitesDiagnosticos
+
+RUTA_TOKENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Tokens.json")
+
+
+def crear_analizadores(ruta_tokens=RUTA_TOKENS, tokens_json=None, maximo_diagnosticos=None,
+                       maximo_por_regla=None):
+    """
+    Crea el par de analizadores que comparten las tablas de tokens y los límites
+
+    Args:
+        ruta_tokens (str): Ruta de Tokens.json; sus tablas se recargan si el
+            archivo cambia (ver TablasTokens.PerfilTokens)
+        tokens_json (dict): Categorías ya cargadas (en lugar de la ruta; no se recargan)
+        maximo_diagnosticos (int): Máximo de diagnósticos guardados entre ambos
+            analizadores (None: sin límite)
+        maximo_por_regla (int): Máximo de diagnósticos guardados por regla
+
+    Returns:
+        tuple: (AnalizadorLexico, AnalizadorGramatical)
+    """
+    # Un único límite para ambos analizadores: el máximo total vale para todo el análisis
+    limites = LimitesDiagnosticos(maximo_diagnosticos, maximo_por_regla)
+    if tokens_json is not None:
+        analizador_lexico = AnalizadorLexico(tokens_json=tokens_json, limites=limites)
+        return analizador_lexico, AnalizadorGramatical(tokens_json, limites=limites)
+    analizador_lexico = AnalizadorLexico(ruta_tokens, limites=limites)
+    return analizador_lexico, AnalizadorGramatical(limites=limites, perfil=analizador_lexico.perfil)
+
+
+def configurar_registro(nivel="INFO"):
+    """
+    Muestra en stderr los mensajes de los cargadores desde `nivel`
+
+    Args:
+        nivel: Nivel mínimo de logging (p. ej. "INFO" o logging.WARNING)
+    """
+    import logging
+    logging.basicConfig(level=nivel, format="%(message)s")
+
+
+def abrir_interfaz(ruta_tokens="Tokens.json"):
+    """
+    Abre la ventana del analizador y espera a que se cierre
+
+    tkinter y los módulos de la interfaz se importan recién aquí.
+
+    Args:
+        ruta_tokens (str): Ruta de Tokens.json
+    """
+    from Formulario import InterfazAnalizador, MAXIMO_DIAGNOSTICOS
+
+    # La interfaz muestra a lo sumo MAXIMO_DIAGNOSTICOS
+    analizador_lexico, analizador_gramatical = crear_analizadores(
+        ruta_tokens, maximo_diagnosticos=MAXIMO_DIAGNOSTICOS)
+    InterfazAnalizador(analizador_lexico, analizador_gramatical).iniciar()
@@ -1,14 +1,89 @@
+from Diagnosticos import Diagnostico
+
+
+class Marco:
+    """
+    Elemento de la pila del PDA
+
+    Usa __slots__ para que cada marco ocupe poco y se cree rápido. Un marco
+    cerrado fuera del tope queda inactivo hasta que sale por el tope.
+    """
+    __slots__ = ("simbolo", "linea", "tiene_siguiente", "activo", "_datos")
+
+    def __init__(self, simbolo, linea, tiene_siguiente=False):
+        self.simbolo = simbolo
+        self.linea = linea
+        self.tiene_siguiente = tiene_siguiente
+        self.activo = True
+        self._datos = None
+
+    def datos(self):
+        """
+        Datos del marco como tupla (simbolo, linea, tiene_siguiente)
+
+        La tupla se reutiliza mientras el marco no cambie (ResumenPDA.desplazar
+        cambia la línea, 'siguiente' marca tiene_siguiente): las capturas
+        sucesivas de la pila (ver PDA.capturar_estado) comparten los marcos
+        que no cambiaron en lugar de crear una tupla por marco cada vez.
+
+        Returns:
+            tuple: (simbolo, linea, tiene_siguiente)
+        """
+        datos = self._datos
+        if datos is None or datos[1] != self.linea or datos[2] != self.tiene_siguiente:
+            datos = self._datos = (self.simbolo, self.linea, self.tiene_siguiente)
+        return datos
+
+    @classmethod
+    def desde_datos(cls, datos):
+        """Marco a partir de una tupla de datos(), que sigue compartiendo"""
+        marco = cls(*datos)
+        marco._datos = datos
+        return marco
+
+    def como_dict(self):
+        """
+        Representación del marco como diccionario (formato anterior de la pila)
+
+        Returns:
+            dict: Datos del marco
+        """
+        if self.simbolo == '(':
+            return {'simbolo': '(', 'linea': self.linea, 'tipo': 'parentesis'}
+        if self.simbolo == '[':
+            return {'simbolo': '[', 'linea': self.linea, 'tipo': 'corchete'}
+        return {
+            'simbolo': self.simbolo,
+            'linea': self.linea,
+            'tiene_siguiente': self.tiene_siguiente,
+            'espera_parentesis': self.simbolo != 'sino'
+        }
+
+
 class PDA:
     """
     Autómata de Pila (Pushdown Automaton) para validar la sintaxis del lenguaje
+
+    Además de la pila principal mantiene índices laterales con los '(' y las
+    estructuras de control abiertas, de modo que cerrar el último '(' o la
+    última estructura es O(1) aunque haya otros símbolos encima en la pila.
+
+    El 'siguiente' de una estructura abre un ámbito en cada tabla de
+    self.tablas y el 'finaliza' que la cierra lo cierra, de modo que los
+    ámbitos de las tablas de símbolos siguen a los bloques.
     """
-    
+
     def __init__(self):
         self.pila = []
+        self.parentesis = []     # Marcos '(' abiertos, en orden de apertura
+        self.estructuras = []    # Marcos de estructuras de control abiertas
         self.estado = "q0"  # Estado inicial
         self.errores = []
         self.advertencias = []
-        
+        self.profundidad = 0             # Marcos activos en la pila
+        self.profundidad_maxima = 0      # Máximo de marcos activos desde el último reinicio
+        self.tablas = ()                 # Tablas de símbolos (TablaSimbolos) con un ámbito por bloque
+
         # Mapeo de símbolos de apertura y cierre
         self.pares = {
             "(": ")",
@@ -19,189 +94,168 @@ class PDA:
             "func": "finaliza",
             "sino": "finaliza"
         }
-        
+
         # Símbolos que requieren 'siguiente' antes de su contenido
         self.requiere_siguiente = ["si", "mientras", "para", "func", "sino"]
-        
+
+        # Tokens que provocan alguna transición; el resto se ignora sin evaluarlos
+        self.simbolos = frozenset(["si", "mientras", "para", "func", "sino", "siguiente",
+                                   "finaliza", "(", ")", "[", "]"])
+
     def reiniciar(self):
         """Reinicia el PDA para un nuevo análisis"""
         self.pila = []
+        self.parentesis = []
+        self.estructuras = []
         self.estado = "q0"
         self.errores = []
         self.advertencias = []
-    
-    def procesar_token(self, token, linea):
+        self.profundidad = 0
+        self.profundidad_maxima = 0
+
+    def _apilar(self, marco):
+        """Apila un marco y actualiza la profundidad máxima"""
+        self.pila.append(marco)
+        self.profundidad += 1
+        if self.profundidad > self.profundidad_maxima:
+            self.profundidad_maxima = self.profundidad
+
+    def _descartar_inactivos(self):
+        """Quita del tope de la pila los marcos que ya fueron cerrados"""
+        pila = self.pila
+        while pila and not pila[-1].activo:
+            pila.pop()
+
+    def procesar_token(self, token, linea, columna=None):
         """
         Procesa un token según las reglas del PDA
-        
+
         Args:
             token: Token a procesar
             linea: Número de línea actual
+            columna: Columna (desde 1) del token, si se conoce
         """
         # Transición 1: Detectar apertura de estructuras
-        if token in ["si", "mientras", "para", "func"]:
-            self.pila.append({
-                'simbolo': token,
-                'linea': linea,
-                'tiene_siguiente': False,
-                'espera_parentesis': True
-            })
+        if token in ("si", "mientras", "para", "func"):
+            marco = Marco(token, linea)
+            self._apilar(marco)
+            self.estructuras.append(marco)
             self.estado = "esperando_parentesis"
-        
-        # Transición 2: Validar paréntesis de apertura
-        elif token == "(" and self.estado == "esperando_parentesis":
-            if self.pila:
-                self.pila.append({
-                    'simbolo': '(',
-                    'linea': linea,
-                    'tipo': 'parentesis'
-                })
-            else:
-                # Paréntesis en expresión normal
-                self.pila.append({
-                    'simbolo': '(',
-                    'linea': linea,
-                    'tipo': 'parentesis'
-                })
-            self.estado = "dentro_parentesis"
-        
-        # Transición 3: Paréntesis de apertura general
+
+        # Transiciones 2 y 3: Paréntesis de apertura
         elif token == "(":
-            self.pila.append({
-                'simbolo': '(',
-                'linea': linea,
-                'tipo': 'parentesis'
-            })
-        
-        # Transición 4: Paréntesis de cierre
+            marco = Marco('(', linea)
+            self._apilar(marco)
+            self.parentesis.append(marco)
+            if self.estado == "esperando_parentesis":
+                self.estado = "dentro_parentesis"
+
+        # Transición 4: Paréntesis de cierre (cierra el último '(' abierto)
         elif token == ")":
-            if not self.pila:
-                self.errores.append(f"⚠ Línea {linea}: ')' sin '(' correspondiente")
+            if not self.parentesis:
+                self.errores.append(Diagnostico("PDA001", linea, columna))
             else:
-                # Buscar el último '(' en la pila
-                encontrado = False
-                temp_stack = []
-                
-                while self.pila:
-                    top = self.pila.pop()
-                    if top['simbolo'] == '(':
-                        encontrado = True
-                        # Restaurar elementos que no eran paréntesis
-                        while temp_stack:
-                            self.pila.append(temp_stack.pop())
-                        break
-                    else:
-                        temp_stack.append(top)
-                
-                if not encontrado:
-                    self.errores.append(f"⚠ Línea {linea}: ')' sin '(' correspondiente")
-                    # Restaurar la pila
-                    while temp_stack:
-                        self.pila.append(temp_stack.pop())
-                
-                # Cambiar estado después del paréntesis de cierre
-                if self.estado == "dentro_parentesis":
-                    self.estado = "esperando_siguiente"
-        
+                self.parentesis.pop().activo = False
+                self.profundidad -= 1
+                self._descartar_inactivos()
+
+            # Cambiar estado después del paréntesis de cierre
+            if self.estado == "dentro_parentesis":
+                self.estado = "esperando_siguiente"
+
         # Transición 5: Detectar 'siguiente'
         elif token == "siguiente":
-            if self.pila:
-                # Buscar la última estructura de control en la pila
-                for i in range(len(self.pila) - 1, -1, -1):
-                    if self.pila[i]['simbolo'] in self.requiere_siguiente:
-                        self.pila[i]['tiene_siguiente'] = True
-                        break
+            # Marcar la última estructura de control abierta; su bloque abre un ámbito
+            if self.estructuras:
+                marco = self.estructuras[-1]
+                if not marco.tiene_siguiente:
+                    marco.tiene_siguiente = True
+                    for tabla in self.tablas:
+                        tabla.entrar()
             self.estado = "dentro_bloque"
-        
+
         # Transición 6: Detectar 'sino'
         elif token == "sino":
-            # Validar que exista un 'si' previo cerrado
-            self.pila.append({
-                'simbolo': 'sino',
-                'linea': linea,
-                'tiene_siguiente': False,
-                'espera_parentesis': False
-            })
+            marco = Marco('sino', linea)
+            self._apilar(marco)
+            self.estructuras.append(marco)
             self.estado = "esperando_siguiente"
-        
+
         # Transición 7: Corchetes de apertura
         elif token == "[":
-            self.pila.append({
-                'simbolo': '[',
-                'linea': linea,
-                'tipo': 'corchete'
-            })
-        
+            self._apilar(Marco('[', linea))
+
         # Transición 8: Corchetes de cierre
         elif token == "]":
-            if not self.pila or self.pila[-1]['simbolo'] != '[':
-                self.errores.append(f"⚠ Línea {linea}: ']' sin '[' correspondiente")
+            if not self.pila or self.pila[-1].simbolo != '[':
+                self.errores.append(Diagnostico("PDA002", linea, columna))
             else:
                 self.pila.pop()
-        
-        # Transición 9: Detectar 'finaliza'
+                self.profundidad -= 1
+                self._descartar_inactivos()
+
+        # Transición 9: Detectar 'finaliza' (cierra la última estructura abierta)
         elif token == "finaliza":
             if not self.pila:
-                self.errores.append(f"⚠ Línea {linea}: 'finaliza' sin estructura que cerrar")
+                self.errores.append(Diagnostico("PDA003", linea, columna))
+            elif not self.estructuras:
+                self.errores.append(Diagnostico("PDA004", linea, columna))
             else:
-                # Buscar la última estructura que requiere finaliza
-                encontrado = False
-                
-                for i in range(len(self.pila) - 1, -1, -1):
-                    elem = self.pila[i]
-                    if elem['simbolo'] in self.requiere_siguiente:
-                        # Validar que tenga 'siguiente'
-                        if not elem.get('tiene_siguiente', False):
-                            self.advertencias.append(
-                                f"⚠️ Línea {elem['linea']}: '{elem['simbolo']}' cerrado con 'finaliza' pero sin 'siguiente'"
-                            )
-                        self.pila.pop(i)
-                        encontrado = True
-                        break
-                
-                if not encontrado:
-                    self.errores.append(f"⚠ Línea {linea}: 'finaliza' sin estructura correspondiente")
-            
+                marco = self.estructuras.pop()
+                # Validar que tenga 'siguiente'
+                if not marco.tiene_siguiente:
+                    self.advertencias.append(Diagnostico("PDA005", marco.linea, args=(marco.simbolo,)))
+                else:
+                    for tabla in self.tablas:
+                        tabla.salir()
+                marco.activo = False
+                self.profundidad -= 1
+                self._descartar_inactivos()
+
             self.estado = "q0"
-    
-    def procesar_linea(self, tokens, numero_linea):
+
+    def procesar_linea(self, tokens, numero_linea, posiciones=None):
         """
         Procesa una línea completa de tokens
-        
+
         Args:
             tokens: Lista de tokens de la línea
             numero_linea: Número de línea
+            posiciones: Inicio y fin de cada token en la línea, alternados (ver
+                LineaTokens.posiciones); permiten indicar la columna de los errores
         """
-        for token in tokens:
-            if token not in [" ", "\n", ""]:
-                self.procesar_token(token, numero_linea)
-    
+        simbolos = self.simbolos
+        if posiciones is None:
+            for token in tokens:
+                if token in simbolos:
+                    self.procesar_token(token, numero_linea)
+            return
+        for indice, token in enumerate(tokens):
+            if token in simbolos:
+                self.procesar_token(token, numero_linea, posiciones[2 * indice] + 1)
+
     def validar_final(self):
         """
         Valida que la pila esté vacía al final del análisis
         """
-        if self.pila:
-            for elem in self.pila:
-                simbolo = elem['simbolo']
-                linea = elem['linea']
-                
-                if simbolo in self.requiere_siguiente:
-                    self.errores.append(
-                        f"⚠ Línea {linea}: '{simbolo}' sin 'finaliza' correspondiente"
-                    )
-                elif simbolo == '(':
-                    self.errores.append(
-                        f"⚠ Línea {linea}: '(' sin ')' correspondiente"
-                    )
-                elif simbolo == '[':
-                    self.errores.append(
-                        f"⚠ Línea {linea}: '[' sin ']' correspondiente"
-                    )
-    
+        for marco in self.pila:
+            if not marco.activo:
+                continue
+
+            simbolo = marco.simbolo
+            linea = marco.linea
+
+            if simbolo == '(':
+                self.errores.append(Diagnostico("PDA006", linea))
+            elif simbolo == '[':
+                self.errores.append(Diagnostico("PDA007", linea))
+            else:
+                self.errores.append(Diagnostico("PDA008", linea, args=(simbolo,)))
+
     def obtener_resultados(self):
         """
         Retorna los errores y advertencias acumulados
-        
+
         Returns:
             dict: {'errores': [], 'advertencias': []}
         """
@@ -209,12 +263,265 @@ class PDA:
             'errores': self.errores.copy(),
             'advertencias': self.advertencias.copy()
         }
-    
+
+    def extraer_resultados(self):
+        """
+        Retorna los errores y advertencias acumulados y los descarta del PDA
+
+        Permite emitir los diagnósticos a medida que aparecen sin que el PDA
+        los acumule durante un análisis por flujo.
+
+        Returns:
+            dict: {'errores': [], 'advertencias': []}
+        """
+        resultados = {
+            'errores': self.errores,
+            'advertencias': self.advertencias
+        }
+        self.errores = []
+        self.advertencias = []
+        return resultados
+
+    def capturar_estado(self):
+        """
+        Captura una copia del estado del autómata (estado y pila)
+
+        Returns:
+            tuple: (estado, marcos activos como tuplas (simbolo, linea, tiene_siguiente))
+        """
+        return (self.estado, tuple(marco.datos() for marco in self.pila if marco.activo))
+
+    def restaurar_estado(self, estado):
+        """
+        Restaura un estado capturado con capturar_estado y descarta los diagnósticos pendientes
+
+        Args:
+            estado (tuple): Estado capturado
+        """
+        self.estado = estado[0]
+        self.pila = [Marco.desde_datos(datos) for datos in estado[1]]
+        self.parentesis = [marco for marco in self.pila if marco.simbolo == '(']
+        self.estructuras = [marco for marco in self.pila if marco.simbolo not in ('(', '[')]
+        self.errores = []
+        self.advertencias = []
+        self.profundidad = len(self.pila)
+        self.profundidad_maxima = self.profundidad
+
+    def estado_igual(self, estado):
+        """
+        Indica si el autómata está exactamente en el estado capturado
+
+        Args:
+            estado (tuple): Estado capturado
+
+        Returns:
+            bool: True si estado y pila coinciden
+        """
+        return self.estado == estado[0] and self.capturar_estado()[1] == estado[1]
+
+    @staticmethod
+    def desplazar_estado(estado, mapeo):
+        """
+        Retorna una copia del estado con los números de línea de la pila remapeados
+
+        Args:
+            estado (tuple): Estado capturado
+            mapeo (callable): Función línea -> nueva línea
+
+        Returns:
+            tuple: Estado con las líneas actualizadas
+        """
+        return (estado[0], tuple((simbolo, mapeo(linea), tiene_siguiente)
+                                 for simbolo, linea, tiene_siguiente in estado[1]))
+
     def obtener_estado_pila(self):
         """
         Retorna el estado actual de la pila (útil para debugging)
-        
+
+        Returns:
+            list: Copia de la pila actual como diccionarios
+        """
+        return [marco.como_dict() for marco in self.pila if marco.activo]
+
+class Pendiente:
+    """
+    Operación de un bloque que depende de la pila anterior al bloque
+
+    Un ')' sin '(' en el bloque, un ']' o 'finaliza' con la pila del bloque
+    vacía o sin estructuras, o un 'siguiente' sin estructura en el bloque: su
+    efecto (y su diagnóstico, si lo hay) se resuelve al combinar el bloque
+    con los anteriores.
+    """
+    __slots__ = ("token", "linea", "columna", "hay_activos", "resultado")
+
+    def __init__(self, token, linea, columna, hay_activos):
+        self.token = token
+        self.linea = linea
+        self.columna = columna
+        self.hay_activos = hay_activos   # Si había marcos abiertos al procesarla (decide PDA003/PDA004)
+        self.resultado = None            # Diagnósticos producidos al resolverla (None: sin resolver)
+
+
+class ResumenPDA(PDA):
+    """
+    Resumen de un bloque de líneas para validar la estructura en paralelo
+
+    Procesa el bloque como el PDA, pero sin conocer la pila con la que
+    empieza: las operaciones que necesitan un marco anterior al bloque
+    quedan pendientes (ver Pendiente). El resumen queda formado por las
+    pendientes, los marcos que el bloque deja abiertos y sus diagnósticos en
+    orden. Combinar un resumen con el del bloque siguiente resuelve las
+    pendientes de este contra los marcos abiertos del primero; la
+    combinación es asociativa, y finalizar() sobre la combinación de todos
+    los bloques produce los mismos diagnósticos que el PDA secuencial
+    (incluidos los de validar_final). El estado de la máquina (q0, ...) no se
+    resume porque no produce diagnósticos.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Reinicia el resumen para un nuevo bloque"""
+        super().reiniciar()
+        # Errores, advertencias y pendientes en el orden en que ocurren: el PDA
+        # agrega sus diagnósticos a errores/advertencias, que aquí son la misma lista
+        self.eventos = []
+        self.errores = self.eventos
+        self.advertencias = self.eventos
+        self.pendientes = []   # Pendientes sin resolver, en orden
+
+    def procesar_token(self, token, linea, columna=None):
+        """
+        Procesa un token como el PDA, dejando pendientes las operaciones sobre la pila anterior
+
+        Args:
+            token: Token a procesar
+            linea: Número de línea actual
+            columna: Columna (desde 1) del token, si se conoce
+        """
+        if ((token == ")" and not self.parentesis)
+                or (token == "]" and not self.pila)
+                or ((token == "finaliza" or token == "siguiente") and not self.estructuras)):
+            pendiente = Pendiente(token, linea, columna, bool(self.pila))
+            self.eventos.append(pendiente)
+            self.pendientes.append(pendiente)
+            if token == "finaliza":
+                self.estado = "q0"
+            return
+        super().procesar_token(token, linea, columna)
+
+    def _resolver(self, pendiente):
+        """
+        Aplica una pendiente de un bloque posterior sobre los marcos abiertos de este
+
+        Returns:
+            bool: True si se resolvió; False si también depende de la pila anterior a este bloque
+        """
+        token = pendiente.token
+        resultado = []
+        if token == ")":
+            if not self.parentesis:
+                return False
+            self.parentesis.pop().activo = False
+            self.profundidad -= 1
+            self._descartar_inactivos()
+        elif token == "]":
+            if not self.pila:
+                return False
+            if self.pila[-1].simbolo != '[':
+                resultado.append(Diagnostico("PDA002", pendiente.linea, pendiente.columna))
+            else:
+                self.pila.pop()
+                self.profundidad -= 1
+                self._descartar_inactivos()
+        elif token == "siguiente":
+            if not self.estructuras:
+                return False
+            marco = self.estructuras[-1]
+            marco.tiene_siguiente = True
+        else:
+            if not self.estructuras:
+                pendiente.hay_activos = pendiente.hay_activos or bool(self.pila)
+                return False
+            marco = self.estructuras.pop()
+            if not marco.tiene_siguiente:
+                resultado.append(Diagnostico("PDA005", marco.linea, args=(marco.simbolo,)))
+            marco.activo = False
+            self.profundidad -= 1
+            self._descartar_inactivos()
+        pendiente.resultado = resultado
+        return True
+
+    def combinar(self, siguiente):
+        """
+        Agrega a este resumen el del bloque que le sigue (el otro resumen queda consumido)
+
+        Args:
+            siguiente (ResumenPDA): Resumen del bloque inmediatamente posterior
+        """
+        for pendiente in siguiente.pendientes:
+            if not self._resolver(pendiente):
+                self.pendientes.append(pendiente)
+        # Los marcos del bloque siguiente quedan encima de los de este
+        for marco in siguiente.pila:
+            if marco.activo:
+                self._apilar(marco)
+        self.parentesis.extend(siguiente.parentesis)
+        self.estructuras.extend(siguiente.estructuras)
+        self.eventos.extend(siguiente.eventos)
+
+    def desplazar(self, lineas):
+        """
+        Suma `lineas` a todos los números de línea del resumen
+
+        Permite resumir un bloque numerando sus líneas desde 1 y ubicarlo
+        después en el archivo.
+
+        Args:
+            lineas (int): Líneas anteriores al bloque
+        """
+        if not lineas:
+            return
+        for marco in self.pila:
+            marco.linea += lineas
+        for pendiente in self.pendientes:
+            pendiente.linea += lineas
+        eventos = self.eventos
+        for indice, evento in enumerate(eventos):
+            if isinstance(evento, Diagnostico):
+                eventos[indice] = evento.con_linea(evento.linea + lineas)
+
+    def finalizar(self):
+        """
+        Resuelve las pendientes contra una pila inicial vacía y valida el estado final
+
+        Debe llamarse sobre la combinación de todos los bloques, en orden.
+
         Returns:
-            list: Copia de la pila actual
+            dict: {'errores': [], 'advertencias': []} como PDA.obtener_resultados
+            después de validar_final
         """
-        return self.pila.copy()
\ No newline at end of file
+        for pendiente in self.pendientes:
+            if pendiente.token == ")":
+                pendiente.resultado = [Diagnostico("PDA001", pendiente.linea, pendiente.columna)]
+            elif pendiente.token == "]":
+                pendiente.resultado = [Diagnostico("PDA002", pendiente.linea, pendiente.columna)]
+            elif pendiente.token == "finaliza":
+                codigo = "PDA004" if pendiente.hay_activos else "PDA003"
+                pendiente.resultado = [Diagnostico(codigo, pendiente.linea, pendiente.columna)]
+            else:
+                pendiente.resultado = []
+        self.pendientes = []
+        self.validar_final()
+
+        errores = []
+        advertencias = []
+        for evento in self.eventos:
+            for diagnostico in (evento.resultado if isinstance(evento, Pendiente) else (evento,)):
+                if diagnostico.severidad == "error":
+                    errores.append(diagnostico)
+                else:
+                    advertencias.append(diagnostico)
+        return {'errores': errores, 'advertencias': advertencias}
@@ -0,0 +1,133 @@
+"""
+Validación de la estructura (PDA) en paralelo por bloques de líneas
+
+El PDA recorre el código en orden, pero el emparejamiento de '(' / ')',
+'[' / ']' y de las estructuras con 'finaliza' se puede resumir por bloque:
+cada proceso tokeniza un bloque de líneas completas y lo procesa con un
+ResumenPDA, que deja pendientes las operaciones sobre la pila anterior al
+bloque. Los resúmenes se combinan en el orden de los bloques y la
+combinación de todos produce los mismos errores y advertencias (con las
+mismas líneas y columnas) que el PDA secuencial seguido de validar_final.
+
+Solo valida la estructura: las reglas semánticas dependen de las tablas de
+símbolos, que se construyen en orden (ver AnalizadorGramatical).
+
+Uso:
+    lexico = AnalizadorLexico()
+    resultado = validar_archivo("programa.txt", lexico, jobs=8)
+"""
+import os
+import stat
+
+from AnalisisLexico import codificacion_compatible_ascii
+from LexicoParalelo import (TAMANO_BLOQUE, bloques_archivo, contar_saltos, dividir_bloques, ejecutar,
+                            leer_bloque, lexico_del_proceso)
+from PDA import ResumenPDA
+
+
+def _resumir(lineas):
+    """
+    Resumen del PDA de las líneas de un bloque
+
+    Args:
+        lineas (iterable): LineaTokens del bloque (numeradas desde 1)
+
+    Returns:
+        ResumenPDA: Resumen del bloque
+    """
+    resumen = ResumenPDA()
+    for linea in lineas:
+        resumen.procesar_linea(linea.tokens, linea.numero, linea.posiciones)
+    return resumen
+
+
+def _resumir_codigo(texto):
+    """
+    Resume un bloque de un código (str)
+
+    Returns:
+        tuple: (ResumenPDA, cantidad de saltos de línea del bloque)
+    """
+    return _resumir(lexico_del_proceso().generar_tokens(texto)), texto.count("\n")
+
+
+def _resumir_archivo(tarea):
+    """
+    Resume un rango de bytes de un archivo
+
+    Args:
+        tarea (tuple): (ruta, inicio, fin, encoding)
+
+    Returns:
+        tuple: (ResumenPDA, cantidad de saltos de línea del bloque)
+    """
+    ruta, inicio, fin, encoding = tarea
+    datos = leer_bloque(ruta, inicio, fin)
+    return _resumir(lexico_del_proceso().generar_tokens_bytes(datos, encoding)), contar_saltos(datos)
+
+
+def combinar_resumenes(resultados):
+    """
+    Combina los resúmenes de los bloques en orden y valida el estado final
+
+    Args:
+        resultados (iterable): (ResumenPDA, saltos de línea) de cada bloque, en
+            orden; las líneas de cada resumen se numeran desde 1 dentro de su bloque
+
+    Returns:
+        dict: {'errores': [], 'advertencias': []} como PDA.obtener_resultados
+        después de validar_final
+    """
+    total = ResumenPDA()
+    desplazamiento = 0   # Líneas de los bloques anteriores
+    for resumen, saltos in resultados:
+        resumen.desplazar(desplazamiento)
+        total.combinar(resumen)
+        desplazamiento += saltos
+    return total.finalizar()
+
+
+def validar_codigo(codigo, analizador_lexico, jobs=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Valida la estructura de un código completo repartida en procesos
+
+    Args:
+        codigo (str): Código fuente completo
+        analizador_lexico: AnalizadorLexico cuya configuración usan los procesos
+        jobs (int): Cantidad de procesos (por defecto, uno por núcleo)
+        tamano_bloque (int): Caracteres aproximados de cada bloque
+
+    Returns:
+        dict: {'errores': [], 'advertencias': []} del PDA (Diagnostico)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    tareas = [codigo[inicio:fin]
+              for inicio, fin in dividir_bloques(len(codigo), lambda posicion: codigo.find("\n", posicion),
+                                                 tamano_bloque)]
+    return combinar_resumenes(ejecutar(_resumir_codigo, tareas, analizador_lexico, jobs))
+
+
+def validar_archivo(ruta, analizador_lexico, encoding="utf-8", jobs=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Valida la estructura de un archivo repartida en procesos
+
+    Cada proceso lee solo su rango del archivo. Si el archivo no es regular
+    (p. ej. una tubería) o la codificación no es compatible con ASCII, se
+    valida en este proceso.
+
+    Args:
+        ruta (str): Ruta del archivo
+        analizador_lexico: AnalizadorLexico cuya configuración usan los procesos
+        encoding (str): Codificación del archivo
+        jobs (int): Cantidad de procesos (por defecto, uno por núcleo)
+        tamano_bloque (int): Bytes aproximados de cada bloque
+
+    Returns:
+        dict: {'errores': [], 'advertencias': []} del PDA (Diagnostico)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if not stat.S_ISREG(os.stat(ruta).st_mode) or not codificacion_compatible_ascii(encoding):
+        return combinar_resumenes([(_resumir(analizador_lexico.generar_tokens_archivo(ruta, encoding)), 0)])
+
+    tareas = [(ruta, inicio, fin, encoding) for inicio, fin in bloques_archivo(ruta, tamano_bloque)]
+    return combinar_resumenes(ejecutar(_resumir_archivo, tareas, analizador_lexico, jobs))
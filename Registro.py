@@ -0,0 +1,40 @@
+"""
+Mensajes de los cargadores por el módulo logging, sin importarlo al arrancar
+
+logging (con traceback, threading y string) cuesta más al importarse que el
+núcleo de análisis completo, así que los módulos del núcleo no lo importan:
+    - informar: el mensaje solo se registra si la aplicación ya usa logging;
+      si no lo importó, nadie lo configuró y el mensaje no se mostraría
+    - advertir: se importa logging al advertir (rara vez); sin configuración
+      la advertencia igual llega a stderr
+
+Para ver los mensajes informativos: NucleoAnalisis.configurar_registro().
+"""
+import sys
+
+
+def informar(nombre, mensaje, *args):
+    """
+    Registra un mensaje informativo si la aplicación usa logging
+
+    Args:
+        nombre (str): Nombre del logger (el del módulo que informa)
+        mensaje (str): Mensaje con formato de logging (%s)
+        *args: Argumentos del mensaje
+    """
+    logging = sys.modules.get("logging")
+    if logging is not None:
+        logging.getLogger(nombre).info(mensaje, *args)
+
+
+def advertir(nombre, mensaje, *args):
+    """
+    Registra una advertencia (sin configuración de logging, se escribe en stderr)
+
+    Args:
+        nombre (str): Nombre del logger (el del módulo que advierte)
+        mensaje (str): Mensaje con formato de logging (%s)
+        *args: Argumentos del mensaje
+    """
+    import logging
+    logging.getLogger(nombre).warning(mensaje, *args)
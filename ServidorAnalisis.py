@@ -0,0 +1,635 @@
+"""
+Servidor local de análisis (asyncio) con analizadores precargados
+
+Atiende peticiones JSON-RPC 2.0, una por línea (NDJSON), por un socket Unix
+o por TCP en localhost. Las herramientas que analizan programas se conectan
+a un servidor ya iniciado en lugar de iniciar un proceso de Python (e
+importar y cargar Tokens.json) por cada análisis.
+
+    - Los análisis se hacen en un pool de procesos cuyos workers crean los
+      analizadores una sola vez.
+    - Las peticiones pendientes se agrupan en lotes: cuando un worker queda
+      libre recibe todas las que esperan (hasta TAMANO_LOTE o BYTES_LOTE),
+      y cada lote es una sola tarea del pool. Un archivo (params 'ruta') va
+      solo en su lote.
+    - Contrapresión: con MAXIMO_EN_COLA peticiones esperando, el servidor
+      deja de leer las conexiones hasta que se libere lugar (el cliente
+      queda bloqueado al escribir, sin perder peticiones).
+    - Cada petición tiene un tiempo máximo desde que llega (TIEMPO_MAXIMO o
+      params 'tiempo_maximo'); si se cumple en la cola o durante el análisis,
+      este se interrumpe (ver Analisis.analizar_stream) y se responde con
+      ERROR_TIEMPO_AGOTADO.
+    - El método 'metricas' retorna latencias (p50, p90, p99), análisis por
+      segundo, tamaño medio de los lotes y contadores de peticiones.
+
+Métodos:
+    analizar  params {'codigo': str} o {'ruta': str}, opcional 'tiempo_maximo'
+              (segundos); el resultado tiene el formato de AnalizadorLote
+              (sin 'archivo'; si no se pudo leer la ruta, {'fallo'})
+    metricas  sin params; ver MetricasServidor.como_dict
+
+Uso:
+    python ServidorAnalisis.py --socket /tmp/analisis.sock --jobs 4
+    python ServidorAnalisis.py --puerto 8765
+
+ClienteAnalisis es un cliente asyncio para las herramientas y para el
+generador de carga (benchmarks/bench_servidor.py).
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from Analisis import AnalisisCancelado, analizar_archivo, analizar_stream
+from AnalisisLexico import dividir_lineas
+from AnalizadorLote import resumir_analisis
+from NucleoAnalisis import RUTA_TOKENS, crear_analizadores
+from TablasTokens import cargar_tabla
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+
+# Peticiones por lote como máximo, y caracteres de código por lote (se
+# completa el lote que llega a este tamaño)
+TAMANO_LOTE = 32
+BYTES_LOTE = 256 * 1024
+# Segundos que se espera a que lleguen más peticiones a un lote incompleto
+# (solo cuando ya hay un worker libre)
+VENTANA_LOTE = 0.001
+# Lotes enviados al pool por worker (uno en análisis y otro listo para seguir)
+LOTES_POR_WORKER = 2
+# Peticiones esperando lote antes de dejar de leer las conexiones
+MAXIMO_EN_COLA = 1024
+# Segundos por petición desde que llega (cola y análisis)
+TIEMPO_MAXIMO = 10.0
+# Segundos extra que se espera al pool después del mayor plazo de un lote
+MARGEN_TIEMPO = 1.0
+# Latencias guardadas para los percentiles (las más recientes)
+MUESTRAS_LATENCIA = 10000
+# Tamaño máximo de una línea del protocolo (una petición o una respuesta)
+LIMITE_MENSAJE = 64 * 1024 * 1024
+
+# Códigos de error de JSON-RPC y del servidor
+ERROR_PARSEO = -32700
+ERROR_PETICION_INVALIDA = -32600
+ERROR_METODO_NO_ENCONTRADO = -32601
+ERROR_PARAMETROS_INVALIDOS = -32602
+ERROR_INTERNO = -32603
+ERROR_TIEMPO_AGOTADO = -32001
+
+
+# Analizadores del worker (se crean una vez por proceso del pool)
+_analizadores = None
+
+
+def _inicializar_worker(ruta_tokens, maximo_diagnosticos, maximo_por_regla):
+    """Crea los analizadores del proceso con las tablas del caché en disco"""
+    global _analizadores
+    tokens_json = cargar_tabla(ruta_tokens).tokens_json
+    _analizadores = crear_analizadores(tokens_json=tokens_json, maximo_diagnosticos=maximo_diagnosticos,
+                                       maximo_por_regla=maximo_por_regla)
+
+
+class Plazo:
+    """
+    Momento límite de una petición, con la interfaz de threading.Event que
+    consulta el análisis (is_set) para interrumpirse
+
+    Se usa time.time() porque el plazo se fija en el servidor y se consulta
+    en otro proceso.
+    """
+    __slots__ = ("limite",)
+
+    def __init__(self, limite):
+        self.limite = limite
+
+    def is_set(self):
+        return time.time() >= self.limite
+
+
+def analizar_solicitudes(solicitudes):
+    """
+    Analiza un lote en un worker del pool
+
+    Args:
+        solicitudes (list): (tipo, dato, limite): tipo 'codigo' o 'ruta', el
+            código o la ruta, y el plazo (time.time()) de la petición
+
+    Returns:
+        list: Por cada solicitud, el resultado de AnalizadorLote.resumir_analisis,
+        {'fallo'} si no se pudo leer la ruta, o None si se cumplió el plazo
+    """
+    analizador_lexico, analizador_gramatical = _analizadores
+    resultados = []
+    for tipo, dato, limite in solicitudes:
+        plazo = Plazo(limite)
+        if plazo.is_set():
+            resultados.append(None)
+            continue
+        if tipo == "ruta":
+            diagnosticos = analizar_archivo(dato, analizador_lexico, analizador_gramatical, cancelado=plazo)
+        else:
+            diagnosticos = analizar_stream(dividir_lineas(dato), analizador_lexico, analizador_gramatical,
+                                           cancelado=plazo)
+        try:
+            resultados.append(resumir_analisis(diagnosticos, analizador_lexico, analizador_gramatical))
+        except AnalisisCancelado:
+            resultados.append(None)
+        except (OSError, UnicodeDecodeError) as e:
+            resultados.append({'fallo': str(e)})
+    return resultados
+
+
+def percentil(valores, fraccion):
+    """Valor de `valores` (ordenados) en la posición `fraccion` (0 a 1)"""
+    return valores[min(len(valores) - 1, int(fraccion * len(valores)))]
+
+
+class MetricasServidor:
+    """Contadores y latencias de las peticiones 'analizar' del servidor"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.recibidas = 0
+        self.completadas = 0
+        self.tiempo_agotado = 0
+        self.fallidas = 0          # Errores internos (p. ej. un worker que terminó)
+        self.lotes = 0
+        self.en_lotes = 0          # Peticiones enviadas en lotes
+        self.latencias = deque(maxlen=MUESTRAS_LATENCIA)
+
+    def registrar(self, latencia, estado):
+        """
+        Args:
+            latencia (float): Segundos desde que llegó la petición hasta la respuesta
+            estado (str): 'completada', 'tiempo_agotado' o 'fallida'
+        """
+        if estado == "completada":
+            self.completadas += 1
+            self.latencias.append(latencia)
+        elif estado == "tiempo_agotado":
+            self.tiempo_agotado += 1
+        else:
+            self.fallidas += 1
+
+    def como_dict(self, en_cola=0, en_curso=0):
+        """
+        Args:
+            en_cola (int): Peticiones esperando lote
+            en_curso (int): Lotes enviados al pool sin terminar
+
+        Returns:
+            dict: {'peticiones': {recibidas, completadas, tiempo_agotado,
+            fallidas, en_cola}, 'lotes': {enviados, en_curso, tamano_medio},
+            'latencia_ms': {p50, p90, p99, maxima} (de las últimas
+            MUESTRAS_LATENCIA completadas), 'por_segundo', 'segundos'}
+        """
+        segundos = time.perf_counter() - self.inicio
+        latencias = sorted(self.latencias)
+        return {
+            'peticiones': {
+                'recibidas': self.recibidas,
+                'completadas': self.completadas,
+                'tiempo_agotado': self.tiempo_agotado,
+                'fallidas': self.fallidas,
+                'en_cola': en_cola,
+            },
+            'lotes': {
+                'enviados': self.lotes,
+                'en_curso': en_curso,
+                'tamano_medio': round(self.en_lotes / self.lotes, 2) if self.lotes else 0,
+            },
+            'latencia_ms': {
+                nombre: round(percentil(latencias, fraccion) * 1000, 3) if latencias else None
+                for nombre, fraccion in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('maxima', 1.0))
+            },
+            'por_segundo': round(self.completadas / segundos, 1) if segundos else 0,
+            'segundos': round(segundos, 3),
+        }
+
+
+class ServidorAnalisis:
+    """
+    Servidor JSON-RPC de análisis sobre asyncio
+
+    Las conexiones dejan sus peticiones en una cola acotada; una tarea las
+    agrupa en lotes cuando hay lugar en el pool, y cada respuesta se escribe
+    en su conexión apenas termina su lote (las respuestas pueden llegar en
+    otro orden que las peticiones: se asocian por 'id').
+    """
+
+    def __init__(self, jobs=None, ruta_tokens=RUTA_TOKENS, maximo_diagnosticos=None, maximo_por_regla=None,
+                 tiempo_maximo=TIEMPO_MAXIMO, tamano_lote=TAMANO_LOTE, ventana_lote=VENTANA_LOTE,
+                 maximo_en_cola=MAXIMO_EN_COLA):
+        """
+        Args:
+            jobs (int): Procesos del pool (por defecto, uno por núcleo)
+            ruta_tokens (str): Ruta de Tokens.json
+            maximo_diagnosticos (int): Diagnósticos guardados por análisis como máximo
+            maximo_por_regla (int): Diagnósticos guardados por análisis y por regla como máximo
+            tiempo_maximo (float): Segundos por petición si no indica 'tiempo_maximo'
+            tamano_lote (int): Peticiones por lote como máximo
+            ventana_lote (float): Segundos de espera para completar un lote (0: no se espera)
+            maximo_en_cola (int): Peticiones pendientes antes de dejar de leer las conexiones
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.opciones = (ruta_tokens, maximo_diagnosticos, maximo_por_regla)
+        self.tiempo_maximo = tiempo_maximo
+        self.tamano_lote = tamano_lote
+        self.ventana_lote = ventana_lote
+        self.maximo_en_cola = maximo_en_cola
+        self.metricas = MetricasServidor()
+        self.pool = None
+        self.servidor = None
+        self._cola = None
+        self._espacios = None      # Lotes que todavía se pueden enviar al pool
+        self._en_curso = 0         # Lotes enviados al pool sin terminar
+        self._tareas = set()       # Lotes en curso y respuestas pendientes
+        self._conexiones = set()   # Escritores de las conexiones abiertas
+        self._agrupador = None
+        self._socket = None
+
+    async def iniciar(self, socket=None, puerto=PUERTO, host=HOST):
+        """
+        Crea el pool (con los analizadores ya cargados) y empieza a aceptar conexiones
+
+        Args:
+            socket (str): Ruta del socket Unix; si no se indica, TCP en host:puerto
+            puerto (int): Puerto TCP (0: uno libre, ver self.direccion)
+            host (str): Dirección TCP (localhost por defecto)
+        """
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_inicializar_worker,
+                                        initargs=self.opciones)
+        # Se espera a que todos los workers carguen sus analizadores antes de aceptar peticiones
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, analizar_solicitudes, [])
+                               for _ in range(self.jobs)))
+
+        self._cola = asyncio.Queue(self.maximo_en_cola)
+        self._espacios = asyncio.Semaphore(self.jobs * LOTES_POR_WORKER)
+        self._agrupador = asyncio.create_task(self._agrupar())
+        self._socket = socket
+        if socket is not None:
+            self.servidor = await asyncio.start_unix_server(self._atender, socket, limit=LIMITE_MENSAJE)
+        else:
+            self.servidor = await asyncio.start_server(self._atender, host, puerto, limit=LIMITE_MENSAJE)
+        self.metricas = MetricasServidor()
+
+    @property
+    def direccion(self):
+        """Ruta del socket Unix o (host, puerto) en los que escucha el servidor"""
+        return self.servidor.sockets[0].getsockname()
+
+    def estado_metricas(self):
+        """Métricas actuales (ver MetricasServidor.como_dict)"""
+        return self.metricas.como_dict(self._cola.qsize(), self._en_curso)
+
+    async def cerrar(self):
+        """
+        Deja de aceptar conexiones, cierra las abiertas y termina el pool
+
+        Las conexiones se cierran antes de esperar al servidor: desde Python
+        3.12, wait_closed() espera a que no quede ninguna abierta. El pool se
+        termina en un hilo aparte para no bloquear el loop mientras los
+        workers acaban su lote.
+        """
+        loop = asyncio.get_running_loop()
+        self.servidor.close()
+        self._agrupador.cancel()
+        for tarea in list(self._tareas):
+            tarea.cancel()
+        for escritor in list(self._conexiones):
+            escritor.close()
+        await asyncio.gather(self.servidor.wait_closed(),
+                             loop.run_in_executor(None, partial(self.pool.shutdown, cancel_futures=True)))
+        if self._socket is not None and os.path.exists(self._socket):
+            os.remove(self._socket)
+
+    async def _atender(self, lector, escritor):
+        """Lee las peticiones de una conexión hasta que el cliente la cierra"""
+        bloqueo = asyncio.Lock()   # Una respuesta completa a la vez por conexión
+        self._conexiones.add(escritor)
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except ValueError:
+                    # Línea más larga que LIMITE_MENSAJE: no se puede seguir leyendo
+                    await self._escribir(escritor, bloqueo, _error(None, ERROR_PETICION_INVALIDA,
+                                                                    "Mensaje demasiado grande"))
+                    break
+                except ConnectionError:
+                    break
+                if not linea:
+                    break
+                if linea.strip():
+                    await self._procesar(linea, escritor, bloqueo)
+        finally:
+            self._conexiones.discard(escritor)
+            escritor.close()
+
+    async def _procesar(self, linea, escritor, bloqueo):
+        """Despacha una petición; las de 'analizar' se responden al terminar su lote"""
+        try:
+            mensaje = json.loads(linea)
+        except ValueError as error:
+            await self._escribir(escritor, bloqueo, _error(None, ERROR_PARSEO, f"JSON inválido: {error}"))
+            return
+        if not isinstance(mensaje, dict) or not isinstance(mensaje.get("method"), str):
+            await self._escribir(escritor, bloqueo, _error(None, ERROR_PETICION_INVALIDA, "Petición inválida"))
+            return
+        if "id" not in mensaje:
+            return  # Notificación: ningún método las usa
+
+        identificador = mensaje["id"]
+        metodo = mensaje["method"]
+        params = mensaje.get("params") or {}
+        if metodo == "metricas":
+            await self._escribir(escritor, bloqueo, _resultado(identificador, self.estado_metricas()))
+        elif metodo != "analizar":
+            await self._escribir(escritor, bloqueo, _error(identificador, ERROR_METODO_NO_ENCONTRADO,
+                                                           f"Método no soportado: {metodo}"))
+        else:
+            solicitud = _solicitud(params, self.tiempo_maximo)
+            if solicitud is None:
+                await self._escribir(escritor, bloqueo, _error(
+                    identificador, ERROR_PARAMETROS_INVALIDOS,
+                    "Se espera 'codigo' o 'ruta' (texto) y 'tiempo_maximo' opcional (segundos)"))
+                return
+            self.metricas.recibidas += 1
+            futuro = asyncio.get_running_loop().create_future()
+            # Con la cola llena se espera aquí, sin leer más peticiones de la conexión
+            llegada = time.perf_counter()
+            await self._cola.put((*solicitud, futuro))
+            self._lanzar(self._responder(identificador, futuro, llegada, escritor, bloqueo))
+
+    def _lanzar(self, corrutina):
+        tarea = asyncio.create_task(corrutina)
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _responder(self, identificador, futuro, llegada, escritor, bloqueo):
+        """Escribe la respuesta de un análisis cuando su lote termina"""
+        try:
+            resultado = await futuro
+        except Exception as error:
+            respuesta, estado = _error(identificador, ERROR_INTERNO, str(error)), "fallida"
+        else:
+            if resultado is None:
+                respuesta = _error(identificador, ERROR_TIEMPO_AGOTADO, "Se agotó el tiempo del análisis")
+                estado = "tiempo_agotado"
+            else:
+                respuesta, estado = _resultado(identificador, resultado), "completada"
+        self.metricas.registrar(time.perf_counter() - llegada, estado)
+        await self._escribir(escritor, bloqueo, respuesta)
+
+    async def _escribir(self, escritor, bloqueo, mensaje):
+        """Escribe un mensaje en una línea; si el cliente se desconectó, se descarta"""
+        if escritor.is_closing():
+            return
+        datos = json.dumps(mensaje, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        async with bloqueo:
+            try:
+                escritor.write(datos)
+                await escritor.drain()
+            except ConnectionError:
+                pass
+
+    async def _agrupar(self):
+        """Arma lotes con las peticiones pendientes a medida que hay lugar en el pool"""
+        while True:
+            lote = [await self._cola.get()]
+            await self._espacios.acquire()
+            # Mientras se esperaba lugar en el pool pudieron llegar más peticiones
+            tamano = self._completar(lote, _peso(lote[0]))
+            if tamano < BYTES_LOTE and len(lote) < self.tamano_lote and self.ventana_lote > 0:
+                await asyncio.sleep(self.ventana_lote)
+                self._completar(lote, tamano)
+            self.metricas.lotes += 1
+            self.metricas.en_lotes += len(lote)
+            self._en_curso += 1
+            self._lanzar(self._ejecutar(lote))
+
+    def _completar(self, lote, tamano):
+        """Agrega al lote las peticiones que ya esperan; retorna el tamaño del lote"""
+        while tamano < BYTES_LOTE and len(lote) < self.tamano_lote and not self._cola.empty():
+            solicitud = self._cola.get_nowait()
+            lote.append(solicitud)
+            tamano += _peso(solicitud)
+        return tamano
+
+    async def _ejecutar(self, lote):
+        """
+        Analiza un lote en el pool y completa el futuro de cada petición
+
+        El lugar del lote en el pool se libera cuando el worker termina, no
+        cuando se deja de esperarlo: si se agota la espera, el worker sigue
+        ocupado y no se le puede enviar otro lote todavía.
+        """
+        loop = asyncio.get_running_loop()
+        trabajo = [(tipo, dato, limite) for tipo, dato, limite, _ in lote]
+        # El worker respeta cada plazo; esto solo cubre un worker que no responde
+        espera = max(limite for _, _, limite in trabajo) - time.time() + MARGEN_TIEMPO
+        try:
+            en_pool = loop.run_in_executor(self.pool, analizar_solicitudes, trabajo)
+        except Exception as error:
+            self._liberar(None)
+            _fallar(lote, error)
+            return
+        en_pool.add_done_callback(self._liberar)
+        try:
+            # shield: cancelar la espera no debe marcar como terminado un lote que sigue en el worker
+            resultados = await asyncio.wait_for(asyncio.shield(en_pool), max(espera, 0))
+        except asyncio.TimeoutError:
+            resultados = [None] * len(lote)
+        except Exception as error:
+            _fallar(lote, error)
+            return
+        for (*_, futuro), resultado in zip(lote, resultados):
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    def _liberar(self, en_pool):
+        """Devuelve el lugar de un lote cuando el pool lo termina (o no lo pudo recibir)"""
+        if en_pool is not None and not en_pool.cancelled():
+            en_pool.exception()   # Ya informada a las peticiones (o se agotó su espera)
+        self._en_curso -= 1
+        self._espacios.release()
+
+
+def _fallar(lote, error):
+    """Completa con un error el futuro de cada petición del lote que siga pendiente"""
+    for *_, futuro in lote:
+        if not futuro.done():
+            futuro.set_exception(error)
+
+
+def _solicitud(params, tiempo_maximo):
+    """(tipo, dato, limite) de los params de 'analizar', o None si no son válidos"""
+    if not isinstance(params, dict):
+        return None
+    tiempo_maximo = params.get("tiempo_maximo", tiempo_maximo)
+    if not isinstance(tiempo_maximo, (int, float)) or tiempo_maximo <= 0:
+        return None
+    limite = time.time() + tiempo_maximo
+    if isinstance(params.get("codigo"), str):
+        return ("codigo", params["codigo"], limite)
+    if isinstance(params.get("ruta"), str):
+        return ("ruta", params["ruta"], limite)
+    return None
+
+
+def _peso(solicitud):
+    """Tamaño de una petición en el lote: los archivos ocupan un lote completo"""
+    return len(solicitud[1]) if solicitud[0] == "codigo" else BYTES_LOTE
+
+
+def _resultado(identificador, resultado):
+    return {"jsonrpc": "2.0", "id": identificador, "result": resultado}
+
+
+def _error(identificador, codigo, mensaje):
+    return {"jsonrpc": "2.0", "id": identificador, "error": {"code": codigo, "message": mensaje}}
+
+
+class ErrorServidor(Exception):
+    """Respuesta de error del servidor de análisis"""
+
+    def __init__(self, codigo, mensaje):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+class ClienteAnalisis:
+    """
+    Cliente asyncio de ServidorAnalisis
+
+    Varias corrutinas pueden usar la misma conexión a la vez: cada llamada
+    espera la respuesta con su 'id'.
+    """
+
+    def __init__(self, lector, escritor):
+        self._lector = lector
+        self._escritor = escritor
+        self._ids = itertools.count(1)
+        self._pendientes = {}   # id -> futuro de la respuesta
+        self._leyendo = asyncio.create_task(self._leer())
+
+    @classmethod
+    async def conectar(cls, socket=None, puerto=PUERTO, host=HOST):
+        """
+        Args:
+            socket (str): Ruta del socket Unix; si no se indica, TCP en host:puerto
+
+        Returns:
+            ClienteAnalisis: Cliente conectado
+        """
+        if socket is not None:
+            lector, escritor = await asyncio.open_unix_connection(socket, limit=LIMITE_MENSAJE)
+        else:
+            lector, escritor = await asyncio.open_connection(host, puerto, limit=LIMITE_MENSAJE)
+        return cls(lector, escritor)
+
+    async def llamar(self, metodo, params=None):
+        """
+        Envía una petición y espera su resultado
+
+        Raises:
+            ErrorServidor: Si el servidor respondió con un error
+            ConnectionError: Si la conexión se cerró antes de la respuesta
+        """
+        identificador = next(self._ids)
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendientes[identificador] = futuro
+        mensaje = {"jsonrpc": "2.0", "id": identificador, "method": metodo, "params": params or {}}
+        self._escritor.write(json.dumps(mensaje, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self._escritor.drain()
+        return await futuro
+
+    async def analizar(self, codigo=None, ruta=None, tiempo_maximo=None):
+        """Resultado del análisis de un código o de un archivo (ver el método 'analizar')"""
+        params = {"codigo": codigo} if codigo is not None else {"ruta": ruta}
+        if tiempo_maximo is not None:
+            params["tiempo_maximo"] = tiempo_maximo
+        return await self.llamar("analizar", params)
+
+    async def metricas(self):
+        """Métricas del servidor (ver MetricasServidor.como_dict)"""
+        return await self.llamar("metricas")
+
+    async def cerrar(self):
+        self._escritor.close()
+        await self._escritor.wait_closed()
+        self._leyendo.cancel()
+
+    async def _leer(self):
+        """Completa el futuro de cada respuesta; al cerrarse la conexión, falla los pendientes"""
+        try:
+            while True:
+                linea = await self._lector.readline()
+                if not linea:
+                    break
+                respuesta = json.loads(linea)
+                futuro = self._pendientes.pop(respuesta.get("id"), None)
+                if futuro is None or futuro.done():
+                    continue
+                if "error" in respuesta:
+                    futuro.set_exception(ErrorServidor(respuesta["error"]["code"], respuesta["error"]["message"]))
+                else:
+                    futuro.set_result(respuesta["result"])
+        finally:
+            for futuro in self._pendientes.values():
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("⚠ El servidor cerró la conexión"))
+            self._pendientes.clear()
+
+
+async def servir(args):
+    """Inicia el servidor y atiende hasta que se interrumpe"""
+    servidor = ServidorAnalisis(args.jobs, args.tokens, args.max_diagnosticos, args.max_por_regla,
+                                args.tiempo_maximo)
+    await servidor.iniciar(args.socket, args.puerto)
+    print(f"✓ Servidor de análisis en {servidor.direccion} con {servidor.jobs} procesos", file=sys.stderr)
+    try:
+        await servidor.servidor.serve_forever()
+    finally:
+        metricas = servidor.estado_metricas()
+        print(f"📊 Análisis: {metricas['peticiones']['completadas']} • "
+              f"p50 {metricas['latencia_ms']['p50']} ms • p99 {metricas['latencia_ms']['p99']} ms • "
+              f"{metricas['por_segundo']}/s", file=sys.stderr)
+        await servidor.cerrar()
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Servidor local de análisis (JSON-RPC por línea)")
+    direccion = parser.add_mutually_exclusive_group()
+    direccion.add_argument("--socket", default=None, help="Ruta del socket Unix en el que escuchar")
+    direccion.add_argument("--puerto", type=int, default=PUERTO,
+                           help=f"Puerto TCP en {HOST} (por defecto, {PUERTO})")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument("--tokens", default=RUTA_TOKENS, help="Ruta de Tokens.json")
+    parser.add_argument("--tiempo-maximo", type=float, default=TIEMPO_MAXIMO, metavar="SEGUNDOS",
+                        help=f"Tiempo máximo por petición (por defecto, {TIEMPO_MAXIMO})")
+    parser.add_argument("--max-diagnosticos", type=int, default=None, metavar="N",
+                        help="Guarda a lo sumo N diagnósticos por análisis (el resto solo se cuenta)")
+    parser.add_argument("--max-por-regla", type=int, default=None, metavar="N",
+                        help="Guarda a lo sumo N diagnósticos de cada regla por análisis")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(servir(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
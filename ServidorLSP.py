@@ -0,0 +1,617 @@
+"""
+Servidor del Language Server Protocol (LSP) sobre stdio
+
+Publica los diagnósticos de AnalizadorLexico, AnalizadorGramatical y el PDA
+en cualquier editor con cliente LSP. Los mensajes son JSON-RPC con cabecera
+Content-Length por la entrada y la salida estándar.
+
+Cada documento abierto tiene sus propios analizadores y un
+AnalizadorIncremental. Los cambios de textDocument/didChange llegan como
+ediciones de rangos (sincronización incremental) y se aplican sobre las
+líneas del documento. Solo se re-analizan las líneas editadas, más las que
+el PDA necesite hasta volver al estado de la ejecución anterior. Los
+mensajes se leen en un hilo aparte; los cambios que llegan juntos se
+analizan una sola vez, antes de publicar los diagnósticos.
+
+Para responder rápido en archivos grandes, cada edición se re-analiza como
+máximo PRESUPUESTO_ANALISIS segundos antes de publicar. Si el cambio afecta
+el estado hasta el final (p. ej. un bloque sin cerrar), el resto se analiza
+entre mensajes y los diagnósticos se publican de nuevo al terminar.
+
+Las posiciones se cuentan en unidades UTF-16, como pide el protocolo. Si el
+cliente ofrece 'utf-32' se usa esa codificación, que cuenta caracteres
+directamente. Las líneas terminan en '\\n' o '\\r\\n' ('\\r' solo no se
+considera salto de línea).
+
+Uso:
+    python ServidorLSP.py [--tokens Tokens.json]
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import traceback
+
+from AnalisisLexico import AnalizadorLexico
+from AnalizadorGramatical import AnalizadorGramatical
+from Diagnosticos import LimitesDiagnosticos
+from Incremental import AnalizadorIncremental
+from TablasTokens import PATRON_MAESTRO
+
+RUTA_TOKENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Tokens.json")
+
+# Nombre del servidor y origen ('source') de sus diagnósticos
+NOMBRE_SERVIDOR = "analizador-lenguajes"
+
+# Diagnósticos publicados como máximo por documento (el resto solo se cuentan)
+MAXIMO_DIAGNOSTICOS = 1000
+
+# Segundos de re-análisis por edición antes de publicar; lo que falte se
+# completa entre mensajes y se vuelve a publicar al terminar
+PRESUPUESTO_ANALISIS = 0.010
+# Segundos de cada tramo del análisis pendiente (un mensaje nuevo espera a lo sumo un tramo)
+TRAMO_PENDIENTE = 0.005
+
+# Severidad LSP de cada severidad de Diagnostico
+SEVERIDADES = {"error": 1, "advertencia": 2}
+
+# TextDocumentSyncKind.Incremental
+SINCRONIZACION_INCREMENTAL = 2
+
+# Códigos de error de JSON-RPC y LSP
+ERROR_PARSEO = -32700
+ERROR_PETICION_INVALIDA = -32600
+ERROR_METODO_NO_ENCONTRADO = -32601
+ERROR_INTERNO = -32603
+ERROR_NO_INICIALIZADO = -32002
+
+
+def leer_mensaje(entrada):
+    """
+    Lee el cuerpo de un mensaje con cabecera Content-Length
+
+    Args:
+        entrada: Flujo binario (p. ej. sys.stdin.buffer)
+
+    Returns:
+        bytes: Cuerpo del mensaje, o None si la entrada terminó
+
+    Raises:
+        ValueError: Si la cabecera no indica la longitud del cuerpo
+    """
+    longitud = None
+    while True:
+        cabecera = entrada.readline()
+        if not cabecera:
+            return None
+        cabecera = cabecera.strip()
+        if not cabecera:
+            break
+        nombre, _, valor = cabecera.decode("ascii", errors="replace").partition(":")
+        if nombre.strip().lower() == "content-length":
+            longitud = int(valor)
+    if longitud is None:
+        raise ValueError("⚠ Mensaje sin cabecera Content-Length")
+
+    cuerpo = entrada.read(longitud)
+    if len(cuerpo) < longitud:
+        return None
+    return cuerpo
+
+
+def escribir_mensaje(salida, mensaje):
+    """
+    Escribe un mensaje JSON-RPC con su cabecera Content-Length
+
+    Args:
+        salida: Flujo binario (p. ej. sys.stdout.buffer)
+        mensaje (dict): Mensaje a enviar
+    """
+    cuerpo = json.dumps(mensaje, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    salida.write(b"Content-Length: %d\r\n\r\n" % len(cuerpo))
+    salida.write(cuerpo)
+    salida.flush()
+
+
+def indice_caracter(texto, caracter, codificacion="utf-16"):
+    """
+    Índice en `texto` de una posición LSP dentro de la línea
+
+    Args:
+        texto (str): Texto de la línea
+        caracter (int): Posición en unidades de `codificacion`
+        codificacion (str): 'utf-16' o 'utf-32'
+
+    Returns:
+        int: Índice en el str (acotado al largo de la línea)
+    """
+    if codificacion == "utf-32" or texto.isascii():
+        return min(caracter, len(texto))
+    unidades = 0
+    for indice, letra in enumerate(texto):
+        if unidades >= caracter:
+            return indice
+        unidades += 2 if ord(letra) > 0xFFFF else 1
+    return len(texto)
+
+
+def posicion_caracter(texto, indice, codificacion="utf-16"):
+    """
+    Posición LSP dentro de la línea de un índice de `texto` (inversa de indice_caracter)
+
+    Returns:
+        int: Posición en unidades de `codificacion`
+    """
+    if codificacion == "utf-32" or texto.isascii():
+        return indice
+    return indice + sum(1 for letra in texto[:indice] if ord(letra) > 0xFFFF)
+
+
+def rango_diagnostico(diagnostico, lineas, codificacion="utf-16"):
+    """
+    Rango LSP que marca un diagnóstico
+
+    Con columna, el rango cubre el token que empieza en ella; sin columna (p.
+    ej. las estructuras que quedaron abiertas), el texto de la línea sin la
+    sangría.
+
+    Args:
+        diagnostico (Diagnostico): Diagnóstico del análisis
+        lineas (list): Texto de cada línea del documento
+        codificacion (str): 'utf-16' o 'utf-32'
+
+    Returns:
+        dict: Range de LSP
+    """
+    numero = min(max(diagnostico.linea, 1), len(lineas)) - 1
+    texto = lineas[numero].rstrip("\r")
+    if diagnostico.columna is None:
+        fin = len(texto.rstrip())
+        inicio = min(len(texto) - len(texto.lstrip()), fin)
+    else:
+        inicio = min(diagnostico.columna - 1, len(texto))
+        token = PATRON_MAESTRO.match(texto, inicio)
+        fin = token.end() if token is not None and token.end() > inicio else min(inicio + 1, len(texto))
+    return {
+        "start": {"line": numero, "character": posicion_caracter(texto, inicio, codificacion)},
+        "end": {"line": numero, "character": posicion_caracter(texto, fin, codificacion)},
+    }
+
+
+def diagnosticos_lsp(resultado_lexico, resultado_gramatical, lineas, codificacion="utf-16", conversiones=None):
+    """
+    Convierte los resultados de un análisis en Diagnostic de LSP
+
+    Con `conversiones`, cada Diagnostic se guarda según el código, la
+    columna, los argumentos y el texto de la línea del diagnóstico: en la
+    siguiente llamada, los de líneas que no cambiaron se reutilizan (con otro
+    número de línea si se movieron). Quedan guardados solo los de esta
+    llamada; los Diagnostic retornados no se deben modificar.
+
+    Args:
+        resultado_lexico (dict): Resultado del análisis léxico
+        resultado_gramatical (dict): Resultado del análisis gramatical
+        lineas (list): Texto de cada línea del código analizado
+        codificacion (str): 'utf-16' o 'utf-32'
+        conversiones (dict): Conversiones de la llamada anterior (se actualiza)
+
+    Returns:
+        list: Diagnósticos (errores léxicos, errores y advertencias, en ese orden)
+    """
+    anteriores = conversiones if conversiones is not None else {}
+    usadas = {}
+    ultima = len(lineas)
+    diagnosticos = []
+    for lista in (resultado_lexico["errores_lexicos"], resultado_gramatical["errores"],
+                  resultado_gramatical["advertencias"]):
+        for diagnostico in lista:
+            numero = min(max(diagnostico.linea, 1), ultima) - 1
+            clave = (diagnostico.codigo, diagnostico.columna, diagnostico.args, lineas[numero], codificacion)
+            convertido = usadas.get(clave) or anteriores.get(clave)
+            if convertido is None:
+                convertido = {
+                    "range": rango_diagnostico(diagnostico, lineas, codificacion),
+                    "severity": SEVERIDADES[diagnostico.severidad],
+                    "code": diagnostico.codigo,
+                    "source": NOMBRE_SERVIDOR,
+                    "message": diagnostico.descripcion,
+                }
+            elif convertido["range"]["start"]["line"] != numero:
+                inicio, fin = convertido["range"]["start"], convertido["range"]["end"]
+                convertido = dict(convertido, range={"start": {"line": numero, "character": inicio["character"]},
+                                                     "end": {"line": numero, "character": fin["character"]}})
+            usadas[clave] = convertido
+            diagnosticos.append(convertido)
+    if conversiones is not None:
+        conversiones.clear()
+        conversiones.update(usadas)
+    return diagnosticos
+
+
+class Documento:
+    """
+    Documento abierto en el editor con su propio estado de análisis
+
+    Las ediciones se aplican sobre `lineas` y se acumula la región cambiada
+    desde el último análisis: las líneas anteriores a `_inicio` y las últimas
+    `_sufijo` líneas son las mismas que se analizaron. analizar() pasa solo
+    esa región a AnalizadorIncremental.aplicar_edicion.
+
+    Con un límite de tiempo, el re-análisis que no alcanza a terminar queda
+    pendiente (ver AnalizadorIncremental) y se retoma con continuar().
+    """
+
+    def __init__(self, uri, version, texto, tokens_json):
+        """
+        Args:
+            uri (str): URI del documento
+            version (int): Versión que informó el editor
+            texto (str): Contenido inicial
+            tokens_json (dict): Categorías de tokens (Tokens.json)
+        """
+        self.uri = uri
+        self.version = version
+        # Un único límite para ambos analizadores, como en la interfaz
+        limites = LimitesDiagnosticos(maximo_total=MAXIMO_DIAGNOSTICOS)
+        self.incremental = AnalizadorIncremental(
+            AnalizadorLexico(tokens_json=tokens_json, limites=limites),
+            AnalizadorGramatical(tokens_json, limites=limites))
+        self._conversiones = {}   # Diagnostic ya convertidos (ver diagnosticos_lsp)
+        self.sin_publicar = False  # El análisis terminó pero sus diagnósticos no se armaron
+        self.reemplazar(texto)
+
+    def reemplazar(self, texto):
+        """Reemplaza todo el contenido del documento"""
+        self.lineas = texto.split("\n")
+        self._inicio = 0
+        self._sufijo = 0
+        self.modificado = True
+
+    def aplicar_cambio(self, cambio, codificacion="utf-16"):
+        """
+        Aplica un TextDocumentContentChangeEvent
+
+        Args:
+            cambio (dict): {'range', 'text'} o solo {'text'} (contenido completo)
+            codificacion (str): Codificación de las posiciones ('utf-16' o 'utf-32')
+        """
+        rango = cambio.get("range")
+        if rango is None:
+            self.reemplazar(cambio["text"])
+            return
+
+        lineas = self.lineas
+        ultima = len(lineas) - 1
+        inicio, fin = rango["start"], rango["end"]
+        linea_inicio = min(inicio["line"], ultima)
+        linea_fin = min(fin["line"], ultima)
+        if fin["line"] > ultima:
+            # Una posición después de la última línea equivale al final del documento
+            columna_fin = len(lineas[ultima])
+        else:
+            columna_fin = indice_caracter(lineas[linea_fin], fin["character"], codificacion)
+        if inicio["line"] > ultima:
+            columna_inicio = len(lineas[ultima])
+        else:
+            columna_inicio = indice_caracter(lineas[linea_inicio], inicio["character"], codificacion)
+
+        texto = lineas[linea_inicio][:columna_inicio] + cambio["text"] + lineas[linea_fin][columna_fin:]
+        # Región cambiada: antes de la edición las líneas posteriores a linea_fin
+        # no cambiaron (si tampoco habían cambiado en ediciones anteriores)
+        self._sufijo = min(self._sufijo, ultima - linea_fin)
+        self._inicio = min(self._inicio, linea_inicio)
+        lineas[linea_inicio:linea_fin + 1] = texto.split("\n")
+        self.modificado = True
+
+    @property
+    def pendiente(self):
+        """True si quedó re-análisis pendiente de una edición anterior"""
+        return not self.incremental.completo
+
+    def analizar(self, codificacion="utf-16", limite=None):
+        """
+        Re-analiza la región cambiada desde el último análisis
+
+        Args:
+            codificacion (str): Codificación de las posiciones ('utf-16' o 'utf-32')
+            limite (float): Segundos como máximo de re-análisis (por defecto, sin límite)
+
+        Returns:
+            list: Diagnósticos de LSP de todo el documento; si quedó análisis
+            pendiente, las líneas que faltan conservan los diagnósticos anteriores
+        """
+        incremental = self.incremental
+        fin = len(incremental.lineas) - self._sufijo
+        nuevas = self.lineas[self._inicio:len(self.lineas) - self._sufijo]
+        resultados = incremental.aplicar_edicion(self._inicio, fin, nuevas, limite=limite)
+        self._inicio = len(self.lineas)
+        self._sufijo = len(self.lineas)
+        self.modificado = False
+        self.sin_publicar = False
+        return diagnosticos_lsp(*resultados, incremental.lineas, codificacion, self._conversiones)
+
+    def continuar(self, codificacion="utf-16", limite=None, publicar=None):
+        """
+        Retoma el re-análisis pendiente
+
+        Args:
+            codificacion (str): Codificación de las posiciones ('utf-16' o 'utf-32')
+            limite (float): Segundos como máximo (por defecto, hasta terminar)
+            publicar (callable): Se consulta al terminar el análisis; si retorna
+                False, los diagnósticos no se arman y quedan para diagnosticos()
+
+        Returns:
+            list: Diagnósticos de LSP de todo el documento si el análisis
+            terminó, o None si todavía queda pendiente (o no se deben publicar)
+        """
+        if not self.incremental.continuar(limite=limite):
+            return None
+        if publicar is not None and not publicar():
+            self.sin_publicar = True
+            return None
+        return self.diagnosticos(codificacion)
+
+    def diagnosticos(self, codificacion="utf-16"):
+        """
+        Diagnósticos de LSP de los resultados guardados, sin re-analizar
+
+        Returns:
+            list: Diagnósticos de LSP de todo el documento
+        """
+        self.sin_publicar = False
+        return diagnosticos_lsp(*self.incremental.resultados(), self.incremental.lineas, codificacion,
+                                self._conversiones)
+
+
+class ServidorLSP:
+    """
+    Servidor LSP de un único cliente
+
+    Un hilo lee los mensajes de la entrada y los deja en una cola. El hilo que
+    llama a ejecutar() procesa todos los que estén esperando. Recién cuando la
+    cola queda vacía analiza los documentos modificados y publica sus
+    diagnósticos. Así una ráfaga de cambios produce un solo análisis.
+
+    Cada edición se re-analiza durante PRESUPUESTO_ANALISIS segundos como
+    máximo antes de publicar. Mientras no lleguen mensajes, el análisis
+    pendiente se continúa por tramos de TRAMO_PENDIENTE segundos, y los
+    diagnósticos se vuelven a publicar al terminar.
+    """
+
+    def __init__(self, tokens_json, entrada, salida):
+        """
+        Args:
+            tokens_json (dict): Categorías de tokens (Tokens.json)
+            entrada: Flujo binario del que se leen los mensajes
+            salida: Flujo binario en el que se escriben las respuestas
+        """
+        self.tokens_json = tokens_json
+        self.entrada = entrada
+        self.salida = salida
+        self.documentos = {}           # uri -> Documento
+        self.codificacion = "utf-16"   # Codificación de las posiciones acordada en initialize
+        self.inicializado = False
+        self.apagado = False           # Se recibió 'shutdown'
+        self.codigo_salida = None      # Se fija al recibir 'exit'
+        self._metodos = {
+            "initialize": self._initialize,
+            "initialized": self._ignorar,
+            "shutdown": self._shutdown,
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+        }
+
+    def ejecutar(self):
+        """
+        Atiende mensajes hasta recibir 'exit' o hasta que la entrada termine
+
+        Returns:
+            int: Código de salida (0 si 'exit' llegó después de 'shutdown', 1 si no)
+        """
+        cola = queue.Queue()
+        threading.Thread(target=self._leer, args=(cola,), daemon=True).start()
+
+        while True:
+            if any(documento.pendiente for documento in self.documentos.values()):
+                try:
+                    mensaje = cola.get_nowait()
+                except queue.Empty:
+                    self._continuar_pendiente(cola)
+                    continue
+            else:
+                mensaje = cola.get()
+            while True:
+                if mensaje is None:
+                    return 0 if self.apagado else 1
+                self._procesar(mensaje)
+                if self.codigo_salida is not None:
+                    return self.codigo_salida
+                try:
+                    mensaje = cola.get_nowait()
+                except queue.Empty:
+                    break
+            self._publicar_modificados()
+
+    def _leer(self, cola):
+        """Hilo lector: deja en la cola cada mensaje, o el ValueError si no es JSON válido"""
+        try:
+            while True:
+                cuerpo = leer_mensaje(self.entrada)
+                if cuerpo is None:
+                    break
+                try:
+                    cola.put(json.loads(cuerpo))
+                except ValueError as error:
+                    cola.put(error)
+        except (OSError, ValueError) as error:
+            # Sin la longitud del mensaje no se puede seguir leyendo
+            print(f"⚠ Error al leer la entrada: {error}", file=sys.stderr)
+        cola.put(None)
+
+    def _procesar(self, mensaje):
+        """Despacha un mensaje a su manejador y responde si es una petición"""
+        if isinstance(mensaje, ValueError):
+            self._responder_error(None, ERROR_PARSEO, f"JSON inválido: {mensaje}")
+            return
+        if not isinstance(mensaje, dict) or "method" not in mensaje:
+            return  # Respuestas del cliente: el servidor no envía peticiones
+
+        metodo = mensaje["method"]
+        params = mensaje.get("params") or {}
+        manejador = self._metodos.get(metodo)
+
+        if "id" not in mensaje:
+            # Notificación: antes de initialize solo se atiende 'exit'
+            if manejador is not None and (self.inicializado or metodo == "exit"):
+                try:
+                    manejador(params)
+                except Exception:
+                    print(f"⚠ Error al procesar '{metodo}':\n{traceback.format_exc()}", file=sys.stderr)
+            return
+
+        identificador = mensaje["id"]
+        if not self.inicializado and metodo != "initialize":
+            self._responder_error(identificador, ERROR_NO_INICIALIZADO, "El servidor no fue inicializado")
+        elif self.apagado:
+            self._responder_error(identificador, ERROR_PETICION_INVALIDA, "El servidor se está apagando")
+        elif manejador is None:
+            self._responder_error(identificador, ERROR_METODO_NO_ENCONTRADO, f"Método no soportado: {metodo}")
+        else:
+            try:
+                resultado = manejador(params)
+            except Exception as error:
+                print(f"⚠ Error al procesar '{metodo}':\n{traceback.format_exc()}", file=sys.stderr)
+                self._responder_error(identificador, ERROR_INTERNO, str(error))
+            else:
+                escribir_mensaje(self.salida, {"jsonrpc": "2.0", "id": identificador, "result": resultado})
+
+    def _responder_error(self, identificador, codigo, mensaje):
+        escribir_mensaje(self.salida, {"jsonrpc": "2.0", "id": identificador,
+                                       "error": {"code": codigo, "message": mensaje}})
+
+    def _notificar(self, metodo, params):
+        escribir_mensaje(self.salida, {"jsonrpc": "2.0", "method": metodo, "params": params})
+
+    def _publicar(self, uri, version, diagnosticos):
+        params = {"uri": uri, "diagnostics": diagnosticos}
+        if version is not None:
+            params["version"] = version
+        self._notificar("textDocument/publishDiagnostics", params)
+
+    def _publicar_modificados(self):
+        """Analiza los documentos modificados y publica sus diagnósticos (y los que quedaron sin publicar)"""
+        for documento in self.documentos.values():
+            if documento.modificado:
+                self._analizar(documento, documento.analizar, PRESUPUESTO_ANALISIS)
+            elif documento.sin_publicar:
+                self._analizar(documento, lambda codificacion, limite: documento.diagnosticos(codificacion), None)
+
+    def _continuar_pendiente(self, cola):
+        """
+        Continúa un tramo del análisis pendiente de un documento y publica si terminó
+
+        Si al terminar ya hay mensajes en la cola, la publicación queda para
+        después de procesarlos (ver _publicar_modificados): un cambio nuevo
+        la haría obsoleta antes de llegar al editor.
+        """
+        for documento in self.documentos.values():
+            if documento.pendiente:
+                self._analizar(documento, lambda codificacion, limite: documento.continuar(
+                    codificacion, limite, publicar=cola.empty), TRAMO_PENDIENTE)
+                return
+
+    def _analizar(self, documento, analisis, limite):
+        """
+        Ejecuta analisis(codificacion, limite) sobre un documento y publica los diagnósticos que retorna
+
+        Si el análisis falla, el documento se vuelve a analizar completo con
+        el próximo cambio.
+        """
+        try:
+            diagnosticos = analisis(self.codificacion, limite)
+        except Exception:
+            print(f"⚠ Error al analizar {documento.uri}:\n{traceback.format_exc()}", file=sys.stderr)
+            # El estado incremental puede haber quedado a medio actualizar
+            documento.incremental.reiniciar()
+            documento.reemplazar("\n".join(documento.lineas))
+            documento.modificado = False
+            return
+        if diagnosticos is not None:
+            self._publicar(documento.uri, documento.version, diagnosticos)
+
+    # Manejadores de los métodos del protocolo
+
+    def _initialize(self, params):
+        general = (params.get("capabilities") or {}).get("general") or {}
+        if "utf-32" in (general.get("positionEncodings") or ()):
+            self.codificacion = "utf-32"
+        self.inicializado = True
+        return {
+            "capabilities": {
+                "positionEncoding": self.codificacion,
+                "textDocumentSync": {"openClose": True, "change": SINCRONIZACION_INCREMENTAL},
+            },
+            "serverInfo": {"name": NOMBRE_SERVIDOR},
+        }
+
+    def _ignorar(self, params):
+        return None
+
+    def _shutdown(self, params):
+        self.apagado = True
+        return None
+
+    def _exit(self, params):
+        self.codigo_salida = 0 if self.apagado else 1
+
+    def _did_open(self, params):
+        documento = params["textDocument"]
+        self.documentos[documento["uri"]] = Documento(documento["uri"], documento.get("version"),
+                                                      documento["text"], self.tokens_json)
+
+    def _did_change(self, params):
+        identificador = params["textDocument"]
+        documento = self.documentos.get(identificador["uri"])
+        if documento is None:
+            print(f"⚠ Cambio en un documento que no está abierto: {identificador['uri']}", file=sys.stderr)
+            return
+        documento.version = identificador.get("version")
+        for cambio in params["contentChanges"]:
+            documento.aplicar_cambio(cambio, self.codificacion)
+
+    def _did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        if self.documentos.pop(uri, None) is not None:
+            # Al cerrar, el editor deja de mostrar los diagnósticos del documento
+            self._publicar(uri, None, [])
+
+
+def main(argv=None):
+    """
+    Punto de entrada por línea de comandos
+
+    Returns:
+        int: Código de salida del servidor
+    """
+    parser = argparse.ArgumentParser(description="Servidor LSP del analizador léxico y gramatical (stdio)")
+    parser.add_argument("--tokens", default=RUTA_TOKENS, help="Ruta de Tokens.json")
+    args = parser.parse_args(argv)
+
+    with open(args.tokens, "r", encoding="utf-8") as archivo:
+        tokens_json = json.load(archivo)
+
+    # La salida estándar es el canal del protocolo: cualquier print va a stderr
+    salida = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    return ServidorLSP(tokens_json, sys.stdin.buffer, salida).ejecutar()
+
+
+if __name__ == "__main__":
+    codigo_salida = main()
+    # El hilo lector puede seguir bloqueado leyendo stdin: se sale sin esperarlo
+    sys.stderr.flush()
+    os._exit(codigo_salida)
@@ -0,0 +1,424 @@
+"""
+Tabla de símbolos con ámbitos anidados
+
+Cada nombre apunta a su enlace visible, una tupla (valor, nivel, anterior):
+el enlace que oculta (de un ámbito exterior) queda encadenado en `anterior`.
+Cada ámbito anidado guarda los nombres que declaró (registro para deshacer),
+así que al cerrarlo solo se recorren sus propias declaraciones. Declarar,
+buscar y cerrar un ámbito cuestan O(1) amortizado por declaración.
+
+Los enlaces viven en un trie de hash persistente (nodos inmutables una vez
+compartidos). Los cambios se acumulan en un diccionario y se vuelcan al trie
+recién al capturar el estado, copiando solo los caminos de los nombres que
+cambiaron. Así una captura no copia la tabla: es la raíz del trie, y
+restaurarla es O(1). Dos capturas con los mismos enlaces tienen la misma
+forma de trie, y al compararlas se saltean los subárboles compartidos.
+"""
+from collections.abc import Mapping
+
+_BITS = 4                          # Bits del hash por nivel del trie
+_RAMAS = 1 << _BITS
+_MASCARA = _RAMAS - 1
+_PROFUNDIDAD = 64 // _BITS         # Niveles hasta agotar el hash: más abajo, un dict con las colisiones
+_MASCARA_HASH = (1 << 64) - 1
+_AUSENTE = object()
+
+
+def _nodo_vacio():
+    return [None] * _RAMAS
+
+
+def _buscar(raiz, nombre):
+    """Enlace de `nombre` en el trie, o None"""
+    codigo = hash(nombre) & _MASCARA_HASH
+    nodo = raiz
+    while True:
+        nodo = nodo[codigo & _MASCARA]
+        if nodo is None:
+            return None
+        tipo = type(nodo)
+        if tipo is tuple:
+            return nodo[1] if nodo[0] == nombre else None
+        if tipo is dict:
+            return nodo.get(nombre)
+        codigo >>= _BITS
+
+
+def _propio(nodo, propios):
+    """El nodo, o una copia si está compartido (no se creó en este volcado)"""
+    if id(nodo) in propios:
+        return nodo
+    copia = list(nodo)
+    propios[id(copia)] = copia
+    return copia
+
+
+def _con(casilla, codigo, profundidad, nombre, enlace, propios):
+    """
+    Casilla del trie con `nombre` apuntando a `enlace`
+
+    Args:
+        casilla: None, hoja (nombre, enlace), nodo (list) o colisiones (dict)
+        codigo (int): Hash de `nombre` sin los bits ya usados por los niveles superiores
+        profundidad (int): Niveles por encima de la casilla
+        nombre (str): Nombre del símbolo
+        enlace (tuple): Enlace del símbolo
+        propios (dict): Nodos creados en este volcado (se modifican sin copiar)
+
+    Returns:
+        Nueva casilla (los nodos compartidos no se modifican)
+    """
+    if casilla is None:
+        return (nombre, enlace)
+    tipo = type(casilla)
+    if tipo is tuple:
+        if casilla[0] == nombre:
+            return (nombre, enlace)
+        if profundidad == _PROFUNDIDAD:
+            return {casilla[0]: casilla[1], nombre: enlace}
+        nodo = _nodo_vacio()
+        propios[id(nodo)] = nodo
+        otro = (hash(casilla[0]) & _MASCARA_HASH) >> (_BITS * profundidad)
+        nodo[otro & _MASCARA] = casilla
+        return _con(nodo, codigo, profundidad, nombre, enlace, propios)
+    if tipo is dict:
+        colisiones = dict(casilla)
+        colisiones[nombre] = enlace
+        return colisiones
+    nodo = _propio(casilla, propios)
+    indice = codigo & _MASCARA
+    nodo[indice] = _con(nodo[indice], codigo >> _BITS, profundidad + 1, nombre, enlace, propios)
+    return nodo
+
+
+def _sin(casilla, codigo, nombre, propios, raiz=False):
+    """
+    Casilla del trie sin `nombre`
+
+    Un subárbol que queda con un solo nombre se reemplaza por su hoja, para
+    que la forma del trie dependa solo de su contenido (ver _unificar).
+
+    Args:
+        casilla: None, hoja (nombre, enlace), nodo (list) o colisiones (dict)
+        codigo (int): Hash de `nombre` sin los bits ya usados por los niveles superiores
+        nombre (str): Nombre del símbolo
+        propios (dict): Nodos creados en este volcado (se modifican sin copiar)
+        raiz (bool): La raíz siempre queda como nodo
+
+    Returns:
+        Nueva casilla (los nodos compartidos no se modifican)
+    """
+    if casilla is None:
+        return None
+    tipo = type(casilla)
+    if tipo is tuple:
+        return None if casilla[0] == nombre else casilla
+    if tipo is dict:
+        if nombre not in casilla:
+            return casilla
+        colisiones = dict(casilla)
+        del colisiones[nombre]
+        return next(iter(colisiones.items())) if len(colisiones) == 1 else colisiones
+    indice = codigo & _MASCARA
+    hijo = _sin(casilla[indice], codigo >> _BITS, nombre, propios)
+    if hijo is casilla[indice]:
+        return casilla
+    nodo = _propio(casilla, propios)
+    nodo[indice] = hijo
+    if not raiz:
+        ocupadas = [casilla for casilla in nodo if casilla is not None]
+        if not ocupadas:
+            return None
+        if len(ocupadas) == 1 and type(ocupadas[0]) is tuple:
+            return ocupadas[0]
+    return nodo
+
+
+def _unificar(a, b):
+    """
+    Compara dos casillas del trie salteando los subárboles compartidos
+
+    Los subárboles iguales pero no compartidos pasan a compartirse: así la
+    próxima comparación con una captura posterior de `b` solo recorre lo que
+    cambió desde esta.
+
+    Args:
+        a: Casilla de la tabla actual
+        b: Casilla de la captura
+
+    Returns:
+        tuple: (iguales, `a` con sus subárboles iguales a los de `b` reemplazados por estos)
+    """
+    if a is b:
+        return True, b
+    if type(a) is list and type(b) is list:
+        iguales = True
+        nodo = None
+        for indice, (x, y) in enumerate(zip(a, b)):
+            igual, casilla = _unificar(x, y)
+            iguales = iguales and igual
+            if casilla is not x:
+                if nodo is None:
+                    nodo = list(a)
+                nodo[indice] = casilla
+        if iguales:
+            return True, b
+        return False, a if nodo is None else nodo
+    if a == b:
+        return True, b
+    return False, a
+
+
+def _nombre(par):
+    return par[0]
+
+
+def _recorrer(raiz):
+    """Pares (nombre, enlace) del trie"""
+    pendientes = [raiz]
+    while pendientes:
+        nodo = pendientes.pop()
+        for casilla in nodo:
+            tipo = type(casilla)
+            if tipo is tuple:
+                yield casilla
+            elif tipo is list:
+                pendientes.append(casilla)
+            elif tipo is dict:
+                yield from casilla.items()
+
+
+class VistaSimbolos(Mapping):
+    """
+    Símbolos visibles de una tabla en un momento dado, como diccionario de solo lectura
+
+    No copia los enlaces: guarda la raíz del trie, que ya no se modifica. Se
+    compara igual a un dict con los mismos símbolos; se itera en orden de
+    nombre, como visibles().
+    """
+
+    __slots__ = ("_raiz", "_cantidad")
+
+    def __init__(self, raiz, cantidad):
+        self._raiz = raiz
+        self._cantidad = cantidad
+
+    def __getitem__(self, nombre):
+        enlace = _buscar(self._raiz, nombre)
+        if enlace is None:
+            raise KeyError(nombre)
+        return enlace[0]
+
+    def __len__(self):
+        return self._cantidad
+
+    def __iter__(self):
+        return iter(sorted(nombre for nombre, _ in _recorrer(self._raiz)))
+
+    def __repr__(self):
+        return f"VistaSimbolos({dict(self)!r})"
+
+
+class TablaSimbolos:
+    """
+    Símbolos visibles (nombre -> valor) con ámbitos que se abren y cierran en pila
+
+    El ámbito global (nivel 0) siempre está abierto. Se usa como un
+    diccionario de solo lectura con los símbolos visibles: `nombre in tabla`,
+    `tabla[nombre]`, `len(tabla)` e iteración sobre los nombres.
+    """
+
+    def __init__(self):
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todos los símbolos y deja abierto solo el ámbito global"""
+        self._raiz = _nodo_vacio()   # Trie con los enlaces del último volcado
+        self._vistos = {}            # nombre -> enlace actual (o None) de los nombres ya buscados
+        self._cambios = set()        # Nombres cambiados desde el último volcado
+        self._cantidad = 0           # Símbolos visibles
+        # Por ámbito anidado abierto, los nombres que declaró como lista
+        # enlazada inmutable (nombre, resto); el global nunca se cierra
+        self._deshacer = []
+
+    @property
+    def nivel(self):
+        """Nivel del ámbito actual (0 = global)"""
+        return len(self._deshacer)
+
+    def _enlace(self, nombre):
+        """Enlace visible de `nombre`, o None"""
+        enlace = self._vistos.get(nombre, _AUSENTE)
+        if enlace is _AUSENTE:
+            enlace = self._vistos[nombre] = _buscar(self._raiz, nombre)
+        return enlace
+
+    def _volcar(self):
+        """Pasa los cambios acumulados al trie (copia solo sus caminos)"""
+        if not self._cambios:
+            return
+        raiz = self._raiz
+        propios = {}
+        for nombre in self._cambios:
+            enlace = self._vistos[nombre]
+            codigo = hash(nombre) & _MASCARA_HASH
+            if enlace is None:
+                raiz = _sin(raiz, codigo, nombre, propios, raiz=True)
+            else:
+                raiz = _con(raiz, codigo, 0, nombre, enlace, propios)
+        self._raiz = raiz
+        self._cambios = set()
+
+    def entrar(self):
+        """Abre un ámbito anidado en el actual"""
+        self._deshacer.append(None)
+
+    def salir(self):
+        """Cierra el ámbito actual y vuelve a hacer visibles los símbolos que ocultaba"""
+        if not self._deshacer:
+            return  # El ámbito global no se cierra
+        declarados = self._deshacer.pop()
+        vistos = self._vistos
+        while declarados is not None:
+            nombre, declarados = declarados
+            anterior = self._enlace(nombre)[2]
+            vistos[nombre] = anterior
+            self._cambios.add(nombre)
+            if anterior is None:
+                self._cantidad -= 1
+
+    def declarar(self, nombre, valor=None):
+        """
+        Declara un símbolo en el ámbito actual
+
+        Si el nombre ya estaba declarado en este mismo ámbito se reemplaza su
+        valor; si venía de un ámbito exterior, queda oculto hasta cerrar este.
+
+        Args:
+            nombre (str): Nombre del símbolo
+            valor: Dato asociado (p. ej. el tipo de una variable)
+        """
+        nivel = len(self._deshacer)
+        enlace = self._enlace(nombre)
+        self._cambios.add(nombre)
+        if enlace is not None and enlace[1] == nivel:
+            self._vistos[nombre] = (valor, nivel, enlace[2])
+            return
+        self._vistos[nombre] = (valor, nivel, enlace)
+        if enlace is None:
+            self._cantidad += 1
+        if nivel:
+            self._deshacer[-1] = (nombre, self._deshacer[-1])
+
+    def buscar(self, nombre, defecto=None):
+        """
+        Valor del símbolo visible con ese nombre
+
+        Args:
+            nombre (str): Nombre del símbolo
+            defecto: Valor retornado si no hay ningún símbolo visible
+
+        Returns:
+            Valor del enlace más interno, o `defecto`
+        """
+        enlace = self._enlace(nombre)
+        return defecto if enlace is None else enlace[0]
+
+    def declarado_en_ambito(self, nombre):
+        """
+        Indica si el nombre fue declarado en el ámbito actual (no en uno exterior)
+
+        Args:
+            nombre (str): Nombre del símbolo
+
+        Returns:
+            bool: True si el enlace visible pertenece al ámbito actual
+        """
+        enlace = self._enlace(nombre)
+        return enlace is not None and enlace[1] == len(self._deshacer)
+
+    def visibles(self):
+        """
+        Copia de los símbolos visibles
+
+        Returns:
+            dict: {nombre: valor} ordenado por nombre (el trie no guarda el orden de declaración)
+        """
+        self._volcar()
+        return {nombre: enlace[0] for nombre, enlace in sorted(_recorrer(self._raiz), key=_nombre)}
+
+    def vista(self):
+        """
+        Símbolos visibles sin copiarlos (ver VistaSimbolos)
+
+        Returns:
+            VistaSimbolos: No cambia aunque la tabla cambie después
+        """
+        self._volcar()
+        return VistaSimbolos(self._raiz, self._cantidad)
+
+    def capturar(self):
+        """
+        Captura el estado de la tabla (ámbitos abiertos y enlaces)
+
+        No copia los enlaces: vuelca los cambios pendientes al trie y retorna
+        su raíz, que ya no se modifica.
+
+        Returns:
+            tuple: (registros de los ámbitos anidados, raíz del trie, cantidad de símbolos)
+        """
+        self._volcar()
+        return (tuple(self._deshacer), self._raiz, self._cantidad)
+
+    def restaurar(self, captura):
+        """
+        Restaura un estado capturado con capturar
+
+        Args:
+            captura (tuple): Estado capturado
+        """
+        deshacer, self._raiz, self._cantidad = captura
+        self._deshacer = list(deshacer)
+        self._vistos = {}
+        self._cambios = set()
+
+    def igual(self, captura):
+        """
+        Indica si la tabla está exactamente en el estado capturado
+
+        Compara los tries desde la raíz y saltea los subárboles compartidos:
+        después de restaurar un estado anterior solo difieren los caminos de
+        los nombres cambiados desde entonces. Los subárboles iguales pasan a
+        compartirse con la captura (ver _unificar).
+
+        Args:
+            captura (tuple): Estado capturado
+
+        Returns:
+            bool: True si los ámbitos abiertos y todos los enlaces coinciden
+        """
+        if len(self._deshacer) != len(captura[0]) or self._cantidad != captura[2]:
+            return False
+        self._volcar()
+        iguales, self._raiz = _unificar(self._raiz, captura[1])
+        return iguales
+
+    def __contains__(self, nombre):
+        return self._enlace(nombre) is not None
+
+    def __getitem__(self, nombre):
+        enlace = self._enlace(nombre)
+        if enlace is None:
+            raise KeyError(nombre)
+        return enlace[0]
+
+    def __len__(self):
+        return self._cantidad
+
+    def __iter__(self):
+        # En el orden del trie (arbitrario); visibles() los ordena por nombre
+        self._volcar()
+        return (nombre for nombre, _ in _recorrer(self._raiz))
+
+    def __repr__(self):
+        return f"TablaSimbolos(nivel={self.nivel}, simbolos={self.visibles()!r})"
@@ -0,0 +1,247 @@
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class TablaVirtual(tk.Frame):
+    """
+    Tabla de solo lectura que dibuja únicamente las filas visibles
+
+    Las filas se guardan como tuplas en una lista; el canvas mantiene un número
+    fijo de elementos (los que caben en pantalla) y al desplazarse solo cambia
+    su texto. Así el tiempo de dibujo no depende de la cantidad de filas y
+    ordenar por una columna no crea ni destruye widgets.
+
+    Si la tabla es más ancha que el espacio disponible, se desplaza en
+    horizontal (encabezados y filas juntos). El texto que no cabe en su
+    columna se acorta con '…'.
+    """
+
+    COLOR_ENCABEZADO = "#2c3e50"
+    COLORES_FILAS = ["#ecf0f1", "#ffffff"]
+    MARGEN_CELDA = 6   # Píxeles libres a cada lado del texto de una celda
+
+    def __init__(self, master, columnas, claves_orden=None, ancho_columna=180, alto_fila=22, **kwargs):
+        """
+        Args:
+            master: Widget contenedor
+            columnas (list): Títulos de las columnas
+            claves_orden (list): Función clave de orden por columna (None = valor de la celda)
+            ancho_columna (int): Ancho en píxeles de cada columna
+            alto_fila (int): Alto en píxeles de cada fila
+        """
+        super().__init__(master, bg="white", **kwargs)
+        self.columnas = columnas
+        self.claves_orden = claves_orden or [None] * len(columnas)
+        self.ancho_columna = ancho_columna
+        self.alto_fila = alto_fila
+
+        self.filas = []
+        self.primera = 0             # Índice de la primera fila visible
+        self.orden = (None, False)   # (columna, descendente)
+        self.elementos = []          # Por fila visible: (rectángulo, [textos])
+        self.fuente = tkfont.Font(family="Arial", size=9)
+        self._recortes = {}          # Texto de una celda -> texto que cabe en la columna
+        ancho_total = ancho_columna * len(columnas)
+
+        # Encabezados: un clic ordena por esa columna (otro clic invierte el orden).
+        # Son un canvas aparte para desplazarse en horizontal junto con las filas
+        self.encabezado = tk.Canvas(self, bg="white", highlightthickness=0,
+                                    width=ancho_total, height=alto_fila + 4)
+        self.encabezado.configure(scrollregion=(0, 0, ancho_total, alto_fila + 4))
+        self.botones = []
+        for col, texto in enumerate(columnas):
+            etiqueta = f"columna{col}"
+            self.encabezado.create_rectangle(col * ancho_columna, 0, (col + 1) * ancho_columna - 1,
+                                             alto_fila + 3, fill=self.COLOR_ENCABEZADO, outline="black",
+                                             tags=etiqueta)
+            boton = self.encabezado.create_text(col * ancho_columna + ancho_columna // 2, (alto_fila + 4) // 2,
+                                                text=texto, fill="white", font=("Arial", 10, "bold"),
+                                                tags=etiqueta)
+            self.encabezado.tag_bind(etiqueta, "<Button-1>", lambda e, c=col: self.ordenar(c))
+            self.botones.append(boton)
+        self.encabezado.configure(cursor="hand2")
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.scrollbar_x = tk.Scrollbar(self, orient="horizontal", command=self._desplazar_x)
+
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0, width=ancho_total,
+                                xscrollcommand=self.scrollbar_x.set)
+
+        self.encabezado.grid(row=0, column=0, sticky="ew")
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.scrollbar_x.grid(row=2, column=0, sticky="ew")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self._dibujar())
+        self.canvas.bind("<MouseWheel>", self._rueda)
+        self.canvas.bind("<Button-4>", lambda e: self._mover(-3))
+        self.canvas.bind("<Button-5>", lambda e: self._mover(3))
+
+    def establecer_filas(self, filas):
+        """
+        Reemplaza el contenido de la tabla
+
+        Args:
+            filas (list): Tuplas con un valor por columna
+        """
+        self.filas = list(filas)
+        self._recortes = {}
+        columna, descendente = self.orden
+        if columna is not None:
+            self._ordenar_filas(columna, descendente)
+        self.primera = 0
+        self._dibujar()
+
+    def ordenar(self, columna):
+        """
+        Ordena por una columna; si ya estaba ordenada por ella invierte el sentido
+
+        Args:
+            columna (int): Índice de la columna
+        """
+        anterior, descendente = self.orden
+        descendente = not descendente if anterior == columna else False
+        self.orden = (columna, descendente)
+        self._ordenar_filas(columna, descendente)
+
+        for col, boton in enumerate(self.botones):
+            marca = (" ▼" if descendente else " ▲") if col == columna else ""
+            self.encabezado.itemconfigure(boton, text=self.columnas[col] + marca)
+
+        self.primera = 0
+        self._dibujar()
+
+    def _ordenar_filas(self, columna, descendente):
+        """Ordena la lista de filas (sin tocar widgets)"""
+        clave = self.claves_orden[columna] or (lambda fila: fila[columna])
+        self.filas.sort(key=clave, reverse=descendente)
+
+    def _visibles(self):
+        """Cantidad de filas que caben en el canvas"""
+        return max(1, self.canvas.winfo_height() // self.alto_fila + 1)
+
+    def _recortar(self, valor):
+        """
+        Texto de una celda acortado con '…' para que quepa en la columna
+
+        Args:
+            valor: Valor de la celda
+
+        Returns:
+            str: El texto completo si cabe, o su prefijo más largo que cabe seguido de '…'
+        """
+        texto = str(valor)
+        recortado = self._recortes.get(texto)
+        if recortado is None:
+            disponible = self.ancho_columna - 2 * self.MARGEN_CELDA
+            recortado = texto
+            if self.fuente.measure(texto) > disponible:
+                # Búsqueda binaria del prefijo más largo que cabe con el '…'
+                bajo, alto = 0, len(texto)
+                while bajo < alto:
+                    medio = (bajo + alto + 1) // 2
+                    if self.fuente.measure(texto[:medio] + "…") <= disponible:
+                        bajo = medio
+                    else:
+                        alto = medio - 1
+                recortado = texto[:bajo] + "…"
+            self._recortes[texto] = recortado
+        return recortado
+
+    def _dibujar(self):
+        """Actualiza los elementos del canvas para mostrar las filas visibles"""
+        visibles = self._visibles()
+        ancho_total = self.ancho_columna * len(self.columnas)
+        self.canvas.configure(scrollregion=(0, 0, ancho_total, self.canvas.winfo_height()))
+
+        # Crear elementos faltantes solo cuando el canvas crece
+        while len(self.elementos) < visibles:
+            y = len(self.elementos) * self.alto_fila
+            fondo = self.canvas.create_rectangle(0, y, self.ancho_columna * len(self.columnas),
+                                                 y + self.alto_fila, outline="#bdc3c7")
+            textos = [self.canvas.create_text(col * self.ancho_columna + self.ancho_columna // 2,
+                                              y + self.alto_fila // 2, text="", font=self.fuente)
+                      for col in range(len(self.columnas))]
+            self.elementos.append((fondo, textos))
+
+        total = len(self.filas)
+        self.primera = max(0, min(self.primera, total - visibles + 1))
+
+        for posicion, (fondo, textos) in enumerate(self.elementos):
+            indice = self.primera + posicion
+            if indice < total and posicion < visibles:
+                fila = self.filas[indice]
+                self.canvas.itemconfigure(fondo, state="normal",
+                                          fill=self.COLORES_FILAS[(indice + 1) % 2])
+                for texto, valor in zip(textos, fila):
+                    self.canvas.itemconfigure(texto, state="normal", text=self._recortar(valor))
+            else:
+                self.canvas.itemconfigure(fondo, state="hidden")
+                for texto in textos:
+                    self.canvas.itemconfigure(texto, state="hidden")
+
+        if total:
+            self.scrollbar.set(self.primera / total, min(1.0, (self.primera + visibles) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _desplazar_x(self, *argumentos):
+        """Comando de la scrollbar horizontal: desplaza encabezados y filas juntos"""
+        self.canvas.xview(*argumentos)
+        self.encabezado.xview(*argumentos)
+
+    def _mover(self, filas):
+        """Desplaza la vista una cantidad de filas"""
+        self.primera += filas
+        self._dibujar()
+
+    def _rueda(self, evento):
+        """Desplazamiento con la rueda del mouse (Windows / macOS)"""
+        self._mover(-3 if evento.delta > 0 else 3)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la scrollbar: 'moveto fracción' o 'scroll n units|pages'"""
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.filas))
+            self._dibujar()
+        elif accion == "scroll":
+            paso = self._visibles() - 1 if unidad == "pages" else 1
+            self._mover(int(cantidad) * paso)
+
+
+def crear_tabla_tokens(master):
+    """
+    Crea la tabla de tokens (TOKEN, TIPO, CANTIDAD) con orden por cada columna
+
+    Args:
+        master: Widget contenedor
+
+    Returns:
+        TablaVirtual: La tabla creada (sin empaquetar)
+    """
+    return TablaVirtual(
+        master,
+        ["TOKEN", "TIPO", "CANTIDAD"],
+        claves_orden=[
+            lambda fila: fila[0],
+            lambda fila: (fila[1], fila[0]),
+            lambda fila: (fila[2], fila[0]),
+        ],
+    )
+
+
+def filas_tokens(tokens_dict):
+    """
+    Convierte el diccionario de tokens en filas ordenadas por tipo y nombre
+
+    Args:
+        tokens_dict (dict): {token: {Token, Tipo, Cantidad}}
+
+    Returns:
+        list: Tuplas (token, tipo, cantidad)
+    """
+    filas = [(datos["Token"], datos["Tipo"], datos["Cantidad"]) for datos in tokens_dict.values()]
+    filas.sort(key=lambda fila: (fila[1], fila[0]))
+    return filas
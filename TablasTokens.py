@@ -0,0 +1,472 @@
+"""
+Tablas de tokens compiladas a partir de Tokens.json
+
+Tokens.json se compila una sola vez en una TablaTokens inmutable: el
+diccionario token -> categoría y token -> código de tipo (también en bytes),
+los conjuntos de tokens reservados y de tipos de datos, y los patrones del
+analizador léxico. Si Tokens.json define operadores o signos que la
+alternancia maestra no reconoce como un solo token (p. ej. '&&' o '->'), se
+agregan al patrón en un grupo propio; si no, se usan PATRON_MAESTRO y
+PATRON_MAESTRO_BYTES tal cual.
+
+Las tablas se comparten:
+    - en el proceso, por contenido: todos los analizadores (y todos los
+      perfiles de lenguaje) con las mismas categorías usan la misma tabla
+    - entre ejecuciones, en disco: la tabla de un archivo se guarda en
+      __pycache__/<archivo>.tablas junto al hash SHA-256 de sus bytes, y al
+      iniciar se reutiliza sin volver a leer el JSON ni compilar nada
+
+Un PerfilTokens sigue un archivo de tokens y lo recarga cuando cambia su
+mtime o su tamaño (ver PerfilTokens.actualizar); los analizadores lo
+consultan al empezar cada análisis.
+
+Uso:
+    perfil = perfil_tokens("Tokens.json")
+    tabla = perfil.tabla
+    tabla.categorias.get("mientras")   # 'Preservada'
+"""
+import hashlib
+import json
+import marshal
+import os
+import re
+import threading
+import weakref
+
+from Registro import advertir, informar
+
+# Tipos de token internados: LineaTokens guarda el índice (un byte) en lugar del nombre
+TIPOS_TOKEN = ("Preservada", "operadores", "signos", "cadena", "numeros", "identificadores", "desconocido")
+CODIGOS_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_TOKEN)}
+
+# Categorías que se consultan en Tokens.json, en orden de prioridad
+CATEGORIAS_JSON = ("Preservada", "operadores", "signos")
+
+# Grupos de la alternancia maestra, en orden: el grupo que coincide (lastgroup)
+# ya indica la categoría del token. Las cadenas no cruzan saltos de línea para
+# poder recorrer un archivo completo de una vez.
+GRUPOS_MAESTRO = (
+    ("cadena", r'"(?:\\.|[^"\\\n])*"'),
+    ("numeros", r'\d+(?!\w)'),
+    ("identificadores", r'[a-zA-Z_][a-zA-Z0-9_]*(?!\w)'),
+    ("palabra", r'\w+'),
+    ("operadores", r'==|!=|<=|>=|\+\+|--|[+\-*/=<>%]'),
+    ("signos", r'[(){}\[\];,]'),
+    ("salto", r'\n'),
+)
+
+# Los mismos grupos en bytes para recorrer archivos mapeados en memoria. Los
+# saltos de línea siguen las reglas de los archivos abiertos en modo texto:
+# '\r\n', '\r' o '\n'; el grupo 'no_ascii' marca las líneas que se decodifican
+# y se tokenizan como texto.
+GRUPOS_MAESTRO_BYTES = (
+    ("cadena", rb'"(?:\\[^\r\n]|[^"\\\r\n])*"'),
+    ("numeros", rb'\d+(?!\w)'),
+    ("identificadores", rb'[a-zA-Z_][a-zA-Z0-9_]*(?!\w)'),
+    ("palabra", rb'\w+'),
+    ("operadores", rb'==|!=|<=|>=|\+\+|--|[+\-*/=<>%]'),
+    ("signos", rb'[(){}\[\];,]'),
+    ("salto", rb'\r\n?|\n'),
+    ("no_ascii", rb'[\x80-\xff]+'),
+)
+
+# Grupo con los tokens de Tokens.json que la alternancia maestra no reconoce;
+# va después de 'cadena' para que tenga prioridad sobre los demás
+GRUPO_RESERVADOS = "reservados"
+
+
+def _alternancia(grupos, reservados=None):
+    """
+    Arma la alternancia de grupos con nombre
+
+    Args:
+        grupos (tuple): Pares (nombre, patrón) en str o en bytes
+        reservados: Patrón del grupo GRUPO_RESERVADOS (None si no hace falta)
+
+    Returns:
+        str o bytes: Patrón completo
+    """
+    if reservados is not None:
+        grupos = grupos[:1] + ((GRUPO_RESERVADOS, reservados),) + grupos[1:]
+    if isinstance(grupos[0][1], bytes):
+        return b"|".join(b"(?P<" + nombre.encode("ascii") + b">" + patron + b")" for nombre, patron in grupos)
+    return "|".join(f"(?P<{nombre}>{patron})" for nombre, patron in grupos)
+
+
+PATRON_MAESTRO = re.compile(_alternancia(GRUPOS_MAESTRO))
+PATRON_MAESTRO_BYTES = re.compile(_alternancia(GRUPOS_MAESTRO_BYTES))
+
+# Categoría por defecto de cada grupo del patrón maestro (si el token no está en Tokens.json)
+CATEGORIA_POR_GRUPO = {
+    "cadena": "cadena",
+    "numeros": "numeros",
+    "identificadores": "identificadores",
+    "palabra": "desconocido",
+    "operadores": "desconocido",
+    "signos": "desconocido",
+    "salto": "desconocido",
+    GRUPO_RESERVADOS: "desconocido",
+}
+CODIGO_POR_GRUPO = {grupo: CODIGOS_TIPO[categoria] for grupo, categoria in CATEGORIA_POR_GRUPO.items()}
+
+# Formato del caché en disco; cambiarlo invalida los archivos .tablas ya escritos
+VERSION_CACHE = 1
+DIRECTORIO_CACHE = "__pycache__"
+
+
+# Tablas de una TablaTokens que se guardan en el caché en disco (todas las
+# estructuras salvo los patrones, que se compilan con los extras)
+CAMPOS_CACHE = ("tokens_json", "categorias", "codigos", "codigos_bytes", "reservadas", "preservadas", "extras")
+
+
+class TablaTokens:
+    """
+    Tablas de búsqueda compiladas de un Tokens.json
+
+    Es inmutable una vez creada (ninguno de sus diccionarios se modifica), así
+    que la comparten todos los analizadores del proceso con las mismas
+    categorías. Se crea con compilar_tabla o cargar_tabla.
+
+    Atributos:
+        tokens_json (dict): Categoría -> tupla de tokens
+        categorias (dict): Token -> categoría (gana la primera de CATEGORIAS_JSON)
+        codigos (dict): Token -> código de tipo (ver TIPOS_TOKEN)
+        codigos_bytes (dict): Lo mismo con los tokens ASCII como bytes
+        reservadas (frozenset): Tokens definidos en Tokens.json
+        tipos_datos (tuple): Palabras reservadas en el orden del archivo
+        preservadas (frozenset): Las mismas palabras reservadas
+        extras (tuple): Tokens que necesitan el grupo GRUPO_RESERVADOS
+        patron, patron_bytes: Alternancia maestra en str y en bytes
+    """
+    __slots__ = ("huella",) + CAMPOS_CACHE + ("tipos_datos", "patron", "patron_bytes", "_derivadas",
+                                             "__weakref__")
+
+    def __init__(self, huella, tablas):
+        """
+        Args:
+            huella (str): Hash de las categorías (ver huella_tokens)
+            tablas (dict): Un valor por cada campo de CAMPOS_CACHE
+        """
+        self.huella = huella
+        for campo in CAMPOS_CACHE:
+            setattr(self, campo, tablas[campo])
+        self.tipos_datos = self.tokens_json.get("Preservada", ())
+        self.patron, self.patron_bytes = _compilar_patrones(self.extras)
+        self._derivadas = {}
+
+    def derivada(self, clave, calcular):
+        """
+        Tabla derivada de esta, calculada una sola vez y compartida
+
+        Sirve a los analizadores que arman sus propias tablas a partir de los
+        tokens (p. ej. la clase de cada token en AnalizadorGramatical).
+
+        Args:
+            clave (str): Nombre de la tabla derivada
+            calcular (callable): calcular(tabla) la crea si todavía no existe
+
+        Returns:
+            El resultado de calcular (no debe modificarse)
+        """
+        derivada = self._derivadas.get(clave)
+        if derivada is None:
+            derivada = self._derivadas.setdefault(clave, calcular(self))
+        return derivada
+
+    def __repr__(self):
+        return f"TablaTokens({self.huella[:12]}, {len(self.categorias)} tokens)"
+
+
+def _compilar_patrones(extras):
+    """
+    Patrones del analizador léxico con los tokens extra de Tokens.json
+
+    Args:
+        extras (tuple): Tokens que la alternancia maestra no reconoce
+
+    Returns:
+        tuple: (patrón en str, patrón en bytes)
+    """
+    if not extras:
+        return PATRON_MAESTRO, PATRON_MAESTRO_BYTES
+    # Los más largos primero, para que '<<=' gane sobre '<<'
+    ordenados = sorted(extras, key=len, reverse=True)
+    patron = re.compile(_alternancia(GRUPOS_MAESTRO, "|".join(map(re.escape, ordenados))))
+    # Los tokens no ASCII solo aparecen en líneas que se tokenizan como texto
+    ascii_ = [token.encode("ascii") for token in ordenados if token.isascii()]
+    if not ascii_:
+        return patron, PATRON_MAESTRO_BYTES
+    return patron, re.compile(_alternancia(GRUPOS_MAESTRO_BYTES, b"|".join(map(re.escape, ascii_))))
+
+
+def huella_tokens(tokens_json):
+    """
+    Hash de las categorías de un Tokens.json, independiente del formato del archivo
+
+    Args:
+        tokens_json (dict): Categorías de tokens
+
+    Returns:
+        str: SHA-256 en hexadecimal
+    """
+    canonico = json.dumps(tokens_json, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+
+def _normalizar(tokens_json):
+    """
+    Copia las categorías como tuplas de str y valida su forma
+
+    Raises:
+        ValueError: Si no es un objeto de listas de tokens
+    """
+    if not isinstance(tokens_json, dict):
+        raise ValueError("⚠ Tokens.json debe ser un objeto con listas de tokens por categoría")
+    normalizado = {}
+    for categoria, tokens in tokens_json.items():
+        if not isinstance(tokens, (list, tuple)) or not all(isinstance(token, str) for token in tokens):
+            raise ValueError(f"⚠ La categoría '{categoria}' de Tokens.json debe ser una lista de tokens")
+        normalizado[categoria] = tuple(tokens)
+    return normalizado
+
+
+def _tokens_extra(categorias):
+    """Operadores y signos que la alternancia maestra no reconoce como un solo token"""
+    extras = []
+    for token, categoria in categorias.items():
+        if categoria == "Preservada" or not token:
+            continue
+        coincidencia = PATRON_MAESTRO.match(token)
+        if coincidencia is None or coincidencia.end() != len(token):
+            extras.append(token)
+    return tuple(extras)
+
+
+# Tablas compiladas del proceso, por huella. Una tabla vive mientras algún
+# analizador o perfil la use; después se descarta sola
+_tablas = weakref.WeakValueDictionary()
+_cerrojo_tablas = threading.Lock()
+
+
+def _tabla_compartida(huella, crear):
+    """Retorna la tabla del proceso con esa huella, creándola con crear() si no existe"""
+    with _cerrojo_tablas:
+        tabla = _tablas.get(huella)
+        if tabla is None:
+            tabla = crear()
+            _tablas[huella] = tabla
+        return tabla
+
+
+def compilar_tabla(tokens_json):
+    """
+    Compila las categorías de un Tokens.json ya cargado
+
+    Args:
+        tokens_json (dict): Categorías de tokens
+
+    Returns:
+        TablaTokens: Tabla compartida por todo el proceso
+
+    Raises:
+        ValueError: Si las categorías no tienen la forma de Tokens.json
+    """
+    normalizado = _normalizar(tokens_json)
+    huella = huella_tokens(normalizado)
+    return _tabla_compartida(huella, lambda: _compilar(huella, normalizado))
+
+
+def _compilar(huella, tokens_json):
+    """Crea la TablaTokens de unas categorías ya normalizadas"""
+    # Si un token aparece en varias categorías gana la primera
+    categorias = {}
+    for categoria in CATEGORIAS_JSON:
+        for token in tokens_json.get(categoria, ()):
+            categorias.setdefault(token, categoria)
+    codigos = {token: CODIGOS_TIPO[categoria] for token, categoria in categorias.items()}
+    return TablaTokens(huella, {
+        "tokens_json": tokens_json,
+        "categorias": categorias,
+        "codigos": codigos,
+        "codigos_bytes": {token.encode("ascii"): codigo for token, codigo in codigos.items()
+                          if token.isascii()},
+        "reservadas": frozenset(categorias),
+        "preservadas": frozenset(tokens_json.get("Preservada", ())),
+        "extras": _tokens_extra(categorias),
+    })
+
+
+def ruta_cache(ruta):
+    """Ruta del caché en disco de las tablas de un archivo de tokens"""
+    directorio, nombre = os.path.split(os.path.abspath(ruta))
+    return os.path.join(directorio, DIRECTORIO_CACHE, nombre + ".tablas")
+
+
+def _leer_cache(ruta, hash_archivo):
+    """
+    Tabla guardada en disco para un archivo con ese hash
+
+    Returns:
+        TablaTokens: La tabla, o None si no hay caché válido
+    """
+    try:
+        with open(ruta_cache(ruta), "rb") as archivo:
+            datos = marshal.loads(archivo.read())
+        if datos["version"] != VERSION_CACHE or datos["hash"] != hash_archivo:
+            return None
+        return _tabla_compartida(datos["huella"], lambda: TablaTokens(datos["huella"], datos["tablas"]))
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        return None
+
+
+def _escribir_cache(ruta, hash_archivo, tabla):
+    """Guarda la tabla en disco; si no se puede (p. ej. directorio de solo lectura) se omite"""
+    datos = {
+        "version": VERSION_CACHE,
+        "hash": hash_archivo,
+        "huella": tabla.huella,
+        "tablas": {campo: getattr(tabla, campo) for campo in CAMPOS_CACHE},
+    }
+    destino = ruta_cache(ruta)
+    try:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        # Se escribe aparte y se reemplaza de una vez: nadie lee un caché a medias
+        temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporal, "wb") as archivo:
+                archivo.write(marshal.dumps(datos))
+            os.replace(temporal, destino)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+    except OSError:
+        pass
+
+
+def _cargar(ruta, datos):
+    """Tabla de un archivo de tokens ya leído (caché en disco o compilación)"""
+    hash_archivo = hashlib.sha256(datos).hexdigest()
+    tabla = _leer_cache(ruta, hash_archivo)
+    if tabla is None:
+        try:
+            tokens_json = json.loads(datos.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError("⚠ El archivo Tokens.json tiene formato inválido") from None
+        tabla = compilar_tabla(tokens_json)
+        _escribir_cache(ruta, hash_archivo, tabla)
+    return hash_archivo, tabla
+
+
+def cargar_tabla(ruta):
+    """
+    Carga un archivo de tokens, usando el caché en disco si su contenido no cambió
+
+    Args:
+        ruta (str): Ruta del archivo (p. ej. Tokens.json)
+
+    Returns:
+        TablaTokens: Tabla compartida por todo el proceso
+
+    Raises:
+        OSError: Si no se puede leer el archivo
+        ValueError: Si el archivo no es un Tokens.json válido
+    """
+    with open(ruta, "rb") as archivo:
+        return _cargar(ruta, archivo.read())[1]
+
+
+class PerfilTokens:
+    """
+    Tablas de un archivo de tokens que se recargan cuando el archivo cambia
+
+    Cada perfil de lenguaje es un archivo de tokens; los perfiles con el mismo
+    contenido comparten la tabla. Usar perfil_tokens para obtener el perfil
+    compartido de una ruta.
+    """
+
+    def __init__(self, ruta):
+        """
+        Args:
+            ruta (str): Ruta del archivo de tokens
+
+        Raises:
+            OSError: Si no se puede leer el archivo
+            ValueError: Si el archivo no es un Tokens.json válido
+        """
+        self.ruta = os.path.abspath(ruta)
+        self._cerrojo = threading.Lock()
+        self.recargas = 0   # Veces que la tabla cambió desde la carga inicial
+        firma = self._firma()
+        with open(self.ruta, "rb") as archivo:
+            datos = archivo.read()
+        self.hash, self.tabla = _cargar(self.ruta, datos)
+        self.firma = firma
+
+    def _firma(self):
+        """(mtime_ns, tamaño) actuales del archivo"""
+        estado = os.stat(self.ruta)
+        return (estado.st_mtime_ns, estado.st_size)
+
+    def actualizar(self):
+        """
+        Recarga la tabla si el archivo cambió desde la última consulta
+
+        Solo cuesta un stat mientras el archivo no cambie. Si el archivo nuevo
+        no se puede leer o no es válido (p. ej. se está guardando) se conserva
+        la tabla anterior y se vuelve a intentar cuando vuelva a cambiar.
+
+        Returns:
+            bool: True si la tabla cambió
+        """
+        try:
+            firma = self._firma()
+        except OSError:
+            return False
+        if firma == self.firma:
+            return False
+        with self._cerrojo:
+            if firma == self.firma:
+                return False
+            self.firma = firma
+            try:
+                with open(self.ruta, "rb") as archivo:
+                    datos = archivo.read()
+                hash_archivo, tabla = _cargar(self.ruta, datos)
+            except (OSError, ValueError) as error:
+                advertir(__name__, "⚠ No se pudo recargar %s: %s", os.path.basename(self.ruta), error)
+                return False
+            self.hash = hash_archivo
+            if tabla is self.tabla:
+                return False
+            self.tabla = tabla
+            self.recargas += 1
+        informar(__name__, "🔄 %s cambió: tablas de tokens recargadas", os.path.basename(self.ruta))
+        return True
+
+
+# Perfiles del proceso, por ruta absoluta
+_perfiles = {}
+_cerrojo_perfiles = threading.Lock()
+
+
+def perfil_tokens(ruta="Tokens.json"):
+    """
+    Perfil compartido de un archivo de tokens
+
+    Args:
+        ruta (str): Ruta del archivo de tokens
+
+    Returns:
+        PerfilTokens: El mismo objeto para todas las llamadas con esa ruta
+
+    Raises:
+        OSError: Si no se puede leer el archivo (p. ej. FileNotFoundError)
+        ValueError: Si el archivo no es un Tokens.json válido
+    """
+    ruta = os.path.abspath(ruta)
+    with _cerrojo_perfiles:
+        perfil = _perfiles.get(ruta)
+        if perfil is None:
+            perfil = PerfilTokens(ruta)
+            _perfiles[ruta] = perfil
+        return perfil
@@ -0,0 +1,8 @@
+"""
+Benchmarks del analizador léxico y gramatical
+
+    generador   Programas sintéticos del lenguaje de Tokens.json
+    suite       Mediciones por tamaño, líneas base JSON y detección de regresiones
+
+Los scripts bench_*.py comparan implementaciones anteriores con las actuales.
+"""
\ No newline at end of file
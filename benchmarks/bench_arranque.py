@@ -0,0 +1,87 @@
+"""
+Benchmark del arranque sin interfaz del núcleo de análisis (NucleoAnalisis)
+
+Inicia intérpretes nuevos y mide en cada uno:
+    - la importación en frío de NucleoAnalisis (con el bytecode ya compilado)
+    - el primer análisis: crear los analizadores (Tokens.json desde el caché
+      de tablas en disco) y analizar un programa corto
+Verifica que ni tkinter ni logging se importen y muestra los módulos que
+más tardan en importarse (python -X importtime).
+
+Termina con código 1 si la importación supera PRESUPUESTO_IMPORTACION o si
+se importa tkinter, para poder usarse como control en una integración continua.
+
+Uso:
+    python benchmarks/bench_arranque.py [ejecuciones]
+"""
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRESUPUESTO_IMPORTACION = 0.050   # segundos, mejor de las ejecuciones
+MODULOS_PROHIBIDOS = ("tkinter", "logging")
+MOSTRAR_MODULOS = 8
+
+# Se ejecuta en cada intérprete nuevo; imprime las mediciones como JSON
+MEDICION = """
+import json, sys, time
+inicio = time.perf_counter()
+import NucleoAnalisis
+importacion = time.perf_counter() - inicio
+prohibidos = [modulo for modulo in {prohibidos!r} if modulo in sys.modules]
+inicio = time.perf_counter()
+lexico, gramatical = NucleoAnalisis.crear_analizadores()
+resultado_lexico, _ = NucleoAnalisis.analizar_codigo("entero x = 1;\\nimprimir(x);", lexico, gramatical)
+primer_analisis = time.perf_counter() - inicio
+print(json.dumps({{"importacion": importacion, "primer_analisis": primer_analisis,
+                  "prohibidos": prohibidos, "tokens": len(resultado_lexico["tokens"])}}))
+"""
+
+
+def medir_interprete():
+    """Mediciones de un intérprete nuevo"""
+    salida = subprocess.run([sys.executable, "-c", MEDICION.format(prohibidos=MODULOS_PROHIBIDOS)],
+                            cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    return json.loads(salida)
+
+
+def modulos_lentos():
+    """(microsegundos acumulados, módulo) de los módulos que más tardan en importarse"""
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", "import NucleoAnalisis"],
+                            cwd=RAIZ, capture_output=True, text=True, check=True).stderr
+    modulos = []
+    for linea in salida.splitlines()[1:]:
+        _, acumulado, nombre = linea.split("|")
+        modulos.append((int(acumulado), nombre.rstrip()))
+    modulos.sort(reverse=True)
+    return modulos[1:MOSTRAR_MODULOS + 1]   # Sin NucleoAnalisis
+
+
+def main():
+    ejecuciones = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    medir_interprete()   # Compila el bytecode y el caché de tablas de Tokens.json
+    mediciones = [medir_interprete() for _ in range(ejecuciones)]
+    importacion = min(medicion["importacion"] for medicion in mediciones)
+    primer_analisis = min(medicion["primer_analisis"] for medicion in mediciones)
+    prohibidos = sorted({modulo for medicion in mediciones for modulo in medicion["prohibidos"]})
+
+    print(f"Arranque de NucleoAnalisis (mejor de {ejecuciones} intérpretes)")
+    dentro = importacion < PRESUPUESTO_IMPORTACION
+    print(f"  {'✓' if dentro else '⚠'} Importación:     {importacion * 1000:7.1f} ms "
+          f"(presupuesto < {PRESUPUESTO_IMPORTACION * 1000:.0f} ms)")
+    print(f"    Primer análisis: {primer_analisis * 1000:7.1f} ms (analizadores y un programa corto)")
+    if prohibidos:
+        print(f"  ⚠ Módulos importados que el núcleo no debe usar: {', '.join(prohibidos)}")
+    else:
+        print(f"  ✓ Sin {' ni '.join(MODULOS_PROHIBIDOS)}")
+    print("  Módulos más lentos (acumulado):")
+    for microsegundos, nombre in modulos_lentos():
+        print(f"    {microsegundos / 1000:6.1f} ms  {nombre.strip()}")
+    return 0 if dentro and "tkinter" not in prohibidos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Benchmark del caché de líneas de AnalizadorLexico
+
+Analiza dos programas con y sin caché: uno repetitivo (pocas líneas distintas,
+como el código generado) y otro con todas las líneas distintas, que mide el
+costo del caché cuando no hay aciertos.
+
+Uso:
+    python benchmarks/bench_cache_lineas.py [cantidad_lineas]
+"""
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalisisLexico import AnalizadorLexico
+
+LINEAS_BASE = [
+    'entero contador = 0;',
+    'decimal promedio = 2.5;',
+    'cadena saludo = "hola mundo";',
+    'mientras (contador < 10) siguiente',
+    '    contador = contador + 1; // incremento',
+    '    si (promedio >= 3) siguiente',
+    '        imprimir(saludo);',
+    '    finaliza',
+    'finaliza',
+    'func calcular(a, b) siguiente',
+    '    i = i + 1;',
+    'finaliza',
+]
+
+
+def codigo_repetitivo(cantidad_lineas):
+    """Programa que repite un mismo bloque de líneas"""
+    repeticiones = max(1, cantidad_lineas // len(LINEAS_BASE))
+    return "\n".join(LINEAS_BASE * repeticiones)
+
+
+def codigo_unico(cantidad_lineas):
+    """Programa en el que ninguna línea se repite"""
+    return "\n".join(f"entero variable{i} = {i} + otra{i};" for i in range(cantidad_lineas))
+
+
+def medir(lexico, codigo, repeticiones=3):
+    """Mejor tiempo de `repeticiones` ejecuciones de analizar_codigo"""
+    mejor = float("inf")
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = lexico.analizar_codigo(codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with redirect_stdout(io.StringIO()):
+        sin_cache = AnalizadorLexico(os.path.join(RAIZ, "Tokens.json"), tamano_cache=0)
+    tokens_json = sin_cache.get_tokens_json()
+
+    for nombre, codigo in (("Repetitivo", codigo_repetitivo(cantidad)),
+                           ("Sin repetir", codigo_unico(cantidad))):
+        con_cache = AnalizadorLexico(tokens_json=tokens_json)
+        t_sin, r_sin = medir(sin_cache, codigo)
+        t_con, r_con = medir(con_cache, codigo)
+
+        assert r_sin['tokens'] == r_con['tokens'], "Los resultados no coinciden"
+        assert r_sin['errores_lexicos'] == r_con['errores_lexicos'], "Los errores no coinciden"
+
+        estadisticas = con_cache.cache.estadisticas()
+        print(f"{nombre} ({codigo.count(chr(10)) + 1:,} líneas)")
+        print(f"  Sin caché: {t_sin:.3f} s")
+        print(f"  Con caché: {t_con:.3f} s ({t_sin / t_con:.2f}x)")
+        print(f"  Aciertos: {estadisticas['tasa_aciertos']:.1%} • "
+              f"Líneas en caché: {estadisticas['lineas']:,}/{estadisticas['capacidad']:,}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Benchmark antes/después del clasificador de tokens de AnalizadorLexico
+
+Compara la clasificación anterior (hasta tres re.fullmatch y tres búsquedas
+lineales en listas por token, y una segunda clasificación en registrar_token)
+contra el motor actual (una pasada de finditer con la alternancia maestra).
+
+Uso:
+    python benchmarks/bench_clasificador.py [cantidad_tokens]
+"""
+import io
+import os
+import re
+import sys
+import time
+from contextlib import redirect_stdout
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalisisLexico import AnalizadorLexico, PATRON_TOKEN
+
+LINEAS_BASE = [
+    'entero contador = 0;',
+    'decimal promedio = 2.5;',
+    'cadena saludo = "hola mundo";',
+    'mientras (contador < 10) siguiente',
+    'contador = contador + 1; // incremento',
+    'si (promedio >= 3) siguiente',
+    'imprimir(saludo);',
+    'finaliza',
+    'func calcular(a, b) siguiente',
+    'finaliza',
+]
+
+
+def generar_codigo(cantidad_tokens):
+    """Genera un programa con aproximadamente `cantidad_tokens` tokens"""
+    tokens_bloque = sum(len(PATRON_TOKEN.findall(linea.split('//')[0])) for linea in LINEAS_BASE)
+    repeticiones = max(1, cantidad_tokens // tokens_bloque)
+    return "\n".join(LINEAS_BASE * repeticiones)
+
+
+class ClasificadorAnterior:
+    """Reproducción del clasificador previo, solo como referencia del benchmark"""
+
+    def __init__(self, tokens_json):
+        self.tokens_json = tokens_json
+        self.tokens_dict = {}
+
+    def clasificar_token(self, token):
+        token = token.strip()
+        if re.fullmatch(r'"(?:\\.|[^"\\])*"', token):
+            return "cadena"
+        for categoria in ["Preservada", "operadores", "signos"]:
+            if token in self.tokens_json.get(categoria, []):
+                return categoria
+        if re.fullmatch(r"\d+(\.\d+)?", token):
+            return "numeros"
+        if re.fullmatch(r"[a-zA-Z_][a-zA-Z0-9_]*", token):
+            return "identificadores"
+        return "desconocido"
+
+    def registrar_token(self, token):
+        categoria = self.clasificar_token(token)
+        if categoria not in ["espacio", "desconocido"]:
+            if token in self.tokens_dict:
+                self.tokens_dict[token]["Cantidad"] += 1
+            else:
+                self.tokens_dict[token] = {"Token": token, "Tipo": categoria, "Cantidad": 1}
+
+    def analizar_codigo(self, codigo):
+        self.tokens_dict = {}
+        errores = []
+        patron = r'"(?:\\.|[^"\\])*"|\w+|==|!=|<=|>=|\+\+|--|[+\-*/=<>%(){}\[\];,]|\n'
+        for numero_linea, linea in enumerate(codigo.split('\n'), start=1):
+            if '//' in linea:
+                linea = linea[:linea.index('//')]
+            linea = linea.strip()
+            if not linea:
+                continue
+            for token in re.findall(patron, linea):
+                if self.clasificar_token(token) == "desconocido":
+                    errores.append((numero_linea, token))
+                else:
+                    self.registrar_token(token)
+        return {'tokens': self.tokens_dict, 'errores_lexicos': errores}
+
+
+def medir(funcion, codigo, repeticiones=3):
+    """Mejor tiempo de `repeticiones` ejecuciones"""
+    mejor = float("inf")
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with redirect_stdout(io.StringIO()):
+        lexico = AnalizadorLexico(os.path.join(RAIZ, "Tokens.json"))
+    anterior = ClasificadorAnterior(lexico.get_tokens_json())
+    codigo = generar_codigo(cantidad)
+    t_antes, r_antes = medir(anterior.analizar_codigo, codigo)
+    t_despues, r_despues = medir(lexico.analizar_codigo, codigo)
+    
+    assert r_antes['tokens'] == r_despues['tokens'], "Los resultados no coinciden"
+    total = sum(datos["Cantidad"] for datos in r_despues['tokens'].values())
+    
+    print(f"Tokens: {total:,} en {codigo.count(chr(10)) + 1:,} líneas")
+    print(f"Antes:   {t_antes:.3f} s ({total / t_antes:,.0f} tokens/s)")
+    print(f"Después: {t_despues:.3f} s ({total / t_despues:,.0f} tokens/s)")
+    print(f"Mejora:  {t_antes / t_despues:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark de la exportación durante el análisis (Exportacion)
+
+Escribe programas sintéticos inválidos de distintos tamaños a archivos
+temporales y exporta cada uno a NDJSON, CSV y SARIF sobre un destino que
+descarta lo escrito. Mide el tiempo, los MB/s y el pico de memoria
+(tracemalloc) de cada exportación: el pico no debería crecer con el tamaño
+del archivo, ya que ningún diagnóstico se guarda antes de escribirse.
+
+Uso:
+    python benchmarks/bench_exportacion.py [megabytes_maximo]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from Exportacion import FORMATOS, exportar_archivo
+from NucleoAnalisis import crear_analizadores
+from benchmarks.generador import escribir_programa
+
+
+class Descartar:
+    """Destino de texto que solo cuenta los caracteres escritos"""
+
+    def __init__(self):
+        self.caracteres = 0
+
+    def write(self, texto):
+        self.caracteres += len(texto)
+        return len(texto)
+
+
+def exportar(ruta, formato, analizadores):
+    """(segundos, pico de memoria en bytes, caracteres escritos) de exportar un archivo"""
+    destino = Descartar()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    exportador = FORMATOS[formato](destino)
+    exportar_archivo(ruta, *analizadores, exportador)
+    exportador.finalizar()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico, destino.caracteres
+
+
+def main():
+    maximo = float(sys.argv[1]) if len(sys.argv) > 1 else 4
+    tamanos = [maximo / 4, maximo]
+    analizadores = crear_analizadores()
+    with tempfile.TemporaryDirectory() as directorio:
+        for megabytes in tamanos:
+            ruta = os.path.join(directorio, f"programa_{megabytes}.txt")
+            escribir_programa(ruta, int(megabytes * 1024 * 1024), invalido=True)
+            print(f"Programa inválido de {megabytes:.1f} MB")
+            for formato in sorted(FORMATOS):
+                segundos, pico, caracteres = exportar(ruta, formato, analizadores)
+                print(f"  {formato:6} {segundos:7.2f} s {megabytes / segundos:6.2f} MB/s  "
+                      f"pico {pico / 1024:8.1f} KB  salida {caracteres / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Verificación del análisis incremental con re-análisis pendiente (Incremental)
+
+Aplica ediciones al azar con AnalizadorIncremental.aplicar_edicion, con y
+sin límite de tiempo (un límite de 0 deja casi todo pendiente), intercaladas
+con pasos de continuar(limite=0). Cada tanto completa el análisis pendiente
+y verifica que los resultados sean iguales a los de un análisis completo
+del mismo texto (Analisis.analizar_codigo). Antes repite la secuencia que
+dejaba un pendiente en el final del código y hacía que continuar() no
+terminara.
+
+Cada continuar() se corta tras MAXIMO_PASOS pasos: si no termina, se
+informa como error en lugar de quedar en un ciclo.
+
+Uso:
+    python benchmarks/bench_incremental.py [semillas] [ediciones]
+"""
+import os
+import random
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from Analisis import analizar_codigo
+from Incremental import AnalizadorIncremental
+from NucleoAnalisis import crear_analizadores
+from benchmarks.generador import GeneradorProgramas
+
+MAXIMO_PASOS = 100000
+VERIFICAR_CADA = 5   # ediciones entre verificaciones completas
+# Líneas que se insertan; las de bloque cambian el estado del PDA hasta el final
+LINEAS_NUEVAS = ("entero a = 1", "a = 2;", "si (a > 0) siguiente", "finaliza", "imprimir(a);",
+                 "func f() siguiente", ")", "cadena c = \"x\";", "")
+
+
+class SinTerminar(Exception):
+    """continuar() no terminó el análisis pendiente en MAXIMO_PASOS pasos"""
+
+
+def completar(incremental):
+    """Completa el análisis pendiente de a pasos de continuar(limite=0)"""
+    for _ in range(MAXIMO_PASOS):
+        if incremental.continuar(limite=0.0):
+            return
+    raise SinTerminar(sorted(incremental.pendientes))
+
+
+def firma(resultado_lexico, resultado_gramatical):
+    """Datos comparables de los resultados de un análisis"""
+    return (resultado_lexico['tokens'], resultado_lexico['errores_lexicos'],
+            resultado_gramatical['errores'], resultado_gramatical['advertencias'],
+            resultado_gramatical['variables'], resultado_gramatical['funciones'])
+
+
+def iguales_al_completo(incremental, completo):
+    """Compara los resultados incrementales con los de un análisis completo del mismo texto"""
+    completar(incremental)
+    codigo = "\n".join(incremental.lineas)
+    return firma(*incremental.resultados()) == firma(*analizar_codigo(codigo, *completo))
+
+
+def pendiente_al_final():
+    """Borrar las líneas desde un pendiente hasta el final no debe dejar un pendiente sin líneas"""
+    incremental = AnalizadorIncremental(*crear_analizadores())
+    incremental.analizar('a = 1\nb = 2\nc = 3\nd = 4')
+    incremental.aplicar_edicion(0, 1, ['entero a = 1'], limite=0.0)
+    for _ in range(MAXIMO_PASOS):
+        if list(incremental.pendientes) == [3]:
+            break
+        incremental.continuar(limite=0.0)
+    incremental.aplicar_edicion(3, 4, [], limite=0.0)
+    return iguales_al_completo(incremental, crear_analizadores())
+
+
+def ediciones_al_azar(semilla, cantidad):
+    """
+    Ediciones al azar sobre un programa sintético
+
+    Returns:
+        tuple: (verificaciones, diferencias, segundos)
+    """
+    azar = random.Random(semilla)
+    generador = GeneradorProgramas(invalido=True, semilla=semilla)
+    lineas = []
+    while len(lineas) < 60:
+        lineas.extend(generador.siguientes_lineas())
+    incremental = AnalizadorIncremental(*crear_analizadores(), intervalo_checkpoint=4)
+    completo = crear_analizadores()
+    incremental.analizar("\n".join(lineas))
+
+    verificaciones = diferencias = 0
+    inicio_tiempo = time.perf_counter()
+    for numero in range(1, cantidad + 1):
+        total = len(incremental.lineas)
+        inicio = azar.randrange(total + 1)
+        if incremental.pendientes and azar.random() < 0.3:
+            # Ediciones que empiezan justo en un re-análisis pendiente
+            inicio = azar.choice(sorted(incremental.pendientes))
+        fin = min(total, inicio + azar.choice((0, 0, 1, 1, 2, 5, total)))
+        nuevas = [azar.choice(LINEAS_NUEVAS) for _ in range(azar.choice((0, 1, 1, 2)))]
+        if inicio == fin and not nuevas:
+            continue
+        incremental.aplicar_edicion(inicio, fin, nuevas, limite=azar.choice((None, 0.0, 0.0, 0.0005)))
+        for _ in range(azar.randrange(3)):
+            incremental.continuar(limite=0.0)
+        if numero % VERIFICAR_CADA == 0:
+            verificaciones += 1
+            diferencias += not iguales_al_completo(incremental, completo)
+    return verificaciones, diferencias, time.perf_counter() - inicio_tiempo
+
+
+def main():
+    semillas = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    cantidad = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    errores = 0
+    try:
+        igual = pendiente_al_final()
+    except SinTerminar as error:
+        igual = False
+        print(f"  ⚠ continuar() no terminó; pendientes {error}")
+    print(f"  {'✓' if igual else '⚠'} Borrado desde un pendiente hasta el final")
+    errores += not igual
+
+    total_verificaciones = total_diferencias = 0
+    segundos = 0
+    for semilla in range(semillas):
+        try:
+            verificaciones, diferencias, tiempo = ediciones_al_azar(semilla, cantidad)
+        except SinTerminar as error:
+            print(f"  ⚠ Semilla {semilla}: continuar() no terminó; pendientes {error}")
+            errores += 1
+            continue
+        total_verificaciones += verificaciones
+        total_diferencias += diferencias
+        segundos += tiempo
+        if diferencias:
+            print(f"  ⚠ Semilla {semilla}: {diferencias} de {verificaciones} verificaciones distintas")
+    errores += total_diferencias
+    print(f"  {'✓' if not total_diferencias else '⚠'} {semillas} semillas × {cantidad} ediciones: "
+          f"{total_verificaciones - total_diferencias} de {total_verificaciones} verificaciones iguales "
+          f"al análisis completo ({segundos:.1f} s)")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
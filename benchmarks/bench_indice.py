@@ -0,0 +1,102 @@
+"""
+Benchmark de la comprobación de proyectos con índice (IndiceProyecto)
+
+Escribe un árbol de programas sintéticos pequeños en un directorio temporal
+y mide:
+    - la comprobación en frío (índice vacío: se analizan todos los archivos)
+    - la comprobación en caliente sin cambios (con todos los resultados y
+      solo los cambios, como en el modo --vigilar)
+    - la comprobación después de modificar algunos archivos
+Verifica que los resultados coincidan con los de AnalizadorLote.
+
+Los mtime de los archivos se llevan al pasado, como en un árbol que no se
+está editando (ver IndiceProyecto.MARGEN_MTIME_NS).
+
+Uso:
+    python benchmarks/bench_indice.py [archivos] [jobs]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalizadorLote import analizar_lote, buscar_archivos
+from IndiceProyecto import IndiceAnalisis, comprobar_proyecto, huella_configuracion, linea_ndjson
+from benchmarks.generador import escribir_programa
+
+TAMANO_ARCHIVO = 1500        # bytes aproximados de cada programa
+ARCHIVOS_POR_CARPETA = 500
+MODIFICADOS = 10
+OBJETIVO_CALIENTE = 1.0      # segundos
+
+
+def resultados_lote(comprobados):
+    """{ruta: resultado} en el formato de AnalizadorLote de los archivos comprobados"""
+    resultados = {}
+    for ruta, cambio, salida, _ in comprobados:
+        resultado = json.loads(linea_ndjson(ruta, cambio, salida))
+        del resultado['cambio']
+        resultados[ruta] = resultado
+    return resultados
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    jobs = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    directorio = tempfile.mkdtemp()
+    try:
+        pasado = time.time() - 60
+        for numero in range(cantidad):
+            carpeta = os.path.join(directorio, f"modulo{numero // ARCHIVOS_POR_CARPETA}")
+            os.makedirs(carpeta, exist_ok=True)
+            ruta = os.path.join(carpeta, f"programa{numero}.txt")
+            escribir_programa(ruta, TAMANO_ARCHIVO, invalido=True, semilla=numero)
+            os.utime(ruta, (pasado, pasado))
+        rutas = buscar_archivos([directorio])
+        indice = IndiceAnalisis(os.path.join(directorio, "indice.sqlite"), huella_configuracion())
+
+        print(f"Proyecto de {len(rutas)} archivos ({os.cpu_count()} núcleos)")
+        t_frio, resultados = medir(lambda: comprobar_proyecto(rutas, indice, jobs))
+        print(f"  En frío:                           {t_frio * 1000:8.1f} ms")
+
+        t_caliente, calientes = medir(lambda: comprobar_proyecto(rutas, indice, jobs))
+        t_ndjson, _ = medir(lambda: "".join(linea_ndjson(ruta, cambio, salida)
+                                            for ruta, cambio, salida, _ in calientes))
+        estado = "✓" if t_caliente + t_ndjson < OBJETIVO_CALIENTE else "⚠"
+        print(f"  {estado} En caliente (todos, con NDJSON):  {(t_caliente + t_ndjson) * 1000:8.1f} ms "
+              f"(objetivo < {OBJETIVO_CALIENTE * 1000:.0f} ms)")
+        t_cambios, cambios = medir(lambda: comprobar_proyecto(rutas, indice, jobs, solo_cambios=True))
+        print(f"  {'✓' if not cambios else '⚠'} En caliente (solo cambios):      {t_cambios * 1000:8.1f} ms")
+
+        modificados = rutas[::max(1, len(rutas) // MODIFICADOS)][:MODIFICADOS]
+        for ruta in modificados:
+            with open(ruta, "a", encoding="utf-8") as archivo:
+                archivo.write("entero agregado = 1;\n")
+        t_modificados, actualizados = medir(lambda: comprobar_proyecto(rutas, indice, jobs, solo_cambios=True))
+        print(f"  Con {len(modificados)} archivos modificados:        {t_modificados * 1000:8.1f} ms "
+              f"({sum(cambio == 'analizado' for _, cambio, _, _ in actualizados)} analizados)")
+        indice.cerrar()
+
+        esperados = list(analizar_lote(rutas, jobs))
+        sin_cambio = resultados_lote(calientes)
+        con_cambio = dict(sin_cambio, **resultados_lote(actualizados))
+        iguales = (resultados_lote(resultados) == sin_cambio
+                   and [con_cambio[ruta] for ruta in rutas] == esperados)
+        print(f"  {'✓' if iguales else '⚠'} Resultados {'iguales' if iguales else 'DISTINTOS'} a los de AnalizadorLote")
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark del análisis léxico en paralelo (LexicoParalelo)
+
+Escribe un programa sintético a un archivo temporal y compara el análisis
+léxico secuencial del archivo (generar_tokens_archivo) con el repartido en
+1, 2, 4... procesos hasta la cantidad de núcleos. Verifica que la tabla de
+tokens y los errores léxicos sean idénticos.
+
+Uso:
+    python benchmarks/bench_lexico_paralelo.py [megabytes]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import LexicoParalelo
+from AnalisisLexico import AnalizadorLexico
+from benchmarks.generador import generar_lineas
+
+
+def secuencial(lexico, ruta):
+    """Análisis léxico del archivo en este proceso, como AnalizadorLexico.analizar_codigo"""
+    lexico.reiniciar()
+    for linea in lexico.generar_tokens_archivo(ruta):
+        lexico.errores_lexicos.extend(lexico.limites.filtrar(lexico.registrar_linea(linea)))
+    return lexico.obtener_resultados()
+
+
+def firma(resultado):
+    """Tabla de tokens (en orden) y errores léxicos de un resultado"""
+    return (list((token, datos["Tipo"], datos["Cantidad"]) for token, datos in resultado["tokens"].items()),
+            [repr(error) for error in resultado["errores_lexicos"]])
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 64
+    with redirect_stdout(io.StringIO()):
+        lexico = AnalizadorLexico(os.path.join(RAIZ, "Tokens.json"))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as archivo:
+        for linea in generar_lineas(int(megabytes * 1024 * 1024), invalido=True):
+            archivo.write(linea + "\n")
+        ruta = archivo.name
+
+    try:
+        t_secuencial, esperado = medir(lambda: secuencial(lexico, ruta))
+        esperado = firma(esperado)
+        print(f"Análisis léxico de {megabytes:g} MB ({os.cpu_count()} núcleos)")
+        print(f"  Secuencial:     {t_secuencial:.2f} s")
+
+        jobs = 1
+        while True:
+            tiempo, resultado = medir(lambda: LexicoParalelo.analizar_archivo(ruta, lexico, jobs=jobs))
+            assert firma(resultado) == esperado, "El resultado en paralelo no coincide"
+            print(f"  {jobs} proceso(s):   {tiempo:.2f} s ({t_secuencial / tiempo:.2f}x)")
+            if jobs >= (os.cpu_count() or 1):
+                break
+            jobs = min(jobs * 2, os.cpu_count())
+    finally:
+        os.unlink(ruta)
+
+
+if __name__ == "__main__":
+    main()
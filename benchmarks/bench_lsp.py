@@ -0,0 +1,263 @@
+"""
+Benchmark del servidor LSP con un cliente local por stdio
+
+Inicia ServidorLSP.py como subproceso, abre un programa sintético de
+10.000 líneas y envía ediciones incrementales (textDocument/didChange). Mide
+la latencia desde el envío de cada cambio hasta la llegada de sus
+diagnósticos. Cada cierta cantidad de ediciones, y al final, espera a que el
+servidor termine el análisis pendiente y verifica que los diagnósticos
+publicados coincidan con los de un análisis completo del mismo texto.
+
+Las ediciones son de tres tipos:
+    - escritura: un carácter agregado o borrado al final de una línea
+    - linea: una declaración insertada o una línea borrada
+    - bloque: un 'si ... siguiente' sin cerrar insertado (y luego borrado) al
+      principio, que cambia el estado del PDA de todas las líneas posteriores
+
+Las ediciones se envían una tras otra apenas llegan los diagnósticos de la
+anterior, o con una pausa entre ellas (como al escribir) si se indica.
+
+Uso:
+    python benchmarks/bench_lsp.py [cantidad_lineas] [ediciones] [pausa_ms]
+"""
+import json
+import os
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalisisLexico import AnalizadorLexico
+from AnalizadorGramatical import AnalizadorGramatical
+from Analisis import analizar_codigo
+from Diagnosticos import LimitesDiagnosticos
+from ServidorLSP import MAXIMO_DIAGNOSTICOS, diagnosticos_lsp, escribir_mensaje, leer_mensaje
+from benchmarks.generador import GeneradorProgramas
+
+URI = "file:///bench/programa.txt"
+LATENCIA_OBJETIVO = 0.050   # segundos
+VERIFICAR_CADA = 25         # ediciones entre verificaciones completas
+ESPERA_MAXIMA = 60          # segundos sin mensajes del servidor antes de abandonar
+
+
+class ClienteLSP:
+    """
+    Cliente LSP mínimo que controla un ServidorLSP en un subproceso
+
+    Como un editor, lee los mensajes del servidor continuamente (en un hilo)
+    y anota el instante en que llega cada uno.
+    """
+
+    def __init__(self):
+        self.proceso = subprocess.Popen([sys.executable, os.path.join(RAIZ, "ServidorLSP.py")],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.siguiente_id = 0
+        self.mensajes = queue.Queue()   # (instante de llegada, mensaje), o None al cerrarse
+        threading.Thread(target=self._leer, daemon=True).start()
+
+    def _leer(self):
+        while True:
+            cuerpo = leer_mensaje(self.proceso.stdout)
+            if cuerpo is None:
+                break
+            mensaje = json.loads(cuerpo)
+            self.mensajes.put((time.perf_counter(), mensaje))
+        self.mensajes.put(None)
+
+    def notificar(self, metodo, params):
+        escribir_mensaje(self.proceso.stdin, {"jsonrpc": "2.0", "method": metodo, "params": params})
+
+    def pedir(self, metodo, params):
+        """Envía una petición y espera su respuesta"""
+        self.siguiente_id += 1
+        identificador = self.siguiente_id
+        escribir_mensaje(self.proceso.stdin,
+                         {"jsonrpc": "2.0", "id": identificador, "method": metodo, "params": params})
+        while True:
+            _, mensaje = self.recibir()
+            if mensaje.get("id") == identificador:
+                if "error" in mensaje:
+                    raise RuntimeError(mensaje["error"])
+                return mensaje["result"]
+
+    def recibir(self):
+        """Siguiente mensaje del servidor como (instante de llegada, mensaje)"""
+        try:
+            recibido = self.mensajes.get(timeout=ESPERA_MAXIMA)
+        except queue.Empty:
+            raise RuntimeError("El servidor no respondió a tiempo") from None
+        if recibido is None:
+            raise RuntimeError("El servidor cerró la conexión")
+        return recibido
+
+    def esperar_diagnosticos(self, uri, version):
+        """
+        Espera la publicación de los diagnósticos de una versión del documento
+
+        Returns:
+            tuple: (instante de llegada, diagnósticos)
+        """
+        while True:
+            llegada, mensaje = self.recibir()
+            if mensaje.get("method") != "textDocument/publishDiagnostics":
+                continue
+            params = mensaje["params"]
+            if params["uri"] == uri and params.get("version") == version:
+                return llegada, params["diagnostics"]
+
+    def esperar_completos(self, uri, version, publicados, esperados):
+        """
+        Espera a que los diagnósticos publicados de una versión sean `esperados`
+
+        El servidor publica primero los diagnósticos del análisis parcial y
+        vuelve a publicar al completar el re-análisis pendiente.
+
+        Args:
+            publicados (list): Últimos diagnósticos recibidos de esa versión
+
+        Returns:
+            float: Instante de llegada de los diagnósticos completos
+        """
+        llegada = time.perf_counter()
+        while publicados != esperados:
+            llegada, publicados = self.esperar_diagnosticos(uri, version)
+        return llegada
+
+    def cerrar(self):
+        """Apaga el servidor con shutdown/exit y devuelve su código de salida"""
+        self.pedir("shutdown", None)
+        self.notificar("exit", None)
+        self.proceso.stdin.close()
+        return self.proceso.wait(timeout=10)
+
+
+def generar(cantidad_lineas):
+    """Programa sintético (con errores) de aproximadamente `cantidad_lineas` líneas"""
+    generador = GeneradorProgramas(invalido=True, semilla=1)
+    lineas = []
+    while len(lineas) < cantidad_lineas:
+        lineas.extend(generador.siguientes_lineas())
+    return lineas + generador.cerrar_todo()
+
+
+def esperado(lineas, tokens_json):
+    """Diagnósticos de un análisis completo, como los publica el servidor"""
+    limites = LimitesDiagnosticos(maximo_total=MAXIMO_DIAGNOSTICOS)
+    lexico = AnalizadorLexico(tokens_json=tokens_json, limites=limites)
+    gramatical = AnalizadorGramatical(tokens_json, limites=limites)
+    return diagnosticos_lsp(*analizar_codigo("\n".join(lineas), lexico, gramatical), lineas)
+
+
+def ediciones(lineas, azar):
+    """
+    Genera ediciones (tipo, rango, texto) y las aplica sobre `lineas`
+
+    Yields:
+        tuple: (tipo, cambio) con cambio en formato TextDocumentContentChangeEvent
+    """
+    def rango(linea_inicio, caracter_inicio, linea_fin, caracter_fin):
+        return {"start": {"line": linea_inicio, "character": caracter_inicio},
+                "end": {"line": linea_fin, "character": caracter_fin}}
+
+    bloque_abierto = False
+    contador = 0
+    while True:
+        contador += 1
+        opcion = azar.random()
+        if opcion < 0.08 or bloque_abierto:
+            if bloque_abierto:
+                # Borra el bloque abierto en la edición anterior
+                del lineas[1]
+                yield "bloque", {"range": rango(1, 0, 2, 0), "text": ""}
+            else:
+                lineas.insert(1, "si (x > 0) siguiente")
+                yield "bloque", {"range": rango(1, 0, 1, 0), "text": "si (x > 0) siguiente\n"}
+            bloque_abierto = not bloque_abierto
+        elif opcion < 0.75:
+            numero = azar.randrange(len(lineas))
+            largo = len(lineas[numero])
+            if largo and azar.random() < 0.5:
+                lineas[numero] = lineas[numero][:-1]
+                yield "escritura", {"range": rango(numero, largo - 1, numero, largo), "text": ""}
+            else:
+                lineas[numero] += ";"
+                yield "escritura", {"range": rango(numero, largo, numero, largo), "text": ";"}
+        elif opcion < 0.9:
+            numero = azar.randrange(len(lineas))
+            texto = f"entero nueva{contador} = {contador};"
+            lineas.insert(numero, texto)
+            yield "linea", {"range": rango(numero, 0, numero, 0), "text": texto + "\n"}
+        else:
+            numero = azar.randrange(len(lineas) - 1)
+            del lineas[numero]
+            yield "linea", {"range": rango(numero, 0, numero + 1, 0), "text": ""}
+
+
+def percentil(valores, fraccion):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(fraccion * len(valores)))]
+
+
+def main():
+    cantidad_lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    cantidad_ediciones = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    pausa = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0
+    with open(os.path.join(RAIZ, "Tokens.json"), "r", encoding="utf-8") as archivo:
+        tokens_json = json.load(archivo)
+
+    lineas = generar(cantidad_lineas)
+    cliente = ClienteLSP()
+    try:
+        cliente.pedir("initialize", {"processId": os.getpid(), "rootUri": None, "capabilities": {}})
+        cliente.notificar("initialized", {})
+
+        inicio = time.perf_counter()
+        cliente.notificar("textDocument/didOpen", {"textDocument": {
+            "uri": URI, "languageId": "programa", "version": 0, "text": "\n".join(lineas)}})
+        llegada, publicados = cliente.esperar_diagnosticos(URI, 0)
+        primeros = llegada - inicio
+        esperados = esperado(lineas, tokens_json)
+        completos = cliente.esperar_completos(URI, 0, publicados, esperados) - inicio
+        print(f"Documento de {len(lineas)} líneas: {len(esperados)} diagnósticos")
+        print(f"  Apertura: primeros diagnósticos {primeros * 1000:.1f} ms, completos {completos * 1000:.1f} ms")
+
+        latencias = {}
+        azar = random.Random(0)
+        for version, (tipo, cambio) in enumerate(ediciones(lineas, azar), start=1):
+            if version > cantidad_ediciones:
+                break
+            if pausa:
+                time.sleep(pausa)
+            inicio = time.perf_counter()
+            cliente.notificar("textDocument/didChange", {
+                "textDocument": {"uri": URI, "version": version}, "contentChanges": [cambio]})
+            llegada, publicados = cliente.esperar_diagnosticos(URI, version)
+            latencias.setdefault(tipo, []).append(llegada - inicio)
+            if version % VERIFICAR_CADA == 0 or version == cantidad_ediciones:
+                cliente.esperar_completos(URI, version, publicados, esperado(lineas, tokens_json))
+
+        print(f"  Latencia de didChange → publishDiagnostics ({cantidad_ediciones} ediciones):")
+        for tipo, valores in latencias.items():
+            print(f"    {tipo:<10} n={len(valores):<4} p50={percentil(valores, 0.5) * 1000:6.1f} ms  "
+                  f"p95={percentil(valores, 0.95) * 1000:6.1f} ms  max={max(valores) * 1000:6.1f} ms")
+        todas = [valor for valores in latencias.values() for valor in valores]
+        p95 = percentil(todas, 0.95)
+        dentro = p95 < LATENCIA_OBJETIVO
+        estado = "✓" if dentro else "⚠"
+        print(f"  {estado} p95 total: {p95 * 1000:.1f} ms (objetivo < {LATENCIA_OBJETIVO * 1000:.0f} ms)")
+        print(f"  ✓ Diagnósticos completos iguales al análisis completo en {cantidad_ediciones // VERIFICAR_CADA + 1} verificaciones")
+        codigo_salida = cliente.cerrar()
+        print(f"  Código de salida del servidor: {codigo_salida}")
+        return 0 if dentro and codigo_salida == 0 else 1
+    finally:
+        if cliente.proceso.poll() is None:
+            cliente.proceso.kill()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Benchmark de escalamiento del PDA según la profundidad de anidamiento
+
+Compara el PDA anterior (búsquedas hacia atrás en la pila y pila.pop(i) desde
+el medio) con el actual (marcos con __slots__ e índices laterales de '(' y
+estructuras abiertas) en tres escenarios:
+
+    bloques      d × 'si ( x ) siguiente' seguido de d × 'finaliza'
+    parentesis   d × '(' , d × '[' y luego d × ')'  (cada ')' salta d corchetes)
+    estructuras  d × 'si siguiente', d × '[' y luego d × 'finaliza'
+
+Uso:
+    python benchmarks/bench_pda.py [profundidad_maxima]
+"""
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from PDA import PDA
+
+# Por encima de esta profundidad el PDA anterior tarda minutos (es cuadrático)
+LIMITE_ANTERIOR = 10_000
+
+
+class PDAAnterior:
+    """Reproducción de las transiciones del PDA previo, solo como referencia"""
+
+    def __init__(self):
+        self.pila = []
+        self.estado = "q0"
+        self.errores = []
+        self.advertencias = []
+        self.requiere_siguiente = ["si", "mientras", "para", "func", "sino"]
+
+    def procesar_token(self, token, linea):
+        if token in ["si", "mientras", "para", "func"]:
+            self.pila.append({'simbolo': token, 'linea': linea,
+                              'tiene_siguiente': False, 'espera_parentesis': True})
+            self.estado = "esperando_parentesis"
+        elif token == "(":
+            self.pila.append({'simbolo': '(', 'linea': linea, 'tipo': 'parentesis'})
+            if self.estado == "esperando_parentesis":
+                self.estado = "dentro_parentesis"
+        elif token == ")":
+            if not self.pila:
+                self.errores.append(f"⚠ Línea {linea}: ')' sin '(' correspondiente")
+            else:
+                encontrado = False
+                temp_stack = []
+                while self.pila:
+                    top = self.pila.pop()
+                    if top['simbolo'] == '(':
+                        encontrado = True
+                        while temp_stack:
+                            self.pila.append(temp_stack.pop())
+                        break
+                    temp_stack.append(top)
+                if not encontrado:
+                    self.errores.append(f"⚠ Línea {linea}: ')' sin '(' correspondiente")
+                    while temp_stack:
+                        self.pila.append(temp_stack.pop())
+                if self.estado == "dentro_parentesis":
+                    self.estado = "esperando_siguiente"
+        elif token == "siguiente":
+            for i in range(len(self.pila) - 1, -1, -1):
+                if self.pila[i]['simbolo'] in self.requiere_siguiente:
+                    self.pila[i]['tiene_siguiente'] = True
+                    break
+            self.estado = "dentro_bloque"
+        elif token == "[":
+            self.pila.append({'simbolo': '[', 'linea': linea, 'tipo': 'corchete'})
+        elif token == "]":
+            if not self.pila or self.pila[-1]['simbolo'] != '[':
+                self.errores.append(f"⚠ Línea {linea}: ']' sin '[' correspondiente")
+            else:
+                self.pila.pop()
+        elif token == "finaliza":
+            if not self.pila:
+                self.errores.append(f"⚠ Línea {linea}: 'finaliza' sin estructura que cerrar")
+            else:
+                for i in range(len(self.pila) - 1, -1, -1):
+                    elem = self.pila[i]
+                    if elem['simbolo'] in self.requiere_siguiente:
+                        self.pila.pop(i)
+                        break
+            self.estado = "q0"
+
+    def procesar_linea(self, tokens, numero_linea):
+        for token in tokens:
+            self.procesar_token(token, numero_linea)
+
+
+def escenario_bloques(d):
+    return [["si", "(", "x", ")", "siguiente"]] * d + [["finaliza"]] * d
+
+
+def escenario_parentesis(d):
+    return [["("]] * d + [["["]] * d + [[")"]] * d
+
+
+def escenario_estructuras(d):
+    return [["si", "siguiente"]] * d + [["["]] * d + [["finaliza"]] * d
+
+
+ESCENARIOS = {
+    "bloques": escenario_bloques,
+    "parentesis": escenario_parentesis,
+    "estructuras": escenario_estructuras,
+}
+
+
+def medir(clase, lineas):
+    """Tiempo de procesar todas las líneas con una instancia nueva del PDA"""
+    pda = clase()
+    inicio = time.perf_counter()
+    for numero, tokens in enumerate(lineas, start=1):
+        pda.procesar_linea(tokens, numero)
+    return time.perf_counter() - inicio
+
+
+def main():
+    maxima = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    profundidades = [d for d in (10, 100, 1_000, 10_000, 100_000) if d <= maxima]
+
+    print(f"{'escenario':<12} {'profundidad':>11} {'anterior (s)':>13} {'actual (s)':>11} {'mejora':>8}")
+    for nombre, escenario in ESCENARIOS.items():
+        for d in profundidades:
+            lineas = escenario(d)
+            actual = medir(PDA, lineas)
+            if d <= LIMITE_ANTERIOR:
+                anterior = medir(PDAAnterior, lineas)
+                print(f"{nombre:<12} {d:>11,} {anterior:>13.4f} {actual:>11.4f} {anterior / actual:>7.1f}x")
+            else:
+                print(f"{nombre:<12} {d:>11,} {'-':>13} {actual:>11.4f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
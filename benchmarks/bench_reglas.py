@@ -0,0 +1,146 @@
+"""
+Benchmark de las reglas semánticas con las categorías del analizador léxico
+
+Compara las validaciones de declaración y asignación que consultan la
+categoría de cada token (asignada por el analizador léxico) con las
+anteriores, que volvían a verificar cada token con re.match. El programa
+está formado casi solo por declaraciones y asignaciones.
+
+Uso:
+    python benchmarks/bench_reglas.py [cantidad_lineas]
+"""
+import io
+import os
+import re
+import sys
+import time
+from contextlib import redirect_stdout
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalisisLexico import AnalizadorLexico
+from AnalizadorGramatical import AnalizadorGramatical
+from Diagnosticos import Diagnostico
+
+PLANTILLAS = [
+    'entero e{i} = {i};',
+    'decimal d{i} = {i};',
+    'cadena c{i} = "texto {i}";',
+    'booleano b{i} = verdadero;',
+    'e{i} = e{i} + 1;',
+    'c{i} = "otro";',
+    'b{i} = falso;',
+    'd{i} = {i};',
+    'x{i} = 3;',
+    'entero m{i} = "mal";',
+]
+
+
+def codigo_declaraciones(cantidad_lineas):
+    """Programa de declaraciones y asignaciones (algunas con errores de tipo)"""
+    return "\n".join(PLANTILLAS[i % len(PLANTILLAS)].format(i=i // len(PLANTILLAS))
+                     for i in range(cantidad_lineas))
+
+
+class ReglasAnteriores(AnalizadorGramatical):
+    """Declaración y asignación verificando cada token con re.match (implementación anterior)"""
+
+    def _validar_declaracion(self, tokens, clases, linea):
+        resultado = {"errores": [], "advertencias": []}
+        if len(tokens) < 2:
+            resultado["errores"].append(Diagnostico("DEC001", linea))
+            return resultado
+        tipo_dato = tokens[0]
+        nombre_var = tokens[1]
+        if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", nombre_var):
+            resultado["errores"].append(Diagnostico("DEC002", linea, args=(nombre_var,)))
+            return resultado
+        self.variables.declarar(nombre_var, tipo_dato)
+        if len(tokens) == 2 or (len(tokens) == 3 and tokens[-1] == ";"):
+            resultado["advertencias"].append(Diagnostico("DEC003", linea, args=(nombre_var,)))
+            return resultado
+        if "=" in tokens:
+            idx = tokens.index("=")
+            if idx + 1 >= len(tokens):
+                resultado["errores"].append(Diagnostico("DEC004", linea))
+                return resultado
+            valor = tokens[idx + 1]
+            if tipo_dato == "cadena":
+                if not re.match(r'^".*"$', valor):
+                    resultado["errores"].append(Diagnostico("DEC005", linea))
+            elif tipo_dato == "booleano":
+                if valor not in ["verdadero", "falso"]:
+                    resultado["errores"].append(Diagnostico("DEC006", linea))
+            elif tipo_dato == "entero":
+                if not re.match(r"^\d+$", valor):
+                    resultado["errores"].append(Diagnostico("DEC007", linea, args=(valor,)))
+            elif tipo_dato == "decimal":
+                if not re.match(r"^\d+(\.\d+)?$", valor):
+                    resultado["errores"].append(Diagnostico("DEC008", linea, args=(valor,)))
+        return resultado
+
+    def _validar_asignacion(self, tokens, clases, linea):
+        resultado = {"errores": [], "advertencias": []}
+        if "=" not in tokens:
+            return resultado
+        idx = tokens.index("=")
+        if idx == 0:
+            resultado["errores"].append(Diagnostico("ASG001", linea))
+            return resultado
+        var = tokens[idx - 1]
+        if idx + 1 < len(tokens) and tokens[idx + 1] == "=":
+            return resultado
+        if re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", var):
+            if var not in self.variables:
+                resultado["errores"].append(Diagnostico("ASG002", linea, args=(var,)))
+                return resultado
+            if idx + 1 < len(tokens):
+                valor = tokens[idx + 1]
+                tipo_var = self.variables[var]
+                if tipo_var == "entero" and not re.match(r"^\d+$", valor):
+                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", valor):
+                        resultado["errores"].append(Diagnostico("ASG003", linea, args=(var, "entero")))
+                elif tipo_var == "cadena" and not re.match(r'^".*"$', valor):
+                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", valor):
+                        resultado["errores"].append(Diagnostico("ASG003", linea, args=(var, "cadena")))
+                elif tipo_var == "booleano" and valor not in ["verdadero", "falso"]:
+                    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", valor):
+                        resultado["errores"].append(Diagnostico("ASG003", linea, args=(var, "booleano")))
+        return resultado
+
+
+def medir(gramatical, lineas, repeticiones=5):
+    """Mejor tiempo de validar las reglas semánticas de todas las líneas"""
+    mejor = float("inf")
+    resultados = None
+    for _ in range(repeticiones):
+        gramatical.reiniciar()
+        inicio = time.perf_counter()
+        resultados = [gramatical.validar_semantica(texto, numero, tokens, tipos)
+                      for texto, numero, tokens, tipos in lineas]
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultados
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with redirect_stdout(io.StringIO()):
+        lexico = AnalizadorLexico(os.path.join(RAIZ, "Tokens.json"))
+    tokens_json = lexico.get_tokens_json()
+
+    codigo = codigo_declaraciones(cantidad)
+    lineas = [(linea.texto, linea.numero, linea.tokens, linea.tipos) for linea in lexico.generar_tokens(codigo)]
+
+    t_anterior, r_anterior = medir(ReglasAnteriores(tokens_json), lineas)
+    t_actual, r_actual = medir(AnalizadorGramatical(tokens_json), lineas)
+    assert [{k: list(map(str, v)) for k, v in r.items()} for r in r_anterior] == \
+           [{k: list(map(str, v)) for k, v in r.items()} for r in r_actual], "Los diagnósticos no coinciden"
+
+    print(f"Declaraciones y asignaciones ({len(lineas):,} líneas)")
+    print(f"  Con re.match:            {t_anterior:.3f} s")
+    print(f"  Con categorías léxicas:  {t_actual:.3f} s ({t_anterior / t_actual:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
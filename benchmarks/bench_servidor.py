@@ -0,0 +1,158 @@
+"""
+Generador de carga del servidor de análisis (ServidorAnalisis)
+
+Inicia el servidor en este proceso sobre un socket Unix temporal (TCP en un
+puerto libre de localhost si no hay sockets Unix) y, sin red externa:
+    - mide un análisis en un proceso nuevo por petición, como hacían las
+      herramientas (importación, Tokens.json y análisis)
+    - lanza `clientes` conexiones concurrentes que envían `peticiones` cada
+      una con programas sintéticos pequeños (válidos e inválidos), y mide la
+      latencia (p50/p99) y los análisis por segundo vistos por los clientes
+    - verifica que los resultados sean iguales a los del análisis en este
+      proceso (AnalizadorLote.resumir_analisis)
+    - envía un programa grande con un tiempo máximo corto y verifica que se
+      responda con ERROR_TIEMPO_AGOTADO
+Al final muestra las métricas del servidor (método 'metricas') y verifica
+que el servidor se cierre aunque un cliente siga conectado.
+
+Uso:
+    python benchmarks/bench_servidor.py [clientes] [peticiones] [jobs]
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from Analisis import analizar_stream
+from AnalisisLexico import dividir_lineas
+from AnalizadorLote import resumir_analisis
+from NucleoAnalisis import crear_analizadores
+from ServidorAnalisis import ERROR_TIEMPO_AGOTADO, ClienteAnalisis, ErrorServidor, ServidorAnalisis, percentil
+from benchmarks.generador import generar_programa
+
+PROGRAMAS_DISTINTOS = 64
+TAMANO_PROGRAMA = 2048
+PROCESOS_NUEVOS = 5
+ESPERA_CIERRE = 10   # segundos como máximo de ServidorAnalisis.cerrar()
+
+# Un análisis en un proceso nuevo, como lo hace una herramienta sin el servidor
+PROCESO_NUEVO = """
+import sys
+from NucleoAnalisis import crear_analizadores
+from Analisis import analizar_stream
+from AnalisisLexico import dividir_lineas
+from AnalizadorLote import resumir_analisis
+lexico, gramatical = crear_analizadores()
+resumir_analisis(analizar_stream(dividir_lineas(sys.stdin.read()), lexico, gramatical), lexico, gramatical)
+"""
+
+
+def proceso_nuevo(codigo):
+    """Segundos de un análisis en un intérprete nuevo"""
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-c", PROCESO_NUEVO], input=codigo, text=True, cwd=RAIZ, check=True)
+    return time.perf_counter() - inicio
+
+
+def esperados(programas):
+    """Resultado de cada programa analizado en este proceso"""
+    lexico, gramatical = crear_analizadores()
+    return [resumir_analisis(analizar_stream(dividir_lineas(codigo), lexico, gramatical), lexico, gramatical)
+            for codigo in programas]
+
+
+async def cliente(direccion, programas, esperado, peticiones, desfase, latencias):
+    """Envía `peticiones` análisis de a uno; retorna la cantidad de resultados distintos a los esperados"""
+    conexion = await conectar(direccion)
+    distintos = 0
+    try:
+        for numero in range(peticiones):
+            indice = (desfase + numero) % len(programas)
+            inicio = time.perf_counter()
+            resultado = await conexion.analizar(programas[indice])
+            latencias.append(time.perf_counter() - inicio)
+            distintos += resultado != esperado[indice]
+    finally:
+        await conexion.cerrar()
+    return distintos
+
+
+async def conectar(direccion):
+    if isinstance(direccion, str):
+        return await ClienteAnalisis.conectar(socket=direccion)
+    return await ClienteAnalisis.conectar(host=direccion[0], puerto=direccion[1])
+
+
+async def carga(clientes, peticiones, jobs, programas, esperado):
+    servidor = ServidorAnalisis(jobs)
+    with tempfile.TemporaryDirectory() as directorio:
+        if hasattr(socket, "AF_UNIX"):
+            await servidor.iniciar(socket=os.path.join(directorio, "analisis.sock"))
+        else:
+            await servidor.iniciar(puerto=0)
+        abierta = None
+        try:
+            latencias = []
+            inicio = time.perf_counter()
+            distintos = await asyncio.gather(*(
+                cliente(servidor.direccion, programas, esperado, peticiones, numero * 7, latencias)
+                for numero in range(clientes)))
+            segundos = time.perf_counter() - inicio
+            latencias.sort()
+            print(f"  {clientes} clientes × {peticiones} peticiones, {servidor.jobs} procesos")
+            print(f"    Latencia: p50 {percentil(latencias, 0.5) * 1000:7.2f} ms  "
+                  f"p99 {percentil(latencias, 0.99) * 1000:7.2f} ms")
+            print(f"    {len(latencias) / segundos:8.1f} análisis/s")
+            iguales = not sum(distintos)
+            print(f"  {'✓' if iguales else '⚠'} Resultados {'iguales' if iguales else 'DISTINTOS'} "
+                  f"a los del análisis en este proceso")
+
+            conexion = await conectar(servidor.direccion)
+            try:
+                grande = generar_programa(4 * 1024 * 1024, invalido=True)
+                try:
+                    await conexion.analizar(grande, tiempo_maximo=0.05)
+                    print("  ⚠ El programa grande no agotó el tiempo máximo")
+                except ErrorServidor as error:
+                    agotado = error.codigo == ERROR_TIEMPO_AGOTADO
+                    print(f"  {'✓' if agotado else '⚠'} Programa de 4 MB con 50 ms: {error}")
+                metricas = await conexion.metricas()
+            finally:
+                await conexion.cerrar()
+            print(f"  Métricas del servidor: {metricas}")
+            # Queda conectada mientras se cierra el servidor, como un cliente que no terminó
+            abierta = await conectar(servidor.direccion)
+        finally:
+            inicio = time.perf_counter()
+            try:
+                await asyncio.wait_for(servidor.cerrar(), ESPERA_CIERRE)
+                print(f"  ✓ Servidor cerrado con un cliente conectado en "
+                      f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+            except asyncio.TimeoutError:
+                print(f"  ⚠ El servidor no se cerró en {ESPERA_CIERRE} s con un cliente conectado")
+        if abierta is not None:
+            await abierta.cerrar()
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    peticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    jobs = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    programas = [generar_programa(TAMANO_PROGRAMA, invalido=numero % 2 == 1, semilla=numero)
+                 for numero in range(PROGRAMAS_DISTINTOS)]
+    esperado = esperados(programas)
+
+    print(f"Programas de {TAMANO_PROGRAMA} bytes")
+    t_proceso = min(proceso_nuevo(programas[numero]) for numero in range(PROCESOS_NUEVOS))
+    print(f"  Proceso nuevo por análisis: {t_proceso * 1000:7.2f} ms (mejor de {PROCESOS_NUEVOS})")
+    asyncio.run(carga(clientes, peticiones, jobs, programas, esperado))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark de la carga de tablas de tokens (TablasTokens)
+
+Escribe un Tokens.json en un directorio temporal (el del proyecto, o uno con
+más palabras reservadas si se indica) y mide:
+    - la carga anterior: json.load y las tablas del clasificador armadas por
+      cada analizador (léxico, gramatical y el léxico interno del gramatical)
+    - la compilación sin caché (lectura, JSON, tablas y patrones)
+    - la carga desde el caché en disco (__pycache__/Tokens.json.tablas)
+    - la creación de los analizadores con la tabla ya compartida en el proceso
+    - la comprobación de recarga con el archivo sin cambios (un stat)
+    - la recarga después de modificar el archivo
+Verifica que la tabla cargada desde el caché coincida con las tablas de la
+carga anterior.
+
+Uso:
+    python benchmarks/bench_tablas.py [palabras_reservadas_extra]
+"""
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalisisLexico import AnalizadorLexico
+from AnalizadorGramatical import AnalizadorGramatical
+from TablasTokens import CATEGORIAS_JSON, CODIGOS_TIPO, cargar_tabla, perfil_tokens, ruta_cache
+
+REPETICIONES = 200
+
+
+def medir(funcion, repeticiones=REPETICIONES):
+    """Mejor tiempo de `repeticiones` ejecuciones"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def carga_anterior(ruta):
+    """Reproducción de la carga previa: cada analizador armaba sus tablas desde el JSON"""
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        tokens_json = json.load(archivo)
+    for _ in range(3):
+        categorias = {}
+        for categoria in CATEGORIAS_JSON:
+            for token in tokens_json.get(categoria, []):
+                categorias.setdefault(token, categoria)
+        codigos = {token: CODIGOS_TIPO[categoria] for token, categoria in categorias.items()}
+        codigos_bytes = {token.encode("ascii"): codigo for token, codigo in codigos.items() if token.isascii()}
+        frozenset(categorias)
+    return categorias, codigos_bytes
+
+
+def sin_cache(ruta):
+    os.remove(ruta_cache(ruta))
+    cargar_tabla(ruta)
+
+
+def main():
+    extra = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    with open(os.path.join(RAIZ, "Tokens.json"), "r", encoding="utf-8") as archivo:
+        tokens_json = json.load(archivo)
+    tokens_json["Preservada"] += [f"palabra{numero}" for numero in range(extra)]
+    directorio = tempfile.mkdtemp()
+    try:
+        ruta = os.path.join(directorio, "Tokens.json")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(tokens_json, archivo, ensure_ascii=False, indent=4)
+        cargar_tabla(ruta)
+
+        print(f"Tokens.json con {sum(map(len, tokens_json.values()))} tokens")
+        t_anterior = medir(lambda: carga_anterior(ruta))
+        print(f"  Carga anterior (JSON por analizador): {t_anterior * 1e6:9.1f} µs")
+        t_compilar = medir(lambda: sin_cache(ruta))
+        print(f"  Compilación sin caché:                {t_compilar * 1e6:9.1f} µs")
+        t_disco = medir(lambda: cargar_tabla(ruta))
+        print(f"  Desde el caché en disco:              {t_disco * 1e6:9.1f} µs")
+        tabla = cargar_tabla(ruta)
+        iguales = (tabla.categorias, tabla.codigos_bytes) == carga_anterior(ruta)
+        print(f"  {'✓' if iguales else '⚠'} Tabla del caché {'igual' if iguales else 'DISTINTA'} a la de la carga anterior")
+        del tabla
+
+        perfil = perfil_tokens(ruta)
+        t_compartida = medir(lambda: (AnalizadorLexico(perfil=perfil),
+                                      AnalizadorGramatical(perfil=perfil)))
+        print(f"  Analizadores con la tabla compartida: {t_compartida * 1e6:9.1f} µs")
+        t_comprobar = medir(perfil.actualizar)
+        print(f"  Comprobación de recarga sin cambios:  {t_comprobar * 1e6:9.1f} µs")
+
+        def recargar():
+            tokens_json["Preservada"].append("nueva")
+            with open(ruta, "w", encoding="utf-8") as archivo:
+                json.dump(tokens_json, archivo, ensure_ascii=False)
+            inicio = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                assert perfil.actualizar()
+            return time.perf_counter() - inicio
+        t_recarga = min(recargar() for _ in range(20))
+        print(f"  Recarga tras modificar el archivo:    {t_recarga * 1e6:9.1f} µs")
+
+    finally:
+        shutil.rmtree(directorio)
+
+
+if __name__ == "__main__":
+    main()
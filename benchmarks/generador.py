@@ -0,0 +1,244 @@
+"""
+Generador de programas sintéticos del lenguaje de Tokens.json
+
+Produce programas de un tamaño aproximado en bytes, con bloques
+si/sino/mientras/func ... siguiente ... finaliza anidados hasta una
+profundidad dada, declaraciones entero/decimal/cadena/booleano,
+asignaciones con expresiones, llamadas e imprimir, y comentarios.
+
+Un programa válido está bien formado: bloques balanceados, variables
+declaradas antes de usarse (y usadas solo dentro del bloque que las declaró)
+y valores acordes a su tipo. No produce errores
+léxicos ni del PDA, aunque las reglas semánticas actuales igual reportan
+algunas construcciones correctas (p. ej. 'si (' al inicio de línea). Con
+`invalido=True` se inyectan errores léxicos, semánticos y de estructura.
+
+Las líneas se generan de a una, así que un programa de 1 GB puede escribirse
+a disco sin tenerlo completo en memoria.
+"""
+import random
+
+TIPOS = ("entero", "decimal", "cadena", "booleano")
+OPERADORES = ("+", "-", "*", "/", "%")
+COMPARADORES = ("<", ">", "<=", ">=", "==", "!=")
+CADENAS = ('"hola"', '"mundo"', '"texto de prueba"', '"a // b"', '"resultado: "')
+# Los nombres se reutilizan para que la tabla de tokens y la de variables no
+# crezcan sin límite en programas grandes
+NOMBRES_DISTINTOS = 256
+
+# Errores inyectados en los programas inválidos (plantillas con {v} = variable)
+PLANTILLAS_ERROR = (
+    "{v}@ = 1;",                    # símbolo no reconocido (se ignora) y ambigüedad
+    "entero 9{v} = 1;",             # token desconocido / identificador inválido
+    "entero {v}_e = hola;",         # valor inválido para entero
+    "booleano {v}_b = 3;",          # valor inválido para booleano
+    "cadena {v}_c = 5;",            # cadena sin comillas
+    "no_declarada = {v};",          # variable no declarada
+    "{v} = año;",                   # token desconocido
+    ")",                            # ')' sin '('
+    "]",                            # ']' sin '['
+    "finaliza",                     # 'finaliza' sin estructura
+    "si ({v} = 1) siguiente",       # asignación en condición (bloque que nunca se cierra)
+    "mientras ({v} < 10",           # paréntesis sin cerrar
+)
+
+
+class GeneradorProgramas:
+    """
+    Genera las líneas de un programa sintético
+
+    Mantiene las variables visibles por tipo y la pila de bloques abiertos
+    para que las asignaciones usen variables existentes y cada bloque se cierre
+    con 'finaliza' (salvo los errores inyectados a propósito). Al cerrar un
+    bloque dejan de usarse las variables que declaró.
+    """
+
+    def __init__(self, profundidad=4, invalido=False, tasa_errores=0.05, semilla=0):
+        """
+        Args:
+            profundidad (int): Anidamiento máximo de bloques
+            invalido (bool): Si se inyectan errores
+            tasa_errores (float): Probabilidad de error por línea (si invalido)
+            semilla (int): Semilla del generador aleatorio (programas reproducibles)
+        """
+        self.profundidad = max(0, profundidad)
+        self.invalido = invalido
+        self.tasa_errores = tasa_errores
+        self.azar = random.Random(semilla)
+        self.variables = {tipo: [] for tipo in TIPOS}   # Variables visibles por tipo
+        self.bloques = []          # Pila de bloques abiertos: 'si' | 'sino' | 'mientras' | 'func'
+        self.ambitos = [{}]        # Por ámbito (global y un bloque abierto cada uno), nombre -> tipo
+        self.contador = 0          # Sufijo para nombres únicos
+
+    def _nombre(self, prefijo):
+        """Nombre de variable o función (se repiten cada NOMBRES_DISTINTOS)"""
+        self.contador += 1
+        return f"{prefijo}{self.contador % NOMBRES_DISTINTOS}"
+
+    def _variable(self, tipo):
+        """Variable ya declarada del tipo, o None si todavía no hay ninguna"""
+        if not self.variables[tipo]:
+            return None
+        return self.azar.choice(self.variables[tipo])
+
+    def _sangria(self):
+        return "    " * len(self.bloques)
+
+    def _declaracion(self):
+        tipo = self.azar.choice(TIPOS)
+        nombre = self._nombre({"entero": "contador", "decimal": "promedio",
+                               "cadena": "texto", "booleano": "bandera"}[tipo])
+        self.ambitos[-1][nombre] = tipo
+        if nombre not in self.variables[tipo]:
+            self.variables[tipo].append(nombre)
+        valor = {
+            "entero": str(self.azar.randint(0, 999)),
+            "decimal": f"{self.azar.randint(0, 99)}.{self.azar.randint(0, 99)}",
+            "cadena": self.azar.choice(CADENAS),
+            "booleano": self.azar.choice(("verdadero", "falso")),
+        }[tipo]
+        return f"{tipo} {nombre} = {valor};"
+
+    def _expresion(self):
+        """Expresión aritmética entre variables enteras y números"""
+        terminos = [self._variable("entero") or "1"]
+        for _ in range(self.azar.randint(1, 3)):
+            terminos.append(self.azar.choice(OPERADORES))
+            terminos.append(self.azar.choice((self._variable("entero") or "2",
+                                              str(self.azar.randint(1, 100)))))
+        return " ".join(terminos)
+
+    def _condicion(self):
+        izquierda = self._variable("entero") or "1"
+        return f"({izquierda} {self.azar.choice(COMPARADORES)} {self.azar.randint(0, 100)})"
+
+    def _sentencia(self):
+        """Una línea que no abre ni cierra bloques"""
+        opcion = self.azar.random()
+        if opcion < 0.25 or not self.variables["entero"]:
+            return self._declaracion()
+        if opcion < 0.60:
+            variable = self._variable("entero")
+            return f"{variable} = {self._expresion()};"
+        if opcion < 0.70 and self.variables["cadena"]:
+            return f"{self._variable('cadena')} = {self.azar.choice(CADENAS)};"
+        if opcion < 0.80:
+            return f"imprimir({self._variable('entero')});"
+        if opcion < 0.90:
+            return f"{self._variable('entero')} = {self._expresion()}; // actualiza"
+        return "// comentario de línea"
+
+    def _abrir_ambito(self, tipo):
+        self.bloques.append(tipo)
+        self.ambitos.append({})
+
+    def _cerrar_ambito(self):
+        """Cierra el bloque actual; sus variables dejan de ser visibles salvo que un ámbito exterior las declare"""
+        for nombre, tipo in self.ambitos.pop().items():
+            if not any(nombre in ambito for ambito in self.ambitos):
+                self.variables[tipo].remove(nombre)
+        return self.bloques.pop()
+
+    def _abrir_bloque(self):
+        tipo = self.azar.choice(("si", "mientras", "func"))
+        self._abrir_ambito(tipo)
+        if tipo == "func":
+            return f"func {self._nombre('calcular')}(a, b) siguiente"
+        return f"{tipo} {self._condicion()} siguiente"
+
+    def _cerrar_bloque(self):
+        """Líneas que cierran el bloque actual (un 'si' puede seguir con 'sino')"""
+        tipo = self._cerrar_ambito()
+        lineas = [self._sangria() + "finaliza"]
+        if tipo == "si" and self.azar.random() < 0.3:
+            lineas.append(self._sangria() + "sino siguiente")
+            self._abrir_ambito("sino")
+        return lineas
+
+    def _error(self):
+        variable = self._variable("entero") or "x"
+        return self.azar.choice(PLANTILLAS_ERROR).format(v=variable)
+
+    def siguientes_lineas(self):
+        """
+        Genera el siguiente grupo de líneas del programa
+
+        Returns:
+            list: Una o más líneas (sin salto de línea)
+        """
+        if self.invalido and self.azar.random() < self.tasa_errores:
+            return [self._sangria() + self._error()]
+
+        opcion = self.azar.random()
+        if opcion < 0.15 and len(self.bloques) < self.profundidad:
+            linea = self._sangria() + self._abrir_bloque()
+            return [linea]
+        if opcion < 0.30 and self.bloques:
+            return self._cerrar_bloque()
+        return [self._sangria() + self._sentencia()]
+
+    def cerrar_todo(self):
+        """
+        Líneas que cierran todos los bloques abiertos
+
+        Returns:
+            list: Un 'finaliza' por bloque
+        """
+        lineas = []
+        while self.bloques:
+            self._cerrar_ambito()
+            lineas.append(self._sangria() + "finaliza")
+        return lineas
+
+
+def generar_lineas(tamano_bytes, profundidad=4, invalido=False, tasa_errores=0.05, semilla=0):
+    """
+    Genera las líneas de un programa de aproximadamente `tamano_bytes` bytes
+
+    Args:
+        tamano_bytes (int): Tamaño aproximado del programa (UTF-8, con saltos de línea)
+        profundidad (int): Anidamiento máximo de bloques
+        invalido (bool): Si se inyectan errores
+        tasa_errores (float): Probabilidad de error por línea (si invalido)
+        semilla (int): Semilla del generador aleatorio
+
+    Yields:
+        str: Cada línea, sin salto de línea
+    """
+    generador = GeneradorProgramas(profundidad, invalido, tasa_errores, semilla)
+    escritos = 0
+    while escritos < tamano_bytes:
+        for linea in generador.siguientes_lineas():
+            escritos += len(linea.encode("utf-8")) + 1
+            yield linea
+    yield from generador.cerrar_todo()
+
+
+def generar_programa(tamano_bytes, profundidad=4, invalido=False, tasa_errores=0.05, semilla=0):
+    """
+    Genera un programa completo en memoria
+
+    Returns:
+        str: Código fuente (ver generar_lineas para los argumentos)
+    """
+    return "\n".join(generar_lineas(tamano_bytes, profundidad, invalido, tasa_errores, semilla))
+
+
+def escribir_programa(ruta, tamano_bytes, profundidad=4, invalido=False, tasa_errores=0.05, semilla=0):
+    """
+    Escribe un programa en disco línea por línea (para tamaños que no caben en memoria)
+
+    Args:
+        ruta (str): Archivo de destino
+        (resto: ver generar_lineas)
+
+    Returns:
+        int: Cantidad de líneas escritas
+    """
+    cantidad = 0
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for linea in generar_lineas(tamano_bytes, profundidad, invalido, tasa_errores, semilla):
+            archivo.write(linea)
+            archivo.write("\n")
+            cantidad += 1
+    return cantidad
\ No newline at end of file
@@ -0,0 +1,312 @@
+"""
+Suite de benchmarks del analizador sobre programas sintéticos
+
+Mide el rendimiento (tokens/s y líneas/s) de AnalizadorLexico.analizar_codigo,
+AnalizadorGramatical.analizar_codigo, el PDA (sobre tokens ya generados) y el
+análisis por flujo, para programas de distintos tamaños generados con
+benchmarks.generador. Los resultados se pueden guardar como línea base en
+JSON y comparar contra una línea base anterior para detectar regresiones.
+
+Los tamaños mayores que --limite-memoria solo se miden por flujo: el programa
+se escribe a un archivo temporal y se analiza con analizar_archivo, con
+memoria acotada.
+
+Uso:
+    python -m benchmarks.suite --tamanos 1KB,1MB,16MB --guardar linea_base.json
+    python -m benchmarks.suite --tamanos 1KB,1MB,16MB --comparar linea_base.json --umbral 0.15
+    python -m benchmarks.suite --tamanos 1GB --profundidad 16 --invalido
+
+Código de salida: 0 sin regresiones, 1 si alguna medición empeoró más que el umbral.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from AnalisisLexico import AnalizadorLexico
+from AnalizadorGramatical import AnalizadorGramatical
+from Analisis import analizar_archivo, analizar_stream
+from PDA import PDA
+from benchmarks.generador import generar_programa, escribir_programa
+
+UNIDADES = {"GB": 1024 ** 3, "MB": 1024 ** 2, "KB": 1024, "B": 1}
+TAMANOS_POR_DEFECTO = "1KB,64KB,1MB,16MB"
+OBJETIVOS = ("lexico", "gramatical", "pda", "flujo")
+VERSION_FORMATO = 1
+
+
+def parsear_tamano(texto):
+    """
+    Convierte un tamaño como '64KB' o '1GB' a bytes
+
+    Args:
+        texto (str): Número con unidad opcional (B, KB, MB, GB)
+
+    Returns:
+        int: Cantidad de bytes
+    """
+    texto = texto.strip().upper()
+    for unidad, factor in UNIDADES.items():
+        if texto.endswith(unidad):
+            return int(float(texto[:-len(unidad)]) * factor)
+    return int(texto)
+
+
+def formatear_tamano(cantidad):
+    """Tamaño en bytes con la mayor unidad exacta (p. ej. 1048576 -> '1MB')"""
+    for unidad, factor in UNIDADES.items():
+        if cantidad >= factor and cantidad % factor == 0:
+            return f"{cantidad // factor}{unidad}"
+    return f"{cantidad}B"
+
+
+def medir(funcion, repeticiones=3, tiempo_minimo=0.05):
+    """
+    Mejor tiempo por llamada de `funcion`
+
+    Las funciones muy rápidas se ejecutan varias veces por muestra para que
+    cada muestra dure al menos `tiempo_minimo` segundos.
+
+    Returns:
+        float: Segundos por llamada (mínimo de las muestras)
+    """
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+
+    vueltas = 1
+    if duracion < tiempo_minimo:
+        vueltas = int(tiempo_minimo / max(duracion, 1e-9)) + 1
+
+    mejor = duracion if vueltas == 1 else float("inf")
+    for _ in range(repeticiones - 1 if vueltas == 1 else repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(vueltas):
+            funcion()
+        mejor = min(mejor, (time.perf_counter() - inicio) / vueltas)
+    return mejor
+
+
+def _medicion(tamano, lineas, tokens, segundos):
+    """Arma el registro de una medición"""
+    return {
+        'bytes': tamano,
+        'lineas': lineas,
+        'tokens': tokens,
+        'segundos': segundos,
+        'tokens_por_segundo': tokens / segundos if segundos else 0.0,
+        'lineas_por_segundo': lineas / segundos if segundos else 0.0,
+    }
+
+
+def _contar_tokens(analizador_lexico, errores_lexicos):
+    """Tokens léxicos de un análisis: los registrados más los desconocidos"""
+    return sum(datos["Cantidad"] for datos in analizador_lexico.tokens_dict.values()) + errores_lexicos
+
+
+def medir_en_memoria(codigo, tamano, tokens_json, repeticiones):
+    """
+    Mide los cuatro objetivos sobre un programa cargado en memoria
+
+    Returns:
+        dict: {objetivo: medición}
+    """
+    lexico = AnalizadorLexico(tokens_json=tokens_json)
+    resultado = lexico.analizar_codigo(codigo)
+    tokens = _contar_tokens(lexico, len(resultado['errores_lexicos']))
+    lineas = codigo.count("\n") + 1
+
+    # El PDA se mide sobre los tokens ya generados por el analizador léxico
+    lineas_tokens = [(linea.tokens, linea.numero) for linea in lexico.generar_tokens(codigo)]
+
+    def ejecutar_pda():
+        pda = PDA()
+        for tokens_linea, numero in lineas_tokens:
+            pda.procesar_linea(tokens_linea, numero)
+        pda.validar_final()
+
+    def ejecutar_flujo():
+        for _ in analizar_stream(codigo.split("\n"), AnalizadorLexico(tokens_json=tokens_json),
+                                 AnalizadorGramatical(tokens_json)):
+            pass
+
+    # Analizadores nuevos en cada llamada: el caché de líneas empieza vacío
+    funciones = {
+        'lexico': lambda: AnalizadorLexico(tokens_json=tokens_json).analizar_codigo(codigo),
+        'gramatical': lambda: AnalizadorGramatical(tokens_json).analizar_codigo(codigo),
+        'pda': ejecutar_pda,
+        'flujo': ejecutar_flujo,
+    }
+    return {objetivo: _medicion(tamano, lineas, tokens, medir(funcion, repeticiones))
+            for objetivo, funcion in funciones.items()}
+
+
+def medir_desde_disco(tamano, tokens_json, profundidad, invalido, semilla):
+    """
+    Mide el análisis por flujo de un programa escrito a un archivo temporal
+
+    Returns:
+        dict: {'flujo': medición}
+    """
+    descriptor, ruta = tempfile.mkstemp(suffix=".txt", prefix="bench_")
+    os.close(descriptor)
+    try:
+        lineas = escribir_programa(ruta, tamano, profundidad, invalido, semilla=semilla)
+        tamano_real = os.path.getsize(ruta)
+
+        lexico = AnalizadorLexico(tokens_json=tokens_json)
+        gramatical = AnalizadorGramatical(tokens_json)
+        errores_lexicos = 0
+        inicio = time.perf_counter()
+        for diagnostico in analizar_archivo(ruta, lexico, gramatical):
+            if diagnostico.tipo == 'error_lexico':
+                errores_lexicos += 1
+        segundos = time.perf_counter() - inicio
+
+        tokens = _contar_tokens(lexico, errores_lexicos)
+        return {'flujo': _medicion(tamano_real, lineas, tokens, segundos)}
+    finally:
+        os.remove(ruta)
+
+
+def ejecutar_suite(tamanos, tokens_json, profundidad=4, invalido=False, semilla=0,
+                   repeticiones=3, limite_memoria=UNIDADES["MB"] * 256):
+    """
+    Ejecuta todas las mediciones
+
+    Args:
+        tamanos (list): Tamaños de programa en bytes
+        tokens_json (dict): Categorías de Tokens.json
+        profundidad (int): Anidamiento máximo de los programas generados
+        invalido (bool): Si los programas incluyen errores
+        semilla (int): Semilla del generador
+        repeticiones (int): Muestras por medición (se toma la mejor)
+        limite_memoria (int): Tamaño desde el cual solo se mide por flujo desde disco
+
+    Returns:
+        dict: {'objetivo@tamaño': medición}
+    """
+    resultados = {}
+    for tamano in tamanos:
+        etiqueta = formatear_tamano(tamano)
+        print(f"⏳ Midiendo {etiqueta}...", file=sys.stderr)
+        if tamano > limite_memoria:
+            mediciones = medir_desde_disco(tamano, tokens_json, profundidad, invalido, semilla)
+        else:
+            codigo = generar_programa(tamano, profundidad, invalido, semilla=semilla)
+            mediciones = medir_en_memoria(codigo, tamano, tokens_json, repeticiones)
+        for objetivo, medicion in mediciones.items():
+            resultados[f"{objetivo}@{etiqueta}"] = medicion
+    return resultados
+
+
+def comparar(resultados, linea_base, umbral):
+    """
+    Compara los resultados contra una línea base
+
+    Args:
+        resultados (dict): Mediciones actuales
+        linea_base (dict): Mediciones guardadas
+        umbral (float): Caída relativa de tokens/s que se considera regresión
+
+    Returns:
+        dict: {'objetivo@tamaño': cambio relativo de tokens/s} de las regresiones
+    """
+    regresiones = {}
+    for clave, medicion in resultados.items():
+        base = linea_base.get(clave)
+        if not base or not base['tokens_por_segundo']:
+            continue
+        cambio = medicion['tokens_por_segundo'] / base['tokens_por_segundo'] - 1
+        if cambio < -umbral:
+            regresiones[clave] = cambio
+    return regresiones
+
+
+def imprimir_resultados(resultados, linea_base=None, regresiones=None):
+    """Muestra una tabla de resultados (y el cambio respecto de la línea base)"""
+    linea_base = linea_base or {}
+    regresiones = regresiones or {}
+    print(f"{'MEDICIÓN':<20} {'LÍNEAS':>12} {'TOKENS':>14} {'SEGUNDOS':>10} "
+          f"{'TOKENS/S':>14} {'LÍNEAS/S':>12} {'CAMBIO':>9}")
+    for clave, medicion in resultados.items():
+        cambio = ""
+        base = linea_base.get(clave)
+        if base and base['tokens_por_segundo']:
+            cambio = f"{medicion['tokens_por_segundo'] / base['tokens_por_segundo'] - 1:+.1%}"
+        marca = "  ⚠ REGRESIÓN" if clave in regresiones else ""
+        print(f"{clave:<20} {medicion['lineas']:>12,} {medicion['tokens']:>14,} "
+              f"{medicion['segundos']:>10.4f} {medicion['tokens_por_segundo']:>14,.0f} "
+              f"{medicion['lineas_por_segundo']:>12,.0f} {cambio:>9}{marca}")
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks del analizador sobre programas sintéticos")
+    parser.add_argument("--tamanos", default=TAMANOS_POR_DEFECTO,
+                        help=f"Tamaños separados por comas (por defecto {TAMANOS_POR_DEFECTO})")
+    parser.add_argument("--profundidad", type=int, default=4, help="Anidamiento máximo de bloques")
+    parser.add_argument("--invalido", action="store_true", help="Generar programas con errores")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Muestras por medición")
+    parser.add_argument("--limite-memoria", default="256MB",
+                        help="Desde este tamaño solo se mide el análisis por flujo desde disco")
+    parser.add_argument("--tokens", default=os.path.join(RAIZ, "Tokens.json"), help="Ruta de Tokens.json")
+    parser.add_argument("--guardar", default=None, help="Guarda los resultados como línea base JSON")
+    parser.add_argument("--comparar", default=None, help="Línea base JSON contra la que comparar")
+    parser.add_argument("--umbral", type=float, default=0.10,
+                        help="Caída de tokens/s que se marca como regresión (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    with open(args.tokens, "r", encoding="utf-8") as archivo:
+        tokens_json = json.load(archivo)
+
+    parametros = {
+        'profundidad': args.profundidad,
+        'invalido': args.invalido,
+        'semilla': args.semilla,
+    }
+    tamanos = [parsear_tamano(tamano) for tamano in args.tamanos.split(",") if tamano.strip()]
+    resultados = ejecutar_suite(tamanos, tokens_json, repeticiones=args.repeticiones,
+                                limite_memoria=parsear_tamano(args.limite_memoria), **parametros)
+
+    linea_base = None
+    regresiones = {}
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as archivo:
+            guardado = json.load(archivo)
+        if guardado.get('parametros') != parametros:
+            print(f"⚠️ La línea base se midió con otros parámetros: {guardado.get('parametros')}",
+                  file=sys.stderr)
+        linea_base = guardado['resultados']
+        regresiones = comparar(resultados, linea_base, args.umbral)
+
+    imprimir_resultados(resultados, linea_base, regresiones)
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as archivo:
+            json.dump({
+                'version': VERSION_FORMATO,
+                'fecha': datetime.datetime.now().isoformat(timespec="seconds"),
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'parametros': parametros,
+                'resultados': resultados,
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"✓ Línea base guardada en {args.guardar}", file=sys.stderr)
+
+    if regresiones:
+        print(f"⚠ {len(regresiones)} regresiones por encima del {args.umbral:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Salida de los tres formatos de Exportacion
+"""
+import csv
+import io
+import json
+
+import pytest
+
+from Analisis import analizar_archivo
+from Exportacion import COLUMNAS_CSV, FORMATOS, VERSION_SARIF, exportar_lote
+from NucleoAnalisis import crear_analizadores
+from benchmarks.generador import generar_programa
+
+
+@pytest.fixture
+def archivos(tmp_path):
+    rutas = []
+    for semilla in range(3):
+        ruta = tmp_path / f"programa{semilla}.txt"
+        ruta.write_text(generar_programa(4 * 1024, invalido=True, tasa_errores=0.1, semilla=semilla),
+                        encoding="utf-8")
+        rutas.append(str(ruta))
+    return rutas
+
+
+def esperados(ruta):
+    """Diagnósticos (en orden de detección) y tabla de tokens de un archivo"""
+    lexico, gramatical = crear_analizadores()
+    diagnosticos = list(analizar_archivo(ruta, lexico, gramatical))
+    tokens = [(token, datos["Tipo"], datos["Cantidad"]) for token, datos in lexico.obtener_tokens_ordenados()]
+    return diagnosticos, tokens
+
+
+def exportar(formato, rutas, jobs=1):
+    salida = io.StringIO()
+    exportar_lote(rutas, FORMATOS[formato](salida), jobs=jobs)
+    return salida.getvalue()
+
+
+def test_ndjson(archivos):
+    registros = [json.loads(linea) for linea in exportar("ndjson", archivos).splitlines()]
+    for ruta in archivos:
+        diagnosticos, tokens = esperados(ruta)
+        assert diagnosticos
+        del_archivo = [registro for registro in registros if registro['archivo'] == ruta]
+        assert [{clave: valor for clave, valor in registro.items() if clave not in ('registro', 'archivo')}
+                for registro in del_archivo if registro['registro'] == 'diagnostico'] == \
+            [diagnostico.como_dict() for diagnostico in diagnosticos]
+        assert [(registro['token'], registro['tipo'], registro['cantidad'])
+                for registro in del_archivo if registro['registro'] == 'token'] == tokens
+        resumen, = [registro for registro in del_archivo if registro['registro'] == 'resumen']
+        assert resumen['errores'] == sum(diagnostico.tipo == 'error' for diagnostico in diagnosticos)
+        assert resumen['tokens_unicos'] == len(tokens)
+
+
+def test_csv(archivos):
+    filas = list(csv.reader(io.StringIO(exportar("csv", archivos))))
+    assert tuple(filas[0]) == COLUMNAS_CSV
+    for ruta in archivos:
+        diagnosticos, tokens = esperados(ruta)
+        del_archivo = [dict(zip(COLUMNAS_CSV, fila)) for fila in filas[1:] if fila[1] == ruta]
+        assert [(fila['linea'], fila['codigo'], fila['mensaje'])
+                for fila in del_archivo if fila['registro'] == 'diagnostico'] == \
+            [(str(diagnostico.linea), diagnostico.codigo, diagnostico.mensaje) for diagnostico in diagnosticos]
+        assert [(fila['token'], fila['tipo'], int(fila['cantidad']))
+                for fila in del_archivo if fila['registro'] == 'token'] == tokens
+
+
+def test_sarif(archivos, tmp_path):
+    faltante = str(tmp_path / "no_existe.txt")
+    documento = json.loads(exportar("sarif", archivos + [faltante]))
+    assert documento['version'] == VERSION_SARIF
+    corrida, = documento['runs']
+    reglas = corrida['tool']['driver']['rules']
+    resultados = corrida['results']
+
+    diagnosticos = [diagnostico for ruta in archivos for diagnostico in esperados(ruta)[0]]
+    assert [(resultado['ruleId'], resultado['locations'][0]['physicalLocation']['region']['startLine'])
+            for resultado in resultados] == [(diagnostico.codigo, diagnostico.linea) for diagnostico in diagnosticos]
+    assert all(reglas[resultado['ruleIndex']]['id'] == resultado['ruleId'] for resultado in resultados)
+
+    resumen = corrida['properties']['resumen']
+    assert resumen['archivos'] == len(archivos)
+    assert resumen['fallidos'] == 1
+    assert resumen['errores'] == sum(diagnostico.tipo == 'error' for diagnostico in diagnosticos)
+    invocacion, = corrida['invocations']
+    assert not invocacion['executionSuccessful']
+    assert len(invocacion['toolExecutionNotifications']) == 1
+
+
+@pytest.mark.parametrize("formato", sorted(FORMATOS))
+def test_pool_igual_que_en_proceso(archivos, formato):
+    """Con varios procesos se exporta lo mismo que escribiendo durante el análisis"""
+    assert exportar(formato, archivos, jobs=2) == exportar(formato, archivos)
@@ -0,0 +1,110 @@
+"""
+Análisis incremental (Incremental) contra el análisis completo del mismo texto
+"""
+import random
+
+import pytest
+
+from Analisis import analizar_codigo
+from Incremental import AnalizadorIncremental
+from NucleoAnalisis import crear_analizadores
+from benchmarks.generador import GeneradorProgramas
+
+MAXIMO_PASOS = 100000
+# Líneas que se insertan; las de bloque cambian el estado del PDA hasta el final
+LINEAS_NUEVAS = ("entero a = 1", "a = 2;", "si (a > 0) siguiente", "finaliza", "imprimir(a);",
+                 "func f() siguiente", ")", "cadena c = \"x\";", "")
+
+
+def completar(incremental):
+    """Completa el análisis pendiente de a pasos de continuar(limite=0)"""
+    for _ in range(MAXIMO_PASOS):
+        if incremental.continuar(limite=0.0):
+            return
+    pytest.fail(f"continuar() no terminó; pendientes: {sorted(incremental.pendientes)}")
+
+
+def firma(resultado_lexico, resultado_gramatical):
+    """Datos comparables de los resultados de un análisis"""
+    return (resultado_lexico['tokens'], resultado_lexico['errores_lexicos'],
+            resultado_gramatical['errores'], resultado_gramatical['advertencias'],
+            dict(resultado_gramatical['variables']), set(resultado_gramatical['funciones']))
+
+
+def comparar_con_completo(incremental):
+    completar(incremental)
+    codigo = "\n".join(incremental.lineas)
+    assert firma(*incremental.resultados()) == firma(*analizar_codigo(codigo, *crear_analizadores()))
+
+
+def programa(semilla, minimo_lineas=60):
+    generador = GeneradorProgramas(invalido=True, semilla=semilla)
+    lineas = []
+    while len(lineas) < minimo_lineas:
+        lineas.extend(generador.siguientes_lineas())
+    return lineas
+
+
+def test_analisis_inicial_igual_al_completo():
+    incremental = AnalizadorIncremental(*crear_analizadores())
+    incremental.analizar("\n".join(programa(1)))
+    comparar_con_completo(incremental)
+
+
+def test_borrar_desde_pendiente_hasta_el_final():
+    """Borrar desde un pendiente hasta el final no debe dejar un pendiente sin líneas (continuar no terminaba)"""
+    incremental = AnalizadorIncremental(*crear_analizadores())
+    incremental.analizar('a = 1\nb = 2\nc = 3\nd = 4')
+    incremental.aplicar_edicion(0, 1, ['entero a = 1'], limite=0.0)
+    for _ in range(MAXIMO_PASOS):
+        if list(incremental.pendientes) == [3]:
+            break
+        incremental.continuar(limite=0.0)
+    incremental.aplicar_edicion(3, 4, [], limite=0.0)
+    comparar_con_completo(incremental)
+
+
+@pytest.mark.parametrize("limite", [None, 0.0])
+def test_borrar_todo(limite):
+    incremental = AnalizadorIncremental(*crear_analizadores())
+    incremental.analizar("\n".join(programa(2)))
+    incremental.aplicar_edicion(0, len(incremental.lineas), [], limite=limite)
+    comparar_con_completo(incremental)
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_ediciones_al_azar(semilla):
+    azar = random.Random(semilla)
+    incremental = AnalizadorIncremental(*crear_analizadores(), intervalo_checkpoint=4)
+    incremental.analizar("\n".join(programa(semilla)))
+    for numero in range(1, 61):
+        total = len(incremental.lineas)
+        inicio = azar.randrange(total + 1)
+        if incremental.pendientes and azar.random() < 0.3:
+            # Ediciones que empiezan justo en un re-análisis pendiente
+            inicio = azar.choice(sorted(incremental.pendientes))
+        fin = min(total, inicio + azar.choice((0, 0, 1, 1, 2, 5, total)))
+        nuevas = [azar.choice(LINEAS_NUEVAS) for _ in range(azar.choice((0, 1, 1, 2)))]
+        if inicio == fin and not nuevas:
+            continue
+        incremental.aplicar_edicion(inicio, fin, nuevas, limite=azar.choice((None, 0.0, 0.0)))
+        for _ in range(azar.randrange(3)):
+            incremental.continuar(limite=0.0)
+        if numero % 5 == 0:
+            comparar_con_completo(incremental)
+
+
+def test_limite_de_diagnosticos():
+    """Con límites, los conteos de descartados coinciden con los del análisis completo"""
+    opciones = {'maximo_diagnosticos': 5, 'maximo_por_regla': 2}
+    lineas = programa(7, minimo_lineas=200)
+    incremental = AnalizadorIncremental(*crear_analizadores(**opciones))
+    incremental.analizar("\n".join(lineas))
+    incremental.aplicar_edicion(10, 12, ["si (a > 0) siguiente", ")"], limite=0.0)
+    completar(incremental)
+
+    completo = crear_analizadores(**opciones)
+    resultados = analizar_codigo("\n".join(incremental.lineas), *completo)
+    assert firma(*incremental.resultados()) == firma(*resultados)
+    assert (incremental.gramatical.limites.descartados('error')
+            == completo[1].limites.descartados('error'))
@@ -0,0 +1,103 @@
+"""
+Comprobación de un proyecto con el índice en disco (IndiceProyecto)
+"""
+import json
+import os
+import shutil
+
+import pytest
+
+import IndiceProyecto
+from AnalizadorLote import analizar_lote
+from IndiceProyecto import IndiceAnalisis, comprobar_proyecto, huella_configuracion
+from benchmarks.generador import generar_programa
+
+# mtime anterior a MARGEN_MTIME_NS: el índice lo guarda y puede evitar leer el archivo
+MTIME_VIEJO = 1_600_000_000 * 10**9
+
+
+@pytest.fixture
+def proyecto(tmp_path):
+    rutas = []
+    for semilla in range(3):
+        ruta = tmp_path / f"programa{semilla}.txt"
+        ruta.write_text(generar_programa(2 * 1024, invalido=True, semilla=semilla), encoding="utf-8")
+        os.utime(ruta, ns=(MTIME_VIEJO, MTIME_VIEJO))
+        rutas.append(str(ruta))
+    return rutas
+
+
+@pytest.fixture
+def indice(tmp_path):
+    indice = IndiceAnalisis(str(tmp_path / "indice.sqlite"), huella_configuracion())
+    yield indice
+    indice.cerrar()
+
+
+def cambios(comprobados):
+    return {ruta: cambio for ruta, cambio, _, _ in comprobados}
+
+
+def test_salida_como_analizador_lote(proyecto, indice):
+    comprobados = comprobar_proyecto(proyecto, indice, jobs=1)
+    assert set(cambios(comprobados).values()) == {'analizado'}
+    for (ruta, _, salida, con_errores), resultado in zip(comprobados, analizar_lote(proyecto, jobs=1)):
+        del resultado['archivo']
+        assert json.loads(salida) == resultado
+        assert con_errores == bool(resultado['errores_lexicos'] or resultado['errores'])
+
+
+def test_sin_cambios_no_lee_los_archivos(proyecto, indice, monkeypatch):
+    primera = comprobar_proyecto(proyecto, indice, jobs=1)
+
+    def leer_hash(ruta):
+        raise AssertionError(f"se leyó {ruta} sin que cambiara")
+
+    monkeypatch.setattr(IndiceProyecto, "_leer_hash", leer_hash)
+    segunda = comprobar_proyecto(proyecto, indice, jobs=1)
+    assert set(cambios(segunda).values()) == {'sin_cambios'}
+    assert [salida for _, _, salida, _ in segunda] == [salida for _, _, salida, _ in primera]
+    assert comprobar_proyecto(proyecto, indice, jobs=1, solo_cambios=True) == []
+
+
+def test_contenido_reutilizado(proyecto, indice, tmp_path):
+    comprobar_proyecto(proyecto, indice, jobs=1)
+    copia = str(tmp_path / "copia.txt")
+    shutil.copyfile(proyecto[0], copia)
+    comprobados = comprobar_proyecto(proyecto + [copia], indice, jobs=1)
+    assert cambios(comprobados)[copia] == 'reutilizado'
+    assert comprobados[-1][2] == comprobados[0][2]
+
+
+def test_archivo_modificado(proyecto, indice):
+    comprobar_proyecto(proyecto, indice, jobs=1)
+    with open(proyecto[1], "a", encoding="utf-8") as archivo:
+        archivo.write("\nentero nuevo = 1\n")
+    os.utime(proyecto[1], ns=(MTIME_VIEJO + 10**9, MTIME_VIEJO + 10**9))
+    assert cambios(comprobar_proyecto(proyecto, indice, jobs=1)) == {
+        proyecto[0]: 'sin_cambios', proyecto[1]: 'analizado', proyecto[2]: 'sin_cambios'}
+
+
+def test_archivo_eliminado(proyecto, indice):
+    comprobar_proyecto(proyecto, indice, jobs=1)
+    os.remove(proyecto[2])
+    comprobados = comprobar_proyecto(proyecto[:2], indice, jobs=1)
+    assert comprobados[-1] == (proyecto[2], 'eliminado', '{"eliminado": true}', False)
+    assert [cambio for _, cambio, _, _ in comprobados[:2]] == ['sin_cambios', 'sin_cambios']
+    # Una vez informado, sale del índice
+    assert os.path.abspath(proyecto[2]) not in indice.archivos()
+    assert [cambio for _, cambio, _, _ in comprobar_proyecto(proyecto[:2], indice, jobs=1)] == \
+        ['sin_cambios', 'sin_cambios']
+
+
+def test_huella_distinta_vacia_el_indice(proyecto, tmp_path):
+    ruta_indice = str(tmp_path / "indice.sqlite")
+    indice = IndiceAnalisis(ruta_indice, huella_configuracion())
+    comprobar_proyecto(proyecto, indice, jobs=1)
+    indice.cerrar()
+    indice = IndiceAnalisis(ruta_indice, huella_configuracion(maximo_diagnosticos=1))
+    try:
+        assert set(cambios(comprobar_proyecto(proyecto, indice, jobs=1, maximo_diagnosticos=1)).values()) == \
+            {'analizado'}
+    finally:
+        indice.cerrar()
@@ -0,0 +1,118 @@
+"""
+Análisis léxico (LexicoParalelo) y validación del PDA (PDAParalelo) repartidos en bloques
+contra el análisis secuencial
+"""
+import pytest
+
+import LexicoParalelo
+import PDAParalelo
+from NucleoAnalisis import crear_analizadores
+from PDA import PDA, ResumenPDA
+from benchmarks.generador import generar_programa
+
+TAMANO_BLOQUE = 2048   # Varios bloques por programa
+
+
+@pytest.fixture(scope="module")
+def programa():
+    return generar_programa(40 * 1024, invalido=True, tasa_errores=0.1, semilla=3)
+
+
+def firma_lexica(resultado):
+    """Tabla de tokens (en orden) y errores léxicos de un resultado"""
+    return (list((token, datos["Tipo"], datos["Cantidad"]) for token, datos in resultado["tokens"].items()),
+            resultado["errores_lexicos"])
+
+
+def pda_secuencial(lexico, codigo):
+    pda = PDA()
+    for linea in lexico.generar_tokens(codigo):
+        pda.procesar_linea(linea.tokens, linea.numero, linea.posiciones)
+    pda.validar_final()
+    return pda.obtener_resultados()
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_lexico_codigo(programa, jobs):
+    lexico, _ = crear_analizadores()
+    esperado = firma_lexica(lexico.analizar_codigo(programa))
+    assert esperado[1]
+    resultado = LexicoParalelo.analizar_codigo(programa, lexico, jobs=jobs, tamano_bloque=TAMANO_BLOQUE)
+    assert firma_lexica(resultado) == esperado
+
+
+def test_lexico_archivo(programa, tmp_path):
+    ruta = tmp_path / "programa.txt"
+    ruta.write_text(programa, encoding="utf-8")
+    lexico, _ = crear_analizadores()
+    esperado = firma_lexica(lexico.analizar_codigo(programa))
+    resultado = LexicoParalelo.analizar_archivo(str(ruta), lexico, jobs=2, tamano_bloque=TAMANO_BLOQUE)
+    assert firma_lexica(resultado) == esperado
+
+
+def test_lexico_limites(programa):
+    """Los errores que superan el límite se cuentan como en el análisis secuencial"""
+    secuencial, _ = crear_analizadores(maximo_diagnosticos=3)
+    esperado = firma_lexica(secuencial.analizar_codigo(programa))
+    lexico, _ = crear_analizadores(maximo_diagnosticos=3)
+    resultado = LexicoParalelo.analizar_codigo(programa, lexico, jobs=1, tamano_bloque=TAMANO_BLOQUE)
+    assert firma_lexica(resultado) == esperado
+    assert lexico.limites.descartados() == secuencial.limites.descartados() > 0
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_pda_codigo(programa, jobs):
+    lexico, _ = crear_analizadores()
+    esperado = pda_secuencial(lexico, programa)
+    assert esperado['errores']
+    assert PDAParalelo.validar_codigo(programa, lexico, jobs=jobs, tamano_bloque=TAMANO_BLOQUE) == esperado
+
+
+def test_pda_archivo(programa, tmp_path):
+    ruta = tmp_path / "programa.txt"
+    ruta.write_text(programa, encoding="utf-8")
+    lexico, _ = crear_analizadores()
+    esperado = pda_secuencial(lexico, programa)
+    assert PDAParalelo.validar_archivo(str(ruta), lexico, jobs=2, tamano_bloque=TAMANO_BLOQUE) == esperado
+
+
+@pytest.mark.parametrize("cortes", [(1, 2), (3, 9), (10, 40), (25, 26), (0, 60)])
+def test_resumen_combinar_asociativo(programa, cortes):
+    """(a + b) + c y a + (b + c) dan los mismos diagnósticos que el PDA secuencial"""
+    lexico, _ = crear_analizadores()
+    lineas = programa.split("\n")[:60]
+    codigo = "\n".join(lineas)
+    esperado = pda_secuencial(lexico, codigo)
+    inicio, fin = cortes
+    bloques = [lineas[:inicio], lineas[inicio:fin], lineas[fin:]]
+
+    def resumenes():
+        """Resumen de cada bloque, ya desplazado a su lugar en el código"""
+        desplazamiento = 0
+        for bloque in bloques:
+            resumen = PDAParalelo._resumir(lexico.generar_tokens("\n".join(bloque)))
+            resumen.desplazar(desplazamiento)
+            desplazamiento += len(bloque)
+            yield resumen
+
+    a, b, c = resumenes()
+    a.combinar(b)
+    a.combinar(c)
+    izquierda = a.finalizar()
+
+    a, b, c = resumenes()
+    b.combinar(c)
+    a.combinar(b)
+    derecha = a.finalizar()
+
+    assert izquierda == derecha == esperado
+
+
+def test_resumen_vacio_es_neutro(programa):
+    lexico, _ = crear_analizadores()
+    codigo = "\n".join(programa.split("\n")[:40])
+    esperado = pda_secuencial(lexico, codigo)
+    total = ResumenPDA()
+    total.combinar(PDAParalelo._resumir(lexico.generar_tokens(codigo)))
+    total.combinar(ResumenPDA())
+    assert total.finalizar() == esperado